@@ -0,0 +1,118 @@
+"""
+이미지 매칭 벤치마크 스크립트
+표준(전체 해상도) 매칭과 피라미드(coarse-to-fine) 매칭의 정확도와 속도를 비교합니다.
+
+사용법:
+    python benchmark_image_matching.py [이미지 폴더] [--runs N]
+
+폴더의 각 스크린샷에서 텍스처가 있는 영역을 템플릿으로 잘라낸 뒤,
+두 방식으로 원래 위치(±2px, 또는 동일한 복사본)를 다시 찾는지와 소요 시간을 측정합니다.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root / "src"))
+
+import cv2
+import numpy as np
+from vision.template_matching import match_best, match_pyramid, build_pyramid, pyramid_levels_for
+
+TEMPLATE_SIZES = [(24, 24), (48, 32), (96, 48), (160, 90)]
+TOLERANCE = 2
+
+
+def pick_templates(gray: np.ndarray, sizes, per_size: int = 3, seed: int = 0):
+    """Pick textured patches (high variance) as templates"""
+    rng = np.random.default_rng(seed)
+    h, w = gray.shape
+    picks = []
+    for tw, th in sizes:
+        if tw >= w or th >= h:
+            continue
+        candidates = []
+        for _ in range(200):
+            x = int(rng.integers(0, w - tw))
+            y = int(rng.integers(0, h - th))
+            patch = gray[y:y + th, x:x + tw]
+            candidates.append((float(patch.std()), x, y))
+        candidates.sort(reverse=True)
+        for _, x, y in candidates[:per_size]:
+            picks.append(((x, y), gray[y:y + th, x:x + tw].copy()))
+    return picks
+
+
+def is_correct(screen: np.ndarray, template: np.ndarray, loc, expected) -> bool:
+    """Expected location, or an identical copy of the template elsewhere"""
+    if abs(loc[0] - expected[0]) <= TOLERANCE and abs(loc[1] - expected[1]) <= TOLERANCE:
+        return True
+    th, tw = template.shape[:2]
+    found = screen[loc[1]:loc[1] + th, loc[0]:loc[0] + tw]
+    return found.shape == template.shape and np.array_equal(found, template)
+
+
+def time_call(func, runs: int):
+    """Return (last result, median milliseconds)"""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Standard vs pyramid template matching")
+    parser.add_argument("folder", nargs="?", default=str(project_root / "captures"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    images = sorted(Path(args.folder).glob("*.png"))
+    if not images:
+        print(f"이미지가 없습니다: {args.folder}")
+        return
+
+    stats = {"standard": {"hits": 0, "ms": []}, "pyramid": {"hits": 0, "ms": []}}
+    total = 0
+
+    for image_path in images:
+        screen = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+        if screen is None:
+            continue
+        for (tx, ty), template in pick_templates(screen, TEMPLATE_SIZES):
+            total += 1
+            levels = pyramid_levels_for(template.shape)
+            template_pyramid = build_pyramid(template, levels)
+
+            (_, loc), ms = time_call(lambda: match_best(screen, template), args.runs)
+            stats["standard"]["ms"].append(ms)
+            if is_correct(screen, template, loc, (tx, ty)):
+                stats["standard"]["hits"] += 1
+
+            # 화면 피라미드는 실행 시 프레임당 한 번 생성되므로 측정에 포함
+            (_, loc), ms = time_call(
+                lambda: match_pyramid(screen, template, template_pyramid=template_pyramid),
+                args.runs)
+            stats["pyramid"]["ms"].append(ms)
+            if is_correct(screen, template, loc, (tx, ty)):
+                stats["pyramid"]["hits"] += 1
+
+    if not total:
+        print("템플릿을 만들 수 있는 이미지가 없습니다")
+        return
+
+    print(f"이미지 {len(images)}개, 템플릿 {total}개, 반복 {args.runs}회\n")
+    print(f"{'mode':<10} {'accuracy':>10} {'median ms':>10} {'p95 ms':>10}")
+    for mode, data in stats.items():
+        accuracy = data["hits"] / total * 100
+        print(f"{mode:<10} {accuracy:>9.1f}% {np.median(data['ms']):>10.2f} "
+              f"{np.percentile(data['ms'], 95):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+OCR 입력 경로 / 일괄 OCR 벤치마크 스크립트
+
+사용법:
+    python benchmark_ocr_batch.py [이미지 폴더] [--runs N] [--regions N] [--preprocess]
+
+1. 캡처 -> 추론 입력 변환: 이전 경로(PIL frombytes + np.array + RGB->GRAY->RGB 전처리)와
+   현재 경로(mss 버퍼 numpy 뷰 + 한 번의 색 변환 + 재사용 버퍼)의 지연 시간과 최대 메모리 비교
+2. 여러 작은 영역: 영역마다 OCR(extract_text_from_frame)과 한 번의 일괄 OCR(extract_text_batch) 비교
+   (PaddleOCR 필요, 없으면 1번만 실행)
+
+입력 변환은 폴더에서 가장 큰 PNG로, 일괄 OCR은 이름순 첫 번째 PNG를 화면 대신 사용해 측정합니다 (replay 캡처 백엔드).
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root / "src"))
+
+import cv2
+import numpy as np
+from vision.screen_capture import ScreenFrame, get_screen_capture
+from vision.capture_backends import BACKEND_REPLAY
+
+PADDING = 6
+
+
+def measure(func, runs: int):
+    """Return (median milliseconds, peak traced MB)"""
+    timings, peaks = [], []
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / (1 << 20))
+        tracemalloc.stop()
+    return float(np.median(timings)), max(peaks)
+
+
+def legacy_input(raw: bytes, size, preprocess: bool):
+    """Capture-to-input path before the shared capture service"""
+    from PIL import Image
+    img_pil = Image.frombytes("RGB", size, raw, "raw", "BGRX")
+    img_array = np.array(img_pil)
+    if preprocess:
+        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        binary = cv2.threshold(cv2.createCLAHE(2.0, (8, 8)).apply(cv2.medianBlur(gray, 3)),
+                               0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+        img_array = cv2.cvtColor(binary, cv2.COLOR_GRAY2RGB)
+    return img_array
+
+
+def current_input(extractor, raw: bytes, size, preprocess: bool):
+    """Current path: numpy view of the capture buffer, one conversion, reused buffers"""
+    width, height = size
+    frame = ScreenFrame(np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4), 0, 0, time.perf_counter())
+    img_array = frame.rgb()
+    if preprocess:
+        img_array = extractor.preprocess_image_for_ocr(img_array, frame.gray())
+    return img_array
+
+
+def benchmark_input(extractor, image_path: Path, runs: int, preprocess: bool):
+    bgra = cv2.cvtColor(cv2.imread(str(image_path), cv2.IMREAD_COLOR), cv2.COLOR_BGR2BGRA)
+    height, width = bgra.shape[:2]
+    raw = bgra.tobytes()  # mss의 shot.raw와 같은 BGRA 바이트
+    print(f"[입력 변환] {image_path.name} {width}x{height}, 전처리 {'사용' if preprocess else '안 함'}")
+    print(f"{'path':<10} {'ms':>8} {'peak MB':>9}")
+    for name, func in (("legacy", lambda: legacy_input(raw, (width, height), preprocess)),
+                       ("current", lambda: current_input(extractor, raw, (width, height), preprocess))):
+        try:
+            func()  # warm-up (재사용 버퍼 할당)
+        except ImportError as e:
+            print(f"{name:<10} 건너뜀 ({e})")
+            continue
+        ms, peak = measure(func, runs)
+        print(f"{name:<10} {ms:>8.2f} {peak:>9.1f}")
+    print()
+
+
+def line_regions(results, frame_region, limit):
+    """Padded boxes around detected lines"""
+    fx, fy, fw, fh = frame_region
+    regions = []
+    for r in results[:limit]:
+        x, y, w, h = r.bbox
+        x0, y0 = max(fx, x - PADDING), max(fy, y - PADDING)
+        x1, y1 = min(fx + fw, x + w + PADDING), min(fy + fh, y + h + PADDING)
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+    return regions
+
+
+def benchmark_batch(extractor, runs: int, count: int):
+    capture = get_screen_capture()
+    # 반복 측정이므로 결과 재사용 기능은 끔
+    extractor._ocr_cache = None
+    extractor._incremental = None
+    frame = capture.grab(None)
+    regions = line_regions(extractor.extract_text_from_frame(frame, ocr_mode="full"), frame.region, count)
+    if len(regions) < 2:
+        print("일괄 OCR: 텍스트 라인이 부족합니다")
+        return
+
+    def sequential():
+        capture.invalidate()
+        return [extractor.extract_text_from_frame(capture.grab(region)) for region in regions]
+
+    def batched():
+        capture.invalidate()
+        return extractor.extract_text_batch(regions)
+
+    print(f"[일괄 OCR] 영역 {len(regions)}개")
+    print(f"{'path':<12} {'ms':>8} {'peak MB':>9} {'texts':>6}")
+    for name, func in (("per-region", sequential), ("batch", batched)):
+        texts = sum(len(r) for r in func())
+        ms, peak = measure(func, runs)
+        print(f"{name:<12} {ms:>8.1f} {peak:>9.1f} {texts:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture-to-inference input path and batched OCR")
+    parser.add_argument("folder", nargs="?", default=str(project_root / "captures"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--regions", type=int, default=6, help="regions for the batch comparison")
+    parser.add_argument("--preprocess", action="store_true", help="include OCR preprocessing")
+    args = parser.parse_args()
+
+    images = sorted(Path(args.folder).glob("*.png"))
+    if not images:
+        print(f"이미지가 없습니다: {args.folder}")
+        return
+
+    from vision.text_extractor_paddle import PaddleTextExtractor, PADDLEOCR_AVAILABLE
+    extractor = PaddleTextExtractor()
+    extractor.set_preprocessing(args.preprocess)
+    # 가장 큰 스크린샷으로 입력 변환 측정
+    benchmark_input(extractor, max(images, key=lambda p: p.stat().st_size), args.runs, args.preprocess)
+
+    if not PADDLEOCR_AVAILABLE:
+        print("PaddleOCR이 없어 일괄 OCR 비교를 건너뜁니다")
+        return
+    get_screen_capture().configure_backend(BACKEND_REPLAY, source=args.folder, mode="static")
+    benchmark_batch(extractor, args.runs, args.regions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+OCR 빠른 경로 벤치마크 스크립트
+작은 영역에서 전체 검출(검출 + 인식)과 줄 인식(투영 프로파일 분할 + 인식만)의 속도와 결과를 비교합니다.
+
+사용법:
+    python benchmark_ocr_fast_path.py [이미지 폴더] [--runs N] [--max-regions N]
+
+폴더의 각 스크린샷에서 전체 검출로 텍스트 라인을 찾은 뒤,
+- 한 줄 영역: 라인 박스 주변 여백을 포함한 영역
+- 여러 줄 영역: 세로로 인접한 라인 2~4개를 합친 영역
+을 만들어 두 방식의 소요 시간과 인식 텍스트 일치율을 측정합니다. (PaddleOCR 필요)
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root / "src"))
+
+import cv2
+import numpy as np
+from vision.ocr_common import (paddle_init_params, parse_ocr_results, create_text_recognizer,
+                               recognize_boxes, check_gpu_availability)
+from vision.line_segmentation import (plan_recognition_boxes, OCR_MODE_AUTO, OCR_MODE_LINE,
+                                      OCR_MODE_LINES)
+
+PADDING = 6
+CONFIDENCE = 0.5
+
+
+def single_line_regions(boxes, shape, limit):
+    """Padded crops around individual detected lines"""
+    h, w = shape[:2]
+    regions = []
+    for x, y, bw, bh in boxes[:limit]:
+        x0, y0 = max(0, x - PADDING), max(0, y - PADDING)
+        x1, y1 = min(w, x + bw + PADDING), min(h, y + bh + PADDING)
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+    return regions
+
+
+def multi_line_regions(boxes, shape, limit):
+    """Union of 2-4 vertically adjacent lines with overlapping columns"""
+    h, w = shape[:2]
+    ordered = sorted(boxes, key=lambda b: (b[1], b[0]))
+    regions = []
+    for i, (x, y, bw, bh) in enumerate(ordered):
+        group = [(x, y, bw, bh)]
+        for nx, ny, nw, nh in ordered[i + 1:]:
+            last = group[-1]
+            if ny - (last[1] + last[3]) > 2 * last[3]:
+                break
+            if nx < x + bw and nx + nw > x and len(group) < 4:
+                group.append((nx, ny, nw, nh))
+        if len(group) < 2:
+            continue
+        x0 = max(0, min(b[0] for b in group) - PADDING)
+        y0 = max(0, min(b[1] for b in group) - PADDING)
+        x1 = min(w, max(b[0] + b[2] for b in group) + PADDING)
+        y1 = min(h, max(b[1] + b[3] for b in group) + PADDING)
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+        if len(regions) >= limit:
+            break
+    return regions
+
+
+def time_call(func, runs: int):
+    """Return (last result, median milliseconds)"""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, float(np.median(timings))
+
+
+def texts(results):
+    """Recognized text in reading order, whitespace removed"""
+    ordered = sorted(results, key=lambda r: (r.bbox[1] // 8, r.bbox[0]))
+    return "".join(r.text for r in ordered).replace(" ", "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full detection vs line recognition on small regions")
+    parser.add_argument("folder", nargs="?", default=str(project_root / "captures"))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-regions", type=int, default=10, help="regions per image and kind")
+    args = parser.parse_args()
+
+    images = sorted(Path(args.folder).glob("*.png"))
+    if not images:
+        print(f"이미지가 없습니다: {args.folder}")
+        return
+
+    from paddleocr import PaddleOCR
+    use_gpu = check_gpu_availability()
+    ocr = PaddleOCR(**paddle_init_params(use_gpu))
+    recognizer = create_text_recognizer(use_gpu)
+    if recognizer is None:
+        print("인식 전용 모델을 사용할 수 없습니다 (PaddleOCR 3.x 필요)")
+        return
+
+    kinds = {"line": OCR_MODE_LINE, "lines": OCR_MODE_LINES}
+    stats = {kind: {"full_ms": [], "fast_ms": [], "same": 0, "auto_fast": 0, "total": 0} for kind in kinds}
+
+    for image_path in images:
+        screen = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+        if screen is None:
+            continue
+        rgb = cv2.cvtColor(screen, cv2.COLOR_BGR2RGB)
+        detected = parse_ocr_results(ocr.ocr(rgb), CONFIDENCE)
+        boxes = [r.bbox for r in detected]
+        regions = {
+            "line": single_line_regions(boxes, rgb.shape, args.max_regions),
+            "lines": multi_line_regions(boxes, rgb.shape, args.max_regions),
+        }
+
+        for kind, mode in kinds.items():
+            for x, y, w, h in regions[kind]:
+                crop = np.ascontiguousarray(rgb[y:y + h, x:x + w])
+                gray = cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY)
+                data = stats[kind]
+                data["total"] += 1
+                if plan_recognition_boxes(gray, OCR_MODE_AUTO) is not None:
+                    data["auto_fast"] += 1
+
+                full, ms = time_call(lambda: parse_ocr_results(ocr.ocr(crop), CONFIDENCE), args.runs)
+                data["full_ms"].append(ms)
+
+                # 줄 분할도 실행 시 매번 수행되므로 측정에 포함
+                fast, ms = time_call(
+                    lambda: recognize_boxes(recognizer, crop, plan_recognition_boxes(gray, mode),
+                                            CONFIDENCE),
+                    args.runs)
+                data["fast_ms"].append(ms)
+                if texts(full) == texts(fast):
+                    data["same"] += 1
+
+    print(f"이미지 {len(images)}개, 반복 {args.runs}회\n")
+    print(f"{'region':<8} {'count':>6} {'full ms':>9} {'fast ms':>9} {'speedup':>8} "
+          f"{'same text':>10} {'auto fast':>10}")
+    for kind, data in stats.items():
+        if not data["total"]:
+            continue
+        full_ms = np.median(data["full_ms"])
+        fast_ms = np.median(data["fast_ms"])
+        print(f"{kind:<8} {data['total']:>6} {full_ms:>9.1f} {fast_ms:>9.1f} {full_ms / fast_ms:>7.1f}x "
+              f"{data['same'] / data['total'] * 100:>9.1f}% {data['auto_fast'] / data['total'] * 100:>9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
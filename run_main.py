@@ -25,74 +25,79 @@ os.environ['PYTHONPATH'] = f"{project_root}:{src_path}"
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
 # 이제 메인 애플리케이션 실행
-try:
-    from PyQt5.QtWidgets import QApplication
-    from PyQt5.QtCore import Qt
-    from PyQt5.QtGui import QFont
+# (OCR 워커 프로세스는 이 스크립트를 다시 import하므로 GUI 실행은 __main__에서만)
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
     
-    # High DPI 지원 - QApplication 생성 전에 설정
-    if hasattr(Qt, 'AA_EnableHighDpiScaling'):
-        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
-        QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    try:
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtCore import Qt
+        from PyQt5.QtGui import QFont
     
-    # 애플리케이션 초기화
-    app = QApplication(sys.argv)
-    app.setApplicationName("Excel Macro Automation")
+        # High DPI 지원 - QApplication 생성 전에 설정
+        if hasattr(Qt, 'AA_EnableHighDpiScaling'):
+            QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+        if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
+            QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
-    # 한글 폰트 설정
-    font = QFont("Malgun Gothic", 10)  # Windows 기본 한글 폰트
-    app.setFont(font)
+        # 애플리케이션 초기화
+        app = QApplication(sys.argv)
+        app.setApplicationName("Excel Macro Automation")
     
-    # 메인 윈도우 import 및 실행
-    from ui.main_window import MainWindow
-    from config.settings import Settings
-    from logger.app_logger import setup_logger
-    from ui.dialogs.first_run_dialog import SplashScreenWithOCR
-    from utils.ocr_manager import OCRManager
+        # 한글 폰트 설정
+        font = QFont("Malgun Gothic", 10)  # Windows 기본 한글 폰트
+        app.setFont(font)
     
-    # 로거 설정
-    logger = setup_logger()
-    logger.info("Starting Excel Macro Automation Application")
+        # 메인 윈도우 import 및 실행
+        from ui.main_window import MainWindow
+        from config.settings import Settings
+        from logger.app_logger import setup_logger
+        from ui.dialogs.first_run_dialog import SplashScreenWithOCR
+        from utils.ocr_manager import OCRManager
     
-    # 설정 초기화
-    settings = Settings()
+        # 로거 설정
+        logger = setup_logger()
+        logger.info("Starting Excel Macro Automation Application")
     
-    # OCR 체크가 포함된 스플래시 스크린
-    splash = SplashScreenWithOCR()
-    splash.show_and_check_ocr()
+        # 설정 초기화
+        settings = Settings()
     
-    # 스플래시가 닫힐 때까지 대기
-    while splash.isVisible():
-        app.processEvents()
+        # OCR 체크가 포함된 스플래시 스크린
+        splash = SplashScreenWithOCR()
+        splash.show_and_check_ocr()
     
-    # 메인 윈도우 생성 및 표시
-    window = MainWindow(settings)
-    window.setWindowTitle("Excel 기반 작업 자동화 매크로")
-    window.show()
+        # 스플래시가 닫힐 때까지 대기
+        while splash.isVisible():
+            app.processEvents()
     
-    print("\nExcel Macro Automation 애플리케이션이 실행되었습니다!")
-    print("모든 GUI 컴포넌트가 로드되었습니다.")
-    print("\n기능:")
-    print("- Excel 탭: 파일 불러오기, 시트 선택, 데이터 미리보기")
-    print("- Editor 탭: 드래그 앤 드롭 매크로 편집")
-    print("- Run 탭: 매크로 실행 및 모니터링")
-    print("\n창을 닫으면 종료됩니다.")
+        # 메인 윈도우 생성 및 표시
+        window = MainWindow(settings)
+        window.setWindowTitle("Excel 기반 작업 자동화 매크로")
+        window.show()
     
-    # 이벤트 루프 실행
-    sys.exit(app.exec_())
+        print("\nExcel Macro Automation 애플리케이션이 실행되었습니다!")
+        print("모든 GUI 컴포넌트가 로드되었습니다.")
+        print("\n기능:")
+        print("- Excel 탭: 파일 불러오기, 시트 선택, 데이터 미리보기")
+        print("- Editor 탭: 드래그 앤 드롭 매크로 편집")
+        print("- Run 탭: 매크로 실행 및 모니터링")
+        print("\n창을 닫으면 종료됩니다.")
     
-except Exception as e:
-    print(f"\n오류 발생: {e}")
-    print("\n자세한 오류 정보:")
-    import traceback
-    traceback.print_exc()
+        # 이벤트 루프 실행
+        sys.exit(app.exec_())
     
-    print("\n디버깅 정보:")
-    print(f"Project root: {project_root}")
-    print(f"Src path: {src_path}")
-    print(f"Python path: {sys.path[:3]}")
+    except Exception as e:
+        print(f"\n오류 발생: {e}")
+        print("\n자세한 오류 정보:")
+        import traceback
+        traceback.print_exc()
     
-    # 오류 발생 시 일시 정지
-    input("\nPress Enter to exit...")
-    sys.exit(1)
\ No newline at end of file
+        print("\n디버깅 정보:")
+        print(f"Project root: {project_root}")
+        print(f"Src path: {src_path}")
+        print(f"Python path: {sys.path[:3]}")
+    
+        # 오류 발생 시 일시 정지
+        input("\nPress Enter to exit...")
+        sys.exit(1)
\ No newline at end of file
@@ -14,6 +14,7 @@ from excel.models import MacroStatus
 from logger.app_logger import get_logger
 from config.settings import Settings
 from automation.executor import StepExecutor
+from automation.execution_plan import ExecutionPlan, PlannedStep, ACTION_EXCEL_LOOP, compile_plan
 from automation.hotkey_listener import HotkeyListener
 from logger.execution_logger import get_execution_logger
 from automation.progress_calculator import ProgressCalculator, ExecutionMode as CalcExecutionMode, ProgressInfo
@@ -67,6 +68,7 @@ class ExecutionEngine(QThread):
         
         # Current execution context
         self.macro: Optional[Macro] = None
+        self.plan: Optional[ExecutionPlan] = None
         self.excel_manager: Optional[ExcelManager] = None
         self.target_rows: List[int] = []
         self.current_row_index: Optional[int] = None
@@ -111,33 +113,19 @@ class ExecutionEngine(QThread):
         if self.state != ExecutionState.IDLE:
             raise RuntimeError("Cannot set macro while execution is active")
             
-        self.macro = macro
-        self.excel_manager = excel_manager
-        
-        # Debug: print macro steps with detailed information
-        for i, step in enumerate(macro.steps):
-            self.logger.debug(f"Step {i+1}: {step.step_type.value}, name='{step.name}'")
-            if hasattr(step, 'search_text'):
-                self.logger.debug(f"  - search_text: '{step.search_text}' (type: {type(step.search_text)}, len: {len(step.search_text) if step.search_text else 0})")
-            if hasattr(step, 'excel_column'):
-                self.logger.debug(f"  - excel_column: '{step.excel_column}' (type: {type(step.excel_column)}, is None: {step.excel_column is None})")
-            
-            # Special debugging for TextSearchStep
-            if hasattr(step, 'step_type') and step.step_type.value == 'ocr_text':
-                self.logger.debug(f"  - TextSearchStep detailed info:")
-                self.logger.debug(f"    - has search_text: {hasattr(step, 'search_text')}, value: '{getattr(step, 'search_text', 'N/A')}'")
-                self.logger.debug(f"    - has excel_column: {hasattr(step, 'excel_column')}, value: '{getattr(step, 'excel_column', 'N/A')}'")
-                # Pre-validate this step
-                if hasattr(step, 'validate'):
-                    step_errors = step.validate()
-                    if step_errors:
-                        self.logger.debug(f"    - Validation errors: {step_errors}")
-        
         # Validate macro
         errors = macro.validate()
         if errors:
             raise ValueError(f"Macro validation failed: {', '.join(errors)}")
             
+        self.macro = macro
+        self.excel_manager = excel_manager
+        
+        # 행과 무관한 구조(블록 쌍, 반복 본문, 핸들러, 오류 정책)는 여기서 한 번만 해석
+        self.plan = compile_plan(macro, self.step_executor.handlers)
+        self.logger.debug(f"Execution plan: {len(self.plan)} enabled steps, "
+                          f"{len(self.plan.row_entries)} per row, {len(self.plan.blocks)} Excel blocks")
+            
         # Initialize progress calculator
         mode = CalcExecutionMode.EXCEL if excel_manager else CalcExecutionMode.STANDALONE
         self.progress_calculator = ProgressCalculator(mode)
@@ -148,7 +136,7 @@ class ExecutionEngine(QThread):
         
     def run(self):
         """Main execution thread"""
-        if not self.macro:
+        if not self.macro or not self.plan:
             self.error.emit("No macro loaded")
             return
             
@@ -156,6 +144,9 @@ class ExecutionEngine(QThread):
             self._set_state(ExecutionState.RUNNING)
             self.hotkey_listener.start()
             
+            # Optimized template variants are built once and reused across runs
+            self.step_executor.optimize_templates(self.macro.steps)
+            
             # Start CSV logging session
             excel_file = self.excel_manager.file_path if self.excel_manager else "Unknown"
             log_file = self.execution_logger.start_session(self.macro.name, excel_file)
@@ -299,10 +290,11 @@ class ExecutionEngine(QThread):
             # Set variables in executor context
             self.step_executor.set_variables(row_data)
             
-            # Execute each step
-            step_index = 0
-            while step_index < len(self.macro.steps):
-                step = self.macro.steps[step_index]
+            # Execute each step (disabled steps and Excel blocks are already left out of the plan;
+            # Excel blocks are handled at a higher level)
+            for entry in self.plan.row_entries:
+                step = entry.step
+                step_index = entry.index
                 
                 # Check if stopping
                 if self.state == ExecutionState.STOPPING:
@@ -311,25 +303,6 @@ class ExecutionEngine(QThread):
                 # Handle pause
                 self._pause_event.wait()
                 
-                # Skip disabled steps
-                if not step.enabled:
-                    step_index += 1
-                    continue
-                    
-                # Handle Excel workflow steps
-                if step.step_type == StepType.EXCEL_ROW_START:
-                    # Find the matching end step
-                    end_index = self._find_excel_end_step(step_index, step)
-                    if end_index != -1:
-                        # Skip the entire Excel block in row execution
-                        # (Excel blocks are handled at a higher level)
-                        step_index = end_index + 1
-                        continue
-                    else:
-                        self.logger.error(f"No matching Excel end step found for {step.name}")
-                        step_index += 1
-                        continue
-                    
                 # Emit step executing signal
                 self.stepExecuting.emit(step, row_index)
                 
@@ -345,20 +318,18 @@ class ExecutionEngine(QThread):
                 step_error = ""
                 
                 try:
-                    # Special handling for LoopStep
-                    if step.step_type == StepType.LOOP and hasattr(step, 'loop_type'):
-                        if step.loop_type == "excel_rows" and step.excel_rows:
-                            # Execute loop for each Excel row
-                            self._execute_excel_loop(step, row_index)
-                            step_success = True
-                        else:
-                            # Regular loop execution (count, etc.)
-                            self.step_executor.execute_step(step)
-                            step_success = True
+                    if entry.action == ACTION_EXCEL_LOOP and getattr(step, 'excel_rows', None):
+                        # Execute loop for each Excel row
+                        self._execute_excel_loop(entry, row_index)
+                    elif step.step_type == StepType.LOOP:
+                        # Regular loop execution (count, etc.)
+                        self.step_executor.execute_step(step, entry.handler)
                     else:
                         # Regular step execution
-                        self.step_executor.execute_step(step)
-                        step_success = True
+                        self.step_executor.prefetch_image_queries(self.plan.steps, step_index)
+                        self.step_executor.prefetch_text_queries(self.plan.steps, step_index)
+                        self.step_executor.execute_step(step, entry.handler)
+                    step_success = True
                     
                     # Progress calculator: complete step
                     if self.progress_calculator:
@@ -368,12 +339,11 @@ class ExecutionEngine(QThread):
                     self.logger.error(error_msg)
                     step_error = str(e)
                     
-                    # Emit detailed error for UI
-                    if step.error_handling.value == "stop":
-                        self.error.emit(error_msg)
-                    
                     # Handle error based on step configuration
-                    if step.error_handling.value == "stop":
+                    if entry.stops_on_error:
+                        # Emit detailed error for UI
+                        self.error.emit(error_msg)
+                        
                         # Log failed step
                         step_duration = (time.time() - step_start_time) * 1000
                         self.execution_logger.log_step_execution(
@@ -381,17 +351,17 @@ class ExecutionEngine(QThread):
                             False, step_duration, step_error
                         )
                         return ExecutionResult(row_index, False, error_msg)
-                    elif step.error_handling.value == "retry":
+                    elif entry.retries:
                         # Retry logic
-                        for retry in range(step.retry_count):
+                        for retry in range(entry.retry_count):
                             try:
                                 time.sleep(1)  # Wait before retry
-                                self.step_executor.execute_step(step)
+                                self.step_executor.execute_step(step, entry.handler)
                                 step_success = True
                                 step_error = ""
                                 break
                             except:
-                                if retry == step.retry_count - 1:
+                                if retry == entry.retry_count - 1:
                                     # Log failed step after all retries
                                     step_duration = (time.time() - step_start_time) * 1000
                                     self.execution_logger.log_step_execution(
@@ -407,10 +377,6 @@ class ExecutionEngine(QThread):
                     row_index, step_index, step.name, step.step_type.value,
                     step_success, step_duration, step_error
                 )
-                
-                # Move to next step (unless already moved by Excel block skip)
-                if step.step_type != StepType.EXCEL_ROW_START:
-                    step_index += 1
                     
             # Progress calculator: complete row
             if self.progress_calculator:
@@ -436,8 +402,11 @@ class ExecutionEngine(QThread):
             # Set empty variables in executor context
             self.step_executor.set_variables({})
             
-            # Execute each step
-            for step_index, step in enumerate(self.macro.steps):
+            # Execute each enabled step
+            for entry in self.plan.entries:
+                step = entry.step
+                step_index = entry.index
+                
                 # Check if stopping
                 if self.state == ExecutionState.STOPPING:
                     return ExecutionResult(0, False, "Execution stopped")
@@ -445,10 +414,6 @@ class ExecutionEngine(QThread):
                 # Handle pause
                 self._pause_event.wait()
                 
-                # Skip disabled steps
-                if not step.enabled:
-                    continue
-                    
                 # Emit step executing signal
                 self.stepExecuting.emit(step, 0)
                 
@@ -464,7 +429,9 @@ class ExecutionEngine(QThread):
                 step_error = ""
                 
                 try:
-                    self.step_executor.execute_step(step)
+                    self.step_executor.prefetch_image_queries(self.plan.steps, step_index)
+                    self.step_executor.prefetch_text_queries(self.plan.steps, step_index)
+                    self.step_executor.execute_step(step, entry.handler)
                     step_success = True
                     
                     # Progress calculator: complete step
@@ -475,12 +442,11 @@ class ExecutionEngine(QThread):
                     self.logger.error(error_msg)
                     step_error = str(e)
                     
-                    # Emit detailed error for UI
-                    if step.error_handling.value == "stop":
-                        self.error.emit(error_msg)
-                    
                     # Handle error based on step configuration
-                    if step.error_handling.value == "stop":
+                    if entry.stops_on_error:
+                        # Emit detailed error for UI
+                        self.error.emit(error_msg)
+                        
                         # Log failed step
                         step_duration = (time.time() - step_start_time) * 1000
                         self.execution_logger.log_step_execution(
@@ -488,17 +454,17 @@ class ExecutionEngine(QThread):
                             False, step_duration, step_error
                         )
                         return ExecutionResult(0, False, error_msg)
-                    elif step.error_handling.value == "retry":
+                    elif entry.retries:
                         # Retry logic
-                        for retry in range(step.retry_count):
+                        for retry in range(entry.retry_count):
                             try:
                                 time.sleep(1)  # Wait before retry
-                                self.step_executor.execute_step(step)
+                                self.step_executor.execute_step(step, entry.handler)
                                 step_success = True
                                 step_error = ""
                                 break
                             except:
-                                if retry == step.retry_count - 1:
+                                if retry == entry.retry_count - 1:
                                     # Log failed step after all retries
                                     step_duration = (time.time() - step_start_time) * 1000
                                     self.execution_logger.log_step_execution(
@@ -524,22 +490,16 @@ class ExecutionEngine(QThread):
             self.execution_logger.log_row_complete(0, False, duration_ms, str(e))
             return ExecutionResult(0, False, str(e), duration_ms)
             
-    def _execute_excel_loop(self, loop_step, parent_row_index: int):
+    def _execute_excel_loop(self, loop_entry: PlannedStep, parent_row_index: int):
         """Execute loop for each Excel row"""
+        loop_step = loop_entry.step
         if not self.excel_manager or not loop_step.excel_rows:
             self.logger.warning("No Excel data available for loop execution")
             return
             
-        # Get the nested steps that need to be executed
-        nested_steps = []
-        for step_id in loop_step.loop_steps:
-            # Find the step by ID in the macro
-            for step in self.macro.steps:
-                if step.step_id == step_id:
-                    nested_steps.append(step)
-                    break
-                    
-        if not nested_steps:
+        # Nested steps were looked up by ID when the plan was compiled
+        nested_entries = loop_entry.body.entries if loop_entry.body else ()
+        if not nested_entries:
             self.logger.warning("No nested steps found in loop")
             return
             
@@ -571,21 +531,18 @@ class ExecutionEngine(QThread):
                 self.logger.info(f"Executing loop iteration for Excel row {excel_row_index + 1}")
                 
                 # Execute each nested step
-                for nested_step in nested_steps:
-                    if not nested_step.enabled:
-                        continue
-                        
+                for nested in nested_entries:
                     # Handle pause
                     self._pause_event.wait()
                     
                     try:
-                        self.step_executor.execute_step(nested_step)
+                        self.step_executor.execute_step(nested.step, nested.handler)
                     except Exception as e:
-                        error_msg = f"Loop step '{nested_step.name}' failed for row {excel_row_index + 1}: {str(e)}"
+                        error_msg = f"Loop step '{nested.step.name}' failed for row {excel_row_index + 1}: {str(e)}"
                         self.logger.error(error_msg)
                         
                         # Handle error based on step configuration
-                        if nested_step.error_handling.value == "stop":
+                        if nested.stops_on_error:
                             raise Exception(error_msg)
                         # For "continue", just log and proceed to next step/row
                         
@@ -612,26 +569,9 @@ class ExecutionEngine(QThread):
             self._pause_event.set()  # Resume if paused
             self.logger.info("Stopping execution...")
             
-    def _find_excel_end_step(self, start_index: int, start_step) -> int:
-        """Find the matching Excel end step for a given start step"""
-        if not hasattr(start_step, 'pair_id'):
-            return -1
-            
-        pair_id = start_step.pair_id
-        for i in range(start_index + 1, len(self.macro.steps)):
-            step = self.macro.steps[i]
-            if (step.step_type == StepType.EXCEL_ROW_END and 
-                hasattr(step, 'pair_id') and 
-                step.pair_id == pair_id):
-                return i
-        return -1
-        
     def _has_excel_workflow_blocks(self) -> bool:
         """Check if the macro contains Excel workflow blocks"""
-        for step in self.macro.steps:
-            if step.step_type == StepType.EXCEL_ROW_START:
-                return True
-        return False
+        return self.plan.has_row_start
         
     def _execute_with_excel_workflow(self):
         """Execute macro with Excel workflow blocks"""
@@ -648,34 +588,15 @@ class ExecutionEngine(QThread):
             self.logger.warning("No status column configured - creating default")
             self.excel_manager._current_data.set_status_column('매크로_상태')
             
-        # Find all Excel workflow blocks
-        excel_blocks = []
-        i = 0
-        while i < len(self.macro.steps):
-            step = self.macro.steps[i]
-            if step.step_type == StepType.EXCEL_ROW_START:
-                end_index = self._find_excel_end_step(i, step)
-                if end_index != -1:
-                    excel_blocks.append({
-                        'start_step': step,
-                        'start_index': i,
-                        'end_index': end_index,
-                        'steps': self.macro.steps[i+1:end_index]
-                    })
-                    i = end_index + 1
-                else:
-                    self.logger.error(f"No matching end step found for Excel block at index {i}")
-                    i += 1
-            else:
-                i += 1
-                
+        # Excel workflow blocks were paired when the plan was compiled
+        excel_blocks = self.plan.blocks
         if not excel_blocks:
             self.logger.error("No valid Excel workflow blocks found")
             return
             
         # Execute the workflow
         for block in excel_blocks:
-            start_step = block['start_step']
+            start_step = block.start_step
             
             # Determine which rows to process based on repeat mode
             if start_step.repeat_mode == "incomplete_only":
@@ -716,9 +637,9 @@ class ExecutionEngine(QThread):
                 
                 # Execute steps in the block
                 row_success = True
-                for step_idx, step in enumerate(block['steps']):
-                    if not step.enabled:
-                        continue
+                for entry in block.plan.entries:
+                    step = entry.step
+                    step_idx = entry.index
                     
                     # Emit step executing signal
                     self.stepExecuting.emit(step, row_index)
@@ -728,7 +649,9 @@ class ExecutionEngine(QThread):
                     
                     try:
                         self.logger.debug(f"Executing step '{step.name}' for row {row_index}")
-                        self.step_executor.execute_step(step)
+                        self.step_executor.prefetch_image_queries(block.plan.steps, step_idx)
+                        self.step_executor.prefetch_text_queries(block.plan.steps, step_idx)
+                        self.step_executor.execute_step(step, entry.handler)
                         
                         # Log successful step execution
                         step_duration = (time.time() - step_start_time) * 1000
@@ -747,7 +670,7 @@ class ExecutionEngine(QThread):
                             False, step_duration, step_error
                         )
                         
-                        if step.error_handling.value == "stop":
+                        if entry.stops_on_error:
                             row_success = False
                             break
                             
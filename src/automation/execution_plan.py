@@ -0,0 +1,170 @@
+"""
+Compiled execution plan of a macro
+
+Everything the engine needs to know about a macro's structure that does not
+depend on the row being processed is resolved once, when the macro is set:
+Excel row start/end pairs, the steps that run per row (Excel blocks cut out),
+nested loop bodies, step handlers and error policies. The row loops then only
+walk tuples.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from core.macro_types import Macro, MacroStep, StepType, ErrorHandling
+from logger.app_logger import get_logger
+
+ACTION_RUN = "run"                  # execute the step
+ACTION_EXCEL_LOOP = "excel_loop"    # loop step over Excel rows, body run by the engine
+ACTION_SKIP_BLOCK = "skip_block"    # Excel row start: the block is run by the workflow mode
+
+
+@dataclass(frozen=True)
+class PlannedStep:
+    """One enabled step with everything resolved that does not change per row"""
+    index: int                          # position in the step list the plan was compiled from
+    step: MacroStep
+    handler: Optional[Callable[[MacroStep], Any]]  # None: no handler (execute_step raises)
+    action: str = ACTION_RUN
+    policy: ErrorHandling = ErrorHandling.STOP
+    retry_count: int = 0
+    end_index: int = -1                 # matching Excel row end for a row start (-1: none)
+    body: Optional['ExecutionPlan'] = None  # loop body
+
+    @property
+    def stops_on_error(self) -> bool:
+        return self.policy is ErrorHandling.STOP
+
+    @property
+    def retries(self) -> bool:
+        return self.policy is ErrorHandling.RETRY
+
+
+@dataclass(frozen=True)
+class ExcelBlock:
+    """Excel row start/end pair and the compiled steps between them"""
+    start_step: MacroStep
+    start_index: int
+    end_index: int
+    plan: 'ExecutionPlan'
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Immutable plan for a step list
+
+    Attributes:
+        steps: The compiled step list (prefetching looks ahead in it)
+        entries: Enabled steps in order (standalone mode, Excel block bodies)
+        row_entries: Enabled steps run per row in Excel mode (Excel blocks cut out)
+        blocks: Excel row start/end blocks (Excel workflow mode)
+        has_row_start: The list contains an Excel row start step, paired or not
+    """
+    steps: Tuple[MacroStep, ...]
+    entries: Tuple[PlannedStep, ...]
+    row_entries: Tuple[PlannedStep, ...]
+    blocks: Tuple[ExcelBlock, ...] = ()
+    has_row_start: bool = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def _pair_excel_blocks(steps: Sequence[MacroStep]) -> Dict[int, int]:
+    """Row start index -> index of the first later row end with the same pair_id"""
+    ends: Dict[str, List[int]] = defaultdict(list)
+    for index, step in enumerate(steps):
+        if step.step_type == StepType.EXCEL_ROW_END and getattr(step, 'pair_id', None):
+            ends[step.pair_id].append(index)
+    pairs = {}
+    for index, step in enumerate(steps):
+        if step.step_type != StepType.EXCEL_ROW_START:
+            continue
+        candidates = ends.get(getattr(step, 'pair_id', None), ())
+        position = bisect_right(candidates, index)
+        if position < len(candidates):
+            pairs[index] = candidates[position]
+    return pairs
+
+
+def compile_steps(steps: Sequence[MacroStep], handlers: Dict[StepType, Callable],
+                  steps_by_id: Optional[Dict[str, MacroStep]] = None, nested: bool = False) -> ExecutionPlan:
+    """Compile a step list
+
+    Args:
+        steps: Steps in execution order
+        handlers: Step type -> handler (StepExecutor.handlers)
+        steps_by_id: Lookup for loop bodies (default: the steps themselves)
+        nested: Loop or Excel block body; its steps only run through their
+            handlers, so loops and Excel blocks inside it are not expanded
+    """
+    steps = tuple(steps)
+    if steps_by_id is None:
+        steps_by_id = {step.step_id: step for step in steps}
+    pairs = _pair_excel_blocks(steps)
+
+    entries = []
+    for index, step in enumerate(steps):
+        if not step.enabled:
+            continue
+        action = ACTION_RUN
+        body = None
+        if nested:
+            pass  # 본문 단계는 핸들러로만 실행됨
+        elif step.step_type == StepType.EXCEL_ROW_START:
+            action = ACTION_SKIP_BLOCK
+        elif step.step_type == StepType.LOOP and getattr(step, 'loop_type', None) == "excel_rows":
+            action = ACTION_EXCEL_LOOP
+            loop_body = [steps_by_id[step_id] for step_id in step.loop_steps if step_id in steps_by_id]
+            body = compile_steps(loop_body, handlers, steps_by_id, nested=True)
+        entries.append(PlannedStep(
+            index=index,
+            step=step,
+            handler=handlers.get(step.step_type),
+            action=action,
+            policy=ErrorHandling(step.error_handling),
+            retry_count=step.retry_count,
+            end_index=pairs.get(index, -1),
+            body=body,
+        ))
+
+    # 행 단위 실행: 짝이 맞는 Excel 블록은 통째로 건너뜀 (블록은 워크플로 모드에서 실행)
+    row_entries = []
+    skip_until = -1
+    for entry in entries:
+        if entry.index <= skip_until:
+            continue
+        if entry.action == ACTION_SKIP_BLOCK:
+            skip_until = entry.end_index
+            continue
+        row_entries.append(entry)
+
+    # 워크플로 모드: 활성 여부와 관계없이 시작/끝 쌍으로 블록 구성
+    blocks = []
+    index = 0
+    while not nested and index < len(steps):
+        end_index = pairs.get(index, -1)
+        if end_index == -1:
+            index += 1
+            continue
+        body = compile_steps(steps[index + 1:end_index], handlers, steps_by_id, nested=True)
+        blocks.append(ExcelBlock(steps[index], index, end_index, body))
+        index = end_index + 1
+
+    return ExecutionPlan(
+        steps=steps,
+        entries=tuple(entries),
+        row_entries=tuple(row_entries),
+        blocks=tuple(blocks),
+        has_row_start=any(step.step_type == StepType.EXCEL_ROW_START for step in steps),
+    )
+
+
+def compile_plan(macro: Macro, handlers: Dict[StepType, Callable]) -> ExecutionPlan:
+    """Compile a macro for the engine"""
+    pairs = _pair_excel_blocks(macro.steps)
+    for index, step in enumerate(macro.steps):
+        if step.step_type == StepType.EXCEL_ROW_START and index not in pairs:
+            get_logger(__name__).error(f"No matching Excel end step found for {step.name} (step {index + 1})")
+    return compile_steps(macro.steps, handlers)
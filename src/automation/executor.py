@@ -5,7 +5,7 @@ Step executor for macro steps
 import re
 import time
 import os
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable
 import pyautogui
 import pyperclip
 import random
@@ -14,6 +14,14 @@ from core.macro_types import MacroStep, StepType
 from config.settings import Settings
 from logger.app_logger import get_logger
 from core.error_handler import get_error_handler, ErrorCategory
+from vision.text_matcher import WIDTH_TABLE
+from vision.debug_capture import get_debug_capture
+
+# Steps that change what is on screen; cached capture frames are dropped after them
+INPUT_STEP_TYPES = {
+    StepType.MOUSE_CLICK, StepType.MOUSE_MOVE, StepType.MOUSE_DRAG, StepType.MOUSE_SCROLL,
+    StepType.KEYBOARD_TYPE, StepType.KEYBOARD_HOTKEY,
+}
 
 class StepExecutor:
     """Executes individual macro steps"""
@@ -45,6 +53,27 @@ class StepExecutor:
         self._text_extractor = None
         self._init_text_extractor()
         
+        # Shared screen capture (frames are reused until the next input action)
+        self._screen_capture = None
+        self._last_input_time = 0.0
+        self._init_screen_capture()
+        
+        # Image lookups matched ahead of time for consecutive image steps
+        self._prefetched_images: Dict[tuple, Any] = {}
+        self._prefetch_generation = -1
+        self._prefetch_time = 0.0
+        self._prefetch_max_age = settings.get("vision.batch_max_age_ms", 250) / 1000
+        
+        # Text checks of consecutive steps recognized together (run lazily by the first one)
+        self._pending_text_queries: list = []
+        self._prefetched_texts: Dict[tuple, Any] = {}
+        self._text_prefetch_generation = -1
+        self._text_prefetch_time = 0.0
+        self._text_prefetch_max_age = settings.get("ocr.batch_max_age_ms", 1000) / 1000
+        
+        # 텍스트 대기 단계별 등장까지 걸린 시간 (초)
+        self._wait_text_history: Dict[str, list] = {}
+        
         # Step handlers mapping
         self._handlers = {
             StepType.MOUSE_CLICK: self._execute_mouse_click,
@@ -55,9 +84,11 @@ class StepExecutor:
             StepType.KEYBOARD_HOTKEY: self._execute_keyboard_hotkey,
             StepType.WAIT_TIME: self._execute_wait_time,
             StepType.WAIT_IMAGE: self._execute_wait_image,
+            StepType.WAIT_TEXT: self._execute_wait_text,
             StepType.SCREENSHOT: self._execute_screenshot,
             StepType.IMAGE_SEARCH: self._execute_image_search,
             StepType.OCR_TEXT: self._execute_text_search,
+            StepType.TEXT_ANCHOR: self._execute_text_anchor,
             StepType.IF_CONDITION: self._execute_if_condition,
             StepType.LOOP: self._execute_loop,
             StepType.EXCEL_ROW_START: self._execute_excel_row_start,
@@ -85,22 +116,189 @@ class StepExecutor:
             self.logger.error("Text search features will be disabled. Please install PaddleOCR.")
             self._text_extractor = None
         
+    def _init_screen_capture(self):
+        """Initialize shared screen capture service"""
+        try:
+            from vision.screen_capture import get_screen_capture
+            self._screen_capture = get_screen_capture()
+        except ImportError as e:
+            self.logger.warning(f"Screen capture service not available: {e}")
+            self._screen_capture = None
+            
+    def _notify_input(self):
+        """Mark cached screen frames stale after mouse/keyboard input"""
+        self._last_input_time = time.perf_counter()
+        if self._screen_capture:
+            self._screen_capture.invalidate()
+        
+    def optimize_templates(self, steps) -> None:
+        """Prepare optimized variants of every template used by the steps"""
+        if not self._image_matcher or not self.settings.get("vision.optimize_templates", True):
+            return
+        from vision.template_optimizer import collect_image_paths
+        try:
+            count = self._image_matcher.optimize_templates(collect_image_paths(steps))
+            if count:
+                self.logger.info(f"Using optimized variants for {count} templates")
+        except Exception as e:
+            self.logger.warning(f"Template optimization failed: {e}")
+            
+    def _image_query_key(self, step) -> Optional[tuple]:
+        """(image_path, confidence, region, match_mode) for steps that only look for an image"""
+        if step.step_type in (StepType.IMAGE_SEARCH, StepType.WAIT_IMAGE):
+            region = tuple(step.region) if step.region else None
+            return (step.image_path, step.confidence, region,
+                    getattr(step, 'match_mode', 'standard'))
+        if step.step_type == StepType.IF_CONDITION and step.condition_type == "image_exists":
+            value = step.condition_value
+            region = value.get('region')
+            return (value.get('image_path', ''), value.get('confidence', 0.9),
+                    tuple(region) if region else None, value.get('match_mode', 'standard'))
+        return None
+        
+    def prefetch_image_queries(self, steps, index: int):
+        """Match a run of consecutive image steps against one captured frame
+        
+        Called by the engine before executing ``steps[index]``. When that step
+        and the following ones only look for images (no input in between), all
+        their templates are matched in one batch; the handlers then reuse the
+        results as long as no input happened and the frame is still fresh.
+        """
+        if not self._image_matcher or not self._screen_capture:
+            return
+        keys = []
+        for step in steps[index:]:
+            if not step.enabled:
+                continue
+            key = self._image_query_key(step)
+            if key is None:
+                break
+            keys.append(key)
+        keys = list(dict.fromkeys(keys))
+        if len(keys) < 2 or all(key in self._prefetched_images for key in keys):
+            return
+        
+        from vision.image_matcher import ImageQuery
+        generation = self._screen_capture.generation
+        results = self._image_matcher.find_images_batch(
+            [ImageQuery(path, confidence, region, mode) for path, confidence, region, mode in keys]
+        )
+        self._prefetched_images = dict(zip(keys, results))
+        self._prefetch_generation = generation
+        self._prefetch_time = time.perf_counter()
+        self.logger.debug(f"Prefetched {len(keys)} image lookups from one capture")
+        
+    def _take_prefetched_image(self, key: tuple):
+        """Prefetched MatchResult for a lookup, if still valid"""
+        result = self._prefetched_images.pop(key, None)
+        if result is None:
+            return None
+        if (self._screen_capture is None or
+                self._screen_capture.generation != self._prefetch_generation or
+                time.perf_counter() - self._prefetch_time > self._prefetch_max_age):
+            self._prefetched_images.clear()
+            return None
+        return result
+        
+    def _text_query_key(self, step) -> Optional[tuple]:
+        """(region, confidence, ocr_mode) for steps that OCR a fixed region"""
+        if step.step_type in (StepType.OCR_TEXT, StepType.TEXT_ANCHOR):
+            region = getattr(step, 'region', None)
+            if region:
+                return (tuple(int(v) for v in region), getattr(step, 'confidence', 0.5),
+                        getattr(step, 'ocr_mode', 'auto'))
+        elif step.step_type == StepType.IF_CONDITION and step.condition_type == "text_exists":
+            region = step.condition_value.get('region')
+            if region:
+                return (tuple(int(v) for v in region), 0.5, step.condition_value.get('ocr_mode', 'full'))
+        return None
+        
+    def prefetch_text_queries(self, steps, index: int):
+        """Plan one batched OCR for a run of consecutive text checks
+        
+        Called by the engine before executing ``steps[index]``. When that step
+        and the following ones read fixed regions with no input in between,
+        the first of them OCRs all regions from one capture in one inference
+        call (after its own screen delay); the others reuse the results as
+        long as no input happened. A step that may click (or an IF, whose
+        branch may) ends the run.
+        """
+        self._pending_text_queries = []
+        if not self._text_extractor or not self._screen_capture:
+            return
+        keys = []
+        for step in steps[index:]:
+            if not step.enabled:
+                continue
+            key = self._text_query_key(step)
+            if key is None:
+                break
+            keys.append(key)
+            if step.step_type == StepType.IF_CONDITION or getattr(step, 'click_on_found', True) or \
+                    getattr(step, 'on_found', None) or getattr(step, 'on_not_found', None):
+                break
+        keys = list(dict.fromkeys(keys))
+        if len(keys) < 2 or all(self._prefetched_text_ready(key) for key in keys):
+            return
+        self._pending_text_queries = keys
+        
+    def _prefetched_text_ready(self, key: Optional[tuple]) -> bool:
+        """Whether batched OCR results for the lookup exist and are still valid"""
+        return (key in self._prefetched_texts and self._screen_capture is not None and
+                self._screen_capture.generation == self._text_prefetch_generation and
+                time.perf_counter() - self._text_prefetch_time <= self._text_prefetch_max_age)
+        
+    def _take_prefetched_text(self, key: Optional[tuple]):
+        """Batched OCR results for a lookup (running the planned batch first if needed)"""
+        if key is None:
+            return None
+        if key in self._pending_text_queries:
+            from vision.text_extractor_paddle import TextQuery
+            keys, self._pending_text_queries = self._pending_text_queries, []
+            generation = self._screen_capture.generation
+            results = self._text_extractor.extract_text_batch(
+                [TextQuery(region, confidence, mode) for region, confidence, mode in keys])
+            self._prefetched_texts = dict(zip(keys, results))
+            self._text_prefetch_generation = generation
+            self._text_prefetch_time = time.perf_counter()
+            self.logger.debug(f"OCR of {len(keys)} text checks batched from one capture")
+        if not self._prefetched_text_ready(key):
+            self._prefetched_texts.clear()
+            return None
+        return self._prefetched_texts.pop(key)
+        
     def set_variables(self, variables: Dict[str, Any]):
         """Set variables for template substitution"""
         self.variables = variables
         
-    def execute_step(self, step: MacroStep) -> Any:
-        """Execute a single step"""
-        handler = self._handlers.get(step.step_type)
+    @property
+    def handlers(self) -> Dict[StepType, Callable]:
+        """Step type -> handler (resolved once by the engine's execution plan)"""
+        return self._handlers
+        
+    def execute_step(self, step: MacroStep, handler: Optional[Callable] = None) -> Any:
+        """Execute a single step
+        
+        Args:
+            handler: Handler resolved in advance (default: looked up by step type)
+        """
+        handler = handler or self._handlers.get(step.step_type)
         if not handler:
             raise NotImplementedError(f"No handler for step type: {step.step_type}")
+            
+        if self._screen_capture:
+            self._screen_capture.begin_step()
         
         self.logger.info(f"\n{'='*50}")
         self.logger.info(f"단계 실행 시작: {step.name} ({step.step_type.value})")
         self.logger.info(f"{'='*50}")
         
         try:
-            result = handler(step)
+            try:
+                result = handler(step)
+            finally:
+                if step.step_type in INPUT_STEP_TYPES:
+                    self._notify_input()
             self.logger.info(f"단계 실행 완료: {step.name}")
             return result
         except Exception as e:
@@ -130,7 +328,7 @@ class StepExecutor:
         """단계 타입에 따른 오류 카테고리 결정"""
         if step_type in [StepType.WAIT_IMAGE]:
             return ErrorCategory.IMAGE_SEARCH
-        elif step_type in [StepType.WAIT_TEXT]:
+        elif step_type in [StepType.WAIT_TEXT, StepType.TEXT_ANCHOR]:
             return ErrorCategory.TEXT_SEARCH
         elif step_type in [StepType.MOUSE_CLICK, StepType.MOUSE_MOVE, 
                          StepType.KEYBOARD_TYPE, StepType.KEYBOARD_HOTKEY]:
@@ -244,14 +442,7 @@ class StepExecutor:
         # 6. 텍스트 정규화 (전각->반각 변환 등)
         if getattr(step, 'normalize_text', False):
             # 전각 문자를 반각으로 변환
-            replacements = {
-                '：': ':', '；': ';', '（': '(', '）': ')',
-                '［': '[', '］': ']', '｛': '{', '｝': '}',
-                '＜': '<', '＞': '>', '，': ',', '。': '.',
-                '！': '!', '？': '?', '　': ' '
-            }
-            for full_width, half_width in replacements.items():
-                search_text = search_text.replace(full_width, half_width)
+            search_text = search_text.translate(WIDTH_TABLE)
             self.logger.debug(f"Normalized text: {search_text}")
         
         # 7. 양쪽 공백 제거 후 반환
@@ -279,17 +470,44 @@ class StepExecutor:
         # 성능 모니터링
         search_start_time = time.time()
         
+        # 인식 방식 (작은 영역은 검출 없이 줄 단위 인식)
+        ocr_mode = getattr(step, 'ocr_mode', 'auto')
+        
+        if self._screen_capture is None:
+            return self._search_text_with_retry_legacy(search_text, region, exact_match, confidence,
+                                                       max_retries, retry_delay, monitor_info, ocr_mode)
+        
+        from vision.polling import FrameDiffer
+        from vision.text_extractor_paddle import MATCH_EXACT, MATCH_PARTIAL
+        strategies = (MATCH_EXACT,) if exact_match else (MATCH_PARTIAL,)
+        differ = FrameDiffer()
+        text_results = None
+        ocr_runs = 0
+        
+        # 연속된 텍스트 단계와 함께 일괄 인식한 결과가 있으면 첫 시도에 사용
+        prefetched = self._take_prefetched_text(self._text_query_key(step))
+        
         result = None
         for attempt in range(max_retries):
             try:
-                # 텍스트 검색 수행 (monitor_info 전달)
-                result = self._text_extractor.find_text(
-                    search_text,
-                    region=region,
-                    exact_match=exact_match,
-                    confidence_threshold=confidence,
-                    monitor_info=monitor_info
-                )
+                if prefetched is not None:
+                    text_results, prefetched = prefetched, None
+                    self.logger.info(f"일괄 OCR 결과 사용 ({len(text_results)}개 항목)")
+                    match = self._text_extractor.match_text(search_text, text_results, strategies)
+                    result = match.result if match else None
+                else:
+                    # 화면이 바뀐 경우에만 OCR 재실행 (같은 픽셀을 다시 인식하지 않음)
+                    frame = self._screen_capture.grab(tuple(region) if region else None, max_age_ms=0)
+                    changed = differ.update(frame.gray())
+                    if text_results is None or changed != []:
+                        text_results = self._text_extractor.extract_text_from_frame(
+                            frame, confidence, debug_prefix="ocr_region" if region else None,
+                            ocr_mode=ocr_mode)
+                        ocr_runs += 1
+                        match = self._text_extractor.match_text(search_text, text_results, strategies)
+                        result = match.result if match else None
+                    else:
+                        self.logger.debug(f"화면 변화 없음 - OCR 생략 (시도 {attempt + 1}/{max_retries})")
                 
                 if result:
                     break  # 찾았으면 루프 종료
@@ -304,6 +522,8 @@ class StepExecutor:
                 self.logger.info(f"텍스트를 찾지 못했습니다. {retry_delay}초 후 재시도합니다... (시도 {attempt + 1}/{max_retries})")
                 time.sleep(retry_delay)
         
+        self.logger.info(f"텍스트 검색 OCR 실행: {ocr_runs}/{max_retries}회")
+        
         # 성능 경고
         search_elapsed = time.time() - search_start_time
         if search_elapsed > 5.0:
@@ -311,6 +531,33 @@ class StepExecutor:
             
         return result
     
+    def _search_text_with_retry_legacy(self, search_text: str, region: Optional[Tuple[int, int, int, int]],
+                                       exact_match: bool, confidence: float, max_retries: int,
+                                       retry_delay: float, monitor_info: Optional[Dict] = None,
+                                       ocr_mode: str = 'auto') -> Optional[Any]:
+        """캡처 서비스가 없을 때의 재시도 (매 시도마다 OCR 실행)"""
+        result = None
+        for attempt in range(max_retries):
+            try:
+                result = self._text_extractor.find_text(
+                    search_text,
+                    region=region,
+                    exact_match=exact_match,
+                    confidence_threshold=confidence,
+                    monitor_info=monitor_info,
+                    ocr_mode=ocr_mode
+                )
+                if result:
+                    break
+            except Exception as e:
+                if attempt == max_retries - 1:
+                    raise
+                self.logger.warning(f"텍스트 검색 시도 {attempt + 1}/{max_retries} 실패: {e}")
+            if attempt < max_retries - 1 and not result:
+                self.logger.info(f"텍스트를 찾지 못했습니다. {retry_delay}초 후 재시도합니다... (시도 {attempt + 1}/{max_retries})")
+                time.sleep(retry_delay)
+        return result
+    
     def _perform_text_click(self, result: Any, click_offset: Tuple[int, int], double_click: bool) -> None:
         """텍스트 검색 결과에 대한 클릭 수행"""
         click_x = result.center[0] + click_offset[0]
@@ -395,6 +642,7 @@ class StepExecutor:
                 text = self._substitute_variables(text)
                 self.logger.info(f"Typing text: {text}")
                 pyautogui.typewrite(text, interval=0.05)
+                self._notify_input()
                 
         elif action_type == "계속" or action_type == "continue":
             self.logger.info("Continuing to next step")
@@ -508,6 +756,8 @@ class StepExecutor:
             self.logger.info(f"클릭 수행 중 - 위치: ({x}, {y}), 버튼: {button}")
             pyautogui.click(x, y, button=button)
         
+        self._notify_input()
+        
         # 클릭 후 위치 확인
         after_x, after_y = pyautogui.position()
         self.logger.info(f"클릭 후 마우스 위치: ({after_x}, {after_y})")
@@ -618,43 +868,150 @@ class StepExecutor:
     def _execute_wait_image(self, step) -> Optional[Tuple[int, int, int, int]]:
         """Execute wait for image"""
         if self._image_matcher:
+            # Already visible in the batch matched for the preceding image steps?
+            prefetched = self._take_prefetched_image(self._image_query_key(step))
+            if prefetched is not None and prefetched.found:
+                self.logger.debug(f"Image found at: {prefetched.location} (prefetched)")
+                return prefetched.location
+                
             # Use OpenCV-based matcher
             result = self._image_matcher.wait_for_image(
                 step.image_path,
                 timeout=step.timeout,
                 confidence=step.confidence,
-                region=step.region
+                region=step.region,
+                match_mode=getattr(step, 'match_mode', 'standard')
             )
             
+            if self._image_matcher.last_wait_stats:
+                self.logger.debug(f"Wait image stats: {self._image_matcher.last_wait_stats.summary()}")
+                
             if result.found:
                 self.logger.debug(f"Image found at: {result.location}")
                 return result.location
             else:
                 raise TimeoutError(f"Image not found within {step.timeout} seconds")
         else:
-            # Fallback to pyautogui
-            start_time = time.time()
+            # Fallback to pyautogui: one screenshot per poll, skipped when nothing changed
+            from vision.polling import AdaptivePoller, FrameDiffer, WaitStats
+            import numpy as np
             
-            while time.time() - start_time < step.timeout:
+            deadline = time.time() + step.timeout
+            stats = WaitStats()
+            differ = FrameDiffer()
+            poller = AdaptivePoller(max_interval=0.5, last_input_time=lambda: self._last_input_time)
+            
+            while True:
+                stats.polls += 1
+                changed = False
                 try:
-                    # Try to locate image
-                    location = pyautogui.locateOnScreen(
-                        step.image_path,
-                        confidence=step.confidence,
-                        region=step.region
-                    )
+                    screenshot = pyautogui.screenshot(region=step.region)
+                    dirty = differ.update(np.asarray(screenshot.convert('L')))
+                    changed = dirty is None or bool(dirty)
                     
-                    if location:
-                        self.logger.debug(f"Image found at: {location}")
-                        return location
+                    if changed:
+                        stats.full_matches += 1
+                        location = pyautogui.locate(
+                            step.image_path,
+                            screenshot,
+                            confidence=step.confidence
+                        )
+                        
+                        if location:
+                            if step.region:
+                                location = (location[0] + step.region[0], location[1] + step.region[1],
+                                            location[2], location[3])
+                            self.logger.debug(f"Image found at: {location} ({stats.summary()})")
+                            return location
+                    else:
+                        stats.skipped_polls += 1
                         
                 except Exception as e:
                     self.logger.debug(f"Image search error: {e}")
                     
-                time.sleep(0.5)  # Check every 500ms
+                if time.time() >= deadline:
+                    break
+                poller.sleep(changed, deadline)
                 
+            self.logger.debug(f"Wait image timed out ({stats.summary()})")
             raise TimeoutError(f"Image not found within {step.timeout} seconds")
         
+    def _execute_wait_text(self, step) -> Optional[Tuple[int, int]]:
+        """Execute wait for text
+        
+        영역 픽셀이 바뀐 경우에만 OCR을 실행하고, 화면이 조용하면 폴링 간격을 늘린다.
+        텍스트가 나타나는 즉시 중심 좌표를 반환한다.
+        """
+        if not self._text_extractor:
+            raise RuntimeError("텍스트 대기 기능을 사용하려면 OCR 구성요소가 필요합니다.")
+        
+        from vision.polling import AdaptivePoller, FrameDiffer, WaitStats
+        from vision.text_extractor_paddle import MATCH_EXACT, MATCH_PARTIAL
+        
+        search_text = self._prepare_search_text(step)
+        region = tuple(step.region) if step.region else None
+        exact_match = getattr(step, 'exact_match', False)
+        confidence = getattr(step, 'confidence', 0.5)
+        ocr_mode = getattr(step, 'ocr_mode', 'auto')
+        strategies = (MATCH_EXACT,) if exact_match else (MATCH_PARTIAL,)
+        
+        self.logger.info(f"텍스트 대기: '{search_text}' (영역: {region if region else '전체 화면'}, "
+                         f"제한 시간: {step.timeout}초)")
+        
+        start = time.time()
+        deadline = start + step.timeout
+        stats = WaitStats()
+        differ = FrameDiffer()
+        poller = AdaptivePoller(max_interval=0.5, last_input_time=lambda: self._last_input_time)
+        
+        result = None
+        while not self.stop_execution:
+            stats.polls += 1
+            changed = False
+            try:
+                if self._screen_capture is not None:
+                    frame = self._screen_capture.grab(region, max_age_ms=0)
+                    dirty = differ.update(frame.gray())
+                    changed = dirty is None or bool(dirty)
+                    if changed:
+                        stats.full_matches += 1
+                        text_results = self._text_extractor.extract_text_from_frame(
+                            frame, confidence, ocr_mode=ocr_mode)
+                        match = self._text_extractor.match_text(search_text, text_results, strategies)
+                        result = match.result if match else None
+                    else:
+                        stats.skipped_polls += 1
+                else:
+                    changed = True
+                    stats.full_matches += 1
+                    result = self._text_extractor.find_text(
+                        search_text, region=region, exact_match=exact_match,
+                        confidence_threshold=confidence, monitor_info=step.monitor_info,
+                        ocr_mode=ocr_mode)
+            except Exception as e:
+                self.logger.debug(f"Text wait error: {e}")
+            
+            if result is not None or time.time() >= deadline:
+                break
+            poller.sleep(changed, deadline)
+        
+        elapsed = time.time() - start
+        if result is None:
+            self.logger.info(f"텍스트 대기 시간 초과 ({elapsed:.2f}초, {stats.summary()})")
+            if self.stop_execution:
+                return None
+            get_debug_capture().flush(f"text wait timeout: '{search_text}'")
+            raise TimeoutError(f"Text '{search_text}' not found within {step.timeout} seconds")
+        
+        history = self._wait_text_history.setdefault(step.step_id, [])
+        history.append(elapsed)
+        del history[:-100]
+        ordered = sorted(history)
+        self.logger.info(f"텍스트 등장: '{result.text}' {result.center} - {elapsed:.2f}초 ({stats.summary()})")
+        self.logger.info(f"등장 시간 통계 ({len(history)}회): 중앙값 {ordered[len(ordered) // 2]:.2f}초, "
+                         f"최대 {ordered[-1]:.2f}초, 제한 시간 {step.timeout}초")
+        return result.center
+        
     # Screen handlers
     
     def _execute_screenshot(self, step) -> str:
@@ -678,10 +1035,17 @@ class StepExecutor:
         current_x, current_y = pyautogui.position()
         self.logger.info(f"스크린샷 시작 - 현재 마우스 위치: ({current_x}, {current_y})")
         
-        if self._image_matcher and hasattr(step, 'region') and step.region:
-            # Capture specific region
-            self.logger.info(f"영역 스크린샷: {step.region}")
-            self._image_matcher.capture_region(step.region, filename)
+        region = getattr(step, 'region', None)
+        if self._image_matcher:
+            # Shared capture service (reuses a frame grabbed by a preceding search)
+            self.logger.info(f"영역 스크린샷: {region if region else '전체 화면'}")
+            self._image_matcher.capture_region(tuple(region) if region else None, filename)
+        elif self._screen_capture:
+            # Capture backend without OpenCV
+            from PIL import Image
+            self.logger.info(f"영역 스크린샷: {region if region else '전체 화면'}")
+            frame = self._screen_capture.grab(tuple(region) if region else None)
+            Image.fromarray(frame.rgb()).save(filename)
         else:
             # Full screen capture
             screen_width, screen_height = pyautogui.size()
@@ -697,12 +1061,15 @@ class StepExecutor:
         center = None
         
         if self._image_matcher:
-            # Use OpenCV-based matcher
-            result = self._image_matcher.find_image(
-                step.image_path,
-                confidence=step.confidence,
-                region=step.region
-            )
+            # Use OpenCV-based matcher (or the batch matched for preceding image steps)
+            result = self._take_prefetched_image(self._image_query_key(step))
+            if result is None:
+                result = self._image_matcher.find_image(
+                    step.image_path,
+                    confidence=step.confidence,
+                    region=step.region,
+                    match_mode=getattr(step, 'match_mode', 'standard')
+                )
             
             if result.found:
                 self.logger.debug(f"Image found at: {result.location}")
@@ -766,6 +1133,8 @@ class StepExecutor:
         try:
             # Dynamic screen stabilization delay
             stabilization_delay = getattr(step, 'screen_delay', 0.3)  # Default 300ms
+            if self._prefetched_text_ready(self._text_query_key(step)):
+                stabilization_delay = 0  # 앞 단계에서 입력 없이 이미 안정된 화면을 인식함
             if stabilization_delay > 0:
                 self.logger.debug(f"Waiting {stabilization_delay}s for screen stabilization")
                 time.sleep(stabilization_delay)
@@ -841,6 +1210,7 @@ class StepExecutor:
                 # Text not found after all retries
                 self.logger.warning(f"======== 텍스트 검색 실패 ========")
                 self.logger.warning(f"찾을 수 없는 텍스트: '{search_text}'")
+                get_debug_capture().flush(f"text not found: '{search_text}'")
                 
                 # Check for new on_not_found action
                 if hasattr(step, 'on_not_found') and step.on_not_found:
@@ -856,6 +1226,61 @@ class StepExecutor:
             # Re-raise the exception with more context
             raise RuntimeError(f"텍스트 검색 중 오류 발생: {str(e)}")
     
+    def _execute_text_anchor(self, step) -> Any:
+        """Execute anchor-relative text read/click
+        
+        영역을 한 번만 OCR해 라벨을 찾고, 같은 결과의 공간 인덱스에서 라벨 기준 위치의
+        값을 찾는다 (값 영역을 위한 두 번째 OCR 없음).
+        
+        Returns:
+            클릭 시 클릭한 값의 중심 좌표, 아니면 읽은 값 텍스트
+        """
+        if not self._text_extractor:
+            raise RuntimeError("텍스트 기준 읽기를 사용하려면 OCR 구성요소가 필요합니다.")
+        
+        from vision.text_extractor_paddle import MATCH_EXACT, FALLBACK_STRATEGIES
+        from vision.text_index import TextIndex, split_labeled, join_text, QUERY_RIGHT, QUERY_ROW
+        
+        label = self._prepare_search_text(step)
+        region = tuple(step.region) if step.region else None
+        query = getattr(step, 'query', QUERY_RIGHT)
+        self.logger.info(f"텍스트 기준 읽기: 라벨 '{label}', 위치 {query} (영역: {region if region else '전체 화면'})")
+        
+        text_results = self._take_prefetched_text(self._text_query_key(step))
+        if text_results is None:
+            text_results = self._text_extractor.extract_text_from_region(
+                region, step.confidence, monitor_info=step.monitor_info, ocr_mode=step.ocr_mode)
+        
+        strategies = (MATCH_EXACT,) if step.exact_match else FALLBACK_STRATEGIES
+        match = self._text_extractor.match_text(label, text_results, strategies)
+        if match is None:
+            get_debug_capture().flush(f"anchor not found: '{label}'")
+            raise RuntimeError(f"기준 텍스트 '{label}'을(를) 찾을 수 없습니다")
+        
+        # 라벨과 값이 한 박스로 검출된 경우 ("환자번호: 12345678") 나눠서 사용
+        anchor, inline_value = split_labeled(match.result, label)
+        index = TextIndex(text_results)
+        if inline_value is not None and query in (QUERY_RIGHT, QUERY_ROW):
+            values = [inline_value] + (index.row(match.result, step.max_distance) if query == QUERY_ROW else [])
+        else:
+            values = index.query(anchor, query,
+                                 step.max_distance, tuple(step.box_offset))
+        if not values:
+            get_debug_capture().flush(f"value not found: '{label}' {query}")
+            raise RuntimeError(f"'{label}' 기준 {query} 위치에서 텍스트를 찾을 수 없습니다")
+        
+        value_text = join_text(values) if len(values) > 1 else values[0].text
+        self.logger.info(f"읽은 값: '{value_text}' (라벨: '{match.result.text}' {match.result.center})")
+        if step.output_variable:
+            self.variables[step.output_variable] = value_text
+            self.logger.info(f"변수 저장: ${{{step.output_variable}}} = '{value_text}'")
+        
+        if step.click_on_found:
+            target = values[0]
+            self._perform_text_click(target, tuple(step.click_offset), step.double_click)
+            return target.center
+        return value_text
+    
     # Flow control handlers
     
     def _execute_if_condition(self, step) -> bool:
@@ -871,11 +1296,14 @@ class StepExecutor:
                 region = step.condition_value.get('region')
                 
                 if self._image_matcher:
-                    result = self._image_matcher.find_image(
-                        image_path,
-                        confidence=confidence,
-                        region=region
-                    )
+                    result = self._take_prefetched_image(self._image_query_key(step))
+                    if result is None:
+                        result = self._image_matcher.find_image(
+                            image_path,
+                            confidence=confidence,
+                            region=region,
+                            match_mode=step.condition_value.get('match_mode', 'standard')
+                        )
                     condition_result = result.found if result else False
                 else:
                     # Fallback to pyautogui
@@ -898,12 +1326,19 @@ class StepExecutor:
                 # Substitute variables in search text
                 search_text = self._substitute_variables(search_text)
                 
-                if search_text:
+                text_results = self._take_prefetched_text(self._text_query_key(step)) if search_text else None
+                if text_results is not None:
+                    from vision.text_extractor_paddle import MATCH_EXACT, MATCH_PARTIAL
+                    match = self._text_extractor.match_text(
+                        search_text, text_results, (MATCH_EXACT,) if exact_match else (MATCH_PARTIAL,))
+                    condition_result = match is not None
+                elif search_text:
                     result = self._text_extractor.find_text(
                         search_text,
                         region=region,
                         exact_match=exact_match,
-                        confidence_threshold=0.5
+                        confidence_threshold=0.5,
+                        ocr_mode=step.condition_value.get('ocr_mode', 'full')
                     )
                     condition_result = result is not None
                 else:
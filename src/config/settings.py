@@ -32,6 +32,52 @@ class Settings:
                 "click_delay_max": 0.3
             }
         },
+        "vision": {
+            "capture_freshness_ms": 30,  # 이 시간 내의 캡처 프레임은 재사용
+            "capture_backend": "mss",  # mss, xshm (Xvfb), replay (녹화된 프레임 재생)
+            "replay_source": "",  # replay: PNG 폴더 또는 녹화 세션 폴더
+            "replay_mode": "step",  # replay: step, sequence, time, static
+            "xshm_display": "",  # xshm: X 디스플레이 (기본값 $DISPLAY)
+            "record_session_dir": "",  # 지정 시 캡처한 프레임을 이 폴더에 녹화
+            "match_workers": 4,  # 다중 배율/일괄 이미지 검색 스레드 수
+            "multi_scale_certain": 0.97,  # 이 신뢰도 이상이면 나머지 배율 검색 생략
+            "change_driven_wait": True,  # 이미지 대기 시 변경된 타일만 다시 검색
+            "wait_min_interval": 0.05,  # 입력 직후/화면 변경 시 폴링 간격 (초)
+            "wait_tile_size": 64,  # 변경 감지 타일 크기 (픽셀)
+            "wait_full_check_interval": 2.0,  # 전체 영역 재검색 주기 (초)
+            "hit_prior": True,  # 마지막으로 찾은 위치 주변을 먼저 검색
+            "hit_probe_margin": 32,  # 우선 검색 창 여백 (픽셀)
+            "template_cache_mb": 100,  # 템플릿 메모리 캐시 한도
+            "template_disk_cache": True,  # 전처리된 템플릿을 디스크에 저장
+            "batch_max_age_ms": 250,  # 연속 이미지 단계의 일괄 검색 결과 유효 시간
+            "optimize_templates": True  # 여백 제거/특징 영역 추출한 템플릿 사용
+        },
+        "ocr": {
+            "warmup_on_start": True,  # 메인 창 표시 후 백그라운드에서 OCR 모델 로드/예열
+            "worker_processes": 1,  # PaddleOCR을 실행할 별도 프로세스 수 (0이면 앱 프로세스에서 실행)
+            "worker_timeout": 60,  # 응답이 없는 OCR 워커를 재시작하기까지의 시간 (초)
+            "profile": None,  # tune_ocr_profile.py가 저장하는 OCR 엔진 설정 (모델, 검출 크기, 스레드, MKL-DNN)
+            "result_cache": True,  # 같은 내용의 영역은 OCR 결과 재사용
+            "result_cache_entries": 512,  # 메모리에 보관할 OCR 결과 수
+            "result_disk_cache": False,  # OCR 결과를 디스크에 저장 (재시작 후에도 유지, 화면 텍스트가 평문으로 남음)
+            "layout_memory": False,  # 고정 양식: 라인 위치를 기억하고 검출 단계 생략
+            "tiling": True,  # 큰 영역/전체 화면은 겹치는 타일로 나눠 OCR (작은 글자 인식 향상)
+            "tile_size": 960,  # 타일 한 변의 최대 크기 (검출 모델 입력 크기)
+            "tile_overlap": 64,  # 타일 겹침 (가장 큰 글자 높이보다 크게)
+            "incremental": True,  # 같은 영역을 다시 OCR할 때 바뀐 타일만 인식
+            "fuzzy_match": True,  # 검색 텍스트 오인식 허용 (편집 거리 기반)
+            "jamo_match": True,  # 한글은 자모 단위로 비교 (환자 vs 환지 = 1글자 차이)
+            "max_error_ratio": 0.25,  # 검색 텍스트 글자당 허용 오류 비율 (숫자는 항상 정확히 일치)
+            "batch_max_age_ms": 1000  # 연속 텍스트 단계의 일괄 OCR 결과 유효 시간
+        },
+        "debug_capture": {
+            "enabled": True,  # 최근 OCR 입력 영역을 메모리에 보관 (실패 시 debug/ocr_regions에 저장)
+            "capacity": 20,  # 보관할 영역 이미지 수
+            "max_mb": 64,  # 보관 이미지 메모리 한도
+            "sample_rate": 0.0,  # 실패가 아니어도 저장할 OCR 호출 비율 (0.1이면 10번에 한 번)
+            "directory": "debug/ocr_regions",
+            "png_compression": 6  # PNG 압축 수준 0-9 (백그라운드에서 저장)
+        },
         "ui": {
             "window_size": [1280, 720],
             "show_tooltips": True,
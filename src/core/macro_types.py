@@ -31,6 +31,7 @@ class StepType(Enum):
     IMAGE_SEARCH = "image_search"
     OCR_TEXT = "ocr_text"
     DYNAMIC_TEXT_SEARCH = "dynamic_text_search"
+    TEXT_ANCHOR = "text_anchor"  # 기준 텍스트(라벨) 옆의 값 읽기/클릭
     
     # Flow control
     IF_CONDITION = "if_condition"
@@ -310,6 +311,7 @@ class WaitImageStep(MacroStep):
     timeout: float = 10.0
     confidence: float = 0.9
     region: Optional[tuple] = None  # (x, y, width, height)
+    match_mode: str = "standard"  # standard, pyramid
     
     def validate(self) -> List[str]:
         errors = []
@@ -327,7 +329,8 @@ class WaitImageStep(MacroStep):
             "image_path": self.image_path,
             "timeout": self.timeout,
             "confidence": self.confidence,
-            "region": list(self.region) if self.region else None
+            "region": list(self.region) if self.region else None,
+            "match_mode": self.match_mode
         })
         return data
     
@@ -344,7 +347,138 @@ class WaitImageStep(MacroStep):
             image_path=data.get("image_path", ""),
             timeout=data.get("timeout", 10.0),
             confidence=data.get("confidence", 0.9),
-            region=tuple(region) if region else None
+            region=tuple(region) if region else None,
+            match_mode=data.get("match_mode", "standard")
+        )
+
+@dataclass
+class WaitTextStep(MacroStep):
+    """Wait for text to appear"""
+    step_type: StepType = field(default=StepType.WAIT_TEXT, init=False)
+    search_text: str = ""  # Text to wait for (can include ${variables})
+    region: Optional[tuple] = None  # (x, y, width, height)
+    monitor_info: Optional[Dict[str, Any]] = None
+    timeout: float = 10.0
+    exact_match: bool = False
+    confidence: float = 0.5
+    ocr_mode: str = "auto"  # OCR mode: auto, full, line, lines
+    
+    def validate(self) -> List[str]:
+        errors = []
+        if not self.search_text or not self.search_text.strip():
+            errors.append("기다릴 텍스트를 입력하세요")
+        if self.timeout <= 0:
+            errors.append("Timeout must be positive")
+        if not 0 <= self.confidence <= 1:
+            errors.append("신뢰도는 0과 1 사이의 값이어야 합니다")
+        return errors
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data.update({
+            "search_text": self.search_text,
+            "region": list(self.region) if self.region else None,
+            "monitor_info": self.monitor_info,
+            "timeout": self.timeout,
+            "exact_match": self.exact_match,
+            "confidence": self.confidence,
+            "ocr_mode": self.ocr_mode
+        })
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WaitTextStep':
+        region = data.get("region")
+        return cls(
+            step_id=data.get("step_id", str(uuid.uuid4())),
+            name=data.get("name", ""),
+            description=data.get("description", ""),
+            enabled=data.get("enabled", True),
+            error_handling=ErrorHandling(data.get("error_handling", "stop")),
+            retry_count=data.get("retry_count", 0),
+            search_text=data.get("search_text", ""),
+            region=tuple(region) if region else None,
+            monitor_info=data.get("monitor_info"),
+            timeout=data.get("timeout", 10.0),
+            exact_match=data.get("exact_match", False),
+            confidence=data.get("confidence", 0.5),
+            ocr_mode=data.get("ocr_mode", "full")
+        )
+
+@dataclass
+class TextAnchorStep(MacroStep):
+    """Find a label and read or click the text placed relative to it (one OCR)"""
+    step_type: StepType = field(default=StepType.TEXT_ANCHOR, init=False)
+    search_text: str = ""  # Label text (can include ${variables})
+    region: Optional[tuple] = None  # (x, y, width, height) covering label and value
+    monitor_info: Optional[Dict[str, Any]] = None
+    exact_match: bool = False
+    confidence: float = 0.5
+    ocr_mode: str = "auto"  # OCR mode: auto, full, line, lines
+    query: str = "right"  # right, below, row, box, left, above
+    box_offset: Tuple[int, int, int, int] = (0, 0, 200, 30)  # box query: (dx, dy, w, h) from label top-left
+    max_distance: int = 0  # Largest gap between label and value in pixels (0: unlimited)
+    output_variable: str = ""  # Store the value text as ${variable}
+    click_on_found: bool = False
+    click_offset: Tuple[int, int] = (0, 0)  # Offset from center of the value
+    double_click: bool = False
+    
+    def validate(self) -> List[str]:
+        errors = []
+        if not self.search_text or not self.search_text.strip():
+            errors.append("기준 텍스트(라벨)를 입력하세요")
+        if self.query not in ("right", "below", "row", "box", "left", "above"):
+            errors.append(f"알 수 없는 위치 지정 방식: {self.query}")
+        if self.query == "box" and (self.box_offset[2] <= 0 or self.box_offset[3] <= 0):
+            errors.append("상자 크기는 0보다 커야 합니다")
+        if not self.output_variable and not self.click_on_found:
+            errors.append("값을 저장할 변수 이름을 입력하거나 클릭을 선택하세요")
+        if not 0 <= self.confidence <= 1:
+            errors.append("신뢰도는 0과 1 사이의 값이어야 합니다")
+        return errors
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data.update({
+            "search_text": self.search_text,
+            "region": list(self.region) if self.region else None,
+            "monitor_info": self.monitor_info,
+            "exact_match": self.exact_match,
+            "confidence": self.confidence,
+            "ocr_mode": self.ocr_mode,
+            "query": self.query,
+            "box_offset": list(self.box_offset),
+            "max_distance": self.max_distance,
+            "output_variable": self.output_variable,
+            "click_on_found": self.click_on_found,
+            "click_offset": list(self.click_offset),
+            "double_click": self.double_click
+        })
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TextAnchorStep':
+        region = data.get("region")
+        return cls(
+            step_id=data.get("step_id", str(uuid.uuid4())),
+            name=data.get("name", ""),
+            description=data.get("description", ""),
+            enabled=data.get("enabled", True),
+            error_handling=ErrorHandling(data.get("error_handling", "stop")),
+            retry_count=data.get("retry_count", 0),
+            search_text=data.get("search_text", ""),
+            region=tuple(region) if region else None,
+            monitor_info=data.get("monitor_info"),
+            exact_match=data.get("exact_match", False),
+            confidence=data.get("confidence", 0.5),
+            ocr_mode=data.get("ocr_mode", "full"),
+            query=data.get("query", "right"),
+            box_offset=tuple(data.get("box_offset", [0, 0, 200, 30])),
+            max_distance=data.get("max_distance", 0),
+            output_variable=data.get("output_variable", ""),
+            click_on_found=data.get("click_on_found", False),
+            click_offset=tuple(data.get("click_offset", [0, 0])),
+            double_click=data.get("double_click", False)
         )
 
 @dataclass
@@ -362,6 +496,7 @@ class TextSearchStep(MacroStep):
     double_click: bool = False  # Whether to double click
     normalize_text: bool = False  # Whether to normalize special characters (e.g., full-width to half-width)
     screen_delay: float = 0.3  # Screen stabilization delay in seconds
+    ocr_mode: str = "auto"  # OCR mode: auto, full (detection), line (single line), lines (split lines)
     # NEW: Optional action properties
     on_found: Optional[Dict[str, Any]] = None
     on_not_found: Optional[Dict[str, Any]] = None
@@ -436,6 +571,7 @@ class TextSearchStep(MacroStep):
             "double_click": self.double_click,
             "normalize_text": self.normalize_text,
             "screen_delay": self.screen_delay,
+            "ocr_mode": self.ocr_mode,
             # NEW: Optional action properties
             "on_found": self.on_found,
             "on_not_found": self.on_not_found
@@ -489,6 +625,7 @@ class TextSearchStep(MacroStep):
             double_click=data.get("double_click", False),
             normalize_text=data.get("normalize_text", False),
             screen_delay=screen_delay,
+            ocr_mode=data.get("ocr_mode", "full"),  # Steps saved before OCR modes keep full detection
             # NEW: Optional action properties
             on_found=data.get("on_found"),
             on_not_found=data.get("on_not_found")
@@ -617,6 +754,7 @@ class ImageSearchStep(MacroStep):
     click_on_found: bool = True
     click_offset: Tuple[int, int] = (0, 0)
     double_click: bool = False
+    match_mode: str = "standard"  # standard, pyramid
     # NEW: Optional action properties
     on_found: Optional[Dict[str, Any]] = None
     on_not_found: Optional[Dict[str, Any]] = None
@@ -639,6 +777,7 @@ class ImageSearchStep(MacroStep):
             "click_on_found": self.click_on_found,
             "click_offset": list(self.click_offset),
             "double_click": self.double_click,
+            "match_mode": self.match_mode,
             # NEW: Optional action properties
             "on_found": self.on_found,
             "on_not_found": self.on_not_found
@@ -664,6 +803,7 @@ class ImageSearchStep(MacroStep):
             click_on_found=data.get("click_on_found", True),
             click_offset=tuple(click_offset),
             double_click=data.get("double_click", False),
+            match_mode=data.get("match_mode", "standard"),
             # NEW: Optional action properties
             on_found=data.get("on_found"),
             on_not_found=data.get("on_not_found")
@@ -725,9 +865,11 @@ class StepFactory:
         StepType.KEYBOARD_HOTKEY: KeyboardHotkeyStep,
         StepType.WAIT_TIME: WaitTimeStep,
         StepType.WAIT_IMAGE: WaitImageStep,
+        StepType.WAIT_TEXT: WaitTextStep,
         StepType.IMAGE_SEARCH: ImageSearchStep,
         StepType.SCREENSHOT: ScreenshotStep,
         StepType.OCR_TEXT: TextSearchStep,
+        StepType.TEXT_ANCHOR: TextAnchorStep,
         StepType.IF_CONDITION: IfConditionStep,
         StepType.LOOP: LoopStep,
         StepType.EXCEL_ROW_START: ExcelRowStartStep,
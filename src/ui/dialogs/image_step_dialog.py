@@ -153,6 +153,11 @@ class ImageStepDialog(QDialog):
         self.preview_region_btn.clicked.connect(self._preview_region)
         region_btn_layout.addWidget(self.preview_region_btn)
         
+        self.suggest_region_btn = QPushButton("추천 영역")
+        self.suggest_region_btn.setToolTip("지금까지 이미지를 찾은 위치를 모두 포함하는 영역을 적용합니다")
+        self.suggest_region_btn.clicked.connect(self._apply_suggested_region)
+        region_btn_layout.addWidget(self.suggest_region_btn)
+        
         self.region_buttons_widget.setLayout(region_btn_layout)
         self.region_buttons_widget.setVisible(False)  # Hidden by default
         
@@ -484,6 +489,22 @@ class ImageStepDialog(QDialog):
         # Keep the scope combo at "특정 영역 선택"
         self.search_scope_combo.setCurrentIndex(len(self.monitors) + 1)
         
+    def _apply_suggested_region(self):
+        """Use the region learned from previous search hits"""
+        image_path = self.image_path_input.text()
+        if not image_path:
+            QMessageBox.warning(self, "경고", "먼저 이미지를 선택하세요.")
+            return
+            
+        suggested = self.image_matcher.suggest_region(image_path)
+        if not suggested:
+            QMessageBox.information(self, "알림", "추천할 영역이 없습니다.\n이미지를 몇 번 찾은 뒤 다시 시도하세요.")
+            return
+            
+        self.region = suggested
+        x, y, width, height = suggested
+        self.region_label.setText(f"추천 영역: ({x}, {y}) 크기: {width}x{height}")
+        
     def _preview_region(self):
         """Preview selected region with DPI support"""
         if not self.region:
@@ -491,34 +512,23 @@ class ImageStepDialog(QDialog):
             return
             
         try:
-            # Use mss for DPI-aware screenshot
-            import mss
+            # Capture through the shared capture service (physical coordinates)
+            from vision.screen_capture import get_screen_capture
             from PIL import Image
             import io
             
-            with mss.mss() as sct:
-                # Region is already in physical coordinates
-                x, y, width, height = self.region
-                monitor = {
-                    "left": x,
-                    "top": y,
-                    "width": width,
-                    "height": height
-                }
-                
-                # Capture the region
-                screenshot = sct.grab(monitor)
-                
-                # Convert to PIL Image
-                img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-                
-                # Convert to QPixmap
-                bytes_io = io.BytesIO()
-                img.save(bytes_io, format='PNG')
-                bytes_io.seek(0)
-                
-                pixmap = QPixmap()
-                pixmap.loadFromData(bytes_io.read())
+            # Region is already in physical coordinates
+            x, y, width, height = self.region
+            frame = get_screen_capture().grab((x, y, width, height), max_age_ms=0)
+            img = Image.fromarray(frame.rgb())
+            
+            # Convert to QPixmap
+            bytes_io = io.BytesIO()
+            img.save(bytes_io, format='PNG')
+            bytes_io.seek(0)
+            
+            pixmap = QPixmap()
+            pixmap.loadFromData(bytes_io.read())
             
             if pixmap.isNull():
                 QMessageBox.warning(self, "경고", "영역 미리보기를 생성할 수 없습니다.")
@@ -601,6 +611,24 @@ class ImageStepDialog(QDialog):
         """Override to return step-specific data"""
         return {}
         
+    def _add_match_mode_combo(self, layout: QVBoxLayout):
+        """Add matching engine selector (standard / pyramid)"""
+        match_mode_layout = QHBoxLayout()
+        match_mode_layout.addWidget(QLabel("검색 방식:"))
+        self.match_mode_combo = QComboBox()
+        self.match_mode_combo.addItem("표준 (전체 해상도)", "standard")
+        self.match_mode_combo.addItem("피라미드 (빠른 전체 화면 검색)", "pyramid")
+        self.match_mode_combo.setToolTip("피라미드: 축소 이미지에서 후보를 찾은 뒤 원본 해상도로 확인합니다")
+        match_mode_layout.addWidget(self.match_mode_combo)
+        layout.addLayout(match_mode_layout)
+        
+    def _load_match_mode(self):
+        """Select the step's matching engine in the combo"""
+        match_mode = getattr(self.step, 'match_mode', 'standard') if self.step else 'standard'
+        index = self.match_mode_combo.findData(match_mode)
+        if index >= 0:
+            self.match_mode_combo.setCurrentIndex(index)
+        
     def accept(self):
         """Validate and accept dialog"""
         # Basic validation
@@ -616,6 +644,12 @@ class ImageStepDialog(QDialog):
             QMessageBox.warning(self, "확인 오류", "선택한 이미지 파일이 존재하지 않습니다")
             return
             
+        # Trim margins / pick a distinctive patch so every row matches a smaller template
+        try:
+            self.image_matcher.optimize_templates([self.image_path_input.text()])
+        except Exception as e:
+            print(f"DEBUG: Template optimization skipped: {e}")
+            
         super().accept()
     
     def _on_region_selected(self, result):
@@ -704,6 +738,9 @@ class WaitImageStepDialog(ImageStepDialog):
         
         params_layout.addLayout(confidence_layout)
         
+        # Matching engine
+        self._add_match_mode_combo(params_layout)
+        
         # Test result
         self.test_result_label = QLabel()
         params_layout.addWidget(self.test_result_label)
@@ -718,13 +755,15 @@ class WaitImageStepDialog(ImageStepDialog):
         if isinstance(self.step, WaitImageStep):
             self.timeout_spin.setValue(int(self.step.timeout))
             self.confidence_spin.setValue(self.step.confidence)
+            self._load_match_mode()
             
     def get_custom_data(self) -> Dict[str, Any]:
         """Get wait-specific data"""
         return {
             'step_type': StepType.WAIT_IMAGE,
             'timeout': self.timeout_spin.value(),
-            'confidence': self.confidence_spin.value()
+            'confidence': self.confidence_spin.value(),
+            'match_mode': self.match_mode_combo.currentData()
         }
         
     def _test_match(self):
@@ -738,7 +777,8 @@ class WaitImageStepDialog(ImageStepDialog):
         result = self.image_matcher.find_image(
             image_path,
             confidence=self.confidence_spin.value(),
-            region=self.region
+            region=self.region,
+            match_mode=self.match_mode_combo.currentData()
         )
         
         if result.found:
@@ -780,6 +820,9 @@ class ImageSearchStepDialog(ImageStepDialog):
         confidence_layout.addWidget(self.confidence_spin)
         params_layout.addLayout(confidence_layout)
         
+        # Matching engine
+        self._add_match_mode_combo(params_layout)
+        
         # Search all occurrences
         self.search_all_check = QCheckBox("모든 항목 찾기")
         params_layout.addWidget(self.search_all_check)
@@ -1137,6 +1180,7 @@ class ImageSearchStepDialog(ImageStepDialog):
             'click_on_found': self.click_on_found_check.isChecked(),
             'click_offset': (self.offset_x_spin.value(), self.offset_y_spin.value()),
             'double_click': self.click_type_combo.currentIndex() == 1,  # True if "더블 클릭" selected
+            'match_mode': self.match_mode_combo.currentData(),
             'monitor_info': self.monitor_info  # Add monitor info for DPI-aware operations
         }
         
@@ -1207,6 +1251,8 @@ class ImageSearchStepDialog(ImageStepDialog):
         if self.step and hasattr(self.step, 'confidence'):
             self.confidence_spin.setValue(self.step.confidence)
             
+        self._load_match_mode()
+            
         if self.step and hasattr(self.step, 'click_on_found'):
             self.click_on_found_check.setChecked(self.step.click_on_found)
             
@@ -1304,7 +1350,8 @@ class ImageSearchStepDialog(ImageStepDialog):
             result = self.image_matcher.find_image(
                 image_path,
                 confidence=self.confidence_spin.value(),
-                region=self.region
+                region=self.region,
+                match_mode=self.match_mode_combo.currentData()
             )
             
             if result.found:
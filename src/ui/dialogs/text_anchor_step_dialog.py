@@ -0,0 +1,215 @@
+"""
+Text anchor step configuration dialog
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QDoubleSpinBox, QSpinBox, QCheckBox, QComboBox, QDialogButtonBox, QFormLayout, QWidget
+)
+from PyQt5.QtCore import Qt, QTimer
+from core.macro_types import TextAnchorStep
+from ui.widgets.roi_selector import ROISelectorOverlay
+
+
+class TextAnchorStepDialog(QDialog):
+    """Dialog for configuring text anchor step"""
+
+    def __init__(self, step: TextAnchorStep, parent=None):
+        super().__init__(parent)
+        self.step = step
+        self.region = step.region
+        self.monitor_info = step.monitor_info
+        self.setWindowTitle("텍스트 기준 읽기 설정")
+        self.setModal(True)
+        self.setMinimumWidth(420)
+        self.init_ui()
+        self.load_step_data()
+
+    def init_ui(self):
+        """Initialize UI"""
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+
+        # Step name
+        self.name_edit = QLineEdit()
+        form_layout.addRow("단계 이름:", self.name_edit)
+
+        # Label text
+        self.search_text_edit = QLineEdit()
+        self.search_text_edit.setPlaceholderText("예: 환자번호, ${항목명}")
+        form_layout.addRow("기준 텍스트(라벨):", self.search_text_edit)
+
+        # Region
+        region_layout = QHBoxLayout()
+        self.region_label = QLabel("전체 화면")
+        region_layout.addWidget(self.region_label, 1)
+        select_region_btn = QPushButton("영역 선택")
+        select_region_btn.clicked.connect(self._select_region)
+        region_layout.addWidget(select_region_btn)
+        clear_region_btn = QPushButton("초기화")
+        clear_region_btn.clicked.connect(self._clear_region)
+        region_layout.addWidget(clear_region_btn)
+        form_layout.addRow("검색 영역:", region_layout)
+
+        # Value position
+        self.query_combo = QComboBox()
+        self.query_combo.addItem("오른쪽 가장 가까운 텍스트", "right")
+        self.query_combo.addItem("아래쪽 가장 가까운 텍스트", "below")
+        self.query_combo.addItem("오른쪽 같은 줄 전체", "row")
+        self.query_combo.addItem("라벨 기준 상자 안", "box")
+        self.query_combo.addItem("왼쪽 가장 가까운 텍스트", "left")
+        self.query_combo.addItem("위쪽 가장 가까운 텍스트", "above")
+        self.query_combo.currentIndexChanged.connect(self._update_box_visibility)
+        form_layout.addRow("값 위치:", self.query_combo)
+
+        # Box relative to the label's top-left corner
+        self.box_widget = QWidget()
+        box_layout = QHBoxLayout(self.box_widget)
+        box_layout.setContentsMargins(0, 0, 0, 0)
+        self.box_spins = []
+        for caption, minimum in (("X", -5000), ("Y", -5000), ("폭", 1), ("높이", 1)):
+            spin = QSpinBox()
+            spin.setRange(minimum, 5000)
+            box_layout.addWidget(QLabel(caption))
+            box_layout.addWidget(spin)
+            self.box_spins.append(spin)
+        form_layout.addRow("상자 (라벨 왼쪽 위 기준):", self.box_widget)
+
+        self.max_distance_spin = QSpinBox()
+        self.max_distance_spin.setRange(0, 5000)
+        self.max_distance_spin.setSuffix(" px")
+        self.max_distance_spin.setSpecialValueText("제한 없음")
+        form_layout.addRow("라벨과 값 최대 간격:", self.max_distance_spin)
+
+        # Outputs
+        self.output_variable_edit = QLineEdit()
+        self.output_variable_edit.setPlaceholderText("예: 환자번호값 (다음 단계에서 ${환자번호값})")
+        form_layout.addRow("값 저장 변수:", self.output_variable_edit)
+
+        click_layout = QHBoxLayout()
+        self.click_check = QCheckBox("값 클릭")
+        self.double_click_check = QCheckBox("더블클릭")
+        self.click_offset_x = QSpinBox()
+        self.click_offset_x.setRange(-1000, 1000)
+        self.click_offset_y = QSpinBox()
+        self.click_offset_y.setRange(-1000, 1000)
+        click_layout.addWidget(self.click_check)
+        click_layout.addWidget(self.double_click_check)
+        click_layout.addWidget(QLabel("오프셋"))
+        click_layout.addWidget(self.click_offset_x)
+        click_layout.addWidget(self.click_offset_y)
+        form_layout.addRow("클릭:", click_layout)
+
+        # Matching
+        self.exact_match_check = QCheckBox("라벨 정확히 일치")
+        form_layout.addRow("매칭 방식:", self.exact_match_check)
+
+        self.confidence_spin = QDoubleSpinBox()
+        self.confidence_spin.setRange(0.0, 1.0)
+        self.confidence_spin.setSingleStep(0.05)
+        self.confidence_spin.setValue(0.5)
+        form_layout.addRow("인식 신뢰도:", self.confidence_spin)
+
+        self.ocr_mode_combo = QComboBox()
+        self.ocr_mode_combo.addItem("자동", "auto")
+        self.ocr_mode_combo.addItem("전체 검출", "full")
+        self.ocr_mode_combo.addItem("한 줄 (검출 생략)", "line")
+        self.ocr_mode_combo.addItem("여러 줄 (줄 분할 후 인식)", "lines")
+        form_layout.addRow("인식 방식:", self.ocr_mode_combo)
+
+        layout.addLayout(form_layout)
+
+        # Help text
+        help_label = QLabel("영역을 한 번만 OCR해 라벨을 찾고, 같은 결과에서 라벨 옆의 값을 읽습니다. "
+                            "검색 영역은 라벨과 값을 모두 포함하도록 지정하세요.")
+        help_label.setWordWrap(True)
+        help_label.setStyleSheet("color: #666; font-size: 12px;")
+        layout.addWidget(help_label)
+
+        layout.addStretch()
+
+        # Dialog buttons
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.setLayout(layout)
+
+    def _update_box_visibility(self):
+        self.box_widget.setEnabled(self.query_combo.currentData() == "box")
+
+    def _update_region_label(self):
+        if self.region:
+            x, y, w, h = self.region
+            self.region_label.setText(f"({x}, {y}) 크기: {w}x{h}")
+        else:
+            self.region_label.setText("전체 화면")
+
+    def _select_region(self):
+        """Hide the dialog and show the region selector"""
+        self.hide()
+        QTimer.singleShot(200, self._show_region_selector)
+
+    def _show_region_selector(self):
+        self.roi_selector = ROISelectorOverlay(parent=None)
+        self.roi_selector.selectionComplete.connect(self._on_region_selected)
+        self.roi_selector.selectionCancelled.connect(self.show)
+        self.roi_selector.start_selection()
+
+    def _on_region_selected(self, result):
+        region = result.get("region") if isinstance(result, dict) else result
+        if region and len(region) == 4:
+            self.region = tuple(int(v) for v in region)
+            self.monitor_info = result.get("monitor_info") if isinstance(result, dict) else None
+        self._update_region_label()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def _clear_region(self):
+        self.region = None
+        self.monitor_info = None
+        self._update_region_label()
+
+    def load_step_data(self):
+        """Load data from step"""
+        self.name_edit.setText(self.step.name)
+        self.search_text_edit.setText(self.step.search_text)
+        self.query_combo.setCurrentIndex(max(0, self.query_combo.findData(self.step.query)))
+        for spin, value in zip(self.box_spins, self.step.box_offset):
+            spin.setValue(int(value))
+        self.max_distance_spin.setValue(int(self.step.max_distance))
+        self.output_variable_edit.setText(self.step.output_variable)
+        self.click_check.setChecked(self.step.click_on_found)
+        self.double_click_check.setChecked(self.step.double_click)
+        self.click_offset_x.setValue(int(self.step.click_offset[0]))
+        self.click_offset_y.setValue(int(self.step.click_offset[1]))
+        self.exact_match_check.setChecked(self.step.exact_match)
+        self.confidence_spin.setValue(self.step.confidence)
+        self.ocr_mode_combo.setCurrentIndex(max(0, self.ocr_mode_combo.findData(self.step.ocr_mode)))
+        self._update_region_label()
+        self._update_box_visibility()
+
+    def get_step_data(self):
+        """Get configured step data"""
+        return {
+            'name': self.name_edit.text(),
+            'search_text': self.search_text_edit.text(),
+            'region': self.region,
+            'monitor_info': self.monitor_info,
+            'query': self.query_combo.currentData(),
+            'box_offset': tuple(spin.value() for spin in self.box_spins),
+            'max_distance': self.max_distance_spin.value(),
+            'output_variable': self.output_variable_edit.text().strip(),
+            'click_on_found': self.click_check.isChecked(),
+            'double_click': self.double_click_check.isChecked(),
+            'click_offset': (self.click_offset_x.value(), self.click_offset_y.value()),
+            'exact_match': self.exact_match_check.isChecked(),
+            'confidence': self.confidence_spin.value(),
+            'ocr_mode': self.ocr_mode_combo.currentData()
+        }
@@ -17,7 +17,6 @@ from ui.widgets.roi_selector import ROISelectorOverlay
 from vision.text_extractor_paddle import PaddleTextExtractor as TextExtractor
 from utils.monitor_utils import get_monitor_info
 import pyautogui
-import mss
 
 class TextSearchStepDialog(QDialog):
     """Dialog for configuring text search steps"""
@@ -186,6 +185,18 @@ class TextSearchStepDialog(QDialog):
         )
         options_layout.addRow("텍스트 처리:", self.normalize_text_check)
         
+        self.ocr_mode_combo = QComboBox()
+        self.ocr_mode_combo.addItem("자동", "auto")
+        self.ocr_mode_combo.addItem("전체 검출", "full")
+        self.ocr_mode_combo.addItem("한 줄 (검출 생략)", "line")
+        self.ocr_mode_combo.addItem("여러 줄 (줄 분할 후 인식)", "lines")
+        self.ocr_mode_combo.setToolTip(
+            "자동: 작은 영역은 줄 단위로 바로 인식, 큰 영역은 전체 검출\n"
+            "한 줄: 셀/입력칸처럼 한 줄 텍스트만 있는 영역 (가장 빠름)\n"
+            "여러 줄: 몇 줄의 텍스트가 있는 작은 영역"
+        )
+        options_layout.addRow("인식 방식:", self.ocr_mode_combo)
+        
         options_group.setLayout(options_layout)
         layout.addWidget(options_group)
         
@@ -412,6 +423,7 @@ class TextSearchStepDialog(QDialog):
         self.step.exact_match = self.exact_match_check.isChecked()
         self.step.confidence = self.confidence_spin.value()
         self.step.normalize_text = self.normalize_text_check.isChecked()
+        self.step.ocr_mode = self.ocr_mode_combo.currentData()
         
         # Update click options
         self.step.click_on_found = self.click_on_found_check.isChecked()
@@ -516,6 +528,8 @@ class TextSearchStepDialog(QDialog):
         self.exact_match_check.setChecked(self.step.exact_match)
         self.confidence_spin.setValue(self.step.confidence)
         self.normalize_text_check.setChecked(getattr(self.step, 'normalize_text', False))
+        ocr_mode_index = self.ocr_mode_combo.findData(getattr(self.step, 'ocr_mode', 'auto'))
+        self.ocr_mode_combo.setCurrentIndex(max(0, ocr_mode_index))
         self.click_on_found_check.setChecked(self.step.click_on_found)
         self.offset_x_spin.setValue(self.step.click_offset[0])
         self.offset_y_spin.setValue(self.step.click_offset[1])
@@ -985,7 +999,8 @@ class TextSearchStepDialog(QDialog):
             # Extract text from region
             results = self.text_extractor.extract_text_from_region(
                 self.region, 
-                self.confidence_spin.value()
+                self.confidence_spin.value(),
+                ocr_mode=self.ocr_mode_combo.currentData()
             )
             print(f"DEBUG: Found {len(results)} text results")
             
@@ -995,7 +1010,8 @@ class TextSearchStepDialog(QDialog):
                 search_text,
                 region=self.region,
                 exact_match=self.exact_match_check.isChecked(),
-                confidence_threshold=self.confidence_spin.value()
+                confidence_threshold=self.confidence_spin.value(),
+                ocr_mode=self.ocr_mode_combo.currentData()
             )
             
             if found_result:
@@ -1064,7 +1080,8 @@ class TextSearchStepDialog(QDialog):
             # Extract text from region first (before showing loading)
             results = self.text_extractor.extract_text_from_region(
                 self.region, 
-                self.confidence_spin.value()
+                self.confidence_spin.value(),
+                ocr_mode=self.ocr_mode_combo.currentData()
             )
             print(f"DEBUG: Found {len(results)} text results")
             
@@ -1073,7 +1090,8 @@ class TextSearchStepDialog(QDialog):
                 search_text,
                 region=self.region,
                 exact_match=self.exact_match_check.isChecked(),
-                confidence_threshold=self.confidence_spin.value()
+                confidence_threshold=self.confidence_spin.value(),
+                ocr_mode=self.ocr_mode_combo.currentData()
             )
             
             if found_result:
@@ -1350,6 +1368,7 @@ class TextSearchStepDialog(QDialog):
             'exact_match': self.exact_match_check.isChecked(),
             'confidence': self.confidence_spin.value(),
             'normalize_text': self.normalize_text_check.isChecked(),
+            'ocr_mode': self.ocr_mode_combo.currentData(),
             'click_on_found': self.click_on_found_check.isChecked(),
             'click_offset': (self.offset_x_spin.value(), self.offset_y_spin.value()),
             'double_click': self.click_type_combo.currentIndex() == 1,  # True if "더블 클릭" selected
@@ -0,0 +1,157 @@
+"""
+Wait text step configuration dialog
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QDoubleSpinBox, QCheckBox, QComboBox, QDialogButtonBox, QFormLayout
+)
+from PyQt5.QtCore import Qt, QTimer
+from core.macro_types import WaitTextStep
+from ui.widgets.roi_selector import ROISelectorOverlay
+
+
+class WaitTextStepDialog(QDialog):
+    """Dialog for configuring wait text step"""
+
+    def __init__(self, step: WaitTextStep, parent=None):
+        super().__init__(parent)
+        self.step = step
+        self.region = step.region
+        self.monitor_info = step.monitor_info
+        self.setWindowTitle("텍스트 대기 설정")
+        self.setModal(True)
+        self.setMinimumWidth(400)
+        self.init_ui()
+        self.load_step_data()
+
+    def init_ui(self):
+        """Initialize UI"""
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+
+        # Step name
+        self.name_edit = QLineEdit()
+        form_layout.addRow("단계 이름:", self.name_edit)
+
+        # Text to wait for
+        self.search_text_edit = QLineEdit()
+        self.search_text_edit.setPlaceholderText("예: 저장 완료, ${환자명}")
+        form_layout.addRow("기다릴 텍스트:", self.search_text_edit)
+
+        # Region
+        region_layout = QHBoxLayout()
+        self.region_label = QLabel("전체 화면")
+        region_layout.addWidget(self.region_label, 1)
+        select_region_btn = QPushButton("영역 선택")
+        select_region_btn.clicked.connect(self._select_region)
+        region_layout.addWidget(select_region_btn)
+        clear_region_btn = QPushButton("초기화")
+        clear_region_btn.clicked.connect(self._clear_region)
+        region_layout.addWidget(clear_region_btn)
+        form_layout.addRow("검색 영역:", region_layout)
+
+        # Timeout
+        self.timeout_spin = QDoubleSpinBox()
+        self.timeout_spin.setRange(0.5, 3600.0)
+        self.timeout_spin.setSingleStep(1.0)
+        self.timeout_spin.setDecimals(1)
+        self.timeout_spin.setSuffix(" 초")
+        self.timeout_spin.setValue(10.0)
+        form_layout.addRow("최대 대기:", self.timeout_spin)
+
+        # Matching
+        self.exact_match_check = QCheckBox("정확히 일치")
+        form_layout.addRow("매칭 방식:", self.exact_match_check)
+
+        self.confidence_spin = QDoubleSpinBox()
+        self.confidence_spin.setRange(0.0, 1.0)
+        self.confidence_spin.setSingleStep(0.05)
+        self.confidence_spin.setValue(0.5)
+        form_layout.addRow("인식 신뢰도:", self.confidence_spin)
+
+        self.ocr_mode_combo = QComboBox()
+        self.ocr_mode_combo.addItem("자동", "auto")
+        self.ocr_mode_combo.addItem("전체 검출", "full")
+        self.ocr_mode_combo.addItem("한 줄 (검출 생략)", "line")
+        self.ocr_mode_combo.addItem("여러 줄 (줄 분할 후 인식)", "lines")
+        form_layout.addRow("인식 방식:", self.ocr_mode_combo)
+
+        layout.addLayout(form_layout)
+
+        # Help text
+        help_label = QLabel("텍스트가 나타나면 바로 다음 단계로 진행합니다. "
+                            "영역의 화면이 바뀔 때만 OCR을 실행합니다.")
+        help_label.setWordWrap(True)
+        help_label.setStyleSheet("color: #666; font-size: 12px;")
+        layout.addWidget(help_label)
+
+        layout.addStretch()
+
+        # Dialog buttons
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.setLayout(layout)
+
+    def _update_region_label(self):
+        if self.region:
+            x, y, w, h = self.region
+            self.region_label.setText(f"({x}, {y}) 크기: {w}x{h}")
+        else:
+            self.region_label.setText("전체 화면")
+
+    def _select_region(self):
+        """Hide the dialog and show the region selector"""
+        self.hide()
+        QTimer.singleShot(200, self._show_region_selector)
+
+    def _show_region_selector(self):
+        self.roi_selector = ROISelectorOverlay(parent=None)
+        self.roi_selector.selectionComplete.connect(self._on_region_selected)
+        self.roi_selector.selectionCancelled.connect(self.show)
+        self.roi_selector.start_selection()
+
+    def _on_region_selected(self, result):
+        region = result.get("region") if isinstance(result, dict) else result
+        if region and len(region) == 4:
+            self.region = tuple(int(v) for v in region)
+            self.monitor_info = result.get("monitor_info") if isinstance(result, dict) else None
+        self._update_region_label()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def _clear_region(self):
+        self.region = None
+        self.monitor_info = None
+        self._update_region_label()
+
+    def load_step_data(self):
+        """Load data from step"""
+        self.name_edit.setText(self.step.name)
+        self.search_text_edit.setText(self.step.search_text)
+        self.timeout_spin.setValue(self.step.timeout)
+        self.exact_match_check.setChecked(self.step.exact_match)
+        self.confidence_spin.setValue(self.step.confidence)
+        self.ocr_mode_combo.setCurrentIndex(max(0, self.ocr_mode_combo.findData(self.step.ocr_mode)))
+        self._update_region_label()
+
+    def get_step_data(self):
+        """Get configured step data"""
+        return {
+            'name': self.name_edit.text(),
+            'search_text': self.search_text_edit.text(),
+            'region': self.region,
+            'monitor_info': self.monitor_info,
+            'timeout': self.timeout_spin.value(),
+            'exact_match': self.exact_match_check.isChecked(),
+            'confidence': self.confidence_spin.value(),
+            'ocr_mode': self.ocr_mode_combo.currentData()
+        }
@@ -7,7 +7,7 @@ from PyQt5.QtWidgets import (
     QMenuBar, QMenu, QAction, QStatusBar, QLabel,
     QMessageBox, QTabWidget, QFileDialog, QDialog
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QCloseEvent
 from config.settings import Settings
 from logger.app_logger import get_logger
@@ -20,6 +20,9 @@ from typing import List, Optional
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Background OCR loading progress (percent, message), emitted from the loading thread
+    ocrWarmupProgress = pyqtSignal(int, str)
+    
     def __init__(self, settings: Settings):
         super().__init__()
         self.settings = settings
@@ -186,6 +189,12 @@ class MainWindow(QMainWindow):
         ocr_action.triggered.connect(self.reinstall_ocr)
         tools_menu.addAction(ocr_action)
         
+        # Write recent OCR input regions to disk
+        debug_capture_action = QAction("Save OCR Debug Captures", self)
+        debug_capture_action.setStatusTip("Save the most recent OCR regions to debug/ocr_regions")
+        debug_capture_action.triggered.connect(self.save_ocr_debug_captures)
+        tools_menu.addAction(debug_capture_action)
+        
         # Help menu
         help_menu = menubar.addMenu("Help")
         
@@ -199,6 +208,8 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         
         # Add permanent widgets
+        self.ocr_status_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.ocr_status_label)
         self.status_label = QLabel("Ready")
         self.status_bar.addPermanentWidget(self.status_label)
         
@@ -246,6 +257,15 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'execution_widget'):
             self.execution_widget.reload_settings()
     
+    def save_ocr_debug_captures(self):
+        """Flush the OCR debug capture buffer to disk"""
+        from vision.debug_capture import get_debug_capture
+        debug_capture = get_debug_capture()
+        if debug_capture.flush("request") is None:
+            self.status_bar.showMessage("저장할 OCR 디버그 캡처가 없습니다", 3000)
+        else:
+            self.status_bar.showMessage(f"OCR 디버그 캡처 저장 중: {debug_capture.directory}", 5000)
+        
     def reinstall_ocr(self):
         """Reinstall OCR components"""
         from utils.ocr_manager import OCRManager, OCRStatus
@@ -731,6 +751,29 @@ class MainWindow(QMainWindow):
         super().showEvent(event)
         if self.tray_manager:
             self.tray_manager.set_main_window_visible(True)
+        if not getattr(self, '_ocr_warmup_started', False):
+            self._ocr_warmup_started = True
+            # Let the window paint first, then load OCR models in the background
+            QTimer.singleShot(0, self._start_ocr_warmup)
+            
+    def _start_ocr_warmup(self):
+        """Start loading and warming up OCR models on a background thread"""
+        if not self.settings.get("ocr.warmup_on_start", True):
+            return
+        try:
+            from vision.ocr_warmup import get_ocr_warmup
+        except ImportError as e:
+            self.logger.warning(f"OCR warm-up not available: {e}")
+            return
+        self.ocrWarmupProgress.connect(self._on_ocr_warmup_progress)
+        warmup = get_ocr_warmup()
+        warmup.add_listener(self.ocrWarmupProgress.emit)
+        warmup.start()
+        
+    def _on_ocr_warmup_progress(self, percent: int, message: str):
+        """Show OCR loading progress in the status bar"""
+        self.ocr_status_label.setText(message if percent >= 100 else f"OCR 준비 중 {percent}%")
+        self.ocr_status_label.setToolTip(message)
             
     def hideEvent(self, event):
         """Handle window hide event"""
@@ -34,8 +34,10 @@ class StepPaletteItem(QListWidgetItem):
             StepType.KEYBOARD_HOTKEY: "단축키 입력 동작을 추가합니다",
             StepType.WAIT_TIME: "지정된 시간만큼 대기합니다",
             StepType.WAIT_IMAGE: "이미지가 나타날 때까지 대기합니다",
+            StepType.WAIT_TEXT: "텍스트가 나타날 때까지 대기합니다",
             StepType.IMAGE_SEARCH: "화면에서 이미지를 검색합니다",
             StepType.OCR_TEXT: "화면에서 텍스트를 검색하고 클릭합니다",
+            StepType.TEXT_ANCHOR: "라벨 옆의 값을 읽거나 클릭합니다 (OCR 한 번)",
             StepType.SCREENSHOT: "화면을 캡처합니다",
             StepType.IF_CONDITION: "조건문을 추가합니다",
             StepType.LOOP: "반복문을 추가합니다"
@@ -77,8 +79,10 @@ class StepPalette(QListWidget):
             (StepType.KEYBOARD_HOTKEY, "단축키", "⌘"),
             (StepType.WAIT_TIME, "대기", "⏱️"),
             (StepType.WAIT_IMAGE, "이미지 대기", "🖼️"),
+            (StepType.WAIT_TEXT, "텍스트 대기", "⏳"),
             (StepType.IMAGE_SEARCH, "이미지 검색", "🔍"),
             (StepType.OCR_TEXT, "텍스트 검색", "🔤"),
+            (StepType.TEXT_ANCHOR, "라벨 옆 값 읽기", "🏷️"),
             (StepType.SCREENSHOT, "화면 캡처", "📷"),
         ]
         
@@ -258,8 +262,10 @@ class MacroStepWidget(QFrame):
             StepType.KEYBOARD_HOTKEY: "⌘",
             StepType.WAIT_TIME: "⏱️",
             StepType.WAIT_IMAGE: "🖼️",
+            StepType.WAIT_TEXT: "⏳",
             StepType.IMAGE_SEARCH: "🔍",
             StepType.OCR_TEXT: "🔤",
+            StepType.TEXT_ANCHOR: "🏷️",
             StepType.SCREENSHOT: "📷",
             StepType.IF_CONDITION: "❓",
             StepType.LOOP: "🔄",
@@ -309,6 +315,24 @@ class MacroStepWidget(QFrame):
             if hasattr(self.step, 'seconds'):
                 details.append(f"대기: {self.step.seconds}초")
                 
+        elif self.step.step_type == StepType.WAIT_TEXT:
+            if self.step.search_text:
+                text_preview = self.step.search_text[:20] + "..." if len(self.step.search_text) > 20 else self.step.search_text
+                details.append(f"텍스트: {text_preview}")
+            details.append(f"대기시간: {self.step.timeout}초")
+            if self.step.region:
+                details.append("✓ 영역 지정됨")
+                
+        elif self.step.step_type == StepType.TEXT_ANCHOR:
+            if self.step.search_text:
+                text_preview = self.step.search_text[:20] + "..." if len(self.step.search_text) > 20 else self.step.search_text
+                details.append(f"라벨: {text_preview}")
+            details.append(f"위치: {self.step.query}")
+            if self.step.output_variable:
+                details.append(f"저장: ${{{self.step.output_variable}}}")
+            if self.step.click_on_found:
+                details.append("✓ 값 클릭")
+                
         elif self.step.step_type == StepType.OCR_TEXT:
             if hasattr(self.step, 'excel_column') and self.step.excel_column:
                 details.append(f"엑셀 열: {self.step.excel_column}")
@@ -631,6 +655,7 @@ class MacroFlowWidget(QWidget):
                     step.timeout = step_data['timeout']
                     step.confidence = step_data['confidence']
                     step.region = step_data['region']
+                    step.match_mode = step_data.get('match_mode', 'standard')
                     self._rebuild_ui()
                     self.stepEdited.emit(step)
                     
@@ -647,6 +672,7 @@ class MacroFlowWidget(QWidget):
                     step.click_on_found = step_data.get('click_on_found', True)
                     step.click_offset = step_data.get('click_offset', (0, 0))
                     step.double_click = step_data.get('double_click', False)
+                    step.match_mode = step_data.get('match_mode', 'standard')
                     # Save action configurations
                     step.on_found = step_data.get('on_found')
                     step.on_not_found = step_data.get('on_not_found')
@@ -691,6 +717,7 @@ class MacroFlowWidget(QWidget):
                     step.click_offset = step_data['click_offset']
                     step.double_click = step_data.get('double_click', False)
                     step.normalize_text = step_data.get('normalize_text', False)
+                    step.ocr_mode = step_data.get('ocr_mode', 'auto')
                     # Save action configurations
                     step.on_found = step_data.get('on_found')
                     step.on_not_found = step_data.get('on_not_found')
@@ -831,6 +858,32 @@ class MacroFlowWidget(QWidget):
                     self._rebuild_ui()
                     self.stepEdited.emit(step)
                     
+            elif step.step_type == StepType.WAIT_TEXT:
+                from ui.dialogs.wait_text_step_dialog import WaitTextStepDialog
+                dialog = WaitTextStepDialog(step, parent=self)
+                if dialog.exec_() == QDialog.Accepted:
+                    step_data = dialog.get_step_data()
+                    step.name = step_data['name']
+                    step.search_text = step_data['search_text']
+                    step.region = step_data['region']
+                    step.monitor_info = step_data['monitor_info']
+                    step.timeout = step_data['timeout']
+                    step.exact_match = step_data['exact_match']
+                    step.confidence = step_data['confidence']
+                    step.ocr_mode = step_data['ocr_mode']
+                    self._rebuild_ui()
+                    self.stepEdited.emit(step)
+                    
+            elif step.step_type == StepType.TEXT_ANCHOR:
+                from ui.dialogs.text_anchor_step_dialog import TextAnchorStepDialog
+                dialog = TextAnchorStepDialog(step, parent=self)
+                if dialog.exec_() == QDialog.Accepted:
+                    step_data = dialog.get_step_data()
+                    for key, value in step_data.items():
+                        setattr(step, key, value)
+                    self._rebuild_ui()
+                    self.stepEdited.emit(step)
+                    
             elif step.step_type == StepType.SCREENSHOT:
                 from ui.dialogs.screenshot_step_dialog import ScreenshotStepDialog
                 dialog = ScreenshotStepDialog(step, parent=self)
@@ -1023,8 +1076,10 @@ class MacroFlowWidget(QWidget):
                     StepType.KEYBOARD_HOTKEY: "단축키",
                     StepType.WAIT_TIME: "대기",
                     StepType.WAIT_IMAGE: "이미지 대기",
+                    StepType.WAIT_TEXT: "텍스트 대기",
                     StepType.IMAGE_SEARCH: "이미지 검색",
                     StepType.OCR_TEXT: "텍스트 검색",
+                    StepType.TEXT_ANCHOR: "라벨 옆 값 읽기",
                     StepType.SCREENSHOT: "화면 캡처",
                     StepType.IF_CONDITION: "조건문",
                     StepType.LOOP: "반복문",
@@ -7,11 +7,11 @@ from PyQt5.QtWidgets import QWidget, QApplication, QLabel, QVBoxLayout, QDialog
 from PyQt5.QtCore import Qt, QRect, QPoint, pyqtSignal, QTimer
 from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QPixmap, QFont, QCursor, QPalette
 import sys
-import mss
 from datetime import datetime
 import os
 from pathlib import Path
 from utils.coordinate_utils import get_converter
+from vision.screen_capture import get_screen_capture
 
 class ROISelectorOverlay(QDialog):
     """Transparent overlay for ROI selection"""
@@ -30,9 +30,9 @@ class ROISelectorOverlay(QDialog):
         self.selection_rect = QRect()
         self.monitor_bounds = monitor_bounds  # Restrict to specific monitor if provided
         
-        # mss instance for consistent coordinate system
-        self.sct = mss.mss()
-        self.monitors = self.sct.monitors
+        # Shared capture service for a consistent coordinate system
+        self.capture = get_screen_capture()
+        self.monitors = self.capture.monitors
         self.virtual_monitor = self.monitors[0]  # Combined virtual screen
         
         # Coordinate converter for DPI handling
@@ -332,13 +332,15 @@ class ROISelectorOverlay(QDialog):
             debug_dir.mkdir(parents=True, exist_ok=True)
             
             # Capture the region
-            monitor = {"left": x, "top": y, "width": w, "height": h}
-            screenshot = self.sct.grab(monitor)
+            import cv2
+            frame = self.capture.grab((x, y, w, h), max_age_ms=0)
             
             # Save with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = debug_dir / f"roi_preview_{timestamp}.png"
-            mss.tools.to_png(screenshot.rgb, screenshot.size, output=str(filename))
+            ok, encoded = cv2.imencode(".png", frame.bgr())
+            if ok:
+                encoded.tofile(str(filename))
             
             print(f"DEBUG: ROI preview saved to {filename}")
             
@@ -350,8 +352,6 @@ class ROISelectorOverlay(QDialog):
         print("DEBUG: ROI close() called")
         self.releaseMouse()
         self.releaseKeyboard()
-        if hasattr(self, 'sct'):
-            self.sct.close()
         self.accept()  # Close the dialog properly
 
 class ROISelectorWidget(QWidget):
@@ -431,24 +431,14 @@ class ROISelectorWidget(QWidget):
             
         try:
             # Capture the selected region
-            import mss
-            import numpy as np
             from PIL import Image
             
-            with mss.mss() as sct:
-                monitor = {
-                    "left": self.current_region[0],
-                    "top": self.current_region[1],
-                    "width": self.current_region[2],
-                    "height": self.current_region[3]
-                }
-                
-                screenshot = sct.grab(monitor)
-                img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-                
-                # Convert to QPixmap
-                qpixmap = QPixmap.fromImage(self._pil_to_qimage(img))
-                self.preview_label.setPixmap(qpixmap)
+            frame = get_screen_capture().grab(tuple(self.current_region), max_age_ms=0)
+            img = Image.fromarray(frame.rgb())
+            
+            # Convert to QPixmap
+            qpixmap = QPixmap.fromImage(self._pil_to_qimage(img))
+            self.preview_label.setPixmap(qpixmap)
                 
         except Exception as e:
             self.info_label.setText(f"Preview error: {str(e)}")
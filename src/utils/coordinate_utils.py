@@ -3,7 +3,6 @@ Coordinate system utilities for handling multi-monitor environments
 """
 
 from typing import Tuple, Dict, Optional, List
-import mss
 from logger.app_logger import get_logger
 from PyQt5.QtWidgets import QApplication
 import ctypes
@@ -15,8 +14,9 @@ class CoordinateConverter:
     """Handles coordinate conversion between different systems with DPI awareness"""
     
     def __init__(self):
-        self.sct = mss.mss()
-        self.monitors = self.sct.monitors
+        # Monitor layout comes from the active capture backend (live, Xvfb or replay)
+        from vision.screen_capture import get_screen_capture
+        self.monitors = get_screen_capture().monitors
         self.virtual_monitor = self.monitors[0] if self.monitors else None
         self._dpi_scale = None
         
@@ -227,8 +227,7 @@ class CoordinateConverter:
     
     def close(self):
         """Clean up resources"""
-        if hasattr(self, 'sct'):
-            self.sct.close()
+        # The shared capture service owns the backend
 
 
 # Global instance for convenience
@@ -61,11 +61,11 @@ class OCRManager:
         if not self.is_installed():
             return False
         
-        # PaddleOCR 확인
+        # PaddleOCR 확인 (설치 여부만 - 임포트는 수 초 걸림)
         try:
-            import paddleocr
-            return True
-        except ImportError:
+            import importlib.util
+            return importlib.util.find_spec("paddleocr") is not None
+        except (ImportError, ValueError):
             return False
     
     def set_status(self, status: str):
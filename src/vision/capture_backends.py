@@ -0,0 +1,358 @@
+"""
+Screen capture backends used by ScreenCapture
+
+Every backend returns BGRA ``uint8`` arrays in virtual-desktop coordinates and
+an mss-style monitor list (index 0 is the combined virtual desktop).
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, List, Dict, Any
+import numpy as np
+from logger.app_logger import get_logger
+
+Region = Tuple[int, int, int, int]  # x, y, width, height
+
+BACKEND_MSS = "mss"
+BACKEND_XSHM = "xshm"
+BACKEND_REPLAY = "replay"
+
+
+class CaptureBackend:
+    """Interface for screen grabbers"""
+
+    name = "base"
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        raise NotImplementedError
+
+    def grab(self, region: Region) -> np.ndarray:
+        """BGRA pixels of ``region``; may be a read-only view"""
+        raise NotImplementedError
+
+    def set_step(self, index: int):
+        """Called when the executor starts a new step (used by replay/recording)"""
+
+    def close(self):
+        """Release resources held by the calling thread"""
+
+
+class MssBackend(CaptureBackend):
+    """Live desktop capture with one long-lived ``mss`` instance per thread"""
+
+    name = BACKEND_MSS
+
+    def __init__(self, **mss_kwargs):
+        self._mss_kwargs = mss_kwargs
+        self._local = threading.local()
+
+    def _create(self):
+        import mss
+        return mss.mss(**self._mss_kwargs)
+
+    def _get_sct(self):
+        """Per-thread mss instance (mss handles are not thread-safe)"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = self._create()
+            self._local.sct = sct
+        return sct
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        return self._get_sct().monitors
+
+    def grab(self, region: Region) -> np.ndarray:
+        x, y, w, h = region
+        shot = self._get_sct().grab({"left": x, "top": y, "width": w, "height": h})
+        # Wrap the mss buffer without copying
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        bgra.flags.writeable = False
+        return bgra
+
+    def close(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+class XShmBackend(MssBackend):
+    """X11 capture for Xvfb/headless displays
+
+    Uses mss' Linux grabber bound to an explicit display (``$DISPLAY`` by
+    default, e.g. ``:99`` under Xvfb), which reads the framebuffer through the
+    MIT-SHM (XShm) extension when the server offers it.
+    """
+
+    name = BACKEND_XSHM
+
+    def __init__(self, display: Optional[str] = None):
+        super().__init__()
+        self.display = display or os.environ.get("DISPLAY", ":0")
+
+    def _create(self):
+        from mss.linux import MSS
+        return MSS(display=self.display)
+
+
+class ReplayBackend(CaptureBackend):
+    """Serves recorded frames instead of the live desktop
+
+    ``source`` is either a directory of PNG files (served in name order) or a
+    session recorded by RecordingBackend (``session.jsonl`` manifest with the
+    step index, timestamp and region of every frame, one JSON line each).
+
+    Modes:
+        sequence: every grab advances to the next frame (loops at the end)
+        step: frame recorded for the current step index (``set_step``)
+        time: frame whose timestamp matches the time elapsed since the replay started
+        static: always the first frame
+    """
+
+    name = BACKEND_REPLAY
+    MODES = ("sequence", "step", "time", "static")
+
+    def __init__(self, source: str, mode: str = "step", loop: bool = True,
+                 max_cached_frames: int = 8):
+        self.logger = get_logger(__name__)
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.source = Path(source)
+        self.mode = mode
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._entries = self._load_entries()
+        if not self._entries:
+            raise ValueError(f"No frames to replay in {source}")
+        self.max_cached_frames = max(1, max_cached_frames)
+        self._images: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._position = 0
+        self._step = 0
+        self._start = time.perf_counter()
+
+        first = self._image(self._entries[0])
+        left, top = self._entries[0].get('region', (0, 0))[:2]
+        desktop = {"left": left, "top": top, "width": first.shape[1], "height": first.shape[0]}
+        self._monitors = [desktop, dict(desktop)]
+
+    def _load_entries(self) -> List[Dict[str, Any]]:
+        manifest = self.source / RecordingBackend.MANIFEST
+        if manifest.exists():
+            entries = []
+            with open(manifest, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entries.append(json.loads(line))
+            return sorted(entries, key=lambda e: e.get('index', 0))
+        legacy = self.source / "session.json"
+        if legacy.exists():
+            return json.loads(legacy.read_text(encoding='utf-8'))['frames']
+        files = sorted(p for p in self.source.iterdir() if p.suffix.lower() == '.png')
+        return [{'file': p.name, 'step': i, 'timestamp': float(i)} for i, p in enumerate(files)]
+
+    def _image(self, entry: Dict[str, Any]) -> np.ndarray:
+        """Decoded frame; only the most recently used frames stay in memory"""
+        with self._lock:
+            image = self._images.get(entry['file'])
+            if image is not None:
+                self._images.move_to_end(entry['file'])
+                return image
+        import cv2
+        data = np.fromfile(str(self.source / entry['file']), dtype=np.uint8)
+        decoded = cv2.imdecode(data, cv2.IMREAD_UNCHANGED)
+        if decoded is None:
+            raise ValueError(f"Failed to load replay frame: {entry['file']}")
+        if decoded.ndim == 2:
+            image = cv2.cvtColor(decoded, cv2.COLOR_GRAY2BGRA)
+        elif decoded.shape[2] == 3:
+            image = cv2.cvtColor(decoded, cv2.COLOR_BGR2BGRA)
+        else:
+            image = decoded
+        image.flags.writeable = False
+        with self._lock:
+            self._images[entry['file']] = image
+            self._images.move_to_end(entry['file'])
+            while len(self._images) > self.max_cached_frames:
+                self._images.popitem(last=False)
+        return image
+
+    def _current_entry(self) -> Dict[str, Any]:
+        entries = self._entries
+        if self.mode == "static":
+            return entries[0]
+        if self.mode == "sequence":
+            with self._lock:
+                index = self._position
+                self._position += 1
+            if index >= len(entries):
+                index = index % len(entries) if self.loop else len(entries) - 1
+            return entries[index]
+        if self.mode == "time":
+            elapsed = time.perf_counter() - self._start
+            base = entries[0].get('timestamp', 0.0)
+            chosen = entries[0]
+            for entry in entries:
+                if entry.get('timestamp', 0.0) - base <= elapsed:
+                    chosen = entry
+                else:
+                    break
+            return chosen
+        # step: last frame recorded at or before the current step
+        chosen = entries[0]
+        for entry in entries:
+            if entry.get('step', 0) <= self._step:
+                chosen = entry
+            else:
+                break
+        return chosen
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        return self._monitors
+
+    def grab(self, region: Region) -> np.ndarray:
+        entry = self._current_entry()
+        image = self._image(entry)
+        left, top = entry.get('region', (0, 0))[:2]
+        x, y, w, h = region
+        x0, y0 = x - left, y - top
+        if 0 <= x0 and 0 <= y0 and x0 + w <= image.shape[1] and y0 + h <= image.shape[0]:
+            return image[y0:y0 + h, x0:x0 + w]
+        # Region outside the recorded frame: pad with black like an empty screen
+        out = np.zeros((h, w, 4), dtype=np.uint8)
+        sx0, sy0 = max(0, x0), max(0, y0)
+        sx1, sy1 = min(image.shape[1], x0 + w), min(image.shape[0], y0 + h)
+        if sx1 > sx0 and sy1 > sy0:
+            out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = image[sy0:sy1, sx0:sx1]
+        out.flags.writeable = False
+        return out
+
+    def set_step(self, index: int):
+        self._step = index
+
+    def rewind(self):
+        """Start the replay again from the first frame"""
+        with self._lock:
+            self._position = 0
+            self._step = 0
+            self._start = time.perf_counter()
+
+
+class RecordingBackend(CaptureBackend):
+    """Wraps another backend and records every grabbed frame for later replay
+
+    Frames are handed to a single writer thread, which PNG-encodes them and
+    appends one manifest line per frame, so grabbing stays as cheap as the
+    wrapped backend. The queue is bounded; when the writer falls that far
+    behind, grabs wait for it rather than holding unbounded frames in memory.
+    """
+
+    name = "recording"
+    MANIFEST = "session.jsonl"
+
+    def __init__(self, inner: CaptureBackend, output_dir: str, max_pending: int = 64):
+        self.logger = get_logger(__name__)
+        self.inner = inner
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], np.ndarray]]]" = \
+            queue.Queue(maxsize=max(1, max_pending))
+        self._writer: Optional[threading.Thread] = None
+        self._count = 0
+        self._step = 0
+        self._start = time.perf_counter()
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        return self.inner.monitors
+
+    def grab(self, region: Region) -> np.ndarray:
+        bgra = self.inner.grab(region)
+        with self._lock:
+            self._ensure_writer()
+            index = self._count
+            self._count += 1
+            entry = {
+                'index': index,
+                'file': f"frame_{index:05d}.png",
+                'step': self._step,
+                'timestamp': round(time.perf_counter() - self._start, 4),
+                'region': list(region),
+            }
+            # Enqueued under the lock so flush() cannot slip its stop marker
+            # between numbering a frame and handing it to the writer
+            self._queue.put((entry, bgra))
+        return bgra
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop,
+                                            name="CaptureRecorder", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        import cv2
+        with open(self.output_dir / self.MANIFEST, 'a', encoding='utf-8') as manifest:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                entry, bgra = item
+                try:
+                    ok, encoded = cv2.imencode(".png", bgra)
+                    if not ok:
+                        raise ValueError("PNG encoding failed")
+                    encoded.tofile(str(self.output_dir / entry['file']))
+                    manifest.write(json.dumps(entry) + "\n")
+                    manifest.flush()
+                except Exception as e:
+                    self.logger.warning(f"Failed to record frame: {e}")
+
+    def flush(self):
+        """Wait until every grabbed frame is on disk"""
+        with self._lock:
+            writer = self._writer
+            self._writer = None
+            if writer is not None and writer.is_alive():
+                self._queue.put(None)
+                writer.join()
+
+    def set_step(self, index: int):
+        self._step = index
+        self.inner.set_step(index)
+
+    def close(self):
+        self.flush()
+        self.inner.close()
+
+
+def create_backend(name: str = BACKEND_MSS, **options) -> CaptureBackend:
+    """Build a capture backend by name
+
+    Args:
+        name: "mss", "xshm" or "replay"
+        options: ``display`` for xshm; ``source``, ``mode``, ``loop`` and
+            ``cache_frames`` for replay; ``record_dir`` wraps the backend in a RecordingBackend
+    """
+    record_dir = options.pop('record_dir', None)
+    if name == BACKEND_REPLAY:
+        backend = ReplayBackend(options['source'], options.get('mode', 'step'),
+                                options.get('loop', True), options.get('cache_frames', 8))
+    elif name == BACKEND_XSHM:
+        backend = XShmBackend(options.get('display'))
+    elif name == BACKEND_MSS:
+        backend = MssBackend()
+    else:
+        raise ValueError(f"Unknown capture backend: {name}")
+    if record_dir:
+        backend = RecordingBackend(backend, record_dir)
+    return backend
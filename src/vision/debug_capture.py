@@ -0,0 +1,194 @@
+"""
+Debug capture of OCR input frames
+
+Every OCR input goes into an in-memory ring buffer of the most recent crops
+instead of straight to disk. The buffer is written out (PNG plus a JSON
+sidecar with the recognized text) on a background thread only when a step
+fails or a flush is requested; a configurable share of calls is sampled to
+disk as well.
+"""
+
+import json
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Tuple, Any
+import numpy as np
+from logger.app_logger import get_logger
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+@dataclass
+class CaptureEntry:
+    """One recorded OCR input"""
+    prefix: str
+    region: Tuple[int, int, int, int]
+    captured_at: datetime
+    image: np.ndarray                   # BGRA copy of the crop
+    sequence: int = 0                   # keeps file names unique within a millisecond
+    results: Optional[List[Any]] = None  # TextResult list once OCR finished
+    error: Optional[str] = None
+    written: bool = False
+
+
+class DebugCapture:
+    """Ring buffer of recent OCR crops, written to disk on failure or request"""
+
+    def __init__(self, capacity: int = 20, max_mb: float = 64, sample_rate: float = 0.0,
+                 directory: str = "debug/ocr_regions", png_compression: int = 6, enabled: bool = True):
+        """
+        Args:
+            capacity: Crops kept in memory
+            max_mb: Memory limit of the kept crops (oldest are dropped first)
+            sample_rate: Share of OCR calls written to disk without a failure (0..1)
+            directory: Output folder
+            png_compression: PNG compression level 0-9 (encoding runs in the background)
+            enabled: Record at all
+        """
+        self.logger = get_logger(__name__)
+        self.capacity = max(1, int(capacity))
+        self.max_bytes = int(max_mb * (1 << 20))
+        self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self.directory = Path(directory)
+        self.png_compression = int(png_compression)
+        self.enabled = enabled
+        self._entries: deque = deque()
+        self._bytes = 0
+        self._sample_credit = 0.0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    def record(self, frame, prefix: str = "debug") -> Optional[CaptureEntry]:
+        """Keep a copy of an OCR input frame (the frame itself may be a view of a larger capture)"""
+        if not self.enabled:
+            return None
+        entry = CaptureEntry(prefix, frame.region, datetime.now(), np.array(frame.bgra, copy=True),
+                             sequence=next(self._sequence))
+        with self._lock:
+            self._entries.append(entry)
+            self._bytes += entry.image.nbytes
+            while self._entries and (len(self._entries) > self.capacity or self._bytes > self.max_bytes):
+                self._bytes -= self._entries.popleft().image.nbytes
+        return entry
+
+    def finish(self, entry: Optional[CaptureEntry], results: Optional[List[Any]] = None,
+               error: Optional[str] = None):
+        """Attach the outcome of an OCR call; errors flush the buffer, other calls are sampled"""
+        if entry is None:
+            return
+        entry.results = results
+        entry.error = error
+        if error is not None:
+            self.flush(f"error: {error}")
+            return
+        if self.sample_rate <= 0:
+            return
+        with self._lock:
+            # 결정적 샘플링: sample_rate 0.1이면 10번에 한 번
+            self._sample_credit += self.sample_rate
+            if self._sample_credit < 1.0 or entry.written:
+                return
+            self._sample_credit -= 1.0
+            entry.written = True
+        self._submit([entry], "sample")
+
+    def flush(self, reason: str = "request") -> Optional[Future]:
+        """Write every buffered crop not written yet
+
+        Returns:
+            Future of the background write, or None if there was nothing to write
+        """
+        with self._lock:
+            pending = [e for e in self._entries if not e.written]
+            for entry in pending:
+                entry.written = True
+        if not pending:
+            return None
+        self.logger.info(f"디버그 캡처 {len(pending)}개 저장 ({reason})")
+        return self._submit(pending, reason)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _submit(self, entries: List[CaptureEntry], reason: str) -> Future:
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DebugCapture")
+            writer = self._writer
+        return writer.submit(self._write, entries, reason)
+
+    def _write(self, entries: List[CaptureEntry], reason: str) -> List[Path]:
+        """Encode and write entries (background thread)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        for entry in entries:
+            x, y, width, height = entry.region
+            timestamp = entry.captured_at.strftime("%Y%m%d_%H%M%S_%f")[:-3]  # 밀리초 포함
+            name = f"{entry.prefix}_{timestamp}_{entry.sequence % 10000:04d}_x{x}_y{y}_{width}x{height}.png"
+            path = self.directory / name
+            try:
+                if cv2 is not None:
+                    cv2.imwrite(str(path), entry.image, [cv2.IMWRITE_PNG_COMPRESSION, self.png_compression])
+                else:
+                    from PIL import Image
+                    Image.fromarray(entry.image[:, :, [2, 1, 0, 3]]).save(
+                        str(path), compress_level=self.png_compression)
+                path.with_suffix(".json").write_text(
+                    json.dumps(self._describe(entry, reason), ensure_ascii=False, indent=2), encoding="utf-8")
+                written.append(path)
+            except Exception as e:
+                self.logger.error(f"디버그 캡처 저장 실패: {path} ({e})")
+        if written:
+            self.logger.info(f"디버그 캡처 저장: {written[0].parent} ({len(written)}개)")
+        return written
+
+    @staticmethod
+    def _describe(entry: CaptureEntry, reason: str) -> dict:
+        """Sidecar metadata (the results are only formatted here, when written)"""
+        return {
+            "reason": reason,
+            "region": list(entry.region),
+            "captured_at": entry.captured_at.isoformat(timespec="milliseconds"),
+            "error": entry.error,
+            "results": None if entry.results is None else [
+                {"text": r.text, "confidence": round(float(r.confidence), 4), "bbox": list(r.bbox)}
+                for r in entry.results],
+        }
+
+
+# 전역 디버그 캡처
+_debug_capture = None
+
+
+def get_debug_capture() -> DebugCapture:
+    """Get global debug capture (configured from the debug_capture settings on first call)"""
+    global _debug_capture
+    if _debug_capture is None:
+        options = {}
+        try:
+            from config.settings import Settings
+            options = Settings().get("debug_capture", {}) or {}
+        except Exception:
+            pass
+        _debug_capture = DebugCapture(
+            capacity=options.get("capacity", 20),
+            max_mb=options.get("max_mb", 64),
+            sample_rate=options.get("sample_rate", 0.0),
+            directory=options.get("directory", "debug/ocr_regions"),
+            png_compression=options.get("png_compression", 6),
+            enabled=options.get("enabled", True))
+    return _debug_capture
@@ -0,0 +1,148 @@
+"""
+Per-template history of image match locations
+"""
+
+import json
+import time
+import atexit
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, List, Dict, Any
+from logger.app_logger import get_logger
+
+Region = Tuple[int, int, int, int]  # x, y, width, height
+
+
+class HitHistory:
+    """Remembers where each template was found
+
+    The last hit is used as a search prior (probe a small window there first)
+    and the hit distribution backs the "suggest region" report. History is
+    persisted as JSON so the prior survives restarts.
+    """
+
+    def __init__(self, history_file: Optional[Path] = None, max_hits: int = 50,
+                 save_interval: float = 5.0):
+        """
+        Args:
+            history_file: JSON file, defaults to ~/.excel_macro_automation/image_hit_history.json
+            max_hits: Hits kept per template
+            save_interval: Minimum seconds between automatic saves
+        """
+        self.logger = get_logger(__name__)
+        self.history_file = history_file or Path.home() / ".excel_macro_automation" / "image_hit_history.json"
+        self.max_hits = max_hits
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._hits: Dict[str, List[List[float]]] = self._load()
+        self._dirty = False
+        self._last_save = 0.0
+        atexit.register(self.flush)
+
+    def _load(self) -> Dict[str, List[List[float]]]:
+        if self.history_file.exists():
+            try:
+                return json.loads(self.history_file.read_text(encoding='utf-8'))
+            except Exception as e:
+                self.logger.warning(f"Failed to load image hit history: {e}")
+        return {}
+
+    def record(self, key: str, location: Region):
+        """Store a hit (x, y, width, height) for a template"""
+        x, y, w, h = (int(v) for v in location)
+        with self._lock:
+            hits = self._hits.setdefault(key, [])
+            hits.append([x, y, w, h, round(time.time(), 1)])
+            if len(hits) > self.max_hits:
+                del hits[:-self.max_hits]
+            self._dirty = True
+            due = time.time() - self._last_save >= self.save_interval
+        if due:
+            self.flush()
+
+    def last_hit(self, key: str) -> Optional[Region]:
+        """Most recent hit location"""
+        hits = self._hits.get(key)
+        if not hits:
+            return None
+        x, y, w, h = hits[-1][:4]
+        return (int(x), int(y), int(w), int(h))
+
+    def probe_window(self, key: str, margin: int,
+                     bounds: Optional[Region] = None) -> Optional[Region]:
+        """Last hit grown by ``margin`` pixels and clipped to ``bounds``"""
+        last = self.last_hit(key)
+        if last is None:
+            return None
+        x, y, w, h = last
+        x0, y0, x1, y1 = x - margin, y - margin, x + w + margin, y + h + margin
+        if bounds is not None:
+            bx, by, bw, bh = bounds
+            x0, y0 = max(x0, bx), max(y0, by)
+            x1, y1 = min(x1, bx + bw), min(y1, by + bh)
+        if x1 - x0 < w or y1 - y0 < h:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def suggest_region(self, key: str, padding: int = 20, min_hits: int = 3) -> Optional[Region]:
+        """Smallest region covering every recorded hit, plus padding"""
+        hits = self._hits.get(key)
+        if not hits or len(hits) < min_hits:
+            return None
+        x0 = min(hit[0] for hit in hits) - padding
+        y0 = min(hit[1] for hit in hits) - padding
+        x1 = max(hit[0] + hit[2] for hit in hits) + padding
+        y1 = max(hit[1] + hit[3] for hit in hits) + padding
+        return (int(x0), int(y0), int(x1 - x0), int(y1 - y0))
+
+    def report(self, padding: int = 20) -> List[Dict[str, Any]]:
+        """Learned hit distribution per template"""
+        rows = []
+        for key, hits in self._hits.items():
+            last = hits[-1]
+            same_spot = sum(1 for hit in hits if abs(hit[0] - last[0]) <= 2 and abs(hit[1] - last[1]) <= 2)
+            rows.append({
+                'template': key,
+                'hits': len(hits),
+                'last_hit': tuple(int(v) for v in last[:4]),
+                'stability': same_spot / len(hits),
+                'suggested_region': self.suggest_region(key, padding),
+            })
+        rows.sort(key=lambda row: row['hits'], reverse=True)
+        return rows
+
+    def forget(self, key: Optional[str] = None):
+        """Drop history for one template or all templates"""
+        with self._lock:
+            if key is None:
+                self._hits.clear()
+            else:
+                self._hits.pop(key, None)
+            self._dirty = True
+        self.flush()
+
+    def flush(self):
+        """Write pending changes to disk"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._hits, ensure_ascii=False)
+            self._dirty = False
+            self._last_save = time.time()
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            self.history_file.write_text(data, encoding='utf-8')
+        except Exception as e:
+            self.logger.warning(f"Failed to save image hit history: {e}")
+
+
+# 전역 히스토리
+_hit_history = None
+
+
+def get_hit_history() -> HitHistory:
+    """Get global image hit history"""
+    global _hit_history
+    if _hit_history is None:
+        _hit_history = HitHistory()
+    return _hit_history
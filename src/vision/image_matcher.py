@@ -2,17 +2,30 @@
 OpenCV-based image matching engine with DPI scaling and multi-monitor support
 """
 
+import os
 import time
-from typing import Optional, Tuple, List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Tuple, List, Dict, Any, Sequence, Union
 from dataclasses import dataclass
 import numpy as np
 import cv2
 import pyautogui
 from PIL import Image
-import mss
 from pathlib import Path
 from config.settings import Settings
 from logger.app_logger import get_logger
+from vision.screen_capture import get_screen_capture, ScreenFrame
+from vision.hit_history import get_hit_history
+from vision.template_cache import get_template_cache
+from vision.template_optimizer import (
+    TemplateOptimizer, OptimizedTemplate, load_optimized, optimized_paths
+)
+from vision.polling import AdaptivePoller, FrameDiffer, WaitStats, search_windows
+from vision.template_matching import (
+    MATCH_MODE_STANDARD, MATCH_MODE_PYRAMID, match_best, match_pyramid,
+    pyramid_levels_for, build_pyramid, find_peaks, sort_reading_order
+)
 
 @dataclass
 class MatchResult:
@@ -22,6 +35,17 @@ class MatchResult:
     location: Optional[Tuple[int, int, int, int]] = None  # x, y, width, height
     center: Optional[Tuple[int, int]] = None  # center x, y
     
+@dataclass
+class ImageQuery:
+    """One template lookup in a batch"""
+    template_path: str
+    confidence: float = 0.9
+    region: Optional[Tuple[int, int, int, int]] = None  # sub-region of the shared frame
+    match_mode: str = MATCH_MODE_STANDARD
+    
+# Scale factors tried by multi-scale search (100% <-> 125% DPI and back)
+MULTI_SCALE_FACTORS = (0.8, 0.9, 1.0, 1.1, 1.2)
+
 @dataclass 
 class MonitorInfo:
     """Monitor information"""
@@ -38,17 +62,47 @@ class ImageMatcher:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.logger = get_logger(__name__)
-        self._template_cache: Dict[str, np.ndarray] = {}
-        self._sct = mss.mss()
+        self._template_cache = get_template_cache(
+            max_mb=settings.get("vision.template_cache_mb", 100),
+            use_disk=settings.get("vision.template_disk_cache", True)
+        )
+        self._capture = get_screen_capture()
+        self._capture.configure(settings.get("vision.capture_freshness_ms", 30.0))
+        self._configure_capture_backend()
         self._monitors = self._detect_monitors()
-        self._max_cache_size_mb = 100  # 캐시 크기 제한
-        self._cache_size = 0
+        # 템플릿별로 마지막에 일치한 배율 (다음 검색 시 먼저 시도)
+        self._preferred_scales: Dict[str, float] = {}
+        self._match_executor: Optional[ThreadPoolExecutor] = None
+        self._certain_confidence = settings.get("vision.multi_scale_certain", 0.97)
+        self.last_wait_stats: Optional[WaitStats] = None
+        # 마지막으로 찾은 위치 주변을 먼저 검색
+        self._hit_history = get_hit_history() if settings.get("vision.hit_prior", True) else None
+        self._probe_margin = settings.get("vision.hit_probe_margin", 32)
+        self.probe_stats = {'hits': 0, 'misses': 0}
+        self._stats_lock = threading.Lock()  # probes also run on the match thread pool
+        # 최적화된 템플릿 변형 (<name>.opt.png) 사용 여부
+        self._use_optimized = settings.get("vision.optimize_templates", True)
+        self._optimized: Dict[str, Tuple[Tuple[int, int], Optional[OptimizedTemplate]]] = {}
+        
+    def _configure_capture_backend(self):
+        """Apply vision.capture_backend (mss / xshm / replay) to the shared capture service"""
+        name = self.settings.get("vision.capture_backend", "mss")
+        options = {}
+        if name == "replay":
+            options['source'] = self.settings.get("vision.replay_source", "")
+            options['mode'] = self.settings.get("vision.replay_mode", "step")
+        elif name == "xshm" and self.settings.get("vision.xshm_display"):
+            options['display'] = self.settings.get("vision.xshm_display")
+        record_dir = self.settings.get("vision.record_session_dir", "")
+        if record_dir:
+            options['record_dir'] = record_dir
+        self._capture.configure_backend(name, **options)
         
     def _detect_monitors(self) -> List[MonitorInfo]:
         """Detect all monitors and their properties"""
         monitors = []
         
-        for i, monitor in enumerate(self._sct.monitors[1:], 1):  # Skip combined monitor
+        for i, monitor in enumerate(self._capture.monitors[1:], 1):  # Skip combined monitor
             info = MonitorInfo(
                 index=i,
                 left=monitor["left"],
@@ -92,22 +146,70 @@ class ImageMatcher:
         
         return str(path.absolute())
     
-    def _load_template(self, image_path: str, scale: float = 1.0) -> np.ndarray:
-        """Load and cache template image with scaling"""
-        # 경로 정규화
+    def _optimized_meta(self, image_path: str) -> Optional[OptimizedTemplate]:
+        """Up-to-date optimizer sidecar for a normalized template path"""
+        if not self._use_optimized:
+            return None
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        cached = self._optimized.get(image_path)
+        if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+            cached = ((stat.st_mtime_ns, stat.st_size), load_optimized(image_path))
+            self._optimized[image_path] = cached
+        meta = cached[1]
+        return meta if meta is not None and meta.is_cropped else None
+        
+    def _resolve_template_path(self, image_path: str) -> str:
+        """Normalized path of the image actually matched (optimized variant if present)"""
         image_path = self._normalize_path(image_path)
-        cache_key = f"{image_path}_{scale}"
+        if self._optimized_meta(image_path) is not None:
+            optimized_path = optimized_paths(image_path)[0]
+            if optimized_path.exists():
+                return str(optimized_path)
+        return image_path
+        
+    def _restore_original(self, template_path: str, scale: float, result: MatchResult) -> MatchResult:
+        """Map a match of an optimized patch back to the full template's box and center"""
+        if not result.found:
+            return result
+        meta = self._optimized_meta(self._normalize_path(template_path))
+        if meta is None:
+            return result
+        x, y, w, h = meta.restore_box(result.location[0], result.location[1], scale)
+        return MatchResult(found=True, confidence=result.confidence,
+                           location=(x, y, w, h), center=(x + w // 2, y + h // 2))
         
-        # 캐시 크기 확인
-        if self._cache_size > self._max_cache_size_mb * 1024 * 1024:
-            self.clear_cache()
+    def optimize_templates(self, image_paths: Sequence[str],
+                           reference: Optional[np.ndarray] = None) -> int:
+        """Build optimized variants for templates whose sidecar is missing or stale
         
-        if cache_key in self._template_cache:
-            return self._template_cache[cache_key]
+        Args:
+            image_paths: Template paths as stored in steps
+            reference: Grayscale screen for uniqueness checks (defaults to a fresh capture)
             
-        try:
-            # Load template
-            template = cv2.imread(image_path)
+        Returns:
+            Number of templates that now match through a smaller variant
+        """
+        if reference is None:
+            try:
+                reference = self._grab_frame(max_age_ms=0).gray()
+            except Exception as e:
+                self.logger.debug(f"No reference frame for template optimization: {e}")
+        paths = [self._normalize_path(p) for p in image_paths if p]
+        optimized = TemplateOptimizer().optimize_all(paths, reference)
+        self._optimized.clear()
+        return sum(1 for meta in optimized if meta.is_cropped)
+        
+    def _load_template(self, image_path: str, scale: float = 1.0) -> np.ndarray:
+        """Load and cache template image with scaling"""
+        # 경로 정규화 (최적화된 템플릿이 있으면 사용)
+        image_path = self._resolve_template_path(image_path)
+        
+        def build(data: bytes) -> np.ndarray:
+            # imdecode also handles non-ASCII paths that cv2.imread cannot open
+            template = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
             if template is None:
                 raise ValueError(f"Failed to load image: {image_path}")
                 
@@ -118,66 +220,215 @@ class ImageMatcher:
                 template = cv2.resize(template, (width, height), interpolation=cv2.INTER_LINEAR)
                 
             # Convert to grayscale for faster matching
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-            
-            # Cache the processed template
-            self._template_cache[cache_key] = template_gray
-            # Update cache size
-            self._cache_size += template_gray.nbytes
-            
-            return template_gray
-            
+            return cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        
+        try:
+            return self._template_cache.get(image_path, "gray", scale, build)
         except Exception as e:
             self.logger.error(f"Error loading template {image_path}: {e}")
             raise
             
-    def _capture_screen(self, region: Optional[Tuple[int, int, int, int]] = None,
-                       monitor_index: Optional[int] = None) -> np.ndarray:
-        """Capture screen or region"""
+    def _load_template_pyramid(self, image_path: str, scale: float, levels: int) -> List[np.ndarray]:
+        """Load template Gaussian pyramid (cached alongside the template)"""
+        return self._template_cache.get(
+            self._resolve_template_path(image_path), f"pyr{levels}", scale,
+            lambda data: build_pyramid(self._load_template(image_path, scale), levels)
+        )
+        
+    def _match(self, frame: ScreenFrame, screenshot: np.ndarray, template: np.ndarray,
+               template_path: str, scale: float,
+               match_mode: str = MATCH_MODE_STANDARD) -> Tuple[float, Tuple[int, int]]:
+        """Run the selected matching engine; returns (score, (x, y)) in frame coordinates"""
+        if match_mode == MATCH_MODE_PYRAMID and screenshot.ndim == 2:
+            levels = pyramid_levels_for(template.shape)
+            meta = self._optimized_meta(self._normalize_path(template_path))
+            if meta is not None and meta.pyramid_level is not None:
+                # Coarsest level verified to match uniquely by the optimizer
+                levels = min(levels, meta.pyramid_level)
+            if levels > 0:
+                return match_pyramid(
+                    screenshot, template, levels=levels,
+                    image_pyramid=frame.gray_pyramid(levels),
+                    template_pyramid=self._load_template_pyramid(template_path, scale, levels)
+                )
+        return match_best(screenshot, template)
+        
+    def _grab_frame(self, region: Optional[Tuple[int, int, int, int]] = None,
+                    monitor_index: Optional[int] = None,
+                    max_age_ms: Optional[float] = -1) -> ScreenFrame:
+        """Get a (possibly reused) frame for a region, monitor or the whole desktop"""
+        if not region and monitor_index is not None and 0 <= monitor_index < len(self._monitors):
+            mon_info = self._monitors[monitor_index]
+            region = (mon_info.left, mon_info.top, mon_info.width, mon_info.height)
         try:
-            if region:
-                # Capture specific region
-                monitor = {
-                    "left": region[0],
-                    "top": region[1], 
-                    "width": region[2],
-                    "height": region[3]
-                }
-            elif monitor_index is not None and 0 <= monitor_index < len(self._monitors):
-                # Capture specific monitor
-                mon_info = self._monitors[monitor_index]
-                monitor = {
-                    "left": mon_info.left,
-                    "top": mon_info.top,
-                    "width": mon_info.width,
-                    "height": mon_info.height
-                }
-            else:
-                # Capture all monitors
-                monitor = self._sct.monitors[0]
-                
-            # Capture screenshot
-            screenshot = self._sct.grab(monitor)
-            
-            # Convert to numpy array
-            img = np.array(screenshot)
-            
-            # Convert BGRA to BGR
-            img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-            
-            return img
-            
+            return self._capture.grab(region, max_age_ms=max_age_ms)
         except Exception as e:
             self.logger.error(f"Error capturing screen: {e}")
             raise
             
+    def _capture_screen(self, region: Optional[Tuple[int, int, int, int]] = None,
+                       monitor_index: Optional[int] = None) -> np.ndarray:
+        """Capture screen or region as a BGR image"""
+        return self._grab_frame(region, monitor_index).bgr()
+            
+    def _search_bounds(self, region: Optional[Tuple[int, int, int, int]],
+                       monitor_index: Optional[int]) -> Tuple[int, int, int, int]:
+        """Region that a search without prior would scan"""
+        if region:
+            return tuple(int(v) for v in region)
+        if monitor_index is not None and 0 <= monitor_index < len(self._monitors):
+            mon_info = self._monitors[monitor_index]
+            return (mon_info.left, mon_info.top, mon_info.width, mon_info.height)
+        return self._capture.virtual_region()
+        
+    def _probe_last_hit(self, template_path: str, template: np.ndarray, confidence: float,
+                        region: Optional[Tuple[int, int, int, int]],
+                        monitor_index: Optional[int], grayscale: bool,
+                        frame: Optional[ScreenFrame] = None) -> Optional[MatchResult]:
+        """Match only a small window around the template's last hit
+        
+        Returns the match if it clears ``confidence``, otherwise None so the
+        caller falls back to the full region. When ``frame`` is given the
+        window is cut from it instead of being captured.
+        """
+        if self._hit_history is None:
+            return None
+        key = self._normalize_path(template_path)
+        h, w = template.shape[:2]
+        last = self._hit_history.last_hit(key)
+        if last is None or last[2:] != (w, h):
+            return None
+        window = self._hit_history.probe_window(key, self._probe_margin,
+                                                self._search_bounds(region, monitor_index))
+        if window is None:
+            return None
+        
+        if frame is not None:
+            if not frame.contains(window):
+                return None
+            frame = frame.crop(window)
+        else:
+            frame = self._grab_frame(window)
+        screenshot = frame.gray() if grayscale else frame.bgr()
+        max_val, max_loc = match_best(screenshot, template)
+        if max_val < confidence:
+            with self._stats_lock:
+                self.probe_stats['misses'] += 1
+            return None
+        
+        with self._stats_lock:
+            self.probe_stats['hits'] += 1
+        result = self._to_result(frame, template, max_val, max_loc, confidence)
+        self._remember_hit(template_path, result)
+        return result
+        
+    def _remember_hit(self, template_path: str, result: MatchResult):
+        """Record a successful match in the template's hit history"""
+        if self._hit_history is not None and result.found:
+            self._hit_history.record(self._normalize_path(template_path), result.location)
+            
+    def suggest_region(self, template_path: str, padding: int = 20) -> Optional[Tuple[int, int, int, int]]:
+        """Search region covering every recorded hit of a template (None if too few hits)"""
+        return get_hit_history().suggest_region(self._normalize_path(template_path), padding)
+        
+    def get_hit_report(self, padding: int = 20) -> List[Dict[str, Any]]:
+        """Learned hit distribution for all templates"""
+        return get_hit_history().report(padding)
+        
+    def _get_match_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for scale variants and template batches (cv2 releases the GIL)"""
+        if self._match_executor is None:
+            workers = self.settings.get("vision.match_workers", 4)
+            self._match_executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                                      thread_name_prefix="image-match")
+        return self._match_executor
+        
+    def _find_multi_scale(self, template_path: str, confidence: float,
+                          region: Optional[Tuple[int, int, int, int]],
+                          monitor_index: Optional[int], grayscale: bool,
+                          base_scale: float, match_mode: str) -> MatchResult:
+        """Score all scale variants against a single captured frame
+        
+        The scale that matched this template last time is tried first; a score
+        above the "certain" threshold stops the search without waiting for the
+        remaining scales.
+        """
+        key = self._normalize_path(template_path)
+        preferred = self._preferred_scales.get(key, 1.0)
+        factors = sorted(MULTI_SCALE_FACTORS, key=lambda f: (f != preferred, abs(f - preferred)))
+        certain = max(confidence, self._certain_confidence)
+        
+        # Capture and convert once for every scale
+        frame = self._grab_frame(region, monitor_index)
+        screenshot = frame.gray() if grayscale else frame.bgr()
+        
+        # Templates are loaded up front so worker threads never touch the cache
+        templates = {}
+        for factor in factors:
+            try:
+                templates[factor] = self._load_template(template_path, base_scale * factor)
+                if match_mode == MATCH_MODE_PYRAMID:
+                    levels = pyramid_levels_for(templates[factor].shape)
+                    if levels > 0:
+                        self._load_template_pyramid(template_path, base_scale * factor, levels)
+                        frame.gray_pyramid(levels)
+            except Exception as e:
+                self.logger.debug(f"Skipping scale {factor}: {e}")
+        
+        if not templates:
+            return MatchResult(found=False, confidence=0.0)
+        
+        stop = threading.Event()
+        
+        def score(factor: float) -> Tuple[float, float, Tuple[int, int]]:
+            if stop.is_set():
+                return factor, 0.0, (0, 0)
+            max_val, max_loc = self._match(frame, screenshot, templates[factor], template_path,
+                                           base_scale * factor, match_mode)
+            return factor, max_val, max_loc
+        
+        ordered = [f for f in factors if f in templates]
+        
+        # Preferred scale first, on the calling thread
+        best = score(ordered[0])
+        if best[1] < certain and len(ordered) > 1:
+            futures = [self._get_match_executor().submit(score, f) for f in ordered[1:]]
+            try:
+                for future in as_completed(futures):
+                    candidate = future.result()
+                    if candidate[1] > best[1]:
+                        best = candidate
+                    if best[1] >= certain:
+                        break
+            finally:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+        
+        factor, max_val, (x, y) = best
+        if max_val < confidence:
+            return MatchResult(found=False, confidence=max_val)
+        
+        self._preferred_scales[key] = factor
+        self.logger.debug(f"Found match at scale {factor} with confidence {max_val}")
+        
+        result = self._to_result(frame, templates[factor], max_val, (x, y), confidence)
+        self._remember_hit(template_path, result)
+        return self._restore_original(template_path, base_scale * factor, result)
+            
     def find_image(self, template_path: str, 
                    confidence: float = 0.9,
                    region: Optional[Tuple[int, int, int, int]] = None,
                    monitor_index: Optional[int] = None,
                    grayscale: bool = True,
-                   multi_scale: bool = False) -> MatchResult:
-        """Find image on screen using template matching"""
+                   multi_scale: bool = False,
+                   match_mode: str = MATCH_MODE_STANDARD) -> MatchResult:
+        """Find image on screen using template matching
+        
+        Args:
+            match_mode: "standard" (full-resolution search) or "pyramid"
+                (coarse-to-fine search around the best downscaled candidates)
+        """
         
         try:
             # Determine scale factor
@@ -186,111 +437,114 @@ class ImageMatcher:
                 scale = self._monitors[monitor_index].scale
             
             if multi_scale:
-                # Multi-scale template matching
-                scales = [0.8, 0.9, 1.0, 1.1, 1.2]  # Scale factors to try
-                best_match = MatchResult(found=False, confidence=0.0)
-                
-                for scale_factor in scales:
-                    # Load template at current scale
-                    template = self._load_template(template_path, scale * scale_factor)
-                    
-                    # Capture screen
-                    screenshot = self._capture_screen(region, monitor_index)
-                    
-                    # Convert to grayscale if needed
-                    if grayscale:
-                        screenshot_gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-                    else:
-                        screenshot_gray = screenshot
-                    
-                    # Perform template matching
-                    result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
-                    
-                    # Find best match
-                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                    
-                    if max_val >= confidence and max_val > best_match.confidence:
-                        # Found better match
-                        h, w = template.shape[:2]
-                        x, y = max_loc
-                        
-                        # Adjust for region offset if applicable
-                        if region:
-                            x += region[0]
-                            y += region[1]
-                        elif monitor_index is not None:
-                            mon_info = self._monitors[monitor_index]
-                            x += mon_info.left
-                            y += mon_info.top
-                        
-                        location = (x, y, w, h)
-                        center = (x + w // 2, y + h // 2)
-                        
-                        best_match = MatchResult(
-                            found=True,
-                            confidence=max_val,
-                            location=location,
-                            center=center
-                        )
-                        
-                        self.logger.debug(f"Found match at scale {scale_factor} with confidence {max_val}")
-                
-                return best_match
+                return self._find_multi_scale(template_path, confidence, region, monitor_index,
+                                              grayscale, scale, match_mode)
             else:
                 # Single-scale template matching (original code)
                 # Load template
                 template = self._load_template(template_path, scale)
                 
-                # Capture screen
-                screenshot = self._capture_screen(region, monitor_index)
+                # Probe around the last hit before scanning the whole region
+                probe = self._probe_last_hit(template_path, template, confidence, region,
+                                             monitor_index, grayscale)
+                if probe is not None:
+                    return self._restore_original(template_path, scale, probe)
                 
-                # Convert to grayscale if needed
-                if grayscale:
-                    screenshot_gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-                else:
-                    screenshot_gray = screenshot
+                # Capture screen
+                frame = self._grab_frame(region, monitor_index)
+                screenshot_gray = frame.gray() if grayscale else frame.bgr()
                     
                 # Perform template matching
-                result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
-                
-                # Find best match
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+                max_val, max_loc = self._match(frame, screenshot_gray, template, template_path,
+                                               scale, match_mode)
                 
-                if max_val >= confidence:
-                    # Calculate absolute coordinates
-                    h, w = template.shape[:2]
-                    x, y = max_loc
-                    
-                    # Adjust for region offset if applicable
-                    if region:
-                        x += region[0]
-                        y += region[1]
-                    elif monitor_index is not None:
-                        mon_info = self._monitors[monitor_index]
-                        x += mon_info.left
-                        y += mon_info.top
-                        
-                    location = (x, y, w, h)
-                    center = (x + w // 2, y + h // 2)
-                    
-                    return MatchResult(
-                        found=True,
-                        confidence=max_val,
-                        location=location,
-                        center=center
-                    )
-                else:
-                    return MatchResult(found=False, confidence=max_val)
+                result = self._to_result(frame, template, max_val, max_loc, confidence)
+                self._remember_hit(template_path, result)
+                return self._restore_original(template_path, scale, result)
                 
         except Exception as e:
             self.logger.error(f"Error in find_image: {e}")
             return MatchResult(found=False, confidence=0.0)
             
+    def find_images_batch(self, templates: Sequence[Union[str, ImageQuery]],
+                          region: Optional[Tuple[int, int, int, int]] = None,
+                          confidence: float = 0.9,
+                          parallel: bool = True) -> List[MatchResult]:
+        """Match several templates against one captured frame
+        
+        Args:
+            templates: Template paths or ImageQuery objects (per-template
+                confidence, sub-region and match mode)
+            region: Capture region. Defaults to the bounding box of the query
+                regions, or the whole desktop if any query has no region.
+            confidence: Confidence for plain template paths
+            parallel: Match templates on the thread pool
+            
+        Returns:
+            One MatchResult per template, in input order
+        """
+        queries = [q if isinstance(q, ImageQuery) else ImageQuery(q, confidence) for q in templates]
+        if not queries:
+            return []
+        
+        if region is None and all(q.region for q in queries):
+            x0 = min(q.region[0] for q in queries)
+            y0 = min(q.region[1] for q in queries)
+            x1 = max(q.region[0] + q.region[2] for q in queries)
+            y1 = max(q.region[1] + q.region[3] for q in queries)
+            region = (x0, y0, x1 - x0, y1 - y0)
+        
+        try:
+            frame = self._grab_frame(region)
+            frame.gray()  # convert once, before fanning out
+        except Exception as e:
+            self.logger.error(f"Error in find_images_batch: {e}")
+            return [MatchResult(found=False, confidence=0.0) for _ in queries]
+        
+        def match(query: ImageQuery) -> MatchResult:
+            try:
+                template = self._load_template(query.template_path)
+                sub_frame = frame
+                if query.region:
+                    sub_region = tuple(int(v) for v in query.region)
+                    if not frame.contains(sub_region):
+                        # Query region outside the shared frame: search on its own
+                        return self.find_image(query.template_path, query.confidence,
+                                               sub_region, match_mode=query.match_mode)
+                    sub_frame = frame.crop(sub_region)
+                
+                probe = self._probe_last_hit(query.template_path, template, query.confidence,
+                                             sub_frame.region, None, True, frame=sub_frame)
+                if probe is not None:
+                    return self._restore_original(query.template_path, 1.0, probe)
+                
+                max_val, max_loc = self._match(sub_frame, sub_frame.gray(), template,
+                                               query.template_path, 1.0, query.match_mode)
+                result = self._to_result(sub_frame, template, max_val, max_loc, query.confidence)
+                self._remember_hit(query.template_path, result)
+                return self._restore_original(query.template_path, 1.0, result)
+            except Exception as e:
+                self.logger.error(f"Error matching {query.template_path} in batch: {e}")
+                return MatchResult(found=False, confidence=0.0)
+        
+        if parallel and len(queries) > 1:
+            return list(self._get_match_executor().map(match, queries))
+        return [match(query) for query in queries]
+        
     def find_all_images(self, template_path: str,
                        confidence: float = 0.9,
                        region: Optional[Tuple[int, int, int, int]] = None,
-                       limit: int = 10) -> List[MatchResult]:
-        """Find all occurrences of image on screen"""
+                       limit: int = 10,
+                       iou_threshold: float = 0.3,
+                       reading_order: bool = False) -> List[MatchResult]:
+        """Find all distinct occurrences of image on screen
+        
+        Args:
+            limit: Maximum number of matches (the best ``limit`` by confidence)
+            iou_threshold: Matches overlapping a better match by more than this
+                intersection-over-union are treated as duplicates
+            reading_order: Sort top-to-bottom, left-to-right instead of by confidence
+        """
         
         results = []
         
@@ -299,41 +553,33 @@ class ImageMatcher:
             template = self._load_template(template_path)
             
             # Capture screen  
-            screenshot = self._capture_screen(region)
-            screenshot_gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
+            frame = self._grab_frame(region)
+            screenshot_gray = frame.gray()
+            
+            h, w = template.shape[:2]
+            if screenshot_gray.shape[0] < h or screenshot_gray.shape[1] < w:
+                return results
             
             # Perform template matching
             match_result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
             
-            # Find all matches above threshold
-            locations = np.where(match_result >= confidence)
-            
-            h, w = template.shape[:2]
+            # Distinct peaks, best first
+            peaks = find_peaks(match_result, confidence, (w, h), limit, iou_threshold)
+            if reading_order:
+                order = sort_reading_order([loc for _, loc in peaks], max(1, h // 2))
+                peaks = [peaks[i] for i in order]
             
-            # Process matches
-            for pt in zip(*locations[::-1]):
-                if len(results) >= limit:
-                    break
-                    
-                x, y = pt
-                
-                # Adjust for region offset
-                if region:
-                    x += region[0]
-                    y += region[1]
-                    
-                location = (x, y, w, h)
-                center = (x + w // 2, y + h // 2)
-                
-                # Get confidence for this match
-                conf = match_result[y, x]
+            for conf, (mx, my) in peaks:
+                # Convert to virtual-desktop coordinates
+                x = mx + frame.left
+                y = my + frame.top
                 
-                results.append(MatchResult(
+                results.append(self._restore_original(template_path, 1.0, MatchResult(
                     found=True,
-                    confidence=float(conf),
-                    location=location,
-                    center=center
-                ))
+                    confidence=conf,
+                    location=(x, y, w, h),
+                    center=(x + w // 2, y + h // 2)
+                )))
                 
         except Exception as e:
             self.logger.error(f"Error in find_all_images: {e}")
@@ -345,13 +591,97 @@ class ImageMatcher:
                       confidence: float = 0.9,
                       region: Optional[Tuple[int, int, int, int]] = None,
                       check_interval: float = 0.5,
-                      multi_scale: bool = False) -> MatchResult:
-        """Wait for image to appear on screen"""
+                      multi_scale: bool = False,
+                      match_mode: str = MATCH_MODE_STANDARD,
+                      change_driven: Optional[bool] = None) -> MatchResult:
+        """Wait for image to appear on screen
+        
+        Args:
+            check_interval: Longest polling interval while the screen is idle
+            change_driven: Diff successive frames and only re-match changed
+                tiles (defaults to the vision.change_driven_wait setting)
+        """
+        if change_driven is None:
+            change_driven = self.settings.get("vision.change_driven_wait", True)
+        if not change_driven:
+            return self._wait_for_image_polling(template_path, timeout, confidence, region,
+                                                check_interval, multi_scale, match_mode)
+        
+        deadline = time.time() + timeout
+        stats = WaitStats()
+        self.last_wait_stats = stats
+        poller = self._create_poller(check_interval)
+        differ = FrameDiffer(tile_size=self.settings.get("vision.wait_tile_size", 64))
+        # Safety net: re-match the whole region now and then even if the diff saw nothing
+        full_check_interval = self.settings.get("vision.wait_full_check_interval", 2.0)
+        last_full_check = 0.0
         
+        try:
+            template = self._load_template(template_path)
+        except Exception as e:
+            self.logger.error(f"Error in wait_for_image: {e}")
+            return MatchResult(found=False, confidence=0.0)
+        
+        while True:
+            stats.polls += 1
+            try:
+                frame = self._grab_frame(region, max_age_ms=0)
+                dirty = differ.update(frame.gray())
+                now = time.time()
+            
+                if dirty is None or now - last_full_check >= full_check_interval:
+                    # First frame or periodic full check
+                    stats.full_matches += 1
+                    last_full_check = now
+                    if multi_scale:
+                        result = self.find_image(template_path, confidence, frame.region,
+                                                 multi_scale=True, match_mode=match_mode)
+                    else:
+                        result = self._match_in_frame(frame, template, template_path, confidence,
+                                                      match_mode)
+                elif dirty:
+                    stats.partial_matches += 1
+                    stats.tiles_total += differ.tile_count(frame.gray().shape)
+                    stats.tiles_matched += len(dirty)
+                    if multi_scale:
+                        result = self.find_image(template_path, confidence, frame.region,
+                                                 multi_scale=True, match_mode=match_mode)
+                    else:
+                        result = self._match_dirty_tiles(frame, template, dirty, confidence)
+                else:
+                    stats.skipped_polls += 1
+                    result = None
+            except Exception as e:
+                # Capture failures (display change, lock screen) count as not found this tick
+                self.logger.error(f"Error in wait_for_image: {e}")
+                dirty = None
+                result = None
+            
+            if result is not None and result.found:
+                self.logger.debug(f"wait_for_image found match ({stats.summary()})")
+                if multi_scale:
+                    return result  # find_image already recorded and restored it
+                self._remember_hit(template_path, result)
+                return self._restore_original(template_path, 1.0, result)
+            
+            if time.time() >= deadline:
+                break
+            poller.sleep(bool(dirty), deadline)
+        
+        # Timeout reached
+        self.logger.debug(f"wait_for_image timed out ({stats.summary()})")
+        return MatchResult(found=False, confidence=0.0)
+        
+    def _wait_for_image_polling(self, template_path: str, timeout: float, confidence: float,
+                                region: Optional[Tuple[int, int, int, int]],
+                                check_interval: float, multi_scale: bool,
+                                match_mode: str) -> MatchResult:
+        """Fixed-interval polling (full match every time)"""
         start_time = time.time()
         
         while time.time() - start_time < timeout:
-            result = self.find_image(template_path, confidence, region, multi_scale=multi_scale)
+            result = self.find_image(template_path, confidence, region, multi_scale=multi_scale,
+                                     match_mode=match_mode)
             
             if result.found:
                 return result
@@ -361,9 +691,55 @@ class ImageMatcher:
         # Timeout reached
         return MatchResult(found=False, confidence=0.0)
         
-    def capture_region(self, region: Tuple[int, int, int, int], 
+    def _create_poller(self, max_interval: float) -> AdaptivePoller:
+        """Adaptive poller that speeds up after input actions"""
+        return AdaptivePoller(
+            min_interval=self.settings.get("vision.wait_min_interval", 0.05),
+            max_interval=max_interval,
+            last_input_time=lambda: self._capture.last_input_time
+        )
+        
+    def _match_in_frame(self, frame: ScreenFrame, template: np.ndarray, template_path: str,
+                        confidence: float, match_mode: str) -> MatchResult:
+        """Match a template against a whole frame"""
+        max_val, max_loc = self._match(frame, frame.gray(), template, template_path, 1.0, match_mode)
+        return self._to_result(frame, template, max_val, max_loc, confidence)
+        
+    def _match_dirty_tiles(self, frame: ScreenFrame, template: np.ndarray,
+                           dirty: List[Tuple[int, int, int, int]],
+                           confidence: float) -> MatchResult:
+        """Match only the windows around changed tiles
+        
+        Unchanged pixels produced no match on the previous poll, so a new match
+        must overlap at least one changed tile.
+        """
+        gray = frame.gray()
+        th, tw = template.shape[:2]
+        best_val, best_loc = 0.0, (0, 0)
+        for x, y, w, h in search_windows(dirty, (tw, th), (frame.width, frame.height)):
+            max_val, (lx, ly) = match_best(gray[y:y + h, x:x + w], template)
+            if max_val > best_val:
+                best_val, best_loc = max_val, (x + lx, y + ly)
+        return self._to_result(frame, template, best_val, best_loc, confidence)
+        
+    def _to_result(self, frame: ScreenFrame, template: np.ndarray, max_val: float,
+                   max_loc: Tuple[int, int], confidence: float) -> MatchResult:
+        """Build a MatchResult in virtual-desktop coordinates"""
+        if max_val < confidence:
+            return MatchResult(found=False, confidence=max_val)
+        h, w = template.shape[:2]
+        x = max_loc[0] + frame.left
+        y = max_loc[1] + frame.top
+        return MatchResult(
+            found=True,
+            confidence=max_val,
+            location=(x, y, w, h),
+            center=(x + w // 2, y + h // 2)
+        )
+        
+    def capture_region(self, region: Optional[Tuple[int, int, int, int]], 
                       save_path: Optional[str] = None) -> np.ndarray:
-        """Capture a specific region of the screen"""
+        """Capture a specific region of the screen (None for the whole desktop)"""
         
         screenshot = self._capture_screen(region)
         
@@ -373,10 +749,10 @@ class ImageMatcher:
             
         return screenshot
         
-    def clear_cache(self):
-        """Clear template cache"""
-        self._template_cache.clear()
-        self.logger.debug("Template cache cleared")
+    def clear_cache(self, disk: bool = False):
+        """Clear template cache (``disk`` also empties the preprocessed template store)"""
+        self.logger.debug(f"Clearing template cache ({self._template_cache.size_bytes / 1024 / 1024:.2f} MB)")
+        self._template_cache.clear(disk=disk)
 
 class ImageMatcherLegacy:
     """Legacy image matcher using pyautogui for fallback"""
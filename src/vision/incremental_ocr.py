@@ -0,0 +1,132 @@
+"""
+Incremental OCR: re-recognize only the parts of a region that changed
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, List, Tuple, Dict, Any
+import numpy as np
+from vision.ocr_common import TextResult
+from vision.polling import FrameDiffer, search_windows
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+
+
+@dataclass
+class _RegionState:
+    differ: FrameDiffer
+    results: List[TextResult]   # screen coordinates
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class IncrementalOCR:
+    """Previous frame and OCR results per region
+
+    Between two calls on the same region the frames are compared tile by
+    tile. Unchanged regions reuse the results as-is; otherwise the changed
+    tiles plus a margin are grown to cover every cached line they cut, only
+    those windows are OCRed again, and cached lines outside them are kept.
+    """
+
+    def __init__(self, tile_size: int = 64, margin: int = 16, max_changed_ratio: float = 0.5,
+                 max_regions: int = 8):
+        """
+        Args:
+            tile_size: Diff tile edge in pixels
+            margin: Pixels added around changed tiles (text partly outside a tile)
+            max_changed_ratio: Above this share of the region a full OCR is cheaper
+            max_regions: Regions remembered (least recently used dropped)
+        """
+        self.tile_size = tile_size
+        self.margin = margin
+        self.max_changed_ratio = max_changed_ratio
+        self.max_regions = max_regions
+        self._lock = threading.Lock()
+        self._states: "OrderedDict[Any, _RegionState]" = OrderedDict()
+        self.unchanged = 0
+        self.partial = 0
+        self.full = 0
+
+    def plan(self, key: Any, gray: np.ndarray,
+             offset: Tuple[int, int]) -> Tuple[Optional[List[Rect]], Optional[List[TextResult]]]:
+        """Work needed for the next frame of a region
+
+        Returns:
+            (None, None): full OCR required (no previous frame, size change,
+                or too much changed)
+            ([], results): nothing changed, results are still valid
+            (windows, kept): OCR these windows (frame coordinates) and add the
+                new results to ``kept``
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                self.full += 1
+                return None, None
+            self._states.move_to_end(key)
+            dirty = state.differ.update(gray)
+            if dirty is None:
+                del self._states[key]
+                self.full += 1
+                return None, None
+            if not dirty:
+                self.unchanged += 1
+                return [], list(state.results)
+
+            height, width = gray.shape[:2]
+            grow = self.margin + 1
+            windows = search_windows(dirty, (grow, grow), (width, height))
+
+            # A cached line cut by a window is recognized again as a whole
+            local = [(r.bbox[0] - offset[0], r.bbox[1] - offset[1], r.bbox[2], r.bbox[3])
+                     for r in state.results]
+            touched = set()
+            while True:
+                added = [i for i, box in enumerate(local) if i not in touched
+                         and any(_overlaps(box, w) for w in windows)]
+                if not added:
+                    break
+                touched.update(added)
+                windows = search_windows(windows + [local[i] for i in added], (1, 1), (width, height))
+
+            if sum(w * h for _, _, w, h in windows) > self.max_changed_ratio * width * height:
+                del self._states[key]
+                self.full += 1
+                return None, None
+            self.partial += 1
+            kept = [r for i, r in enumerate(state.results) if i not in touched]
+            return windows, kept
+
+    def remember(self, key: Any, gray: np.ndarray, results: List[TextResult]):
+        """Store the results of the frame just recognized (full or partial pass)"""
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = _RegionState(FrameDiffer(self.tile_size), [])
+                state.differ.update(gray)
+                self._states[key] = state
+            state.results = list(results)
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_regions:
+                self._states.popitem(last=False)
+
+    def forget(self, key: Any = None):
+        """Drop one region's state or all of them"""
+        with self._lock:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters"""
+        return {
+            'regions': len(self._states),
+            'unchanged': self.unchanged,
+            'partial': self.partial,
+            'full': self.full,
+        }
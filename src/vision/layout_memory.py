@@ -0,0 +1,126 @@
+"""
+Layout memory: reuse text-line boxes of fixed forms between OCR calls
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, List, Tuple, Dict, Any
+import numpy as np
+import cv2
+
+Box = Tuple[int, int, int, int]  # x, y, width, height (region coordinates)
+
+
+@dataclass
+class _Layout:
+    boxes: List[Box]
+    reference: np.ndarray   # block-averaged region
+    mask: np.ndarray        # blocks outside every text box (the "structure")
+    uses: int = 0
+
+
+class LayoutMemory:
+    """Remembers detected text lines per region
+
+    On fixed forms only the values inside known text boxes change between
+    rows. A region passes the structural check when every block outside the
+    remembered boxes is unchanged; then only the box crops need recognition.
+    Text growing out of its box, new lines or a different screen change
+    blocks outside the boxes and force a full detection.
+    """
+
+    def __init__(self, block: int = 4, threshold: float = 12.0, margin: int = 3,
+                 max_coverage: float = 0.8, max_layouts: int = 32):
+        """
+        Args:
+            block: Block size used for the structural diff
+            threshold: Mean-intensity difference of a block that counts as a change
+            margin: Pixels around each box excluded from the structural diff
+            max_coverage: Layouts whose boxes cover more of the region than
+                this are not kept (too little structure left to compare)
+            max_layouts: Regions remembered (least recently used dropped)
+        """
+        self.block = max(1, block)
+        self.threshold = threshold
+        self.margin = margin
+        self.max_coverage = max_coverage
+        self.max_layouts = max_layouts
+        self._lock = threading.Lock()
+        self._layouts: "OrderedDict[Any, _Layout]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.structure_changes = 0
+
+    def _downscale(self, gray: np.ndarray) -> np.ndarray:
+        h, w = gray.shape[:2]
+        size = (max(1, w // self.block), max(1, h // self.block))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def _structure_mask(self, shape: Tuple[int, int], boxes: List[Box]) -> np.ndarray:
+        mask = np.ones(shape, dtype=bool)
+        b, m = self.block, self.margin
+        for x, y, w, h in boxes:
+            x0, y0 = max(0, (x - m) // b), max(0, (y - m) // b)
+            x1, y1 = -(-(x + w + m) // b), -(-(y + h + m) // b)
+            mask[y0:y1, x0:x1] = False
+        return mask
+
+    def lookup(self, key: Any, gray: np.ndarray) -> Optional[List[Box]]:
+        """Remembered boxes if the region's structure is unchanged, else None"""
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is None:
+                self.misses += 1
+                return None
+            small = self._downscale(gray)
+            if small.shape != layout.reference.shape:
+                unchanged = False
+            else:
+                diff = np.abs(small - layout.reference)[layout.mask]
+                unchanged = diff.size == 0 or float(diff.max()) <= self.threshold
+            if not unchanged:
+                self.misses += 1
+                self.structure_changes += 1
+                del self._layouts[key]
+                return None
+            self._layouts.move_to_end(key)
+            layout.uses += 1
+            self.hits += 1
+            return list(layout.boxes)
+
+    def remember(self, key: Any, gray: np.ndarray, boxes: List[Box]) -> bool:
+        """Store the boxes found by a full detection pass
+
+        Returns:
+            False if the layout is not usable (no boxes or boxes cover the region)
+        """
+        if not boxes:
+            return False
+        small = self._downscale(gray)
+        mask = self._structure_mask(small.shape, boxes)
+        if 1.0 - mask.mean() > self.max_coverage:
+            return False
+        with self._lock:
+            self._layouts[key] = _Layout(list(boxes), small, mask)
+            self._layouts.move_to_end(key)
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        return True
+
+    def forget(self, key: Any = None):
+        """Drop one remembered layout or all of them"""
+        with self._lock:
+            if key is None:
+                self._layouts.clear()
+            else:
+                self._layouts.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters"""
+        return {
+            'layouts': len(self._layouts),
+            'hits': self.hits,
+            'misses': self.misses,
+            'structure_changes': self.structure_changes,
+        }
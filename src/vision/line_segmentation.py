@@ -0,0 +1,123 @@
+"""
+Projection-profile text-line segmentation for recognition-only OCR
+
+Small regions (a single field value, a few label rows) do not need the
+detection model: ink rows and columns split them into line crops that go
+straight to the recognizer.
+"""
+
+from typing import Optional, List, Tuple
+import numpy as np
+import cv2
+
+Box = Tuple[int, int, int, int]  # x, y, width, height (region coordinates)
+
+# 텍스트 인식 방식 (단계별 ocr_mode)
+OCR_MODE_AUTO = "auto"      # 작은 영역은 줄 분할 + 인식만, 큰 영역은 전체 검출
+OCR_MODE_FULL = "full"      # 항상 검출 + 인식
+OCR_MODE_LINE = "line"      # 한 줄로 간주하고 인식만
+OCR_MODE_LINES = "lines"    # 줄 분할 후 일괄 인식
+OCR_MODES = (OCR_MODE_AUTO, OCR_MODE_FULL, OCR_MODE_LINE, OCR_MODE_LINES)
+
+
+def ink_mask(gray: np.ndarray, min_contrast: float = 3.0) -> np.ndarray:
+    """Foreground (text) pixels: the Otsu class that is not the border colour"""
+    if gray.size == 0 or float(gray.std()) < min_contrast:
+        return np.zeros(gray.shape, dtype=bool)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    border = np.concatenate([binary[0], binary[-1], binary[:, 0], binary[:, -1]])
+    light_background = np.median(border) > 127
+    return binary == 0 if light_background else binary > 0
+
+
+def _runs(flags: np.ndarray, max_gap: int) -> List[Tuple[int, int]]:
+    """[start, end) runs of True, bridging gaps shorter than ``max_gap``"""
+    indices = np.flatnonzero(flags)
+    if len(indices) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > max_gap)
+    starts = np.concatenate([[indices[0]], indices[breaks + 1]])
+    ends = np.concatenate([indices[breaks], [indices[-1]]]) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def split_lines(gray: np.ndarray, single_line: bool = False, min_height: int = 4,
+                row_gap: int = 1) -> List[Box]:
+    """Text segments found from row and column ink profiles
+
+    Rows with ink form line bands; inside a band, column gaps wider than the
+    line height separate fields so each segment gets its own box (like the
+    detection model's per-field boxes).
+
+    Args:
+        gray: Region in grayscale
+        single_line: Treat the whole ink extent as one band
+        min_height: Bands lower than this are dropped (rules, noise)
+        row_gap: Blank rows bridged inside a band
+    """
+    ink = ink_mask(gray)
+    rows = ink.any(axis=1)
+    if single_line:
+        bands = _runs(rows, gray.shape[0])
+    else:
+        bands = _runs(rows, row_gap)
+
+    boxes = []
+    for y0, y1 in bands:
+        height = y1 - y0
+        if height < min_height:
+            continue
+        columns = ink[y0:y1].any(axis=0)
+        for x0, x1 in _runs(columns, max(8, height)):
+            boxes.append((x0, y0, x1 - x0, height))
+    return boxes
+
+
+def _pad(boxes: List[Box], shape: Tuple[int, ...]) -> List[Box]:
+    """Grow ink-tight boxes by a quarter of the line height (like detection boxes)"""
+    height, width = shape[:2]
+    padded = []
+    for x, y, w, h in boxes:
+        pad = max(2, h // 4)
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(width, x + w + pad), min(height, y + h + pad)
+        padded.append((x0, y0, x1 - x0, y1 - y0))
+    return padded
+
+
+def plan_recognition_boxes(gray: np.ndarray, mode: str = OCR_MODE_AUTO,
+                           max_line_height: int = 64, max_lines: int = 16,
+                           max_auto_area: int = 800 * 400) -> Optional[List[Box]]:
+    """Line boxes for recognition-only OCR, or None when detection is needed
+
+    Args:
+        gray: Region in grayscale
+        mode: OCR_MODE_* of the step
+        max_line_height: Taller regions are not treated as one line in auto mode,
+            and taller bands mean the region is not plain text lines
+        max_lines: More bands than this fall back to detection in auto mode
+        max_auto_area: Larger regions always use detection in auto mode
+
+    Returns:
+        List of boxes (empty when the region holds no ink) or None
+    """
+    if mode == OCR_MODE_FULL:
+        return None
+    height, width = gray.shape[:2]
+
+    if mode == OCR_MODE_LINE or (mode == OCR_MODE_AUTO and height <= max_line_height
+                                 and width >= 2 * height):
+        boxes = split_lines(gray, single_line=True)
+    elif mode == OCR_MODE_AUTO and height * width > max_auto_area:
+        return None
+    else:
+        boxes = split_lines(gray)
+
+    if mode == OCR_MODE_AUTO:
+        # 잉크가 없다고 판단해도 대비가 있으면 (옅은 글자 등) 검출에 맡긴다
+        if not boxes and gray.size and float(gray.std()) >= 3.0:
+            return None
+        bands = {(y, h) for _, y, _, h in boxes}
+        if len(bands) > max_lines or any(h > max_line_height for _, h in bands):
+            return None
+    return _pad(boxes, gray.shape)
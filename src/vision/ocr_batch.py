@@ -0,0 +1,152 @@
+"""
+Batching of several small OCR regions into one inference call
+
+Crops are packed onto a shared canvas (a "mosaic") with blank gaps between
+them, the canvas goes through detection/recognition once, and every result
+is mapped back to the crop it came from.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import List, Tuple, Sequence, Optional, Callable
+import numpy as np
+from vision.ocr_common import TextResult
+
+Region = Tuple[int, int, int, int]  # x, y, width, height
+
+
+@dataclass
+class Cell:
+    """Placement of one crop on a canvas"""
+    index: int          # position of the crop in the batch
+    x: int              # canvas position
+    y: int
+    width: int
+    height: int
+
+
+@dataclass
+class Canvas:
+    """One packed canvas and the crops placed on it"""
+    width: int
+    height: int
+    cells: List[Cell]
+
+
+_scratch = threading.local()
+
+
+def scratch_buffer(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    """Contiguous uint8 array backed by a per-thread buffer that is reused between calls
+
+    The contents are only valid until the same thread asks for ``name`` again.
+    """
+    size = int(np.prod(shape))
+    buffers = getattr(_scratch, 'buffers', None)
+    if buffers is None:
+        buffers = _scratch.buffers = {}
+    buffer = buffers.get(name)
+    if buffer is None or buffer.size < size:
+        # Grow with headroom so slightly larger inputs do not reallocate
+        buffer = np.empty(size + size // 2, dtype=np.uint8)
+        buffers[name] = buffer
+    return buffer[:size].reshape(shape)
+
+
+def pack_canvases(sizes: Sequence[Tuple[int, int]], max_width: int = 960, max_height: int = 960,
+                  gap: int = 24) -> List[Canvas]:
+    """Shelf-pack crops onto as few canvases as possible
+
+    Args:
+        sizes: (width, height) of every crop; each must fit ``max_*`` minus
+            the gaps on both sides
+        max_width, max_height: Canvas limit (the detection model's input size,
+            so nothing is downscaled)
+        gap: Blank pixels around every crop (keeps detection from joining
+            text of neighbouring crops)
+
+    Returns:
+        Canvases in order of creation
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    canvases: List[Canvas] = []
+    cells: List[Cell] = []
+    x = y = gap
+    shelf_height = 0
+
+    def close():
+        if cells:
+            canvases.append(Canvas(max(c.x + c.width for c in cells) + gap,
+                                   max(c.y + c.height for c in cells) + gap, list(cells)))
+
+    for index in order:
+        w, h = sizes[index]
+        if x + w + gap > max_width and x > gap:
+            # Next shelf
+            y += shelf_height + gap
+            x, shelf_height = gap, 0
+        if y + h + gap > max_height and cells:
+            close()
+            cells.clear()
+            x = y = gap
+            shelf_height = 0
+        cells.append(Cell(index, x, y, w, h))
+        x += w + gap
+        shelf_height = max(shelf_height, h)
+    close()
+    return canvases
+
+
+def compose(canvas: Canvas, crop: Callable[[int], np.ndarray], channels: int = 3,
+            name: Optional[str] = None, fill: int = 255) -> np.ndarray:
+    """Copy the crops onto a canvas image
+
+    Args:
+        canvas: Packing result
+        crop: Returns the image of a crop index; called once per cell right
+            before it is copied, so it may return a reused buffer
+        channels: Channels of the crops
+        name: Draw into ``scratch_buffer(name)`` instead of a new array
+        fill: Gap colour
+    """
+    shape = (canvas.height, canvas.width, channels)
+    image = scratch_buffer(name, shape) if name else np.empty(shape, dtype=np.uint8)
+    image.fill(fill)
+    for cell in canvas.cells:
+        image[cell.y:cell.y + cell.height, cell.x:cell.x + cell.width] = crop(cell.index)
+    return image
+
+
+def split_results(canvas: Canvas, results: List[TextResult],
+                  origins: Sequence[Tuple[int, int]]) -> List[Tuple[int, List[TextResult]]]:
+    """Assign canvas results to their crops and move them to screen coordinates
+
+    A result belongs to the cell containing its centre; its box is clipped to
+    the cell. Results in the gaps are dropped.
+
+    Args:
+        canvas: Canvas the results were found on
+        results: OCR results in canvas coordinates
+        origins: Screen position of every crop (indexed like the batch)
+
+    Returns:
+        (crop index, results) for every cell of the canvas
+    """
+    per_cell = {cell.index: [] for cell in canvas.cells}
+    for result in results:
+        cx, cy = result.center
+        for cell in canvas.cells:
+            if cell.x <= cx < cell.x + cell.width and cell.y <= cy < cell.y + cell.height:
+                x0 = max(result.bbox[0], cell.x)
+                y0 = max(result.bbox[1], cell.y)
+                x1 = min(result.bbox[0] + result.bbox[2], cell.x + cell.width)
+                y1 = min(result.bbox[1] + result.bbox[3], cell.y + cell.height)
+                dx = origins[cell.index][0] - cell.x
+                dy = origins[cell.index][1] - cell.y
+                per_cell[cell.index].append(TextResult(
+                    text=result.text,
+                    confidence=result.confidence,
+                    bbox=(x0 + dx, y0 + dy, x1 - x0, y1 - y0),
+                    center=(cx + dx, cy + dy)))
+                break
+    return list(per_cell.items())
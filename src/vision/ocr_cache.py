@@ -0,0 +1,209 @@
+"""
+Content-addressed cache of OCR results
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict, Any
+import numpy as np
+from logger.app_logger import get_logger
+from vision.ocr_common import TextResult
+
+# xxhash는 선택 사항 (없으면 blake2b 사용)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None
+
+
+def content_key(image: np.ndarray, variant: str = "") -> str:
+    """Hash of the pixel bytes and shape (identical crops give identical keys)"""
+    data = np.ascontiguousarray(image)
+    if XXHASH_AVAILABLE:
+        hasher = xxhash.xxh3_128()
+    else:
+        hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr((data.shape, str(data.dtype), variant)).encode())
+    hasher.update(memoryview(data).cast('B'))
+    return hasher.hexdigest()
+
+
+def shift_results(results: List[TextResult], dx: int, dy: int) -> List[TextResult]:
+    """Copies of the results moved by (dx, dy)"""
+    return [replace(r,
+                    bbox=(r.bbox[0] + dx, r.bbox[1] + dy, r.bbox[2], r.bbox[3]),
+                    center=(r.center[0] + dx, r.center[1] + dy))
+            for r in results]
+
+
+class OCRCache:
+    """OCR results keyed by crop content
+
+    Results are stored relative to the crop's top-left corner so the same
+    pixels found at another screen position still hit. Memory entries are
+    LRU-bounded; an optional JSON store keeps results across restarts.
+    """
+
+    def __init__(self, max_entries: int = 512, store_dir: Optional[Path] = None,
+                 use_disk: bool = False, max_disk_entries: int = 5000):
+        """
+        Args:
+            max_entries: Entries kept in memory
+            store_dir: On-disk store, defaults to ~/.excel_macro_automation/ocr_cache
+            use_disk: Persist results as plaintext JSON files (off by default:
+                recognized screen text may be sensitive)
+            max_disk_entries: On-disk store is pruned (oldest first) above this count
+        """
+        self.logger = get_logger(__name__)
+        self.max_entries = max(1, max_entries)
+        self.use_disk = use_disk
+        self.max_disk_entries = max_disk_entries
+        self.store_dir = store_dir or Path.home() / ".excel_macro_automation" / "ocr_cache"
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, List[TextResult]]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk_count = 0
+
+        if self.use_disk:
+            try:
+                self.store_dir.mkdir(parents=True, exist_ok=True)
+                self._prune_disk()
+            except Exception as e:
+                self.logger.warning(f"OCR cache store unavailable, using memory only: {e}")
+                self.use_disk = False
+
+    def get(self, key: str, offset: Tuple[int, int] = (0, 0)) -> Optional[List[TextResult]]:
+        """Cached results moved to ``offset``, or None"""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return shift_results(results, *offset)
+
+        results = self._load_from_disk(key) if self.use_disk else None
+        with self._lock:
+            if results is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._put(key, results)
+        return shift_results(results, *offset)
+
+    def put(self, key: str, results: List[TextResult], offset: Tuple[int, int] = (0, 0)):
+        """Store results that were computed at screen position ``offset``"""
+        relative = shift_results(results, -offset[0], -offset[1])
+        with self._lock:
+            self._put(key, relative)
+        if self.use_disk:
+            self._save_to_disk(key, relative)
+
+    def _put(self, key: str, results: List[TextResult]):
+        self._entries[key] = results
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ---- on-disk store ---------------------------------------------------
+
+    def _load_from_disk(self, key: str) -> Optional[List[TextResult]]:
+        path = self.store_dir / f"{key}.json"
+        try:
+            if not path.exists():
+                return None
+            rows = json.loads(path.read_text(encoding='utf-8'))
+            return [TextResult(text, conf, tuple(bbox), tuple(center)) for text, conf, bbox, center in rows]
+        except Exception as e:
+            self.logger.debug(f"OCR cache read failed for {key}: {e}")
+            return None
+
+    def _save_to_disk(self, key: str, results: List[TextResult]):
+        rows = [[r.text, float(r.confidence), [int(v) for v in r.bbox], [int(v) for v in r.center]]
+                for r in results]
+        try:
+            tmp = self.store_dir / f"{key}.json.tmp"
+            tmp.write_text(json.dumps(rows, ensure_ascii=False), encoding='utf-8')
+            path = self.store_dir / f"{key}.json"
+            existed = path.exists()
+            os.replace(tmp, path)
+        except Exception as e:
+            self.logger.debug(f"OCR cache write failed for {key}: {e}")
+            return
+        if not existed:
+            with self._lock:
+                self._disk_count += 1
+                over = self._disk_count > self.max_disk_entries
+            if over:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove the oldest stored results when the store exceeds its budget
+
+        Prunes down to 90% of the budget so writes do not rescan the store
+        every time once it is full.
+        """
+        files = list(self.store_dir.glob("*.json"))
+        keep = len(files)
+        if len(files) > self.max_disk_entries:
+            files.sort(key=lambda p: p.stat().st_mtime)
+            keep = self.max_disk_entries * 9 // 10
+            for path in files[:len(files) - keep]:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_count = keep
+
+    # ---- maintenance -----------------------------------------------------
+
+    def clear(self, disk: bool = False):
+        """Drop cached results (and optionally the on-disk store)"""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.use_disk:
+            for path in self.store_dir.glob("*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            with self._lock:
+                self._disk_count = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+# 전역 OCR 캐시
+_ocr_cache = None
+
+
+def get_ocr_cache(max_entries: Optional[int] = None, use_disk: Optional[bool] = None) -> OCRCache:
+    """Get global OCR cache (options apply on first call)"""
+    global _ocr_cache
+    if _ocr_cache is None:
+        kwargs = {}
+        if max_entries is not None:
+            kwargs['max_entries'] = max_entries
+        if use_disk is not None:
+            kwargs['use_disk'] = use_disk
+        _ocr_cache = OCRCache(**kwargs)
+    return _ocr_cache
@@ -0,0 +1,395 @@
+"""
+OCR pieces shared by the in-process extractor and OCR worker processes
+
+Kept free of Qt/PIL imports so worker processes start quickly.
+"""
+
+import multiprocessing
+from dataclasses import dataclass
+from typing import List, Tuple, Dict, Any, Optional
+from logger.app_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TextResult:
+    """텍스트 검출 결과"""
+    text: str
+    confidence: float
+    bbox: Tuple[int, int, int, int]  # (x, y, width, height)
+    center: Tuple[int, int]  # (center_x, center_y)
+
+
+def check_gpu_availability() -> bool:
+    """GPU 사용 가능 여부 확인"""
+    try:
+        import paddle
+        # GPU가 사용 가능한지 확인
+        is_gpu_available = paddle.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0
+        if is_gpu_available:
+            logger.info(f"GPU 감지됨: {paddle.device.cuda.device_count()}개")
+        else:
+            logger.info("GPU를 사용할 수 없습니다. CPU 모드로 실행됩니다.")
+        return is_gpu_available
+    except Exception as e:
+        logger.debug(f"GPU 확인 중 오류: {e}")
+        return False
+
+
+# OCR 엔진 설정 (tune_ocr_profile.py가 PC별로 측정해 ocr.profile에 저장)
+DEFAULT_OCR_PROFILE: Dict[str, Any] = {
+    'det_model': 'PP-OCRv5_mobile_det',
+    'rec_model': 'korean_PP-OCRv5_mobile_rec',  # 한국어 전용 모델
+    'det_limit_side_len': 0,  # 검출 입력의 긴 변 상한 (0이면 모델 기본값)
+    'cpu_threads': 0,  # 0이면 코어 수 (최대 8)
+    'enable_mkldnn': True,  # CPU일 때만 적용
+}
+
+
+def resolve_ocr_profile(profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Defaults overlaid with the known keys of a stored profile"""
+    resolved = dict(DEFAULT_OCR_PROFILE)
+    if profile:
+        resolved.update({k: v for k, v in profile.items() if k in DEFAULT_OCR_PROFILE and v is not None})
+    return resolved
+
+
+def paddle_init_params(use_gpu: bool, cpu_threads: int = 0,
+                       profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """PaddleOCR 생성 파라미터
+
+    Args:
+        use_gpu: GPU 사용 여부
+        cpu_threads: CPU 스레드 수 (0이면 프로파일 값, 그것도 0이면 코어 수, 최대 8)
+        profile: OCR 엔진 설정 (None이면 DEFAULT_OCR_PROFILE)
+    """
+    profile = resolve_ocr_profile(profile)
+    params = {
+        'lang': 'korean',
+        'text_detection_model_name': profile['det_model'],
+        'text_recognition_model_name': profile['rec_model'],
+        'device': 'gpu' if use_gpu else 'cpu',
+        'enable_mkldnn': bool(profile['enable_mkldnn']) and not use_gpu,  # CPU일 때만 MKL-DNN 사용
+        'cpu_threads': cpu_threads or profile['cpu_threads'] or min(8, multiprocessing.cpu_count()),
+        # 불필요한 전처리 모듈 비활성화 (성능 향상)
+        'use_doc_orientation_classify': False,  # 문서 방향 분류 비활성화
+        'use_doc_unwarping': False,  # 텍스트 이미지 보정 비활성화
+        'use_textline_orientation': False,  # 텍스트 라인 방향 분류 비활성화 (use_angle_cls 대체)
+    }
+    if profile['det_limit_side_len']:
+        # 긴 변이 이보다 크면 축소해서 검출
+        params['text_det_limit_side_len'] = int(profile['det_limit_side_len'])
+        params['text_det_limit_type'] = 'max'
+    return params
+
+
+def create_text_recognizer(use_gpu: bool, cpu_threads: int = 0, profile: Optional[Dict[str, Any]] = None):
+    """인식 전용 모델 (레이아웃 기억 모드에서 검출 단계를 건너뛸 때 사용)
+
+    Returns:
+        PaddleOCR TextRecognition 인스턴스 또는 None (지원하지 않는 버전)
+    """
+    try:
+        from paddleocr import TextRecognition
+    except ImportError:
+        logger.warning("이 PaddleOCR 버전은 인식 전용 모델(TextRecognition)을 지원하지 않습니다.")
+        return None
+    params = paddle_init_params(use_gpu, cpu_threads, profile)
+    return TextRecognition(model_name=params['text_recognition_model_name'],
+                           device=params['device'],
+                           enable_mkldnn=params['enable_mkldnn'],
+                           cpu_threads=params['cpu_threads'])
+
+
+def recognize_boxes(recognizer, image: Any, boxes: List[Tuple[int, int, int, int]],
+                    confidence_threshold: float, offset: Tuple[int, int] = (0, 0),
+                    padding: int = 2) -> List[TextResult]:
+    """
+    알려진 텍스트 라인 위치만 일괄 인식 (검출 생략)
+
+    Args:
+        recognizer: create_text_recognizer() 결과
+        image: 영역 이미지 (전체 OCR과 같은 채널 순서)
+        boxes: 영역 기준 (x, y, width, height) 라인 박스
+        confidence_threshold: 최소 신뢰도
+        offset: 이미지 좌상단의 화면 좌표
+        padding: 라인 박스 주변 여백 (픽셀)
+
+    Returns:
+        박스 위치의 TextResult 리스트
+    """
+    height, width = image.shape[:2]
+    crops, kept = [], []
+    for x, y, w, h in boxes:
+        x0, y0 = max(0, x - padding), max(0, y - padding)
+        x1, y1 = min(width, x + w + padding), min(height, y + h + padding)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            continue
+        crops.append(image[y0:y1, x0:x1])
+        kept.append((x, y, w, h))
+    if not crops:
+        return []
+
+    text_results = []
+    outputs = recognizer.predict(input=crops, batch_size=len(crops))
+    for (x, y, w, h), output in zip(kept, outputs):
+        try:
+            text, confidence = output['rec_text'], float(output['rec_score'])
+        except (KeyError, TypeError):
+            data = output.json.get('res', {})
+            text, confidence = data.get('rec_text', ''), float(data.get('rec_score', 0.0))
+        if not text or not text.strip() or confidence < confidence_threshold:
+            continue
+        text_results.append(TextResult(
+            text=text,
+            confidence=confidence,
+            bbox=(x + offset[0], y + offset[1], w, h),
+            center=(int(x + w / 2) + offset[0], int(y + h / 2) + offset[1])
+        ))
+    return text_results
+
+
+def parse_ocr_results(results: Any, confidence_threshold: float,
+                      offset: Tuple[int, int] = (0, 0)) -> List[TextResult]:
+    """
+    PaddleOCR 원시 결과를 TextResult 리스트로 변환
+
+    Args:
+        results: ocr.ocr() 반환값 (PP-OCRv5 딕셔너리 또는 기존 리스트 형식)
+        confidence_threshold: 최소 신뢰도
+        offset: 이미지 좌상단의 화면 좌표 (결과를 화면 절대 좌표로 보정)
+
+    Returns:
+        TextResult 객체 리스트
+    """
+    offset_x, offset_y = offset
+    text_results = []
+
+    # PP-OCRv5는 결과를 다른 형식으로 반환할 수 있음
+    if results is None:
+        logger.warning("OCR returned None results")
+        return text_results
+
+    # 결과가 딕셔너리인 경우 처리 (PP-OCRv5 가능성)
+    if isinstance(results, dict):
+        logger.debug(f"OCR returned dictionary with keys: {list(results.keys())}")
+        # 일반적인 키들 확인
+        if 'result' in results:
+            results = results['result']
+        elif 'data' in results:
+            results = results['data']
+        elif len(results) > 0:
+            # 첫 번째 값 사용
+            first_key = list(results.keys())[0]
+            results = results[first_key]
+
+    # 결과가 리스트가 아닌 경우
+    if not isinstance(results, list):
+        logger.error(f"Unexpected results type: {type(results)}")
+        # 단일 결과를 리스트로 변환
+        results = [results] if results else []
+
+    # 각 페이지/결과 처리
+    for idx, page_result in enumerate(results):
+        if page_result is None:
+            continue
+
+        # page_result가 리스트가 아닌 경우 처리
+        if not isinstance(page_result, list):
+            logger.debug(f"Page {idx} result is not a list: {type(page_result)}")
+            # 딕셔너리인 경우
+            if isinstance(page_result, dict):
+                # 텍스트 결과가 포함된 키 찾기
+                if 'texts' in page_result:
+                    page_result = page_result['texts']
+                elif 'lines' in page_result:
+                    page_result = page_result['lines']
+                else:
+                    page_result = [page_result]
+            else:
+                page_result = [page_result]
+
+        # 각 라인 처리
+        for line_idx, line in enumerate(page_result):
+            try:
+                # line이 None인 경우
+                if line is None:
+                    continue
+
+                # 변수 초기화
+                bbox_points = None
+                text = ""
+                confidence = 0.0
+
+                # line의 실제 형식 로깅
+                logger.debug(f"Line {line_idx} type: {type(line)}, content: {line}")
+
+                # 딕셔너리 형식 (PP-OCRv5 가능성)
+                if isinstance(line, dict):
+                    # 가능한 키 확인
+                    logger.debug(f"Line {line_idx} dict keys: {list(line.keys())}")
+
+                    # PP-OCRv5 새로운 형식 처리
+                    if 'rec_texts' in line and 'rec_polys' in line:
+                        # PP-OCRv5 형식: 여러 텍스트가 한 번에 들어옴
+                        texts = line.get('rec_texts', [])
+                        scores = line.get('rec_scores', [])
+                        polys = line.get('rec_polys', line.get('rec_boxes', []))
+
+                        logger.debug(f"PP-OCRv5 format detected: {len(texts)} texts found")
+
+                        # 각 텍스트에 대해 처리
+                        for text_idx, text in enumerate(texts):
+                            if text_idx < len(scores) and text_idx < len(polys):
+                                confidence = scores[text_idx]
+                                bbox_array = polys[text_idx]
+
+                                # numpy array를 리스트로 변환
+                                if hasattr(bbox_array, 'tolist'):
+                                    bbox_points = bbox_array.tolist()
+                                else:
+                                    bbox_points = bbox_array
+
+                                # 좌표 처리
+                                if confidence >= confidence_threshold and text.strip():
+                                    try:
+                                        # 4개 점 또는 4개 좌표
+                                        if len(bbox_points) == 4 and isinstance(bbox_points[0], (list, tuple)):
+                                            # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]] 형식
+                                            x_coords = [p[0] for p in bbox_points]
+                                            y_coords = [p[1] for p in bbox_points]
+                                        elif len(bbox_points) == 4:
+                                            # [x, y, width, height] 형식
+                                            x, y, w, h = bbox_points
+                                            x_coords = [x, x+w, x+w, x]
+                                            y_coords = [y, y, y+h, y+h]
+                                        else:
+                                            logger.warning(f"Unexpected bbox format: {bbox_points}")
+                                            continue
+
+                                        min_x = int(min(x_coords))
+                                        min_y = int(min(y_coords))
+                                        max_x = int(max(x_coords))
+                                        max_y = int(max(y_coords))
+
+                                        width = max_x - min_x
+                                        height = max_y - min_y
+
+                                        # 중심점 계산 (반올림으로 더 정확한 중심점)
+                                        center_x = int(min_x + width / 2)
+                                        center_y = int(min_y + height / 2)
+
+                                        # 화면 절대 좌표로 변환
+                                        min_x += offset_x
+                                        min_y += offset_y
+                                        center_x += offset_x
+                                        center_y += offset_y
+
+                                        result = TextResult(
+                                            text=text,
+                                            confidence=confidence,
+                                            bbox=(min_x, min_y, width, height),
+                                            center=(center_x, center_y)
+                                        )
+                                        text_results.append(result)
+
+                                    except Exception as e:
+                                        logger.error(f"Error processing PP-OCRv5 text {text_idx}: {e}")
+
+                        # PP-OCRv5 형식은 이미 처리했으므로 다음 라인으로
+                        continue
+
+                    # 기존 딕셔너리 형식 처리
+                    else:
+                        bbox_points = line.get('points', line.get('bbox', line.get('box', [])))
+                        text = line.get('text', line.get('transcription', ''))
+                        confidence = line.get('confidence', line.get('score', line.get('prob', 1.0)))
+
+                        # bbox_points가 평면 리스트인 경우 변환
+                        if isinstance(bbox_points, list) and len(bbox_points) == 8:
+                            # [x1,y1,x2,y2,x3,y3,x4,y4] -> [[x1,y1],[x2,y2],[x3,y3],[x4,y4]]
+                            bbox_points = [[bbox_points[i], bbox_points[i+1]] for i in range(0, 8, 2)]
+
+                # 기존 리스트/튜플 형식
+                elif isinstance(line, (list, tuple)) and len(line) >= 2:
+                    bbox_points = line[0]
+                    logger.debug(f"Line {line_idx} bbox_points type: {type(bbox_points)}, content: {bbox_points}")
+
+                    # 텍스트와 신뢰도 추출
+                    if isinstance(line[1], (list, tuple)) and len(line[1]) >= 2:
+                        text = str(line[1][0])
+                        confidence = float(line[1][1])
+                    elif isinstance(line[1], str):
+                        text = line[1]
+                        confidence = 1.0
+                    elif isinstance(line[1], dict):
+                        text = line[1].get('text', '')
+                        confidence = line[1].get('confidence', 1.0)
+                    else:
+                        logger.warning(f"Unexpected text format in line {line_idx}: {type(line[1])}")
+                        continue
+                else:
+                    logger.warning(f"Unexpected line format at index {line_idx}: {type(line)}")
+                    continue
+
+                # bbox_points 유효성 검사
+                if not bbox_points or not isinstance(bbox_points, (list, tuple)):
+                    logger.warning(f"Invalid bbox_points for line {line_idx}: {bbox_points}")
+                    logger.warning(f"Full line content: {line}")
+                    continue
+
+                # 빈 텍스트 건너뛰기
+                if not text or not text.strip():
+                    continue
+
+            except Exception as e:
+                logger.error(f"Error parsing line {line_idx}: {e}, line content: {line}")
+                continue
+
+            if confidence >= confidence_threshold:
+                # bbox 좌표 계산
+                try:
+                    # bbox_points가 리스트의 리스트인지 확인
+                    if isinstance(bbox_points[0], (list, tuple)):
+                        x_coords = [p[0] for p in bbox_points]
+                        y_coords = [p[1] for p in bbox_points]
+                    else:
+                        # 평면 리스트인 경우 [x1,y1,x2,y2,...]
+                        x_coords = [bbox_points[i] for i in range(0, len(bbox_points), 2)]
+                        y_coords = [bbox_points[i+1] for i in range(0, len(bbox_points), 2)]
+
+                    if not x_coords or not y_coords:
+                        logger.warning(f"Empty coordinates for text: {text}")
+                        continue
+
+                    min_x = int(min(x_coords))
+                    min_y = int(min(y_coords))
+                    max_x = int(max(x_coords))
+                    max_y = int(max(y_coords))
+                except (ValueError, IndexError) as e:
+                    logger.error(f"Error calculating bbox: {e}, bbox_points: {bbox_points}")
+                    continue
+
+                width = max_x - min_x
+                height = max_y - min_y
+
+                # 중심점 계산 (반올림으로 더 정확한 중심점)
+                center_x = int(min_x + width / 2)
+                center_y = int(min_y + height / 2)
+
+                # 화면 절대 좌표로 변환
+                min_x += offset_x
+                min_y += offset_y
+                center_x += offset_x
+                center_y += offset_y
+
+                result = TextResult(
+                    text=text,
+                    confidence=confidence,
+                    bbox=(min_x, min_y, width, height),
+                    center=(center_x, center_y)
+                )
+                text_results.append(result)
+
+    return text_results
@@ -0,0 +1,268 @@
+"""
+OCR engine profile tuning
+
+Candidate PaddleOCR configurations (CPU threads, MKL-DNN, detection input
+size, detection/recognition model variants) are measured on sample
+screenshots. Every candidate runs in a fresh process so thread pools and
+MKL-DNN caches of one candidate do not skew the next. The fastest profile
+whose accuracy stays within a tolerance of the most accurate one wins.
+"""
+
+import os
+import json
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Sequence, Callable, Iterable
+import numpy as np
+from logger.app_logger import get_logger
+from vision.ocr_common import DEFAULT_OCR_PROFILE, resolve_ocr_profile, paddle_init_params, parse_ocr_results
+from vision.text_matcher import normalize, compact, fuzzy_distances
+
+DET_MODELS = ('PP-OCRv5_mobile_det', 'PP-OCRv5_server_det', 'PP-OCRv4_mobile_det')
+REC_MODELS = ('korean_PP-OCRv5_mobile_rec', 'korean_PP-OCRv3_mobile_rec')
+DET_LIMIT_SIDES = (0, 640, 960, 1280)
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.bmp')
+CONFIDENCE = 0.5
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Sample:
+    """Sample screenshot and its expected text lines (None: unlabeled)"""
+    path: str
+    expected: Optional[List[str]] = None
+
+
+@dataclass
+class ProfileResult:
+    """Measurement of one candidate profile"""
+    profile: Dict[str, Any]
+    latency_ms: float = 0.0     # mean per image of the median OCR time
+    load_s: float = 0.0         # model creation + first inference
+    accuracy: float = 0.0
+    texts: List[List[str]] = field(default_factory=list)  # recognized lines per sample
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def thread_candidates(cpu_count: Optional[int] = None) -> List[int]:
+    """Thread counts worth trying on this machine (2-core thin client .. 16-core workstation)"""
+    cores = cpu_count or os.cpu_count() or 1
+    return sorted({n for n in (1, 2, 4, 6, 8, 12, 16) if n <= cores} | {min(cores, 16)})
+
+
+def load_samples(folders: Iterable[str], limit: int = 0) -> List[Sample]:
+    """Images below the folders with their labels
+
+    Labels are read from ``<image>.txt`` next to the image (one expected text
+    line per line) or from ``labels.json`` in the image's folder
+    (``{"file name": ["line", ...]}``).
+    """
+    samples = []
+    for folder in folders:
+        root = Path(folder)
+        if not root.is_dir():
+            continue
+        for path in sorted(p for p in root.rglob('*') if p.suffix.lower() in IMAGE_SUFFIXES):
+            expected = None
+            sidecar = path.with_suffix('.txt')
+            labels_file = path.parent / 'labels.json'
+            if sidecar.exists():
+                expected = [line.strip() for line in sidecar.read_text(encoding='utf-8').splitlines()
+                            if line.strip()]
+            elif labels_file.exists():
+                try:
+                    expected = json.loads(labels_file.read_text(encoding='utf-8')).get(path.name)
+                except (ValueError, OSError) as e:
+                    logger.warning(f"라벨 파일을 읽을 수 없습니다: {labels_file} ({e})")
+            samples.append(Sample(str(path), expected))
+            if limit and len(samples) >= limit:
+                return samples
+    return samples
+
+
+def line_scores(expected: Sequence[str], texts: Sequence[str]) -> List[float]:
+    """How well every expected line was recognized (1 - edit distance / length)
+
+    Lines are looked up in all recognized text joined together, so a line
+    split over two detection boxes still counts.
+    """
+    haystack = compact(normalize(''.join(texts)))
+    scores = []
+    for line in expected:
+        pattern = compact(normalize(line))
+        if not pattern:
+            continue
+        distance = int(fuzzy_distances(pattern, [haystack], len(pattern))[0])
+        scores.append(max(0.0, 1.0 - distance / len(pattern)))
+    return scores
+
+
+def _read_rgb(path: str) -> np.ndarray:
+    import cv2
+    # imdecode: cv2.imread는 Windows에서 한글 경로를 읽지 못함
+    image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"이미지를 읽을 수 없습니다: {path}")
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def _evaluate(profile: Dict[str, Any], paths: List[str], runs: int, use_gpu: bool) -> ProfileResult:
+    """Measure one profile (runs in a child process)"""
+    result = ProfileResult(profile)
+    try:
+        from paddleocr import PaddleOCR
+        images = [_read_rgb(path) for path in paths]
+        start = time.perf_counter()
+        ocr = PaddleOCR(**paddle_init_params(use_gpu, profile=profile))
+        ocr.ocr(images[0])  # 첫 추론 비용은 로딩 시간에 포함
+        result.load_s = time.perf_counter() - start
+
+        per_image = []
+        for image in images:
+            timings = []
+            raw = None
+            for _ in range(max(1, runs)):
+                start = time.perf_counter()
+                raw = ocr.ocr(image)
+                timings.append((time.perf_counter() - start) * 1000)
+            per_image.append(float(np.median(timings)))
+            result.texts.append([r.text for r in parse_ocr_results(raw, CONFIDENCE)])
+        result.latency_ms = float(np.mean(per_image))
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def evaluate_profile(profile: Dict[str, Any], paths: List[str], runs: int = 3, use_gpu: bool = False,
+                     isolate: bool = True) -> ProfileResult:
+    """Measure one profile on the sample images
+
+    Args:
+        isolate: Run in a fresh process (accurate thread/MKL-DNN behaviour)
+    """
+    if not isolate:
+        return _evaluate(profile, paths, runs, use_gpu)
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            return pool.submit(_evaluate, profile, paths, runs, use_gpu).result()
+    except Exception as e:
+        # 자식 프로세스가 죽은 경우 (지원하지 않는 모델/옵션 조합)
+        return ProfileResult(profile, error=f"{type(e).__name__}: {e}")
+
+
+def profile_key(profile: Dict[str, Any]) -> tuple:
+    return tuple(sorted(resolve_ocr_profile(profile).items()))
+
+
+class OCRProfileTuner:
+    """Staged search for the fastest OCR profile on this machine
+
+    Starts from the built-in configuration, then varies one setting at a time
+    (threads, MKL-DNN, detection input size, detection model, recognition
+    model), keeping the best profile found so far for the next stage. Samples
+    without labels are scored against what the built-in configuration reads
+    on them, so a faster profile must not lose text it used to find.
+    """
+
+    def __init__(self, samples: List[Sample], runs: int = 3, tolerance: float = 0.02,
+                 use_gpu: bool = False, isolate: bool = True,
+                 progress: Optional[Callable[[ProfileResult], None]] = None):
+        """
+        Args:
+            samples: Sample images
+            runs: OCR repetitions per image (median is used)
+            tolerance: Accuracy a faster profile may lose against the most accurate one
+            use_gpu: Tune for GPU inference (thread/MKL-DNN stages are skipped)
+            isolate: Measure every profile in a fresh process
+            progress: Called with every finished measurement
+        """
+        if not samples:
+            raise ValueError("샘플 이미지가 없습니다")
+        self.samples = samples
+        self.paths = [s.path for s in samples]
+        self.runs = runs
+        self.tolerance = tolerance
+        self.use_gpu = use_gpu
+        self.isolate = isolate
+        self.progress = progress
+        self.results: Dict[tuple, ProfileResult] = {}
+        self.reference: Optional[ProfileResult] = None
+
+    def measure(self, profile: Dict[str, Any]) -> ProfileResult:
+        """Measure a profile (each profile only once)"""
+        profile = resolve_ocr_profile(profile)
+        key = profile_key(profile)
+        if key not in self.results:
+            result = evaluate_profile(profile, self.paths, self.runs, self.use_gpu, self.isolate)
+            if result.ok and self.reference is not None:
+                result.accuracy = self._accuracy(result)
+            self.results[key] = result
+            if self.progress:
+                self.progress(result)
+        return self.results[key]
+
+    def _accuracy(self, result: ProfileResult) -> float:
+        scores = []
+        for sample, reference_texts, texts in zip(self.samples, self.reference.texts, result.texts):
+            expected = sample.expected if sample.expected is not None else reference_texts
+            scores.extend(line_scores(expected, texts))
+        return float(np.mean(scores)) if scores else 1.0
+
+    def best(self) -> ProfileResult:
+        """Fastest measured profile within ``tolerance`` of the best accuracy"""
+        measured = [r for r in self.results.values() if r.ok]
+        top = max(r.accuracy for r in measured)
+        return min((r for r in measured if r.accuracy >= top - self.tolerance), key=lambda r: r.latency_ms)
+
+    def tune(self) -> ProfileResult:
+        """Run all stages and return the chosen profile"""
+        cores = os.cpu_count() or 1
+        # 기준: 지금까지 고정되어 있던 설정
+        self.reference = self.measure(dict(DEFAULT_OCR_PROFILE, cpu_threads=min(8, cores)))
+        if not self.reference.ok:
+            raise RuntimeError(f"기본 OCR 설정을 실행할 수 없습니다: {self.reference.error}")
+        self.reference.accuracy = self._accuracy(self.reference)
+
+        stages = [
+            ('det_limit_side_len', DET_LIMIT_SIDES),
+            ('det_model', DET_MODELS),
+            ('rec_model', REC_MODELS),
+        ]
+        if not self.use_gpu:
+            stages = [('cpu_threads', thread_candidates(cores)), ('enable_mkldnn', (True, False))] + stages
+
+        best = self.reference
+        for name, values in stages:
+            for value in values:
+                self.measure(dict(best.profile, **{name: value}))
+            best = self.best()
+            logger.info(f"OCR 프로파일 {name}: {best.profile[name]} ({best.latency_ms:.0f} ms, "
+                        f"정확도 {best.accuracy:.3f})")
+        return best
+
+
+def save_profile(settings, result: ProfileResult):
+    """Store a tuned profile in ``ocr.profile``
+
+    The core count is stored with it so a settings file copied to different
+    hardware falls back to the defaults instead of a mismatched profile.
+    """
+    profile = resolve_ocr_profile(result.profile)
+    profile.update({
+        'cpu_count': os.cpu_count(),
+        'latency_ms': round(result.latency_ms, 1),
+        'accuracy': round(result.accuracy, 4),
+        'tuned_at': datetime.now().isoformat(timespec='seconds'),
+    })
+    settings.set('ocr.profile', profile)
+    settings.save()
+    return profile
@@ -0,0 +1,491 @@
+"""
+PaddleOCR worker processes
+
+Inference runs outside the GUI process so it neither competes for the GIL
+with Qt nor takes the application down when Paddle crashes. Frames are
+handed to workers through shared memory; only small control messages are
+pickled.
+"""
+
+import time
+import queue
+import atexit
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Optional, List, Tuple, Dict, Any
+import numpy as np
+from logger.app_logger import get_logger
+from vision.ocr_common import (TextResult, check_gpu_availability, paddle_init_params, parse_ocr_results,
+                               create_text_recognizer, recognize_boxes, resolve_ocr_profile)
+
+
+class OCRServiceUnavailable(RuntimeError):
+    """No OCR worker could be started"""
+
+
+class OCRCancelled(RuntimeError):
+    """Request was cancelled before its result arrived"""
+
+
+class OCRWorkerError(RuntimeError):
+    """Worker failed, crashed or timed out while handling a request"""
+
+
+class _WorkerDied(Exception):
+    pass
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to a segment owned (and unlinked) by the parent"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Spawned workers share the parent's resource tracker, so the
+        # registration made here is the same one the parent's unlink removes
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(conn, cpu_threads: int, profile: Optional[Dict[str, Any]] = None):
+    """Worker process: load PaddleOCR once, then serve requests until told to stop
+
+    Messages in: (request_id, shm_name, shape, confidence_threshold, offset, boxes) or None;
+        ``boxes`` selects recognition-only of known text lines
+    Messages out: ('ready' | 'error', detail) once, then (request_id, results, error)
+    """
+    try:
+        from paddleocr import PaddleOCR
+        use_gpu = check_gpu_availability()
+        ocr = PaddleOCR(**paddle_init_params(use_gpu, cpu_threads, profile))
+        # 첫 추론 비용을 미리 지불 (warm-up)
+        ocr.ocr(np.full((32, 128, 3), 255, dtype=np.uint8))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+        return
+    conn.send(('ready', None))
+
+    shm = None
+    recognizer = None
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        request_id, shm_name, shape, confidence_threshold, offset, boxes = message
+        image = None
+        try:
+            if shm is None or shm.name != shm_name:
+                if shm is not None:
+                    shm.close()
+                shm = _attach_shared_memory(shm_name)
+            image = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            if boxes is not None:
+                if recognizer is None:
+                    recognizer = create_text_recognizer(use_gpu, cpu_threads, profile)
+                    if recognizer is None:
+                        raise RuntimeError("recognition-only model unavailable")
+                results = recognize_boxes(recognizer, image, boxes, confidence_threshold, offset)
+            else:
+                results = parse_ocr_results(ocr.ocr(image), confidence_threshold, offset)
+            conn.send((request_id, results, None))
+        except Exception as e:
+            conn.send((request_id, None, f"{type(e).__name__}: {e}"))
+        finally:
+            # The view must go before the segment can be closed
+            del image
+
+    if shm is not None:
+        shm.close()
+
+
+class OCRRequest:
+    """Handle for a submitted OCR request"""
+
+    def __init__(self, request_id: int, image: np.ndarray, confidence_threshold: float,
+                 offset: Tuple[int, int], boxes: Optional[List[Tuple[int, int, int, int]]] = None):
+        self.id = request_id
+        self.image = image
+        self.confidence_threshold = confidence_threshold
+        self.offset = offset
+        self.boxes = boxes
+        self.submitted = time.perf_counter()
+        self.elapsed: Optional[float] = None
+        self.worker: Optional[int] = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._results: Optional[List[TextResult]] = None
+        self._error: Optional[Exception] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return isinstance(self._error, OCRCancelled)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self) -> bool:
+        """Cancel the request; a running inference finishes but its result is dropped
+
+        Returns:
+            False if the request had already finished
+        """
+        return self._finish(error=OCRCancelled(f"OCR request {self.id} cancelled"))
+
+    def result(self, timeout: Optional[float] = None) -> List[TextResult]:
+        """Wait for the text results (raises the request's error)"""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"OCR request {self.id} timed out")
+        if self._error is not None:
+            raise self._error
+        return self._results
+
+    def _finish(self, results: Optional[List[TextResult]] = None,
+                error: Optional[Exception] = None) -> bool:
+        with self._lock:
+            if self._done.is_set():
+                return False
+            self._results, self._error = results, error
+            self.elapsed = time.perf_counter() - self.submitted
+            self.image = None  # release the frame
+            self._done.set()
+            return True
+
+
+class _Worker:
+    """Parent-side handle: one process, one shared-memory buffer, one dispatch thread"""
+
+    def __init__(self, service: 'OCRService', index: int):
+        self.service = service
+        self.index = index
+        self.logger = service.logger
+        self.process = None
+        self.conn = None
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.ready = threading.Event()
+        self.serving = False  # dispatch loop running (also while restarting)
+        self.startup_error: Optional[str] = None
+        self.restarts = 0
+        self.handled = 0
+        self.thread = threading.Thread(target=self._run, name=f"OCRWorker-{index}", daemon=True)
+
+    # ---- process lifecycle ----------------------------------------------
+
+    def _spawn(self):
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main,
+                                   args=(child_conn, self.service.cpu_threads, self.service.profile),
+                                   name=f"OCRWorker-{self.index}", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        started = time.perf_counter()
+        try:
+            status, detail = self._receive(self.service.startup_timeout)
+        except (_WorkerDied, TimeoutError) as e:
+            status, detail = 'error', str(e)
+        if status != 'ready':
+            self._stop_process()
+            raise OCRServiceUnavailable(f"OCR worker {self.index} failed to start: {detail}")
+        self.logger.info(f"OCR worker {self.index} ready (pid {self.process.pid}, "
+                         f"{time.perf_counter() - started:.1f}s)")
+
+    def _stop_process(self, graceful: bool = False):
+        if self.process is None:
+            return
+        if graceful and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=2.0)
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        self.process = None
+        self.conn = None
+
+    def _restart(self, reason: str):
+        self.logger.warning(f"OCR worker {self.index} restarting: {reason}")
+        self.ready.clear()
+        self._stop_process()
+        self.restarts += 1
+        try:
+            self._spawn()
+            self.ready.set()
+        except Exception as e:
+            self.startup_error = str(e)
+            self.logger.error(str(e))
+
+    def _receive(self, timeout: float):
+        """Next message from the worker, watching for crashes"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                if self.conn.poll(0.05):
+                    return self.conn.recv()
+            except (EOFError, OSError):
+                raise _WorkerDied("connection closed")
+            if not self.process.is_alive():
+                raise _WorkerDied(f"exit code {self.process.exitcode}")
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"no response within {timeout:.0f}s")
+
+    # ---- shared memory -----------------------------------------------------
+
+    def _ensure_buffer(self, nbytes: int):
+        if self.shm is not None and self.shm.size >= nbytes:
+            return
+        self._release_buffer()
+        # Grow with headroom so slightly larger regions do not reallocate
+        self.shm = shared_memory.SharedMemory(create=True, size=max(nbytes + nbytes // 2, 1 << 20))
+
+    def _release_buffer(self):
+        if self.shm is not None:
+            self.shm.close()
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = None
+
+    # ---- dispatch ------------------------------------------------------------
+
+    def _run(self):
+        try:
+            self._spawn()
+            self.ready.set()
+            self.serving = True
+        except Exception as e:
+            self.startup_error = str(e)
+            self.logger.error(str(e))
+        self.service._worker_started(self)
+
+        # Serve until shut down or until the worker cannot be (re)started
+        while self.ready.is_set():
+            request = self.service._queue.get()
+            if request is None:
+                break
+            if request.done():
+                continue  # cancelled while queued
+            self._handle(request)
+
+        self.serving = False
+        self._stop_process(graceful=True)
+        self._release_buffer()
+        self.service._worker_stopped(self)
+
+    def _handle(self, request: OCRRequest):
+        request.worker = self.index
+        image = request.image
+        if image is None:
+            return
+        if not self.process.is_alive():
+            # Died while idle: replace it before handing it work
+            self._restart(f"exit code {self.process.exitcode} while idle")
+            if not self.ready.is_set():
+                request._finish(error=OCRServiceUnavailable(
+                    f"OCR worker {self.index} could not be restarted: {self.startup_error}"))
+                return
+        try:
+            image = np.asarray(image, dtype=np.uint8)
+            self._ensure_buffer(image.nbytes)
+            # Crops (strided views) are copied straight into shared memory
+            view = np.ndarray(image.shape, dtype=np.uint8, buffer=self.shm.buf)
+            np.copyto(view, image)
+            del view
+            try:
+                self.conn.send((request.id, self.shm.name, image.shape,
+                                request.confidence_threshold, tuple(request.offset), request.boxes))
+            except (OSError, EOFError) as e:
+                raise _WorkerDied(f"send failed: {e}")
+            request_id, results, error = self._receive(self.service.request_timeout)
+            self.handled += 1
+            if error:
+                request._finish(error=OCRWorkerError(f"OCR worker {self.index}: {error}"))
+            else:
+                request._finish(results=results)
+        except _WorkerDied as e:
+            request._finish(error=OCRWorkerError(f"OCR worker {self.index} died ({e})"))
+            self._restart(str(e))
+        except TimeoutError as e:
+            # A hung inference blocks the worker: replace it
+            request._finish(error=OCRWorkerError(f"OCR worker {self.index}: {e}"))
+            self._restart(str(e))
+        except Exception as e:
+            request._finish(error=OCRWorkerError(f"OCR worker {self.index}: {e}"))
+
+
+class OCRService:
+    """Pool of warm PaddleOCR worker processes
+
+    Requests are queued and picked up by the first idle worker, so with two
+    workers independent text searches (e.g. an IF condition and the step that
+    follows) run concurrently.
+    """
+
+    def __init__(self, workers: int = 1, request_timeout: float = 60.0,
+                 startup_timeout: float = 300.0, cpu_threads: int = 0,
+                 profile: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            workers: Number of worker processes
+            request_timeout: A worker not answering within this time is restarted
+            startup_timeout: Time allowed for model loading
+            cpu_threads: Paddle CPU threads per worker (0: the profile's threads
+                shared by the workers, or cores / workers, max 8)
+            profile: OCR engine profile (models, detection size, threads, MKL-DNN)
+        """
+        self.logger = get_logger(__name__)
+        self.workers_count = max(1, int(workers))
+        self.request_timeout = request_timeout
+        self.startup_timeout = startup_timeout
+        self.profile = profile
+        tuned_threads = resolve_ocr_profile(profile)['cpu_threads']
+        if tuned_threads:
+            self.cpu_threads = cpu_threads or max(1, tuned_threads // self.workers_count)
+        else:
+            self.cpu_threads = cpu_threads or max(1, min(8, multiprocessing.cpu_count() // self.workers_count))
+        self._queue: "queue.Queue[Optional[OCRRequest]]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+        self._pending_start = 0
+        self._next_id = 0
+
+    def start(self):
+        """Spawn the workers in the background (models load while the app keeps running)"""
+        with self._lock:
+            if self._workers:
+                return
+            self._queue = queue.Queue()
+            self._started.clear()
+            self._pending_start = self.workers_count
+            self._workers = [_Worker(self, i) for i in range(self.workers_count)]
+            for worker in self._workers:
+                worker.thread.start()
+
+    def _worker_started(self, worker: _Worker):
+        with self._lock:
+            self._pending_start -= 1
+            if self._pending_start <= 0:
+                self._started.set()
+                self._fail_queued_if_unavailable()
+
+    def _worker_stopped(self, worker: _Worker):
+        with self._lock:
+            self._fail_queued_if_unavailable()
+
+    def _fail_queued_if_unavailable(self):
+        """Requests left behind when no worker can serve them (call with the lock held)"""
+        if self._started.is_set() and not any(w.serving for w in self._workers):
+            self._fail_queued(OCRServiceUnavailable("No OCR worker is running"))
+
+    def _fail_queued(self, error: Exception):
+        stop_signals = 0
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                stop_signals += 1
+            else:
+                request._finish(error=error)
+        # Keep shutdown signals for workers that are still running
+        for _ in range(stop_signals):
+            self._queue.put(None)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every worker finished starting; True if at least one is usable"""
+        self.start()
+        self._started.wait(timeout)
+        return self.available
+
+    @property
+    def available(self) -> bool:
+        """False once every worker has failed to start"""
+        if not self._started.is_set():
+            return True
+        return any(worker.serving for worker in self._workers)
+
+    def submit(self, image: np.ndarray, confidence_threshold: float = 0.5,
+               offset: Tuple[int, int] = (0, 0),
+               boxes: Optional[List[Tuple[int, int, int, int]]] = None) -> OCRRequest:
+        """Queue an RGB image for OCR
+
+        Args:
+            image: RGB (or grayscale) uint8 array; it is copied into shared memory
+                when a worker picks the request up, so it must not be modified
+            confidence_threshold: Minimum recognition score
+            offset: Screen position of the image's top-left corner
+            boxes: Known text-line boxes (image coordinates); skips detection and
+                only recognizes these crops
+        """
+        self.start()
+        with self._lock:
+            if not self.available:
+                raise OCRServiceUnavailable("No OCR worker is running")
+            self._next_id += 1
+            request = OCRRequest(self._next_id, image, confidence_threshold, offset, boxes)
+            self._queue.put(request)
+        return request
+
+    def recognize(self, image: np.ndarray, confidence_threshold: float = 0.5,
+                  offset: Tuple[int, int] = (0, 0), timeout: Optional[float] = None,
+                  boxes: Optional[List[Tuple[int, int, int, int]]] = None) -> List[TextResult]:
+        """Submit and wait for the results"""
+        request = self.submit(image, confidence_threshold, offset, boxes)
+        try:
+            return request.result(timeout)
+        except TimeoutError:
+            request.cancel()
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-worker state"""
+        return {
+            'queued': self._queue.qsize(),
+            'workers': [{
+                'index': worker.index,
+                'pid': worker.process.pid if worker.process else None,
+                'ready': worker.ready.is_set(),
+                'handled': worker.handled,
+                'restarts': worker.restarts,
+                'error': worker.startup_error,
+            } for worker in self._workers],
+        }
+
+    def shutdown(self):
+        """Stop all workers and release shared memory"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._fail_queued(OCRCancelled("OCR service shut down"))
+            for _ in workers:
+                self._queue.put(None)
+        for worker in workers:
+            worker.thread.join(timeout=5.0)
+
+
+# 전역 OCR 서비스 (실행 사이에도 워커를 유지)
+_ocr_service = None
+_service_lock = threading.Lock()
+
+
+def get_ocr_service(workers: int = 1, request_timeout: float = 60.0,
+                    profile: Optional[Dict[str, Any]] = None) -> OCRService:
+    """Get global OCR service (options apply on first call)"""
+    global _ocr_service
+    with _service_lock:
+        if _ocr_service is None:
+            _ocr_service = OCRService(workers, request_timeout, profile=profile)
+            atexit.register(_ocr_service.shutdown)
+        return _ocr_service
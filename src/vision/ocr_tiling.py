@@ -0,0 +1,158 @@
+"""
+Tiling of large frames for OCR and merging of results across tile seams
+"""
+
+from typing import List, Tuple, Dict, Optional
+from vision.ocr_common import TextResult
+
+Region = Tuple[int, int, int, int]  # x, y, width, height (virtual-desktop coordinates)
+
+
+def _intersect(a: Region, b: Region) -> Optional[Region]:
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def _spans(start: int, length: int, tile: int, overlap: int) -> List[Tuple[int, int]]:
+    """Evenly sized [start, end) spans no longer than ``tile`` overlapping by ``overlap``"""
+    if length <= tile:
+        return [(start, start + length)]
+    step = tile - overlap
+    count = -(-(length - overlap) // step)
+    size = -(-(length + (count - 1) * overlap) // count)
+    spans = []
+    for i in range(count):
+        s = start + min(i * (size - overlap), length - size)
+        spans.append((s, s + size))
+    return spans
+
+
+def monitor_areas(region: Region, monitors: List[Dict[str, int]]) -> List[Region]:
+    """Parts of ``region`` on each monitor (index 0 of mss' list is the whole desktop)"""
+    screens = [(m["left"], m["top"], m["width"], m["height"]) for m in monitors[1:]] or [region]
+    areas = [_intersect(region, screen) for screen in screens]
+    return [area for area in areas if area is not None] or [region]
+
+
+def plan_tiles(region: Region, monitors: List[Dict[str, int]], tile_size: int = 960,
+               overlap: int = 64) -> List[Region]:
+    """Overlapping tiles covering ``region``, never straddling two monitors
+
+    Args:
+        region: Frame region (usually the whole virtual desktop)
+        monitors: mss-style monitor list (index 0 is the virtual desktop)
+        tile_size: Longest tile side (the detection model's input size)
+        overlap: Pixels shared by neighbouring tiles; should exceed the
+            height of the largest text expected so a line cut by one tile is
+            complete in the other
+
+    Returns:
+        Tiles in virtual-desktop coordinates
+    """
+    tiles = []
+    for x, y, w, h in monitor_areas(region, monitors):
+        for y0, y1 in _spans(y, h, tile_size, overlap):
+            for x0, x1 in _spans(x, w, tile_size, overlap):
+                tiles.append((x0, y0, x1 - x0, y1 - y0))
+    return tiles
+
+
+def _touches_seam(bbox: Region, tile: Region, outer: List[Region], margin: int) -> bool:
+    """True if the box reaches a tile edge that is not also an edge of the frame/monitor"""
+    x, y, w, h = bbox
+    tx, ty, tw, th = tile
+    for ox, oy, ow, oh in outer:
+        if _intersect(tile, (ox, oy, ow, oh)) is None:
+            continue
+        if x - tx <= margin and tx > ox:
+            return True
+        if y - ty <= margin and ty > oy:
+            return True
+        if tx + tw - (x + w) <= margin and tx + tw < ox + ow:
+            return True
+        if ty + th - (y + h) <= margin and ty + th < oy + oh:
+            return True
+    return False
+
+
+def _overlap_ratio(a: Region, b: Region) -> float:
+    """Intersection area divided by the smaller box's area"""
+    inter = _intersect(a, b)
+    if inter is None:
+        return 0.0
+    smaller = min(a[2] * a[3], b[2] * b[3])
+    return inter[2] * inter[3] / smaller if smaller else 0.0
+
+
+def _same_line(a: Region, b: Region, min_ratio: float = 0.6) -> bool:
+    top, bottom = max(a[1], b[1]), min(a[1] + a[3], b[1] + b[3])
+    return bottom - top >= min_ratio * min(a[3], b[3])
+
+
+def _join_text(left: str, right: str) -> str:
+    """Join two fragments of one line, dropping the characters both tiles saw"""
+    for size in range(min(len(left), len(right)), 0, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return f"{left} {right}"
+
+
+def _union(a: TextResult, b: TextResult) -> TextResult:
+    """One line from two overlapping fragments (``a`` starts further left)"""
+    x0, y0 = min(a.bbox[0], b.bbox[0]), min(a.bbox[1], b.bbox[1])
+    x1 = max(a.bbox[0] + a.bbox[2], b.bbox[0] + b.bbox[2])
+    y1 = max(a.bbox[1] + a.bbox[3], b.bbox[1] + b.bbox[3])
+    return TextResult(text=_join_text(a.text, b.text),
+                      confidence=min(a.confidence, b.confidence),
+                      bbox=(x0, y0, x1 - x0, y1 - y0),
+                      center=((x0 + x1) // 2, (y0 + y1) // 2))
+
+
+def merge_tile_results(tile_results: List[Tuple[Region, List[TextResult]]], outer: List[Region],
+                       duplicate_ratio: float = 0.5, contained_ratio: float = 0.9,
+                       seam_margin: int = 4) -> List[TextResult]:
+    """Combine per-tile OCR results into one list
+
+    Text inside an overlap is found by both tiles: of two boxes covering the
+    same pixels the one not cut by a tile seam wins (then the larger, then the
+    more confident). A line longer than the overlap is cut in both tiles;
+    its two fragments on the same row are joined into one result.
+
+    Args:
+        tile_results: (tile, results) pairs, results in virtual-desktop coordinates
+        outer: monitor_areas() of the frame; their edges are not seams
+        duplicate_ratio: Overlap (relative to the smaller box) that marks a duplicate
+        contained_ratio: Overlap above which two cut fragments are the same
+            fragment rather than two halves of a line
+        seam_margin: Distance from a tile edge at which a box counts as cut
+    """
+    candidates = []
+    for tile, results in tile_results:
+        for result in results:
+            cut = _touches_seam(result.bbox, tile, outer, seam_margin)
+            candidates.append((cut, result))
+    candidates.sort(key=lambda c: (c[0], -c[1].bbox[2] * c[1].bbox[3], -c[1].confidence))
+
+    merged: List[Tuple[bool, TextResult]] = []
+    for cut, result in candidates:
+        for i, (kept_cut, kept) in enumerate(merged):
+            if not _same_line(kept.bbox, result.bbox):
+                continue
+            ratio = _overlap_ratio(kept.bbox, result.bbox)
+            if ratio >= contained_ratio:
+                break  # same text seen by two tiles; the better box was kept first
+            if cut and kept_cut and ratio > 0:
+                first, second = sorted((kept, result), key=lambda r: r.bbox[0])
+                merged[i] = (True, _union(first, second))
+                break
+            if ratio >= duplicate_ratio:
+                break
+        else:
+            merged.append((cut, result))
+
+    results = [result for _, result in merged]
+    results.sort(key=lambda r: (r.bbox[1], r.bbox[0]))
+    return results
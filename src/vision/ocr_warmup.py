@@ -0,0 +1,188 @@
+"""
+Background OCR model loading and warm-up
+
+The models are loaded on a daemon thread once the main window is up, so
+neither application start nor the first text step waits for them unless OCR
+is actually needed before loading finished.
+"""
+
+import os
+import threading
+from concurrent.futures import Future
+from typing import Optional, List, Tuple, Callable
+import numpy as np
+from logger.app_logger import get_logger
+
+ProgressCallback = Callable[[int, str], None]  # percent, message
+
+# Typical form/EMR screen text: Hangul, digits, punctuation, mixed Latin
+WARMUP_LINES = (
+    "환자번호 12345678   이름: 홍길동",
+    "진료과: 내과   담당의: 김민수   2025-07-31",
+    "저장되었습니다. (처리 완료)",
+    "Excel Macro 검색 결과 3건",
+)
+
+_FONT_CANDIDATES = (
+    "C:/Windows/Fonts/malgun.ttf",
+    "C:/Windows/Fonts/gulim.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+)
+
+
+def render_warmup_image(lines=WARMUP_LINES, font_size: int = 18, width: int = 640,
+                        line_gap: int = 14) -> Tuple[np.ndarray, List[Tuple[int, int, int, int]]]:
+    """Screen-like RGB image of Korean UI text and its line boxes
+
+    Renders with a system Korean font when PIL and one of the usual fonts are
+    available; otherwise draws the Latin/digit parts with OpenCV so detection
+    and recognition still run on real glyphs of a realistic size.
+    """
+    height = line_gap + len(lines) * (font_size + line_gap) + line_gap
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    image[:line_gap + font_size + line_gap // 2] = (236, 240, 245)  # header row background
+    boxes = []
+
+    font = None
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+        for path in _FONT_CANDIDATES:
+            if os.path.exists(path):
+                font = ImageFont.truetype(path, font_size)
+                break
+    except Exception:
+        font = None
+
+    if font is not None:
+        canvas = Image.fromarray(image)
+        draw = ImageDraw.Draw(canvas)
+        y = line_gap
+        for text in lines:
+            left, top, right, bottom = draw.textbbox((12, y), text, font=font)
+            draw.text((12, y), text, fill=(33, 37, 41), font=font)
+            boxes.append((left, top, right - left, bottom - top))
+            y += font_size + line_gap
+        return np.array(canvas), boxes
+
+    import cv2
+    y = line_gap
+    for text in lines:
+        ascii_text = "".join(c for c in text if c.isascii()).strip() or "12345"
+        scale = font_size / 30
+        (w, h), baseline = cv2.getTextSize(ascii_text, cv2.FONT_HERSHEY_SIMPLEX, scale, 1)
+        cv2.putText(image, ascii_text, (12, y + h), cv2.FONT_HERSHEY_SIMPLEX, scale, (33, 37, 41), 1,
+                    cv2.LINE_AA)
+        boxes.append((12, y, w, h + baseline))
+        y += font_size + line_gap
+    return image, boxes
+
+
+class OCRWarmup:
+    """Loads and warms up the OCR models on a background thread
+
+    ``start()`` returns a future that resolves to True once OCR is ready
+    (False if it cannot be used). Progress is reported to listeners as
+    (percent, message) from the loading thread.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[ProgressCallback] = []
+        self.progress: Tuple[int, str] = (0, "")
+
+    def start(self) -> Future:
+        """Begin loading (no-op if already started)"""
+        with self._lock:
+            if self._future is None:
+                self._future = Future()
+                self._future.set_running_or_notify_cancel()
+                self._thread = threading.Thread(target=self._run, name="OCRWarmup", daemon=True)
+                self._thread.start()
+            return self._future
+
+    @property
+    def future(self) -> Optional[Future]:
+        """Readiness future, None until started"""
+        return self._future
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def is_ready(self) -> bool:
+        """True once loading finished successfully"""
+        return self._future is not None and self._future.done() and self._future.result()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading finished (returns at once if it was never started)
+
+        Returns:
+            True if OCR is ready
+        """
+        if self._future is None:
+            return False
+        if threading.current_thread() is self._thread:
+            return False  # called from the loading itself
+        try:
+            return self._future.result(timeout)
+        except Exception:
+            return False
+
+    def add_listener(self, callback: ProgressCallback):
+        """Receive progress updates (called with the current progress right away)"""
+        with self._lock:
+            self._listeners.append(callback)
+            percent, message = self.progress
+        if message:
+            callback(percent, message)
+
+    def remove_listener(self, callback: ProgressCallback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _report(self, percent: int, message: str):
+        with self._lock:
+            self.progress = (percent, message)
+            listeners = list(self._listeners)
+        self.logger.info(f"OCR 준비 {percent}%: {message}")
+        for callback in listeners:
+            try:
+                callback(percent, message)
+            except Exception as e:
+                self.logger.debug(f"OCR warm-up listener failed: {e}")
+
+    def _run(self):
+        ready = False
+        try:
+            self._report(5, "OCR 구성요소 확인 중...")
+            from vision.text_extractor_paddle import PaddleTextExtractor, PADDLEOCR_AVAILABLE
+            if not PADDLEOCR_AVAILABLE:
+                self._report(100, "PaddleOCR이 설치되지 않았습니다")
+            else:
+                ready = PaddleTextExtractor().preload_models(self._report)
+                if not ready:
+                    self._report(100, "OCR 초기화 실패 (텍스트 검색 시 다시 시도)")
+        except Exception as e:
+            self.logger.error(f"OCR warm-up failed: {e}")
+            self._report(100, "OCR 초기화 실패 (텍스트 검색 시 다시 시도)")
+        finally:
+            self._future.set_result(ready)
+
+
+# 전역 OCR 준비 상태
+_ocr_warmup = None
+
+
+def get_ocr_warmup() -> OCRWarmup:
+    """Get global OCR warm-up"""
+    global _ocr_warmup
+    if _ocr_warmup is None:
+        _ocr_warmup = OCRWarmup()
+    return _ocr_warmup
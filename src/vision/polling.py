@@ -0,0 +1,184 @@
+"""
+Change detection and adaptive polling for wait steps
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple, List, Callable
+import numpy as np
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+
+
+@dataclass
+class WaitStats:
+    """Counters reported by change-driven waits"""
+    polls: int = 0
+    skipped_polls: int = 0     # screen unchanged, no matching at all
+    full_matches: int = 0      # whole region matched
+    partial_matches: int = 0   # only changed tiles matched
+    tiles_total: int = 0
+    tiles_matched: int = 0
+
+    @property
+    def skipped_matches(self) -> int:
+        """Polls that did not need a full-region match"""
+        return self.polls - self.full_matches
+
+    def summary(self) -> str:
+        tile_ratio = self.tiles_matched / self.tiles_total * 100 if self.tiles_total else 0.0
+        return (f"polls={self.polls}, skipped_polls={self.skipped_polls}, "
+                f"full_matches={self.full_matches}, partial_matches={self.partial_matches}, "
+                f"skipped_matches={self.skipped_matches}, dirty_tiles={tile_ratio:.1f}%")
+
+
+class AdaptivePoller:
+    """Polling interval that is short right after input or screen changes
+    and backs off while the screen stays idle
+    """
+
+    def __init__(self, min_interval: float = 0.05, max_interval: float = 0.5,
+                 backoff: float = 1.5, fast_window: float = 1.0,
+                 last_input_time: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            min_interval: Interval used right after input or a screen change
+            max_interval: Upper bound while idle (the old fixed interval)
+            backoff: Growth factor per unchanged poll
+            fast_window: Seconds after an input action that stay at min_interval
+            last_input_time: Returns perf_counter() of the last input action
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.fast_window = fast_window
+        self._last_input_time = last_input_time
+        self.interval = min_interval
+
+    def update(self, changed: bool) -> float:
+        """Compute the next interval from whether the last poll saw a change"""
+        recent_input = (self._last_input_time is not None and
+                        time.perf_counter() - self._last_input_time() < self.fast_window)
+        if changed or recent_input:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return self.interval
+
+    def sleep(self, changed: bool, deadline: Optional[float] = None):
+        """Sleep for the next interval, never past ``deadline`` (time.time())"""
+        interval = self.update(changed)
+        if deadline is not None:
+            interval = min(interval, max(0.0, deadline - time.time()))
+        if interval > 0:
+            time.sleep(interval)
+
+
+class FrameDiffer:
+    """Detect which tiles of a region changed between successive frames
+
+    Frames are block-averaged by ``scale`` before comparing so the diff costs a
+    fraction of a template match.
+    """
+
+    def __init__(self, tile_size: int = 64, scale: int = 4, threshold: float = 2.0):
+        """
+        Args:
+            tile_size: Tile edge in full-resolution pixels (multiple of ``scale``)
+            scale: Block size used for downscaling
+            threshold: Mean-intensity difference that marks a block as changed
+        """
+        self.scale = max(1, scale)
+        self.tile_size = max(self.scale, tile_size // self.scale * self.scale)
+        self.threshold = threshold
+        self._previous: Optional[np.ndarray] = None
+
+    def reset(self):
+        self._previous = None
+
+    def _downscale(self, gray: np.ndarray) -> np.ndarray:
+        """Block sums over ``scale`` x ``scale`` blocks (partial edge blocks included)"""
+        s = self.scale
+        rows = np.add.reduceat(gray, np.arange(0, gray.shape[0], s), axis=0, dtype=np.uint32)
+        blocks = np.add.reduceat(rows, np.arange(0, gray.shape[1], s), axis=1)
+        return blocks.astype(np.float32) / (s * s)
+
+    def update(self, gray: np.ndarray) -> Optional[List[Rect]]:
+        """Feed the next frame
+
+        Returns:
+            None for the first frame (or after a size change), an empty list when
+            nothing changed, otherwise the changed tiles in frame coordinates
+        """
+        small = self._downscale(gray)
+        previous = self._previous
+        self._previous = small
+        if previous is None or previous.shape != small.shape:
+            return None
+
+        changed = np.abs(small - previous) > self.threshold
+        if not changed.any():
+            return []
+
+        # Collapse changed blocks into tiles
+        t = self.tile_size // self.scale
+        rows = -(-changed.shape[0] // t)
+        cols = -(-changed.shape[1] // t)
+        padded = np.zeros((rows * t, cols * t), dtype=bool)
+        padded[:changed.shape[0], :changed.shape[1]] = changed
+        tiles = padded.reshape(rows, t, cols, t).any(axis=(1, 3))
+
+        height, width = gray.shape[:2]
+        dirty = []
+        for ty, tx in zip(*np.nonzero(tiles)):
+            x = int(tx) * self.tile_size
+            y = int(ty) * self.tile_size
+            dirty.append((x, y, min(self.tile_size, width - x), min(self.tile_size, height - y)))
+        return dirty
+
+    def tile_count(self, shape: Tuple[int, ...]) -> int:
+        """Number of tiles covering a frame of the given shape"""
+        return (-(-shape[0] // self.tile_size)) * (-(-shape[1] // self.tile_size))
+
+
+def search_windows(dirty: List[Rect], template_size: Tuple[int, int],
+                   frame_size: Tuple[int, int]) -> List[Rect]:
+    """Windows that contain every template placement overlapping a dirty tile
+
+    Each tile is grown by the template size minus one pixel on the top/left and
+    bottom/right, clipped to the frame, and overlapping windows are merged.
+
+    Args:
+        dirty: Changed tiles (x, y, w, h)
+        template_size: (width, height) of the template
+        frame_size: (width, height) of the frame
+    """
+    tw, th = template_size
+    fw, fh = frame_size
+    windows = []
+    for x, y, w, h in dirty:
+        x0 = max(0, x - tw + 1)
+        y0 = max(0, y - th + 1)
+        x1 = min(fw, x + w + tw - 1)
+        y1 = min(fh, y + h + th - 1)
+        windows.append([x0, y0, x1, y1])
+
+    # Merge overlapping windows until stable
+    merged = True
+    while merged:
+        merged = False
+        result = []
+        for box in windows:
+            for other in result:
+                if box[0] <= other[2] and other[0] <= box[2] and box[1] <= other[3] and other[1] <= box[3]:
+                    other[0] = min(other[0], box[0])
+                    other[1] = min(other[1], box[1])
+                    other[2] = max(other[2], box[2])
+                    other[3] = max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                result.append(box)
+        windows = result
+
+    return [(x0, y0, x1 - x0, y1 - y0) for x0, y0, x1, y1 in windows]
@@ -0,0 +1,285 @@
+"""
+Shared screen capture service with short-lived frame reuse
+"""
+
+import threading
+import time
+from typing import Optional, Tuple, List, Dict, Any
+import numpy as np
+from logger.app_logger import get_logger
+from vision.capture_backends import CaptureBackend, MssBackend, create_backend, BACKEND_MSS
+
+try:
+    import cv2
+except ImportError:  # numpy fallback for colour conversion
+    cv2 = None
+
+Region = Tuple[int, int, int, int]  # x, y, width, height
+
+
+class ScreenFrame:
+    """Captured BGRA pixels tagged with their virtual-desktop origin and capture time
+
+    Crops share memory with the frame they were cut from, and colour conversions
+    are computed once per frame and reused by every caller.
+    """
+
+    def __init__(self, bgra: np.ndarray, left: int, top: int,
+                 timestamp: float, generation: int = 0):
+        self.bgra = bgra
+        self.left = left
+        self.top = top
+        self.timestamp = timestamp
+        self.generation = generation
+        self._converted: Dict[str, np.ndarray] = {}
+        self._gray_pyramid: Optional[List[np.ndarray]] = None
+
+    @property
+    def width(self) -> int:
+        return self.bgra.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.bgra.shape[0]
+
+    @property
+    def region(self) -> Region:
+        return (self.left, self.top, self.width, self.height)
+
+    def age_ms(self) -> float:
+        """Milliseconds since the frame was captured"""
+        return (time.perf_counter() - self.timestamp) * 1000
+
+    def contains(self, region: Region) -> bool:
+        """Check whether a region lies entirely inside this frame"""
+        x, y, w, h = region
+        return (x >= self.left and y >= self.top and
+                x + w <= self.left + self.width and
+                y + h <= self.top + self.height)
+
+    def crop(self, region: Region) -> 'ScreenFrame':
+        """Zero-copy view of a region given in virtual-desktop coordinates"""
+        x, y, w, h = region
+        x0 = x - self.left
+        y0 = y - self.top
+        view = ScreenFrame(self.bgra[y0:y0 + h, x0:x0 + w], x, y,
+                           self.timestamp, self.generation)
+        for key, converted in self._converted.items():
+            view._converted[key] = converted[y0:y0 + h, x0:x0 + w]
+        return view
+
+    def _convert(self, key: str, code_name: str, fallback) -> np.ndarray:
+        converted = self._converted.get(key)
+        if converted is None:
+            if cv2 is not None:
+                converted = cv2.cvtColor(self.bgra, getattr(cv2, code_name))
+            else:
+                converted = np.ascontiguousarray(fallback(self.bgra))
+            converted.flags.writeable = False
+            self._converted[key] = converted
+        return converted
+
+    def bgr(self) -> np.ndarray:
+        """BGR image (OpenCV layout)"""
+        return self._convert('bgr', 'COLOR_BGRA2BGR', lambda a: a[..., :3])
+
+    def rgb(self) -> np.ndarray:
+        """RGB image (PIL / PaddleOCR layout)"""
+        return self._convert('rgb', 'COLOR_BGRA2RGB', lambda a: a[..., 2::-1])
+
+    def gray(self) -> np.ndarray:
+        """Grayscale image used for template matching"""
+        return self._convert(
+            'gray', 'COLOR_BGRA2GRAY',
+            lambda a: (a[..., 2] * 0.299 + a[..., 1] * 0.587 + a[..., 0] * 0.114).astype(np.uint8))
+
+    def gray_pyramid(self, levels: int) -> List[np.ndarray]:
+        """Grayscale Gaussian pyramid [full, 1/2, ...], built once per frame"""
+        pyramid = self._gray_pyramid
+        if pyramid is None:
+            pyramid = [self.gray()]
+        while len(pyramid) <= levels:
+            pyramid.append(cv2.pyrDown(pyramid[-1]))
+        self._gray_pyramid = pyramid
+        return pyramid
+
+
+class ScreenCapture:
+    """Screen grabber shared by the vision stack
+
+    Pixels come from a pluggable CaptureBackend: live ``mss`` (one instance per
+    thread) by default, XShm for Xvfb displays, or replay of recorded frames for
+    headless benchmarks. Frames captured within the freshness window are served again (as crops) instead of grabbing the same
+    pixels twice. ``invalidate()`` is called after every input action so a
+    click or keystroke always forces a fresh capture.
+    """
+
+    def __init__(self, freshness_ms: Optional[float] = 30.0, max_frames: int = 3,
+                 backend: Optional[CaptureBackend] = None):
+        """
+        Args:
+            freshness_ms: How long a frame may be reused. ``None`` reuses frames
+                until the next input action.
+            max_frames: Number of recent frames kept for reuse
+            backend: Pixel source, defaults to live mss capture
+        """
+        self.logger = get_logger(__name__)
+        self.freshness_ms = freshness_ms
+        self.max_frames = max_frames
+        self._backend = backend or MssBackend()
+        self._backend_config = (BACKEND_MSS, ())
+        self._step_index = 0
+        self._lock = threading.Lock()
+        self._frames: List[ScreenFrame] = []
+        self._generation = 0
+        self._last_input_time = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, freshness_ms: Optional[float] = 30.0, max_frames: Optional[int] = None):
+        """Update reuse settings"""
+        self.freshness_ms = freshness_ms
+        if max_frames is not None:
+            self.max_frames = max_frames
+
+    @property
+    def backend(self) -> CaptureBackend:
+        return self._backend
+
+    def set_backend(self, backend: CaptureBackend):
+        """Switch the pixel source (drops cached frames)"""
+        with self._lock:
+            old = self._backend
+            self._backend = backend
+            self._backend_config = (backend.name, ())
+            self._generation += 1
+            self._frames.clear()
+        if old is not backend:
+            old.close()
+        self.logger.info(f"Screen capture backend: {backend.name}")
+
+    def configure_backend(self, name: str = BACKEND_MSS, **options):
+        """Select a backend by name; no-op when the same configuration is active
+
+        See ``capture_backends.create_backend`` for the options.
+        """
+        config = (name, tuple(sorted(options.items())))
+        if config == self._backend_config:
+            return
+        try:
+            self.set_backend(create_backend(name, **options))
+            self._backend_config = config
+        except Exception as e:
+            self.logger.error(f"Failed to create capture backend '{name}': {e}")
+
+    def begin_step(self) -> int:
+        """Advance the step counter (replay backends key frames by it)"""
+        self._step_index += 1
+        self._backend.set_step(self._step_index)
+        return self._step_index
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        """mss-style monitor list; index 0 is the combined virtual desktop"""
+        return self._backend.monitors
+
+    def virtual_region(self) -> Region:
+        """Bounding region of all monitors"""
+        vm = self.monitors[0]
+        return (vm["left"], vm["top"], vm["width"], vm["height"])
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every input action"""
+        return self._generation
+
+    @property
+    def last_input_time(self) -> float:
+        """perf_counter() timestamp of the last input action"""
+        return self._last_input_time
+
+    def grab(self, region: Optional[Region] = None,
+             max_age_ms: Optional[float] = -1) -> ScreenFrame:
+        """Return a frame for the region, reusing a recent capture when possible
+
+        Args:
+            region: (x, y, width, height) or None for the whole virtual desktop
+            max_age_ms: Reuse window for this call. -1 uses the configured
+                window, 0 forces a fresh capture, None accepts any frame taken
+                since the last input action.
+        """
+        target = tuple(int(v) for v in region) if region else self.virtual_region()
+        if max_age_ms == -1:
+            max_age_ms = self.freshness_ms
+
+        if max_age_ms is None or max_age_ms > 0:
+            frame = self._find_cached(target, max_age_ms)
+            if frame is not None:
+                self.hits += 1
+                return frame
+
+        self.misses += 1
+        return self._capture(target)
+
+    def _find_cached(self, target: Region, max_age_ms: Optional[float]) -> Optional[ScreenFrame]:
+        now = time.perf_counter()
+        with self._lock:
+            for frame in reversed(self._frames):
+                if frame.generation != self._generation:
+                    continue
+                if max_age_ms is not None and (now - frame.timestamp) * 1000 > max_age_ms:
+                    continue
+                if frame.region == target:
+                    return frame
+                if frame.contains(target):
+                    return frame.crop(target)
+        return None
+
+    def _capture(self, target: Region) -> ScreenFrame:
+        x, y, w, h = target
+        bgra = self._backend.grab(target)
+
+        with self._lock:
+            frame = ScreenFrame(bgra, x, y, time.perf_counter(), self._generation)
+            # Drop frames that the new capture fully covers, then trim to size
+            self._frames = [f for f in self._frames
+                            if f.generation == self._generation and not frame.contains(f.region)]
+            self._frames.append(frame)
+            if len(self._frames) > self.max_frames:
+                self._frames = self._frames[-self.max_frames:]
+        return frame
+
+    def invalidate(self):
+        """Discard cached frames (called after mouse/keyboard input)"""
+        with self._lock:
+            self._generation += 1
+            self._last_input_time = time.perf_counter()
+            self._frames.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Frame reuse counters"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'cached_frames': len(self._frames),
+        }
+
+    def close(self):
+        """Close the calling thread's grabber and drop cached frames"""
+        self._backend.close()
+        with self._lock:
+            self._frames.clear()
+
+
+# 전역 캡처 서비스
+_screen_capture = None
+
+
+def get_screen_capture() -> ScreenCapture:
+    """Get global screen capture service"""
+    global _screen_capture
+    if _screen_capture is None:
+        _screen_capture = ScreenCapture()
+    return _screen_capture
@@ -0,0 +1,250 @@
+"""
+Byte-bounded LRU cache for preprocessed templates with an on-disk store
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Tuple, Union, Any
+import numpy as np
+from logger.app_logger import get_logger
+
+CachedValue = Union[np.ndarray, List[np.ndarray]]
+
+
+class TemplateCache:
+    """Preprocessed template arrays keyed by file content hash
+
+    Entries are keyed by (content hash, variant, scale) so renamed or copied
+    files share entries and an edited file gets new ones. A (mtime, size)
+    index avoids re-hashing unchanged files. Built arrays are also written to
+    an on-disk store as ``.npy`` files and loaded back memory-mapped, so a
+    fresh process skips ``imread``/``cvtColor``/``resize`` entirely.
+    """
+
+    INDEX_FILE = "index.json"
+    INDEX_SAVE_INTERVAL = 30.0  # seconds between index writes while matching
+
+    def __init__(self, max_bytes: int = 100 * 1024 * 1024,
+                 store_dir: Optional[Path] = None,
+                 use_disk: bool = True,
+                 max_disk_bytes: int = 500 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memory budget for cached arrays
+            store_dir: On-disk store, defaults to ~/.excel_macro_automation/template_cache
+            use_disk: Persist built arrays and load them memory-mapped
+            max_disk_bytes: On-disk store is pruned (oldest first) above this size
+        """
+        self.logger = get_logger(__name__)
+        self.max_bytes = max_bytes
+        self.use_disk = use_disk
+        self.max_disk_bytes = max_disk_bytes
+        self.store_dir = store_dir or Path.home() / ".excel_macro_automation" / "template_cache"
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, Tuple[CachedValue, int]]" = OrderedDict()
+        self._size = 0
+        # path -> [mtime_ns, size, content hash]
+        self._index: Dict[str, List[Any]] = {}
+        self._index_dirty = False
+        self._index_saved = time.monotonic()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.use_disk:
+            try:
+                self.store_dir.mkdir(parents=True, exist_ok=True)
+                self._index = self._load_index()
+                self._prune_disk()
+            except Exception as e:
+                self.logger.warning(f"Template store unavailable, using memory only: {e}")
+                self.use_disk = False
+
+    # ---- file identity -------------------------------------------------
+
+    def _load_index(self) -> Dict[str, List[Any]]:
+        index_file = self.store_dir / self.INDEX_FILE
+        if index_file.exists():
+            try:
+                return json.loads(index_file.read_text(encoding='utf-8'))
+            except Exception as e:
+                self.logger.warning(f"Failed to load template index: {e}")
+        return {}
+
+    def _save_index(self):
+        if not (self.use_disk and self._index_dirty):
+            return
+        try:
+            tmp = self.store_dir / (self.INDEX_FILE + ".tmp")
+            tmp.write_text(json.dumps(self._index, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp, self.store_dir / self.INDEX_FILE)
+            self._index_dirty = False
+            self._index_saved = time.monotonic()
+        except Exception as e:
+            self.logger.warning(f"Failed to save template index: {e}")
+
+    def _identify(self, path: str) -> Tuple[str, Optional[bytes]]:
+        """Content hash of a file; bytes are returned when they had to be read"""
+        stat = os.stat(path)
+        known = self._index.get(path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2], None
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        self._index[path] = [stat.st_mtime_ns, stat.st_size, digest]
+        self._index_dirty = True
+        # New files are batched: the index is written now and then and on flush()
+        if time.monotonic() - self._index_saved >= self.INDEX_SAVE_INTERVAL:
+            self._save_index()
+        return digest, data
+
+    def flush(self):
+        """Write pending file index changes to disk"""
+        with self._lock:
+            self._save_index()
+
+    # ---- lookup ----------------------------------------------------------
+
+    def get(self, path: str, variant: str, scale: float,
+            builder: Callable[[bytes], CachedValue]) -> CachedValue:
+        """Return a cached array, building it with ``builder(file_bytes)`` on a miss
+
+        Args:
+            path: Normalized template path
+            variant: Preprocessing name, e.g. "gray" or "pyr2"
+            scale: Scale the template was resized by
+            builder: Produces the array (or list of arrays) from the file bytes
+        """
+        with self._lock:
+            digest, data = self._identify(path)
+            key = f"{digest}_{variant}_{scale:.4f}"
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            value = self._load_from_disk(key) if self.use_disk else None
+            if value is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                value = builder(data)
+                if self.use_disk:
+                    self._save_to_disk(key, value)
+
+            self._put(key, value)
+            return value
+
+    def _put(self, key: str, value: CachedValue):
+        nbytes = sum(a.nbytes for a in value) if isinstance(value, list) else value.nbytes
+        self._entries[key] = (value, nbytes)
+        self._size += nbytes
+        # Evict least recently used entries (never the one just added)
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= evicted
+
+    # ---- on-disk store ---------------------------------------------------
+
+    def _load_from_disk(self, key: str) -> Optional[CachedValue]:
+        try:
+            single = self.store_dir / f"{key}.npy"
+            if single.exists():
+                return np.load(single, mmap_mode='r')
+            levels = []
+            while (self.store_dir / f"{key}_{len(levels)}.npy").exists():
+                levels.append(np.load(self.store_dir / f"{key}_{len(levels)}.npy", mmap_mode='r'))
+            return levels or None
+        except Exception as e:
+            self.logger.debug(f"Template store read failed for {key}: {e}")
+            return None
+
+    def _save_to_disk(self, key: str, value: CachedValue):
+        arrays = value if isinstance(value, list) else [value]
+        names = [f"{key}_{i}.npy" for i in range(len(arrays))] if isinstance(value, list) else [f"{key}.npy"]
+        try:
+            for name, array in zip(names, arrays):
+                tmp = self.store_dir / (name + ".tmp")
+                with open(tmp, 'wb') as f:
+                    np.save(f, np.ascontiguousarray(array))
+                os.replace(tmp, self.store_dir / name)
+        except Exception as e:
+            self.logger.debug(f"Template store write failed for {key}: {e}")
+
+    def _prune_disk(self):
+        """Remove the oldest stored arrays when the store exceeds its budget"""
+        files = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.store_dir.glob("*.npy")]
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_disk_bytes:
+            return
+        for _, size, path in sorted(files):
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+            if total <= self.max_disk_bytes:
+                break
+
+    # ---- maintenance -----------------------------------------------------
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def clear(self, disk: bool = False):
+        """Drop cached arrays (and optionally the on-disk store)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if disk and self.use_disk:
+                for path in self.store_dir.glob("*.npy"):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                self._index.clear()
+                self._index_dirty = True
+                self._save_index()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters"""
+        return {
+            'entries': len(self._entries),
+            'size_mb': self._size / 1024 / 1024,
+            'max_mb': self.max_bytes / 1024 / 1024,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+        }
+
+
+# 전역 템플릿 캐시 (StepExecutor가 새로 만들어져도 유지)
+_template_cache = None
+
+
+def get_template_cache(max_mb: Optional[float] = None, use_disk: Optional[bool] = None) -> TemplateCache:
+    """Get global template cache (options apply on first call)"""
+    global _template_cache
+    if _template_cache is None:
+        kwargs = {}
+        if max_mb is not None:
+            kwargs['max_bytes'] = int(max_mb * 1024 * 1024)
+        if use_disk is not None:
+            kwargs['use_disk'] = use_disk
+        _template_cache = TemplateCache(**kwargs)
+        atexit.register(_template_cache.flush)
+    return _template_cache
@@ -0,0 +1,179 @@
+"""
+Template matching engines used by ImageMatcher
+"""
+
+from typing import Optional, Tuple, List
+import numpy as np
+import cv2
+
+# Matching modes selectable per step
+MATCH_MODE_STANDARD = "standard"
+MATCH_MODE_PYRAMID = "pyramid"
+MATCH_MODES = (MATCH_MODE_STANDARD, MATCH_MODE_PYRAMID)
+
+
+def match_best(image: np.ndarray, template: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+    """Full-resolution TM_CCOEFF_NORMED match; returns (score, (x, y))"""
+    if image.shape[0] < template.shape[0] or image.shape[1] < template.shape[1]:
+        return 0.0, (0, 0)
+    result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return float(max_val), max_loc
+
+
+def pyramid_levels_for(template_shape: Tuple[int, ...], min_side: int = 16,
+                       max_levels: int = 3) -> int:
+    """Number of pyrDown levels that keep the template at least ``min_side`` pixels"""
+    side = min(template_shape[0], template_shape[1])
+    levels = 0
+    while levels < max_levels and side // 2 >= min_side:
+        side //= 2
+        levels += 1
+    return levels
+
+
+def build_pyramid(image: np.ndarray, levels: int) -> List[np.ndarray]:
+    """Gaussian pyramid [full, 1/2, 1/4, ...] with ``levels`` downscaled entries"""
+    pyramid = [image]
+    for _ in range(levels):
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def top_peaks(result: np.ndarray, k: int, suppress: Tuple[int, int]) -> List[Tuple[float, Tuple[int, int]]]:
+    """Top-K peaks of a match map, suppressing a neighbourhood around each pick"""
+    scores = result.copy()
+    sw, sh = max(1, suppress[0]), max(1, suppress[1])
+    peaks = []
+    for _ in range(k):
+        _, max_val, _, (x, y) = cv2.minMaxLoc(scores)
+        if max_val <= -1.0:
+            break
+        peaks.append((float(max_val), (x, y)))
+        scores[max(0, y - sh):y + sh + 1, max(0, x - sw):x + sw + 1] = -1.0
+    return peaks
+
+
+def match_pyramid(image: np.ndarray, template: np.ndarray,
+                  top_k: int = 8,
+                  levels: Optional[int] = None,
+                  image_pyramid: Optional[List[np.ndarray]] = None,
+                  template_pyramid: Optional[List[np.ndarray]] = None) -> Tuple[float, Tuple[int, int]]:
+    """Coarse-to-fine match
+
+    Matches the downscaled image and template first, then re-runs the
+    full-resolution match only in small windows around the top-K coarse
+    candidates. Falls back to a plain match when the template is too small
+    to downscale.
+
+    Returns:
+        (score, (x, y)) in full-resolution image coordinates
+    """
+    if levels is None:
+        levels = pyramid_levels_for(template.shape)
+    if levels == 0:
+        return match_best(image, template)
+
+    if image_pyramid is None or len(image_pyramid) <= levels:
+        image_pyramid = build_pyramid(image, levels)
+    if template_pyramid is None or len(template_pyramid) <= levels:
+        template_pyramid = build_pyramid(template, levels)
+
+    coarse_image = image_pyramid[levels]
+    coarse_template = template_pyramid[levels]
+    if (coarse_image.shape[0] < coarse_template.shape[0] or
+            coarse_image.shape[1] < coarse_template.shape[1]):
+        return match_best(image, template)
+
+    coarse = cv2.matchTemplate(coarse_image, coarse_template, cv2.TM_CCOEFF_NORMED)
+    th_c, tw_c = coarse_template.shape[:2]
+    candidates = top_peaks(coarse, top_k, (tw_c // 2, th_c // 2))
+
+    factor = 2 ** levels
+    margin = 2 * factor  # pyrDown rounding and coarse localisation error
+    th, tw = template.shape[:2]
+    ih, iw = image.shape[:2]
+
+    best_val, best_loc = 0.0, (0, 0)
+    for _, (cx, cy) in candidates:
+        x0 = max(0, cx * factor - margin)
+        y0 = max(0, cy * factor - margin)
+        x1 = min(iw, cx * factor + tw + margin)
+        y1 = min(ih, cy * factor + th + margin)
+        val, (lx, ly) = match_best(image[y0:y1, x0:x1], template)
+        if val > best_val:
+            best_val, best_loc = val, (x0 + lx, y0 + ly)
+    return best_val, best_loc
+
+
+def find_peaks(result: np.ndarray, threshold: float, template_size: Tuple[int, int],
+               limit: int = 10, iou_threshold: float = 0.3,
+               max_candidates: int = 5000) -> List[Tuple[float, Tuple[int, int]]]:
+    """Distinct matches above ``threshold``, best first
+
+    Keeps only local maxima of the match map, then removes overlapping
+    placements with non-maximum suppression on template-sized boxes.
+
+    Args:
+        result: matchTemplate output (TM_CCOEFF_NORMED)
+        threshold: Minimum score
+        template_size: (width, height) of the template
+        limit: Maximum number of matches returned
+        iou_threshold: Boxes overlapping a better match by more than this are dropped
+        max_candidates: Local maxima kept for NMS (highest scores)
+
+    Returns:
+        [(score, (x, y)), ...] sorted by score
+    """
+    if limit <= 0:
+        return []
+
+    # Local maxima (3x3 neighbourhood) above the threshold
+    dilated = cv2.dilate(result, np.ones((3, 3), np.uint8))
+    ys, xs = np.nonzero((result >= threshold) & (result >= dilated))
+    if len(xs) == 0:
+        return []
+
+    scores = result[ys, xs]
+    order = np.argsort(-scores, kind='stable')[:max_candidates]
+    xs, ys, scores = xs[order], ys[order], scores[order]
+
+    # Greedy NMS; all boxes share the template size
+    w, h = template_size
+    area = float(w * h)
+    keep = []
+    alive = np.ones(len(xs), dtype=bool)
+    for i in range(len(xs)):
+        if not alive[i]:
+            continue
+        keep.append(i)
+        if len(keep) >= limit:
+            break
+        rest = np.nonzero(alive[i + 1:])[0] + i + 1
+        if len(rest) == 0:
+            break
+        overlap_w = np.clip(w - np.abs(xs[rest] - xs[i]), 0, None)
+        overlap_h = np.clip(h - np.abs(ys[rest] - ys[i]), 0, None)
+        inter = overlap_w * overlap_h
+        iou = inter / (2 * area - inter)
+        alive[rest[iou > iou_threshold]] = False
+
+    return [(float(scores[i]), (int(xs[i]), int(ys[i]))) for i in keep]
+
+
+def sort_reading_order(points: List[Tuple[int, int]], row_tolerance: int) -> List[int]:
+    """Indices of points sorted top-to-bottom, then left-to-right
+
+    Points whose y differs by no more than ``row_tolerance`` from the first
+    point of a row are treated as the same row.
+    """
+    by_y = sorted(range(len(points)), key=lambda i: (points[i][1], points[i][0]))
+    rows: List[List[int]] = []
+    row_y = None
+    for i in by_y:
+        y = points[i][1]
+        if row_y is None or y - row_y > row_tolerance:
+            rows.append([])
+            row_y = y
+        rows[-1].append(i)
+    return [i for row in rows for i in sorted(row, key=lambda j: points[j][0])]
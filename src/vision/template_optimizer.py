@@ -0,0 +1,296 @@
+"""
+Template optimization: trim uniform borders, pick a distinctive sub-patch
+and choose the coarsest pyramid level that still matches uniquely
+"""
+
+import os
+import json
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional, Tuple, List, Iterable
+import numpy as np
+import cv2
+from logger.app_logger import get_logger
+from vision.template_matching import build_pyramid, pyramid_levels_for, find_peaks
+
+OPTIMIZED_SUFFIX = ".opt"
+
+
+@dataclass
+class OptimizedTemplate:
+    """Sidecar metadata describing an optimized template variant"""
+    source_mtime_ns: int
+    source_size: int
+    original_size: Tuple[int, int]          # width, height of the source image
+    crop: Tuple[int, int, int, int]         # x, y, width, height of the patch in the source
+    click_offset: Tuple[int, int]           # source center minus patch center
+    pyramid_level: Optional[int] = None     # coarsest level verified unique on a reference
+    uniqueness: Optional[float] = None      # best minus second-best score on the reference
+    created: float = 0.0
+
+    @property
+    def is_cropped(self) -> bool:
+        return tuple(self.crop) != (0, 0, self.original_size[0], self.original_size[1])
+
+    def restore_box(self, x: int, y: int, scale: float = 1.0) -> Tuple[int, int, int, int]:
+        """Source-template box for a patch matched at (x, y) with the given scale"""
+        return (x - int(round(self.crop[0] * scale)),
+                y - int(round(self.crop[1] * scale)),
+                int(round(self.original_size[0] * scale)),
+                int(round(self.original_size[1] * scale)))
+
+
+def optimized_paths(image_path: str) -> Tuple[Path, Path]:
+    """(optimized image, sidecar json) stored next to the source image"""
+    path = Path(image_path)
+    stem = path.stem + OPTIMIZED_SUFFIX
+    return path.parent / (stem + ".png"), path.parent / (stem + ".json")
+
+
+def is_optimized_path(image_path: str) -> bool:
+    return Path(image_path).stem.endswith(OPTIMIZED_SUFFIX)
+
+
+def load_optimized(image_path: str) -> Optional[OptimizedTemplate]:
+    """Sidecar for a source image, or None if missing or out of date"""
+    _, meta_path = optimized_paths(image_path)
+    try:
+        if not meta_path.exists():
+            return None
+        stat = os.stat(image_path)
+        data = json.loads(meta_path.read_text(encoding='utf-8'))
+        meta = OptimizedTemplate(**data)
+        if meta.source_mtime_ns != stat.st_mtime_ns or meta.source_size != stat.st_size:
+            return None
+        return meta
+    except Exception:
+        return None
+
+
+def trim_uniform_border(gray: np.ndarray, tolerance: int = 4) -> Tuple[int, int, int, int]:
+    """Bounding box (x, y, w, h) after removing border rows/columns of one flat colour"""
+    h, w = gray.shape[:2]
+    border = np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])
+    background = int(np.median(border))
+    content = np.abs(gray.astype(np.int16) - background) > tolerance
+    rows = np.nonzero(content.any(axis=1))[0]
+    cols = np.nonzero(content.any(axis=0))[0]
+    if len(rows) == 0 or len(cols) == 0:
+        return (0, 0, w, h)
+    # Keep one pixel of background so edges stay matchable
+    x0 = max(0, int(cols[0]) - 1)
+    y0 = max(0, int(rows[0]) - 1)
+    x1 = min(w, int(cols[-1]) + 2)
+    y1 = min(h, int(rows[-1]) + 2)
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def self_similarity(gray: np.ndarray, patch_box: Tuple[int, int, int, int]) -> float:
+    """Second-best score of a patch against its own template (lower is more distinctive)"""
+    x, y, w, h = patch_box
+    patch = gray[y:y + h, x:x + w]
+    if patch.std() < 1.0:
+        return 1.0  # flat patches match anywhere
+    result = cv2.matchTemplate(gray, patch, cv2.TM_CCOEFF_NORMED)
+    peaks = find_peaks(result, -1.0, (w, h), limit=2, iou_threshold=0.0)
+    return peaks[1][0] if len(peaks) > 1 else 0.0
+
+
+def pick_distinctive_patch(gray: np.ndarray, patch_size: Tuple[int, int],
+                           stride: int = 8) -> Tuple[Tuple[int, int, int, int], float]:
+    """Sub-patch whose best repeat inside the template is weakest
+
+    Returns:
+        ((x, y, w, h), self-similarity score)
+    """
+    h, w = gray.shape[:2]
+    pw, ph = min(patch_size[0], w), min(patch_size[1], h)
+    xs = sorted(set(list(range(0, w - pw + 1, stride)) + [w - pw]))
+    ys = sorted(set(list(range(0, h - ph + 1, stride)) + [h - ph]))
+
+    # Rank by texture first so self-similarity runs only on promising patches
+    candidates = []
+    for y in ys:
+        for x in xs:
+            candidates.append((float(gray[y:y + ph, x:x + pw].std()), x, y))
+    candidates.sort(reverse=True)
+
+    best_box, best_score = (0, 0, w, h), 1.0
+    for _, x, y in candidates[:12]:
+        score = self_similarity(gray, (x, y, pw, ph))
+        if score < best_score:
+            best_box, best_score = (x, y, pw, ph), score
+    return best_box, best_score
+
+
+def unique_level(patch: np.ndarray, reference: np.ndarray, expected: Tuple[int, int],
+                 margin: float = 0.1, tolerance: int = 2) -> Tuple[Optional[int], Optional[float]]:
+    """Coarsest pyramid level at which the patch is still found uniquely at ``expected``
+
+    Returns:
+        (level, uniqueness) or (None, None) if even full resolution is ambiguous
+    """
+    max_level = pyramid_levels_for(patch.shape)
+    patch_pyramid = build_pyramid(patch, max_level)
+    reference_pyramid = build_pyramid(reference, max_level)
+    for level in range(max_level, -1, -1):
+        p, r = patch_pyramid[level], reference_pyramid[level]
+        if r.shape[0] < p.shape[0] or r.shape[1] < p.shape[1]:
+            continue
+        result = cv2.matchTemplate(r, p, cv2.TM_CCOEFF_NORMED)
+        peaks = find_peaks(result, -1.0, (p.shape[1], p.shape[0]), limit=2, iou_threshold=0.0)
+        if not peaks:
+            continue
+        factor = 2 ** level
+        best, (bx, by) = peaks[0]
+        second = peaks[1][0] if len(peaks) > 1 else 0.0
+        on_target = (abs(bx * factor - expected[0]) <= tolerance * factor and
+                     abs(by * factor - expected[1]) <= tolerance * factor)
+        if on_target and best - second >= margin:
+            return level, best - second
+    return None, None
+
+
+class TemplateOptimizer:
+    """Produces ``<name>.opt.png`` + ``<name>.opt.json`` next to template images"""
+
+    def __init__(self, max_patch: Tuple[int, int] = (96, 48), min_gain: float = 0.25,
+                 max_self_similarity: float = 0.8):
+        """
+        Args:
+            max_patch: Largest sub-patch (width, height) kept from big templates
+            min_gain: Minimum fraction of pixels removed before a variant is stored
+            max_self_similarity: Patches repeating inside the template above this
+                score are not distinctive enough
+        """
+        self.logger = get_logger(__name__)
+        self.max_patch = max_patch
+        self.min_gain = min_gain
+        self.max_self_similarity = max_self_similarity
+
+    def optimize(self, image_path: str, reference: Optional[np.ndarray] = None,
+                 force: bool = False) -> Optional[OptimizedTemplate]:
+        """Optimize one template (skipped if its sidecar is up to date)
+
+        Args:
+            image_path: Source template
+            reference: Grayscale screen used to verify uniqueness and pick the
+                pyramid level; without it only self-similarity is checked
+            force: Rebuild even when the sidecar is current
+        """
+        if not image_path or is_optimized_path(image_path) or not os.path.exists(image_path):
+            return None
+        if not force:
+            existing = load_optimized(image_path)
+            if existing is not None:
+                return existing
+
+        try:
+            data = np.fromfile(image_path, dtype=np.uint8)
+            color = cv2.imdecode(data, cv2.IMREAD_COLOR)
+            if color is None:
+                return None
+            gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+            height, width = gray.shape
+
+            # 1. Trim flat margins
+            tx, ty, tw, th = trim_uniform_border(gray)
+            crop = (tx, ty, tw, th)
+            trimmed = gray[ty:ty + th, tx:tx + tw]
+
+            # 2. Large templates: keep only the most distinctive sub-patch
+            if tw > self.max_patch[0] or th > self.max_patch[1]:
+                (px, py, pw, ph), similarity = pick_distinctive_patch(trimmed, self.max_patch)
+                if similarity <= self.max_self_similarity:
+                    crop = (tx + px, ty + py, pw, ph)
+
+            # 3. Verify against the reference screen and pick the pyramid level
+            level, uniqueness = None, None
+            if reference is not None:
+                crop, level, uniqueness = self._verify(gray, crop, (tx, ty, tw, th), reference)
+
+            x, y, w, h = crop
+            gain = 1 - (w * h) / float(width * height)
+            if gain < self.min_gain:
+                crop = (0, 0, width, height)
+                x, y, w, h = crop
+
+            stat = os.stat(image_path)
+            meta = OptimizedTemplate(
+                source_mtime_ns=stat.st_mtime_ns,
+                source_size=stat.st_size,
+                original_size=(width, height),
+                crop=crop,
+                click_offset=(width // 2 - (x + w // 2), height // 2 - (y + h // 2)),
+                pyramid_level=level,
+                uniqueness=uniqueness,
+                created=time.time()
+            )
+            self._save(image_path, color[y:y + h, x:x + w], meta)
+            if meta.is_cropped:
+                self.logger.info(f"Optimized template {Path(image_path).name}: "
+                                 f"{width}x{height} -> {w}x{h} (level {level})")
+            return meta
+
+        except Exception as e:
+            self.logger.warning(f"Template optimization failed for {image_path}: {e}")
+            return None
+
+    def _verify(self, gray: np.ndarray, crop: Tuple[int, int, int, int],
+                trimmed: Tuple[int, int, int, int], reference: np.ndarray):
+        """Check the chosen crop on the reference screen; fall back to the trimmed template"""
+        h, w = gray.shape
+        if reference.shape[0] < h or reference.shape[1] < w:
+            return crop, None, None
+        result = cv2.matchTemplate(reference, gray, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (sx, sy) = cv2.minMaxLoc(result)
+        if score < 0.95:
+            # Template is not on screen right now: the patch alone must not match anything either
+            x, y, bw, bh = crop
+            patch_result = cv2.matchTemplate(reference, gray[y:y + bh, x:x + bw], cv2.TM_CCOEFF_NORMED)
+            if tuple(crop) != tuple(trimmed) and cv2.minMaxLoc(patch_result)[1] >= 0.9:
+                return trimmed, None, None
+            return crop, None, None
+
+        for box in (crop, trimmed):
+            x, y, bw, bh = box
+            level, uniqueness = unique_level(gray[y:y + bh, x:x + bw], reference, (sx + x, sy + y))
+            if level is not None:
+                return box, level, uniqueness
+        return (0, 0, w, h), None, None
+
+    def _save(self, image_path: str, patch: np.ndarray, meta: OptimizedTemplate):
+        image_out, meta_out = optimized_paths(image_path)
+        if meta.is_cropped:
+            ok, encoded = cv2.imencode(".png", patch)
+            if ok:
+                encoded.tofile(str(image_out))
+        elif image_out.exists():
+            image_out.unlink()
+        meta_out.write_text(json.dumps(asdict(meta)), encoding='utf-8')
+
+    def optimize_all(self, image_paths: Iterable[str],
+                     reference: Optional[np.ndarray] = None) -> List[OptimizedTemplate]:
+        """Optimize several templates, skipping ones that are up to date"""
+        results = []
+        for path in dict.fromkeys(p for p in image_paths if p):
+            meta = self.optimize(path, reference)
+            if meta is not None:
+                results.append(meta)
+        return results
+
+
+def collect_image_paths(steps) -> List[str]:
+    """Template paths used by macro steps, including nested IF branches"""
+    paths = []
+    for step in steps:
+        image_path = getattr(step, 'image_path', None)
+        if image_path:
+            paths.append(image_path)
+        condition_value = getattr(step, 'condition_value', None)
+        if isinstance(condition_value, dict) and condition_value.get('image_path'):
+            paths.append(condition_value['image_path'])
+        for branch in ('true_steps', 'false_steps'):
+            paths.extend(collect_image_paths(getattr(step, branch, None) or []))
+    return paths
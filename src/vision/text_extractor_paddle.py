@@ -3,22 +3,40 @@ PaddleOCR 기반 텍스트 추출기
 EasyOCR를 대체하는 새로운 OCR 엔진 구현
 """
 
-from typing import Optional, List, Tuple, Dict, Any
+import os
+import importlib.util
+import threading
+from typing import Optional, List, Tuple, Dict, Any, Sequence, Union, Callable
 from dataclasses import dataclass
-import mss
-from PIL import Image
+import numpy as np
 from logger.app_logger import get_logger
+from vision.screen_capture import get_screen_capture, ScreenFrame
+from vision.ocr_common import (TextResult, check_gpu_availability, paddle_init_params, parse_ocr_results,
+                               create_text_recognizer, recognize_boxes, resolve_ocr_profile)
+from vision.layout_memory import LayoutMemory
+from vision.line_segmentation import OCR_MODE_AUTO, OCR_MODE_FULL, plan_recognition_boxes
+from vision.ocr_service import OCRService, OCRServiceUnavailable, OCRWorkerError, get_ocr_service
+from vision.ocr_cache import get_ocr_cache, content_key
+from vision.ocr_tiling import plan_tiles, monitor_areas, merge_tile_results
+from vision.incremental_ocr import IncrementalOCR
+from vision import text_matcher
+from vision.text_matcher import TextMatcher
+from vision.ocr_batch import scratch_buffer, pack_canvases, compose, split_results
+from vision.ocr_warmup import get_ocr_warmup, render_warmup_image
+from vision.debug_capture import get_debug_capture
 import time
 from functools import wraps
-import multiprocessing
 
-# PaddleOCR 임포트 시도
 try:
-    from paddleocr import PaddleOCR
-    PADDLEOCR_AVAILABLE = True
-except ImportError:
+    import cv2
+except ImportError:  # 전처리/디버그 저장만 비활성화
+    cv2 = None
+
+# PaddleOCR 설치 여부만 확인 (paddle 임포트는 수 초 걸리므로 모델 생성 시 _get_ocr에서)
+try:
+    PADDLEOCR_AVAILABLE = importlib.util.find_spec("paddleocr") is not None
+except (ImportError, ValueError):
     PADDLEOCR_AVAILABLE = False
-    PaddleOCR = None
 
 def measure_performance(func):
     """성능 측정 데코레이터"""
@@ -39,19 +57,45 @@ def measure_performance(func):
         return result
     return wrapper
 
+# 매칭 전략 (find_text_with_fallback 적용 순서)
+MATCH_EXACT = "exact"
+MATCH_PARTIAL = "partial"
+MATCH_AGGRESSIVE = "aggressive"
+FALLBACK_STRATEGIES = (MATCH_EXACT, MATCH_PARTIAL, MATCH_AGGRESSIVE)
+
 @dataclass
-class TextResult:
-    """텍스트 검출 결과"""
-    text: str
-    confidence: float
-    bbox: Tuple[int, int, int, int]  # (x, y, width, height)
-    center: Tuple[int, int]  # (center_x, center_y)
+class TextQuery:
+    """extract_text_batch의 영역 하나"""
+    region: Tuple[int, int, int, int]
+    confidence_threshold: float = 0.5
+    ocr_mode: str = OCR_MODE_FULL
+
+
+@dataclass
+class TextMatch:
+    """텍스트 매칭 결과 (사용된 전략과 점수 포함)"""
+    result: TextResult
+    strategy: str
+    score: float
+
+
+def normalize_text(text: str) -> str:
+    """소문자화, 앞뒤 공백 제거, 전각/반각 문자를 표준 형태로"""
+    return text_matcher.normalize(text)
+
+
+def aggressive_normalize(text: str) -> str:
+    """공백과 특수문자를 모두 제거"""
+    return text_matcher.compact(text)
+
 
 class PaddleTextExtractor:
     """PaddleOCR 기반 텍스트 추출기"""
     
     _instance = None
     _ocr = None
+    _recognizer = None
+    _init_lock = threading.RLock()  # 백그라운드 예열과 첫 단계가 모델을 두 번 만들지 않도록
     
     def __new__(cls):
         """싱글톤 패턴"""
@@ -68,6 +112,48 @@ class PaddleTextExtractor:
             # 이미지 전처리 옵션 (필요시 활성화)
             self.enable_preprocessing = False
             
+            # 마지막 find_text_with_fallback 결과 (전략, 점수)
+            self.last_match: Optional[TextMatch] = None
+            
+            # OCR 워커 프로세스 설정
+            try:
+                from config.settings import Settings
+                self.settings = Settings()
+            except Exception:
+                self.settings = None
+            self._ocr_service_enabled = True
+            
+            # 인식 전용 모델 사용 가능 여부 (실패 시 전체 검출로 전환)
+            self._recognition_only = True
+            
+            # 고정 양식의 텍스트 라인 위치 기억 (검출 단계 생략)
+            self._layout_memory = None
+            if self.settings and self.settings.get("ocr.layout_memory", False):
+                self.set_layout_memory(True)
+            
+            # 반복 검색 시 바뀐 타일만 다시 인식
+            self._incremental = None
+            if not self.settings or self.settings.get("ocr.incremental", True):
+                self._incremental = IncrementalOCR()
+            
+            # 검색 텍스트 매칭 (자모 단위 오타 허용, 신뢰도 가중)
+            fuzzy = not self.settings or self.settings.get("ocr.fuzzy_match", True)
+            self.matcher = TextMatcher(
+                use_jamo=self.settings.get("ocr.jamo_match", True) if self.settings else True,
+                max_error_ratio=(self.settings.get("ocr.max_error_ratio", 0.25) if self.settings else 0.25)
+                if fuzzy else 0.0)
+            
+            # 최근 OCR 입력 (실패 시/요청 시에만 디스크에 저장)
+            self._debug_capture = get_debug_capture()
+            
+            # 동일 영역 내용의 OCR 결과 캐시
+            self._ocr_cache = None
+            self._engine_variant = None
+            if not self.settings or self.settings.get("ocr.result_cache", True):
+                self._ocr_cache = get_ocr_cache(
+                    self.settings.get("ocr.result_cache_entries", 512) if self.settings else None,
+                    self.settings.get("ocr.result_disk_cache", False) if self.settings else None)
+            
             # OCR 상태 확인
             from utils.ocr_manager import OCRManager
             self.ocr_manager = OCRManager()
@@ -75,53 +161,11 @@ class PaddleTextExtractor:
             if not PADDLEOCR_AVAILABLE:
                 self.logger.warning("PaddleOCR이 설치되지 않았습니다. 텍스트 검색 기능이 제한됩니다.")
             
-    def _save_debug_screenshot(self, region: Tuple[int, int, int, int], prefix: str = "debug"):
-        """디버그용 스크린샷 저장"""
-        try:
-            from pathlib import Path
-            from datetime import datetime
-            
-            # Create debug directory
-            debug_dir = Path("debug/ocr_regions")
-            debug_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Capture region
-            with mss.mss() as sct:
-                # Virtual monitor 정보도 함께 로깅
-                virtual_monitor = sct.monitors[0]
-                self.logger.debug(f"Debug screenshot - Virtual monitor: {virtual_monitor}")
-                self.logger.debug(f"Debug screenshot - Region to capture: {region}")
-                
-                monitor = {"left": region[0], "top": region[1], 
-                          "width": region[2], "height": region[3]}
-                screenshot = sct.grab(monitor)
-                
-                # Save screenshot
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # 밀리초 포함
-                filename = debug_dir / f"{prefix}_{timestamp}_x{region[0]}_y{region[1]}_{region[2]}x{region[3]}.png"
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=str(filename))
-                
-                self.logger.info(f"디버그 스크린샷 저장: {filename}")
-                
-        except Exception as e:
-            self.logger.error(f"디버그 스크린샷 저장 실패: {e}")
-    
     def _check_gpu_availability(self) -> bool:
         """GPU 사용 가능 여부 확인"""
-        try:
-            import paddle
-            # GPU가 사용 가능한지 확인
-            is_gpu_available = paddle.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0
-            if is_gpu_available:
-                self.logger.info(f"GPU 감지됨: {paddle.device.cuda.device_count()}개")
-            else:
-                self.logger.info("GPU를 사용할 수 없습니다. CPU 모드로 실행됩니다.")
-            return is_gpu_available
-        except Exception as e:
-            self.logger.debug(f"GPU 확인 중 오류: {e}")
-            return False
+        return check_gpu_availability()
     
-    def _get_ocr(self) -> Optional['PaddleOCR']:
+    def _get_ocr(self) -> Optional[Any]:
         """PaddleOCR 인스턴스 생성 (지연 로딩)"""
         if not PADDLEOCR_AVAILABLE:
             error_msg = (
@@ -131,69 +175,251 @@ class PaddleTextExtractor:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
             
-        if PaddleTextExtractor._ocr is None:
+        with PaddleTextExtractor._init_lock:
+            if PaddleTextExtractor._ocr is None:
+                self._create_ocr()
+        return PaddleTextExtractor._ocr
+    
+    def _create_ocr(self):
+        """PaddleOCR 임포트 및 모델 생성 (_init_lock 보유 상태에서 호출)"""
+        try:
+            self.logger.info("PaddleOCR 초기화 시작")
+            from paddleocr import PaddleOCR
+            
+            # PaddleOCR 버전 확인
             try:
-                self.logger.info("PaddleOCR 초기화 시작")
-                
-                # PaddleOCR 버전 확인
+                import paddleocr
+                if hasattr(paddleocr, '__version__'):
+                    self.logger.info(f"PaddleOCR 버전: {paddleocr.__version__}")
+            except:
+                pass
+            
+            # GPU 사용 가능 여부 확인
+            use_gpu = self._check_gpu_availability()
+            
+            # PP-OCRv5 한국어 모바일 모델만 사용 (한국어는 모바일 버전만 지원)
+            init_params = paddle_init_params(use_gpu, profile=self._ocr_profile())
+            
+            self.logger.info(f"초기화 파라미터: {init_params}")
+            
+            # PaddleOCR 초기화
+            PaddleTextExtractor._ocr = PaddleOCR(**init_params)
+            self.logger.info(f"PaddleOCR 초기화 성공 (디바이스: {'GPU' if use_gpu else 'CPU'})")
+            
+        except Exception as e:
+            error_msg = (
+                f"PaddleOCR 초기화 실패: {str(e)}\n"
+                "해결 방법:\n"
+                "1. pip install --upgrade paddleocr paddlepaddle\n"
+                "2. Visual C++ 재배포 패키지 설치\n"
+                "3. Python 3.8-3.11 버전 확인"
+            )
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg) from e
+    
+    def _run_ocr(self, img_array, confidence_threshold: float, offset: Tuple[int, int],
+                 boxes: Optional[List[Tuple[int, int, int, int]]] = None) -> List[TextResult]:
+        """PaddleOCR 실행 (OCR 워커 프로세스 우선, 없으면 앱 프로세스에서)
+        
+        Args:
+            boxes: 지정 시 검출 없이 이 라인 박스만 인식
+        """
+        self._wait_for_warmup()
+        service = self._get_ocr_service()
+        if service is not None:
+            try:
+                return service.recognize(img_array, confidence_threshold, offset, boxes=boxes)
+            except OCRServiceUnavailable as e:
+                self.logger.warning(f"OCR 워커를 사용할 수 없어 앱 프로세스에서 실행합니다: {e}")
+                self._ocr_service_enabled = False
+            except OCRWorkerError as e:
+                # 워커는 재시작되므로 이번 요청만 앱 프로세스에서 처리
+                self.logger.warning(f"OCR 워커 오류로 이번 요청은 앱 프로세스에서 실행합니다: {e}")
+        
+        if boxes is not None:
+            recognizer = self._get_recognizer()
+            if recognizer is None:
+                raise RuntimeError("인식 전용 모델을 사용할 수 없습니다.")
+            return recognize_boxes(recognizer, img_array, boxes, confidence_threshold, offset)
+        
+        ocr = self._get_ocr()
+        self.logger.debug(f"Performing OCR on image shape: {img_array.shape}")
+        results = ocr.ocr(img_array)
+        
+        # 결과 디버깅
+        self.logger.debug("OCR raw results: %s", results)  # 디버그 로그가 꺼져 있으면 포맷하지 않음
+        
+        # 결과 변환 (영역 좌표 -> 화면 절대 좌표)
+        return parse_ocr_results(results, confidence_threshold, offset)
+    
+    def _run_ocr_incremental(self, frame: ScreenFrame, img_array, confidence_threshold: float,
+                             key) -> Optional[List[TextResult]]:
+        """바뀐 부분만 OCR해 이전 결과와 합침 (처음이거나 많이 바뀌었으면 None)"""
+        windows, kept = self._incremental.plan(key, frame.gray(), (frame.left, frame.top))
+        if windows is None:
+            return None
+        if not windows:
+            self.logger.info(f"화면 변화 없음: 이전 OCR 결과 재사용 ({len(kept)}개, 영역: {frame.region})")
+            return kept
+        
+        regions = [(x + frame.left, y + frame.top, w, h) for x, y, w, h in windows]
+        try:
+            window_results = self._run_ocr_regions(frame, img_array, confidence_threshold, regions)
+        except Exception:
+            self._incremental.forget(key)
+            raise
+        new_results = [r for _, results in window_results for r in results]
+        text_results = sorted(kept + new_results, key=lambda r: (r.bbox[1], r.bbox[0]))
+        self._incremental.remember(key, frame.gray(), text_results)
+        changed = sum(w * h for _, _, w, h in windows) / (frame.width * frame.height)
+        self.logger.info(f"부분 OCR: 변경 영역 {len(windows)}개 ({changed:.0%}), "
+                         f"재사용 {len(kept)}개 + 새로 인식 {len(new_results)}개")
+        return text_results
+    
+    def _plan_tiles(self, frame: ScreenFrame) -> Optional[List[Tuple[int, int, int, int]]]:
+        """큰 프레임(전체 화면 등)의 타일 목록, 한 번에 처리할 크기면 None"""
+        if self.settings and not self.settings.get("ocr.tiling", True):
+            return None
+        tile_size = self.settings.get("ocr.tile_size", 960) if self.settings else 960
+        overlap = self.settings.get("ocr.tile_overlap", 64) if self.settings else 64
+        try:
+            monitors = get_screen_capture().monitors
+        except Exception:
+            monitors = []
+        tiles = plan_tiles(frame.region, monitors, tile_size, overlap)
+        return tiles if len(tiles) > 1 else None
+    
+    def _run_ocr_regions(self, frame: ScreenFrame, img_array, confidence_threshold: float,
+                         regions: List[Tuple[int, int, int, int]]
+                         ) -> List[Tuple[Tuple[int, int, int, int], List[TextResult]]]:
+        """프레임의 여러 부분 영역(화면 좌표)을 각각 OCR (워커가 여러 개면 병렬)"""
+        jobs = []
+        for rx, ry, rw, rh in regions:
+            x0, y0 = rx - frame.left, ry - frame.top
+            jobs.append((img_array[y0:y0 + rh, x0:x0 + rw], (rx, ry), None))
+        return list(zip(regions, self._run_ocr_jobs(jobs, confidence_threshold)))
+    
+    def _run_ocr_jobs(self, jobs: List[Tuple[Any, Tuple[int, int], Optional[List[Tuple[int, int, int, int]]]]],
+                      confidence_threshold: float) -> List[List[TextResult]]:
+        """여러 이미지를 OCR (워커가 여러 개면 병렬)
+        
+        Args:
+            jobs: (이미지, 화면 오프셋, 라인 박스 또는 None) 목록
+        """
+        self._wait_for_warmup()
+        service = self._get_ocr_service()
+        if service is not None:
+            requests = []
+            try:
+                # 모든 이미지를 먼저 넣어 두면 쉬는 워커가 바로 가져감
+                for image, offset, boxes in jobs:
+                    requests.append(service.submit(image, confidence_threshold, offset, boxes=boxes))
+                return [request.result() for request in requests]
+            except OCRServiceUnavailable as e:
+                self.logger.warning(f"OCR 워커를 사용할 수 없어 앱 프로세스에서 실행합니다: {e}")
+                self._ocr_service_enabled = False
+                for request in requests:
+                    request.cancel()
+            except OCRWorkerError as e:
+                self.logger.warning(f"OCR 워커 오류로 남은 이미지는 다시 실행합니다: {e}")
+                for request in requests:
+                    request.cancel()
+            except Exception:
+                for request in requests:
+                    request.cancel()
+                raise
+            
+            # 워커가 이미 끝낸 결과는 그대로 사용
+            finished = []
+            for request in requests:
                 try:
-                    import paddleocr
-                    if hasattr(paddleocr, '__version__'):
-                        self.logger.info(f"PaddleOCR 버전: {paddleocr.__version__}")
-                except:
-                    pass
-                
-                # GPU 사용 가능 여부 확인
-                use_gpu = self._check_gpu_availability()
-                
-                # PP-OCRv5 한국어 모바일 모델만 사용 (한국어는 모바일 버전만 지원)
-                init_params = {
-                    'lang': 'korean',
-                    'text_detection_model_name': 'PP-OCRv5_mobile_det',
-                    'text_recognition_model_name': 'korean_PP-OCRv5_mobile_rec',  # 한국어 전용 모델
-                    'device': 'gpu' if use_gpu else 'cpu',
-                    'enable_mkldnn': not use_gpu,  # CPU일 때만 MKL-DNN 사용
-                    'cpu_threads': min(8, multiprocessing.cpu_count()),
-                    # 불필요한 전처리 모듈 비활성화 (성능 향상)
-                    'use_doc_orientation_classify': False,  # 문서 방향 분류 비활성화
-                    'use_doc_unwarping': False,  # 텍스트 이미지 보정 비활성화
-                    'use_textline_orientation': False,  # 텍스트 라인 방향 분류 비활성화 (use_angle_cls 대체)
-                }
-                
-                self.logger.info(f"초기화 파라미터: {init_params}")
-                
-                # PaddleOCR 초기화
-                PaddleTextExtractor._ocr = PaddleOCR(**init_params)
-                self.logger.info(f"PaddleOCR 초기화 성공 (디바이스: {'GPU' if use_gpu else 'CPU'})")
-                
-            except Exception as e:
-                error_msg = (
-                    f"PaddleOCR 초기화 실패: {str(e)}\n"
-                    "해결 방법:\n"
-                    "1. pip install --upgrade paddleocr paddlepaddle\n"
-                    "2. Visual C++ 재배포 패키지 설치\n"
-                    "3. Python 3.8-3.11 버전 확인"
-                )
-                self.logger.error(error_msg)
-                raise RuntimeError(error_msg) from e
-                
-        return PaddleTextExtractor._ocr
+                    finished.append(request.result(0))
+                except Exception:
+                    finished.append(None)
+            finished += [None] * (len(jobs) - len(finished))
+            return [results if results is not None else
+                    self._run_ocr(np.ascontiguousarray(image), confidence_threshold, offset, boxes)
+                    for results, (image, offset, boxes) in zip(finished, jobs)]
+        
+        return [self._run_ocr(np.ascontiguousarray(image), confidence_threshold, offset, boxes)
+                for image, offset, boxes in jobs]
+    
+    def _run_ocr_tiled(self, frame: ScreenFrame, img_array, confidence_threshold: float,
+                       tiles: List[Tuple[int, int, int, int]]) -> List[TextResult]:
+        """모니터별 겹치는 타일로 나눠 OCR 후 경계 중복 병합
+        
+        큰 화면을 한 번에 넣으면 검출 모델이 축소해 작은 글자를 놓치므로
+        모델 입력 크기의 타일로 나눈다. OCR 워커가 여러 개면 타일을 병렬로 처리한다.
+        """
+        start = time.time()
+        tile_results = self._run_ocr_regions(frame, img_array, confidence_threshold, tiles)
+        results = merge_tile_results(tile_results, monitor_areas(frame.region, get_screen_capture().monitors))
+        found = sum(len(r) for _, r in tile_results)
+        self.logger.info(f"타일 OCR: {len(tiles)}개 타일, {found}개 검출 -> 병합 후 {len(results)}개 "
+                         f"({time.time() - start:.2f}초)")
+        return results
+    
+    def _wait_for_warmup(self):
+        """백그라운드 모델 로드 중이면 끝날 때까지 대기 (시작하지 않았으면 바로 반환)"""
+        warmup = get_ocr_warmup()
+        if warmup.running:
+            self.logger.info("OCR 모델 준비를 기다리는 중...")
+            warmup.wait()
+    
+    def _get_recognizer(self):
+        """인식 전용 모델 (지연 로딩, 앱 프로세스 실행 시)"""
+        with PaddleTextExtractor._init_lock:
+            if PaddleTextExtractor._recognizer is None:
+                self._get_ocr()  # 설치/초기화 오류는 여기서 보고
+                PaddleTextExtractor._recognizer = create_text_recognizer(self._check_gpu_availability(),
+                                                                         profile=self._ocr_profile())
+        return PaddleTextExtractor._recognizer
+    
+    def _get_ocr_service(self) -> Optional['OCRService']:
+        """OCR 워커 프로세스 서비스 (ocr.worker_processes가 0이면 None)"""
+        if not self._ocr_service_enabled or not PADDLEOCR_AVAILABLE:
+            return None
+        workers = self.settings.get("ocr.worker_processes", 1) if self.settings else 1
+        if not workers:
+            self._ocr_service_enabled = False
+            return None
+        timeout = self.settings.get("ocr.worker_timeout", 60) if self.settings else 60
+        return get_ocr_service(workers, timeout, self._ocr_profile())
     
-    def preprocess_image_for_ocr(self, img_array):
-        """OCR 전 이미지 전처리"""
+    def _ocr_profile(self) -> Optional[Dict[str, Any]]:
+        """tune_ocr_profile.py로 측정한 엔진 설정 (없거나 다른 PC에서 측정했으면 None = 기본값)"""
+        profile = self.settings.get("ocr.profile") if self.settings else None
+        if not profile:
+            return None
+        tuned_cores = profile.get("cpu_count")
+        if tuned_cores and tuned_cores != os.cpu_count():
+            self.logger.warning(f"OCR 프로파일이 다른 PC(코어 {tuned_cores}개)에서 측정되어 기본 설정을 사용합니다. "
+                                "tune_ocr_profile.py를 다시 실행하세요.")
+            return None
+        return profile
+    
+    def preprocess_image_for_ocr(self, img_array, gray=None):
+        """OCR 전 이미지 전처리
+        
+        Args:
+            img_array: RGB 이미지
+            gray: 같은 이미지의 그레이스케일 (ScreenFrame.gray(), 있으면 변환 생략)
+            
+        Returns:
+            RGB 이미지 (스레드별 재사용 버퍼 - 다음 전처리 호출 전까지만 유효)
+        """
         try:
             # OpenCV가 없으면 원본 이미지 반환
-            try:
-                import cv2
-            except ImportError:
+            if cv2 is None:
                 self.logger.debug("OpenCV가 설치되지 않았습니다. 이미지 전처리를 건너뜁니다.")
                 return img_array
             
             # 그레이스케일 변환
-            if len(img_array.shape) == 3:
-                gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = img_array
+            if gray is None:
+                if len(img_array.shape) == 3:
+                    gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+                else:
+                    gray = img_array
             
             # 노이즈 제거 (빠른 버전 사용)
             denoised = cv2.medianBlur(gray, 3)
@@ -205,8 +431,9 @@ class PaddleTextExtractor:
             # 이진화 (Otsu's method)
             _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
             
-            # 다시 RGB로 변환 (PaddleOCR 입력 형식)
-            result = cv2.cvtColor(binary, cv2.COLOR_GRAY2RGB)
+            # 다시 RGB로 변환 (PaddleOCR 입력 형식) - 매 호출 새 배열 대신 재사용 버퍼에
+            result = cv2.cvtColor(binary, cv2.COLOR_GRAY2RGB,
+                                  dst=scratch_buffer('preprocess', binary.shape + (3,)))
             
             return result
             
@@ -214,15 +441,53 @@ class PaddleTextExtractor:
             self.logger.error(f"이미지 전처리 오류: {e}")
             return img_array
     
+    def _cache_variant(self, confidence_threshold: float, ocr_mode: str) -> str:
+        """OCR 결과 캐시 키에 포함되는 설정 (모델이 바뀌면 이전 결과를 쓰지 않음)"""
+        if self._engine_variant is None:
+            profile = resolve_ocr_profile(self._ocr_profile())
+            self._engine_variant = f"{profile['det_model']}_{profile['rec_model']}_{profile['det_limit_side_len']}"
+        return f"{confidence_threshold:.3f}_{int(self.enable_preprocessing)}_{ocr_mode}_{self._engine_variant}"
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """OCR 결과 캐시 적중/실패 카운터"""
+        return self._ocr_cache.get_stats() if self._ocr_cache else {}
+    
+    def clear_cache(self, disk: bool = False):
+        """OCR 결과 캐시 비우기"""
+        if self._ocr_cache:
+            self._ocr_cache.clear(disk)
+        if self._incremental:
+            self._incremental.forget()
+    
+    def set_layout_memory(self, enable: bool):
+        """레이아웃 기억 모드 활성화/비활성화
+        
+        첫 전체 OCR에서 찾은 라인 위치를 기억하고, 이후 영역 구조가 같으면
+        검출 없이 해당 라인만 인식한다. 구조가 바뀌면 전체 검출로 돌아간다.
+        """
+        if enable and self._layout_memory is None:
+            self._layout_memory = LayoutMemory()
+        elif not enable:
+            self._layout_memory = None
+        self.logger.info(f"레이아웃 기억: {'활성화' if enable else '비활성화'}")
+    
+    def get_incremental_stats(self) -> Dict[str, Any]:
+        """부분 OCR 카운터 (변화 없음/부분/전체)"""
+        return self._incremental.get_stats() if self._incremental else {}
+    
+    def get_layout_stats(self) -> Dict[str, Any]:
+        """레이아웃 기억 적중/구조 변경 카운터"""
+        return self._layout_memory.get_stats() if self._layout_memory else {}
+    
     def set_preprocessing(self, enable: bool):
         """이미지 전처리 활성화/비활성화"""
         self.enable_preprocessing = enable
         self.logger.info(f"이미지 전처리: {'활성화' if enable else '비활성화'}")
     
-    @measure_performance
     def extract_text_from_region(self, region: Optional[Tuple[int, int, int, int]] = None,
                                 confidence_threshold: float = 0.5,
-                                monitor_info: Optional[Dict] = None) -> List[TextResult]:
+                                monitor_info: Optional[Dict] = None,
+                                ocr_mode: str = OCR_MODE_FULL) -> List[TextResult]:
         """
         화면 영역에서 텍스트 추출 (EasyOCR 인터페이스 호환)
         
@@ -230,6 +495,7 @@ class PaddleTextExtractor:
             region: (x, y, width, height) 또는 None (전체 화면)
             confidence_threshold: 최소 신뢰도
             monitor_info: 모니터 정보 (multi-monitor support)
+            ocr_mode: 인식 방식 (auto, full, line, lines)
             
         Returns:
             TextResult 객체 리스트
@@ -242,329 +508,306 @@ class PaddleTextExtractor:
                 if monitor_info:
                     self.logger.info(f"모니터 정보: {monitor_info}")
                 
-                # Always save debug screenshot for troubleshooting
-                self._save_debug_screenshot(region, "ocr_region")
+            # 스크린샷 캡처 (공유 캡처 서비스 - 최근 프레임 재사용)
+            if region:
+                x, y, width, height = region
+                # Validate region coordinates
+                if width <= 0 or height <= 0:
+                    self.logger.error(f"잘못된 영역 크기: width={width}, height={height}")
+                    return []
+                
+                # 기존 매크로 호환성: monitor_info가 없으면 좌표 그대로 사용
+                # (기존 매크로는 Qt 절대 좌표로 저장되어 있음)
+                if not monitor_info:
+                    self.logger.info("기존 매크로 형식 감지 - 좌표 변환 없이 사용")
+                self.logger.info(f"캡처할 영역: {region}")
             
-            # 스크린샷 캡처
-            monitor_offset_x = 0
-            monitor_offset_y = 0
+            frame = get_screen_capture().grab(region)
             
-            with mss.mss() as sct:
-                # 디버그: virtual monitor 정보 출력
-                virtual_monitor = sct.monitors[0]
-                self.logger.debug(f"Virtual monitor info: {virtual_monitor}")
-                
-                if region:
-                    x, y, width, height = region
-                    # Validate region coordinates
-                    if width <= 0 or height <= 0:
-                        self.logger.error(f"잘못된 영역 크기: width={width}, height={height}")
-                        return []
-                    
-                    # 기존 매크로 호환성: monitor_info가 없으면 좌표 그대로 사용
-                    # (기존 매크로는 Qt 절대 좌표로 저장되어 있음)
-                    if not monitor_info:
-                        self.logger.info("기존 매크로 형식 감지 - 좌표 변환 없이 사용")
-                    
-                    monitor = {"left": x, "top": y, "width": width, "height": height}
-                    self.logger.info(f"mss로 캡처할 영역: {monitor}")
-                else:
-                    monitor = sct.monitors[0]  # 모든 모니터
-                    monitor_offset_x = monitor["left"]
-                    monitor_offset_y = monitor["top"]
-                    
-                # 스크린샷 캡처
-                screenshot = sct.grab(monitor)
+            # 디버그 캡처 링 버퍼에 기록 (실패 시 디스크에 저장)
+            return self.extract_text_from_frame(frame, confidence_threshold,
+                                                debug_prefix="ocr_region" if region else None,
+                                                ocr_mode=ocr_mode)
             
-            # PIL Image로 변환
-            img_pil = Image.frombytes('RGB', (screenshot.width, screenshot.height), 
-                                    screenshot.bgra, 'raw', 'BGRX')
+        except Exception as e:
+            self.logger.error(f"텍스트 추출 오류: {e}")
+            import traceback
+            self.logger.error(f"상세 오류: {traceback.format_exc()}")
+            return []
+    
+    @measure_performance
+    def extract_text_from_frame(self, frame: ScreenFrame, confidence_threshold: float = 0.5,
+                                debug_prefix: Optional[str] = None,
+                                ocr_mode: str = OCR_MODE_FULL) -> List[TextResult]:
+        """
+        이미 캡처된 프레임에서 텍스트 추출
+        
+        Args:
+            frame: 공유 캡처 서비스에서 받은 프레임
+            confidence_threshold: 최소 신뢰도
+            debug_prefix: 지정 시 디버그 캡처 버퍼에 기록 (실패 시/요청 시 이 이름으로 저장)
+            ocr_mode: 인식 방식
+                auto - 작은 한 줄/여러 줄 영역은 검출 없이 인식, 그 외 전체 검출
+                full - 항상 전체 검출
+                line - 영역 전체를 한 줄로 인식
+                lines - 투영 프로파일로 줄을 나눈 뒤 일괄 인식
             
-            # numpy 배열로 변환 (PaddleOCR 입력)
-            import numpy as np
-            img_array = np.array(img_pil)
+        Returns:
+            TextResult 객체 리스트 (화면 절대 좌표)
+        """
+        debug_entry = self._debug_capture.record(frame, debug_prefix) if debug_prefix else None
+        try:
+            # 프레임 위치만큼 좌표 보정 (영역 또는 가상 데스크톱 오프셋)
+            offset_x = frame.left
+            offset_y = frame.top
+            
+            # numpy RGB 배열 (PaddleOCR 입력)
+            img_array = frame.rgb()
+            
+            # 같은 픽셀을 이미 인식했으면 캐시된 결과 사용
+            cache_key = None
+            if self._ocr_cache is not None:
+                cache_key = content_key(img_array, self._cache_variant(confidence_threshold, ocr_mode))
+                cached = self._ocr_cache.get(cache_key, (offset_x, offset_y))
+                if cached is not None:
+                    self.logger.info(f"OCR 캐시 적중: {len(cached)}개 항목 (영역: {frame.region})")
+                    self._debug_capture.finish(debug_entry, cached)
+                    return cached
             
             # 이미지 전처리 적용 (선택적)
             if self.enable_preprocessing:
                 self.logger.debug("이미지 전처리 적용 중...")
-                img_array = self.preprocess_image_for_ocr(img_array)
-            
-            # PaddleOCR 실행
-            ocr = self._get_ocr()
-            self.logger.debug(f"Performing OCR on image shape: {img_array.shape}")
-            results = ocr.ocr(img_array)
-            
-            # 결과 디버깅
-            self.logger.debug(f"OCR raw results: {results}")
-            
-            # 결과 변환
-            text_results = []
-            
-            # PP-OCRv5는 결과를 다른 형식으로 반환할 수 있음
-            if results is None:
-                self.logger.warning("OCR returned None results")
-                return text_results
-            
-            # 결과가 딕셔너리인 경우 처리 (PP-OCRv5 가능성)
-            if isinstance(results, dict):
-                self.logger.debug(f"OCR returned dictionary with keys: {list(results.keys())}")
-                # 일반적인 키들 확인
-                if 'result' in results:
-                    results = results['result']
-                elif 'data' in results:
-                    results = results['data']
-                elif len(results) > 0:
-                    # 첫 번째 값 사용
-                    first_key = list(results.keys())[0]
-                    results = results[first_key]
-            
-            # 결과가 리스트가 아닌 경우
-            if not isinstance(results, list):
-                self.logger.error(f"Unexpected results type: {type(results)}")
-                # 단일 결과를 리스트로 변환
-                results = [results] if results else []
-            
-            # 각 페이지/결과 처리
-            for idx, page_result in enumerate(results):
-                if page_result is None:
-                    continue
-                
-                # page_result가 리스트가 아닌 경우 처리
-                if not isinstance(page_result, list):
-                    self.logger.debug(f"Page {idx} result is not a list: {type(page_result)}")
-                    # 딕셔너리인 경우
-                    if isinstance(page_result, dict):
-                        # 텍스트 결과가 포함된 키 찾기
-                        if 'texts' in page_result:
-                            page_result = page_result['texts']
-                        elif 'lines' in page_result:
-                            page_result = page_result['lines']
-                        else:
-                            page_result = [page_result]
-                    else:
-                        page_result = [page_result]
-                
-                # 각 라인 처리
-                for line_idx, line in enumerate(page_result):
+                img_array = self.preprocess_image_for_ocr(img_array, frame.gray())
+            
+            # 작은 영역: 투영 프로파일로 줄을 나눠 검출 없이 인식
+            text_results = None
+            if self._recognition_only and ocr_mode != OCR_MODE_FULL:
+                text_results = self._recognize_lines(frame, img_array, confidence_threshold,
+                                                     (offset_x, offset_y), ocr_mode)
+            
+            # 레이아웃 기억: 구조가 같으면 검출 없이 알려진 라인만 인식
+            if text_results is None and self._layout_memory is not None:
+                boxes = self._layout_memory.lookup(frame.region, frame.gray())
+                if boxes:
                     try:
-                        # line이 None인 경우
-                        if line is None:
-                            continue
-                        
-                        # 변수 초기화
-                        bbox_points = None
-                        text = ""
-                        confidence = 0.0
-                        
-                        # line의 실제 형식 로깅
-                        self.logger.debug(f"Line {line_idx} type: {type(line)}, content: {line}")
-                        
-                        # 딕셔너리 형식 (PP-OCRv5 가능성)
-                        if isinstance(line, dict):
-                            # 가능한 키 확인
-                            self.logger.debug(f"Line {line_idx} dict keys: {list(line.keys())}")
-                            
-                            # PP-OCRv5 새로운 형식 처리
-                            if 'rec_texts' in line and 'rec_polys' in line:
-                                # PP-OCRv5 형식: 여러 텍스트가 한 번에 들어옴
-                                texts = line.get('rec_texts', [])
-                                scores = line.get('rec_scores', [])
-                                polys = line.get('rec_polys', line.get('rec_boxes', []))
-                                
-                                self.logger.debug(f"PP-OCRv5 format detected: {len(texts)} texts found")
-                                
-                                # 각 텍스트에 대해 처리
-                                for text_idx, text in enumerate(texts):
-                                    if text_idx < len(scores) and text_idx < len(polys):
-                                        confidence = scores[text_idx]
-                                        bbox_array = polys[text_idx]
-                                        
-                                        # numpy array를 리스트로 변환
-                                        if hasattr(bbox_array, 'tolist'):
-                                            bbox_points = bbox_array.tolist()
-                                        else:
-                                            bbox_points = bbox_array
-                                        
-                                        # 좌표 처리
-                                        if confidence >= confidence_threshold and text.strip():
-                                            try:
-                                                # 4개 점 또는 4개 좌표
-                                                if len(bbox_points) == 4 and isinstance(bbox_points[0], (list, tuple)):
-                                                    # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]] 형식
-                                                    x_coords = [p[0] for p in bbox_points]
-                                                    y_coords = [p[1] for p in bbox_points]
-                                                elif len(bbox_points) == 4:
-                                                    # [x, y, width, height] 형식
-                                                    x, y, w, h = bbox_points
-                                                    x_coords = [x, x+w, x+w, x]
-                                                    y_coords = [y, y, y+h, y+h]
-                                                else:
-                                                    self.logger.warning(f"Unexpected bbox format: {bbox_points}")
-                                                    continue
-                                                
-                                                min_x = int(min(x_coords))
-                                                min_y = int(min(y_coords))
-                                                max_x = int(max(x_coords))
-                                                max_y = int(max(y_coords))
-                                                
-                                                width = max_x - min_x
-                                                height = max_y - min_y
-                                                
-                                                # 중심점 계산 (반올림으로 더 정확한 중심점)
-                                                center_x = int(min_x + width / 2)
-                                                center_y = int(min_y + height / 2)
-                                                
-                                                # 영역이 지정된 경우 좌표 조정
-                                                if region:
-                                                    min_x += region[0]
-                                                    min_y += region[1]
-                                                    center_x += region[0]
-                                                    center_y += region[1]
-                                                else:
-                                                    # 전체 화면인 경우 모니터 오프셋 적용
-                                                    min_x += monitor_offset_x
-                                                    min_y += monitor_offset_y
-                                                    center_x += monitor_offset_x
-                                                    center_y += monitor_offset_y
-                                                
-                                                result = TextResult(
-                                                    text=text,
-                                                    confidence=confidence,
-                                                    bbox=(min_x, min_y, width, height),
-                                                    center=(center_x, center_y)
-                                                )
-                                                text_results.append(result)
-                                                
-                                            except Exception as e:
-                                                self.logger.error(f"Error processing PP-OCRv5 text {text_idx}: {e}")
-                                
-                                # PP-OCRv5 형식은 이미 처리했으므로 다음 라인으로
-                                continue
-                            
-                            # 기존 딕셔너리 형식 처리
-                            else:
-                                bbox_points = line.get('points', line.get('bbox', line.get('box', [])))
-                                text = line.get('text', line.get('transcription', ''))
-                                confidence = line.get('confidence', line.get('score', line.get('prob', 1.0)))
-                                
-                                # bbox_points가 평면 리스트인 경우 변환
-                                if isinstance(bbox_points, list) and len(bbox_points) == 8:
-                                    # [x1,y1,x2,y2,x3,y3,x4,y4] -> [[x1,y1],[x2,y2],[x3,y3],[x4,y4]]
-                                    bbox_points = [[bbox_points[i], bbox_points[i+1]] for i in range(0, 8, 2)]
-                        
-                        # 기존 리스트/튜플 형식
-                        elif isinstance(line, (list, tuple)) and len(line) >= 2:
-                            bbox_points = line[0]
-                            self.logger.debug(f"Line {line_idx} bbox_points type: {type(bbox_points)}, content: {bbox_points}")
-                            
-                            # 텍스트와 신뢰도 추출
-                            if isinstance(line[1], (list, tuple)) and len(line[1]) >= 2:
-                                text = str(line[1][0])
-                                confidence = float(line[1][1])
-                            elif isinstance(line[1], str):
-                                text = line[1]
-                                confidence = 1.0
-                            elif isinstance(line[1], dict):
-                                text = line[1].get('text', '')
-                                confidence = line[1].get('confidence', 1.0)
-                            else:
-                                self.logger.warning(f"Unexpected text format in line {line_idx}: {type(line[1])}")
-                                continue
-                        else:
-                            self.logger.warning(f"Unexpected line format at index {line_idx}: {type(line)}")
-                            continue
-                        
-                        # bbox_points 유효성 검사
-                        if not bbox_points or not isinstance(bbox_points, (list, tuple)):
-                            self.logger.warning(f"Invalid bbox_points for line {line_idx}: {bbox_points}")
-                            self.logger.warning(f"Full line content: {line}")
-                            continue
-                            
-                        # 빈 텍스트 건너뛰기
-                        if not text or not text.strip():
-                            continue
-                            
+                        text_results = self._run_ocr(img_array, confidence_threshold, (offset_x, offset_y), boxes)
+                        self.logger.info(f"레이아웃 기억 사용: 검출 생략, {len(boxes)}개 라인만 인식")
                     except Exception as e:
-                        self.logger.error(f"Error parsing line {line_idx}: {e}, line content: {line}")
-                        continue
-                    
-                    if confidence >= confidence_threshold:
-                        # bbox 좌표 계산
-                        try:
-                            # bbox_points가 리스트의 리스트인지 확인
-                            if isinstance(bbox_points[0], (list, tuple)):
-                                x_coords = [p[0] for p in bbox_points]
-                                y_coords = [p[1] for p in bbox_points]
-                            else:
-                                # 평면 리스트인 경우 [x1,y1,x2,y2,...]
-                                x_coords = [bbox_points[i] for i in range(0, len(bbox_points), 2)]
-                                y_coords = [bbox_points[i+1] for i in range(0, len(bbox_points), 2)]
-                            
-                            if not x_coords or not y_coords:
-                                self.logger.warning(f"Empty coordinates for text: {text}")
-                                continue
-                                
-                            min_x = int(min(x_coords))
-                            min_y = int(min(y_coords))
-                            max_x = int(max(x_coords))
-                            max_y = int(max(y_coords))
-                        except (ValueError, IndexError) as e:
-                            self.logger.error(f"Error calculating bbox: {e}, bbox_points: {bbox_points}")
-                            continue
-                        
-                        width = max_x - min_x
-                        height = max_y - min_y
-                        
-                        # 중심점 계산 (반올림으로 더 정확한 중심점)
-                        center_x = int(min_x + width / 2)
-                        center_y = int(min_y + height / 2)
-                        
-                        # 영역이 지정된 경우 좌표 조정
-                        if region:
-                            min_x += region[0]
-                            min_y += region[1]
-                            center_x += region[0]
-                            center_y += region[1]
-                        else:
-                            # 전체 화면인 경우 모니터 오프셋 적용
-                            min_x += monitor_offset_x
-                            min_y += monitor_offset_y
-                            center_x += monitor_offset_x
-                            center_y += monitor_offset_y
-                        
-                        result = TextResult(
-                            text=text,
-                            confidence=confidence,
-                            bbox=(min_x, min_y, width, height),
-                            center=(center_x, center_y)
-                        )
-                        text_results.append(result)
-                        
+                        self.logger.warning(f"인식 전용 실행 실패, 레이아웃 기억 모드를 끕니다: {e}")
+                        self.set_layout_memory(False)
+                        self._recognition_only = False
+            
+            # 이전 호출과 비교해 바뀐 타일만 다시 인식 (결과 캐시 키와 같은 설정별로 구분)
+            incremental_key = (frame.region, self._cache_variant(confidence_threshold, ocr_mode))
+            if text_results is None and self._incremental is not None:
+                text_results = self._run_ocr_incremental(frame, img_array, confidence_threshold, incremental_key)
+            
+            if text_results is None:
+                tiles = self._plan_tiles(frame)
+                if tiles:
+                    text_results = self._run_ocr_tiled(frame, img_array, confidence_threshold, tiles)
+                else:
+                    text_results = self._run_ocr(img_array, confidence_threshold, (offset_x, offset_y))
+                if self._incremental is not None:
+                    self._incremental.remember(incremental_key, frame.gray(), text_results)
+                if self._layout_memory is not None:
+                    self._layout_memory.remember(frame.region, frame.gray(), [
+                        (r.bbox[0] - offset_x, r.bbox[1] - offset_y, r.bbox[2], r.bbox[3]) for r in text_results])
+            
+            if cache_key is not None:
+                self._ocr_cache.put(cache_key, text_results, (offset_x, offset_y))
+            
             self.logger.info(f"추출된 텍스트 항목: {len(text_results)}개")
             
             # 디버그 로깅 - 항상 활성화
             self.logger.info("=== OCR 텍스트 추출 결과 ===")
-            self.logger.info(f"검색 영역: {region if region else '전체 화면'}")
+            self.logger.info(f"검색 영역: {frame.region}")
             self.logger.info(f"추출된 텍스트 개수: {len(text_results)}개")
             
             if len(text_results) > 0:
                 self.logger.info("추출된 텍스트 목록:")
                 for i, result in enumerate(text_results):
                     self.logger.info(f"  [{i}] '{result.text}' 위치: {result.center}, 영역: {result.bbox}, 신뢰도: {result.confidence:.2f}")
-                    
+            
+            self._debug_capture.finish(debug_entry, text_results)
             return text_results
             
         except Exception as e:
             self.logger.error(f"텍스트 추출 오류: {e}")
             import traceback
             self.logger.error(f"상세 오류: {traceback.format_exc()}")
+            self._debug_capture.finish(debug_entry, error=str(e))
             return []
     
+    def _recognize_lines(self, frame: ScreenFrame, img_array, confidence_threshold: float,
+                         offset: Tuple[int, int], ocr_mode: str) -> Optional[List[TextResult]]:
+        """한 줄/여러 줄 빠른 경로 (전체 검출이 필요하면 None)"""
+        boxes = plan_recognition_boxes(frame.gray(), ocr_mode)
+        if boxes is None:
+            return None
+        if not boxes:
+            self.logger.info(f"빈 영역: OCR 생략 (영역: {frame.region})")
+            return []
+        try:
+            results = self._run_ocr(img_array, confidence_threshold, offset, boxes)
+        except Exception as e:
+            self.logger.warning(f"인식 전용 실행 실패, 전체 검출을 사용합니다: {e}")
+            self._recognition_only = False
+            return None
+        if not results and ocr_mode == OCR_MODE_AUTO:
+            # 자동 판단이 틀렸을 수 있음 (아이콘, 표 등) - 전체 검출로 확인
+            self.logger.debug("줄 인식 결과 없음, 전체 검출로 재시도")
+            return None
+        self.logger.info(f"줄 인식 사용: 검출 생략, {len(boxes)}개 줄 일괄 인식 (방식: {ocr_mode})")
+        return results
+    
+    @measure_performance
+    def extract_text_batch(self, regions: Sequence[Union[Tuple[int, int, int, int], TextQuery]],
+                           confidence_threshold: float = 0.5,
+                           ocr_mode: str = OCR_MODE_FULL) -> List[List[TextResult]]:
+        """
+        여러 영역을 한 번 캡처하고 한 번의 추론으로 텍스트 추출
+        
+        영역들을 잘라 빈 여백을 두고 하나의 캔버스에 모은 뒤 검출/인식을 한 번에
+        실행하고, 결과를 각 영역의 화면 좌표로 되돌린다. 작은 영역마다 OCR을
+        따로 부를 때의 호출당 오버헤드가 한 번으로 줄어든다.
+        
+        Args:
+            regions: (x, y, width, height) 또는 TextQuery (영역별 신뢰도/인식 방식) 목록
+            confidence_threshold: 영역 튜플에 적용할 최소 신뢰도
+            ocr_mode: 영역 튜플에 적용할 인식 방식
+            
+        Returns:
+            영역별 TextResult 리스트 (입력 순서, 화면 절대 좌표)
+        """
+        queries = [q if isinstance(q, TextQuery) else TextQuery(q, confidence_threshold, ocr_mode)
+                   for q in regions]
+        queries = [TextQuery(tuple(int(v) for v in q.region), q.confidence_threshold, q.ocr_mode)
+                   for q in queries]
+        if not queries:
+            return []
+        
+        x0 = min(q.region[0] for q in queries)
+        y0 = min(q.region[1] for q in queries)
+        x1 = max(q.region[0] + q.region[2] for q in queries)
+        y1 = max(q.region[1] + q.region[3] for q in queries)
+        try:
+            frame = get_screen_capture().grab((x0, y0, x1 - x0, y1 - y0))
+        except Exception as e:
+            self.logger.error(f"일괄 OCR 캡처 오류: {e}")
+            return [[] for _ in queries]
+        
+        crops = [frame.crop(q.region) for q in queries]
+        try:
+            return self._extract_batch(crops, queries)
+        except Exception as e:
+            # 영역별로 따로 인식
+            self.logger.warning(f"일괄 OCR 실패, 영역별로 실행합니다: {e}")
+            return [self.extract_text_from_frame(crop, q.confidence_threshold, ocr_mode=q.ocr_mode)
+                    for crop, q in zip(crops, queries)]
+    
+    def _extract_batch(self, crops: List[ScreenFrame], queries: List[TextQuery]) -> List[List[TextResult]]:
+        """extract_text_batch 본체 (crops는 한 프레임의 영역별 뷰)"""
+        start = time.time()
+        tile_size = self.settings.get("ocr.tile_size", 960) if self.settings else 960
+        gap = 24
+        outputs: List[Optional[List[TextResult]]] = [None] * len(crops)
+        cache_keys: List[Optional[str]] = [None] * len(crops)
+        detect: List[int] = []
+        line_boxes: Dict[int, List[Tuple[int, int, int, int]]] = {}
+        cached = single = 0
+        
+        for i, (crop, query) in enumerate(zip(crops, queries)):
+            if self._ocr_cache is not None:
+                cache_keys[i] = content_key(crop.rgb(), self._cache_variant(query.confidence_threshold,
+                                                                            query.ocr_mode))
+                outputs[i] = self._ocr_cache.get(cache_keys[i], (crop.left, crop.top))
+                if outputs[i] is not None:
+                    cached += 1
+                    continue
+            if crop.width + 2 * gap > tile_size or crop.height + 2 * gap > tile_size:
+                # 캔버스에 들어가지 않는 큰 영역은 따로 (타일 분할 등 적용)
+                outputs[i] = self.extract_text_from_frame(crop, query.confidence_threshold,
+                                                          ocr_mode=query.ocr_mode)
+                single += 1
+                continue
+            boxes = None
+            if self._recognition_only and query.ocr_mode != OCR_MODE_FULL:
+                boxes = plan_recognition_boxes(crop.gray(), query.ocr_mode)
+            if boxes is None:
+                detect.append(i)
+            elif boxes:
+                line_boxes[i] = boxes
+            else:
+                outputs[i] = []  # 빈 영역
+        
+        def image_of(index: int):
+            image = crops[index].rgb()
+            if self.enable_preprocessing:
+                image = self.preprocess_image_for_ocr(image, crops[index].gray())
+            return image
+        
+        def run(detect_indices: List[int], boxes_by_index: Dict[int, List[Tuple[int, int, int, int]]]):
+            """검출 캔버스와 줄 인식 캔버스를 한 번에 제출"""
+            jobs, plans = [], []
+            for indices, with_boxes in ((detect_indices, False), (list(boxes_by_index), True)):
+                if not indices:
+                    continue
+                sizes = [(crops[i].width, crops[i].height) for i in indices]
+                for canvas in pack_canvases(sizes, tile_size, tile_size, gap):
+                    for cell in canvas.cells:
+                        cell.index = indices[cell.index]
+                    boxes = None
+                    if with_boxes:
+                        boxes = [(bx + cell.x, by + cell.y, bw, bh) for cell in canvas.cells
+                                 for bx, by, bw, bh in boxes_by_index[cell.index]]
+                    image = compose(canvas, image_of, name=f"batch_canvas_{len(jobs)}")
+                    jobs.append((image, (0, 0), boxes))
+                    plans.append(canvas)
+            threshold = min(queries[i].confidence_threshold for i in detect_indices + list(boxes_by_index))
+            origins = [(crop.left, crop.top) for crop in crops]
+            found: Dict[int, List[TextResult]] = {}
+            for canvas, results in zip(plans, self._run_ocr_jobs(jobs, threshold)):
+                found.update(split_results(canvas, results, origins))
+            return found, len(jobs)
+        
+        calls = 0
+        if detect or line_boxes:
+            try:
+                found, calls = run(detect, line_boxes)
+            except Exception as e:
+                if not line_boxes:
+                    raise
+                self.logger.warning(f"인식 전용 실행 실패, 전체 검출을 사용합니다: {e}")
+                self._recognition_only = False
+                detect, line_boxes = detect + list(line_boxes), {}
+                found, calls = run(detect, line_boxes)
+            
+            # 자동 판단이 틀렸을 수 있는 빈 줄 인식 결과는 검출로 다시 확인
+            retry = [i for i in line_boxes if not found[i] and queries[i].ocr_mode == OCR_MODE_AUTO]
+            if retry:
+                found_again, more = run(retry, {})
+                found.update(found_again)
+                calls += more
+            
+            for i, results in found.items():
+                threshold = queries[i].confidence_threshold
+                outputs[i] = sorted((r for r in results if r.confidence >= threshold),
+                                    key=lambda r: (r.bbox[1], r.bbox[0]))
+                if cache_keys[i] is not None:
+                    self._ocr_cache.put(cache_keys[i], outputs[i], (crops[i].left, crops[i].top))
+        
+        self.logger.info(f"일괄 OCR: 영역 {len(crops)}개 -> 추론 {calls}회 "
+                         f"(검출 {len(detect)}, 줄 인식 {len(line_boxes)}, 캐시 {cached}, 개별 {single}) "
+                         f"{time.time() - start:.2f}초")
+        return [output if output is not None else [] for output in outputs]
+    
     @measure_performance
     def find_text(self, target_text: str, region: Optional[Tuple[int, int, int, int]] = None,
                   exact_match: bool = False, confidence_threshold: float = 0.5,
                   confidence: float = None, max_retries: int = 1,
-                  monitor_info: Optional[Dict] = None) -> Optional[TextResult]:
+                  monitor_info: Optional[Dict] = None,
+                  ocr_mode: str = OCR_MODE_FULL) -> Optional[TextResult]:
         """
         특정 텍스트 찾기 (EasyOCR 인터페이스 호환)
         
@@ -576,6 +819,7 @@ class PaddleTextExtractor:
             confidence: 하위 호환성을 위한 매개변수
             max_retries: 최대 재시도 횟수
             monitor_info: 모니터 정보 (multi-monitor support)
+            ocr_mode: 인식 방식 (auto, full, line, lines)
             
         Returns:
             TextResult 또는 None
@@ -605,96 +849,70 @@ class PaddleTextExtractor:
                     return None
                     
             # 모든 텍스트 추출 (monitor_info 전달)
-            text_results = self.extract_text_from_region(region, confidence_threshold, monitor_info)
-            
-            # 대상 텍스트 정규화
-            target_lower = target_text.lower().strip()
-            
-            # 특수 문자 정규화 (전각 -> 반각)
-            def normalize_special_chars(text):
-                """특수 문자 정규화"""
-                replacements = {
-                    '：': ':', '；': ';', '（': '(', '）': ')',
-                    '［': '[', '］': ']', '｛': '{', '｝': '}',
-                    '＜': '<', '＞': '>', '，': ',', '。': '.',
-                    '！': '!', '？': '?', '　': ' '
-                }
-                for full, half in replacements.items():
-                    text = text.replace(full, half)
-                return text
-            
-            # 대상 텍스트 정규화
-            target_normalized = normalize_special_chars(target_lower)
-            
-            self.logger.info(f"=== 텍스트 검색 시작 ===")
-            self.logger.info(f"찾을 텍스트: '{target_text}'")
-            self.logger.info(f"정규화된 텍스트: '{target_normalized}'")
-            self.logger.info(f"검색 모드: {'정확 일치' if exact_match else '부분 일치'}")
-            
-            # 매칭 로직
-            best_match = None
-            best_score = 0.0
+            text_results = self.extract_text_from_region(region, confidence_threshold, monitor_info, ocr_mode)
             
-            for i, result in enumerate(text_results):
-                text_lower = result.text.lower().strip()
-                text_normalized = normalize_special_chars(text_lower)
-                
-                # 각 텍스트 비교 로그
-                self.logger.debug(f"  비교 [{i}]: OCR='{result.text}' → 정규화='{text_normalized}'")
-                
-                if exact_match:
-                    # 정확한 매칭 - 정규화된 텍스트로 비교
-                    if text_normalized == target_normalized:
-                        self.logger.info(f"  ✓ 정확히 일치! 위치: {result.center}")
-                        return result
-                else:
-                    # 부분 매칭 - 대상이 검출된 텍스트에 포함
-                    if target_normalized in text_normalized:
-                        # 매칭 점수 계산
-                        score = len(target_normalized) / len(text_normalized)
-                        self.logger.debug(f"    → 부분 일치 (대상이 OCR에 포함), 점수: {score:.2f}")
-                        if score > best_score:
-                            best_match = result
-                            best_score = score
-                    # 검출된 텍스트가 대상에 포함 (부분 OCR 결과)
-                    elif text_normalized in target_normalized and len(text_normalized) > 2:
-                        score = len(text_normalized) / len(target_normalized)
-                        self.logger.debug(f"    → 부분 일치 (OCR이 대상에 포함), 점수: {score:.2f}")
-                        if score > best_score:
-                            best_match = result
-                            best_score = score
-                    # 공백 제거 후 비교 (띄어쓰기 차이 허용)
-                    elif target_normalized.replace(' ', '') in text_normalized.replace(' ', ''):
-                        score = len(target_normalized) / len(text_normalized) * 0.9  # 약간 낮은 점수
-                        self.logger.debug(f"    → 공백 무시 일치, 점수: {score:.2f}")
-                        if score > best_score:
-                            best_match = result
-                            best_score = score
-            
-            if best_match:
-                self.logger.info(f"=== 텍스트 찾음 ===")
-                self.logger.info(f"찾은 텍스트: '{best_match.text}'")
-                self.logger.info(f"위치: {best_match.center}")
-                self.logger.info(f"매칭 점수: {best_score:.2f}")
-            else:
-                self.logger.warning(f"=== 텍스트를 찾을 수 없음 ===")
-                self.logger.warning(f"찾으려던 텍스트: '{target_text}'")
-                self.logger.warning(f"검색 영역: {region if region else '전체 화면'}")
-                self.logger.warning(f"OCR로 추출된 텍스트 개수: {len(text_results)}개")
-                if len(text_results) > 0:
-                    self.logger.warning("가능한 원인:")
-                    self.logger.warning("1. 텍스트가 검색 영역 밖에 있음")
-                    self.logger.warning("2. OCR 인식 오류")
-                    self.logger.warning("3. 텍스트 형식 불일치 (띄어쓰기, 특수문자 등)")
-                else:
-                    self.logger.warning("OCR이 아무 텍스트도 추출하지 못했습니다. 검색 영역을 확인하세요.")
-                
-            return best_match
+            strategies = (MATCH_EXACT,) if exact_match else (MATCH_PARTIAL,)
+            match = self.match_text(target_text, text_results, strategies)
+            if match is None:
+                self._log_not_found(target_text, region, text_results)
+                return None
+            return match.result
             
         except Exception as e:
             self.logger.error(f"텍스트 검색 오류: {e}")
             return None
     
+    def match_text(self, target_text: str, text_results: List[TextResult],
+                   strategies: Tuple[str, ...] = FALLBACK_STRATEGIES) -> Optional[TextMatch]:
+        """
+        추출된 결과에 매칭 전략을 순서대로 적용 (OCR 재실행 없음)
+        
+        Args:
+            target_text: 찾을 텍스트
+            text_results: extract_text_* 결과
+            strategies: 시도할 전략 (MATCH_EXACT, MATCH_PARTIAL, MATCH_AGGRESSIVE)
+            
+        Returns:
+            처음으로 일치한 전략의 최고 점수 결과 또는 None
+        """
+        self.logger.info(f"=== 텍스트 검색 시작 ===")
+        self.logger.info(f"찾을 텍스트: '{target_text}'")
+        self.logger.info(f"정규화된 텍스트: '{normalize_text(target_text)}'")
+        self.logger.info(f"검색 전략: {', '.join(strategies)}")
+        
+        texts = [result.text for result in text_results]
+        confidences = [result.confidence for result in text_results]
+        for strategy in strategies:
+            scores = self.matcher.scores(target_text, texts, confidences, strategy) if texts else []
+            best_match = None
+            best_score = 0.0
+            if len(scores):
+                index = int(scores.argmax())
+                if self.matcher.accepts(scores[index]):
+                    best_match, best_score = text_results[index], float(scores[index])
+            if best_match is not None:
+                self.logger.info(f"=== 텍스트 찾음 ===")
+                self.logger.info(f"찾은 텍스트: '{best_match.text}'")
+                self.logger.info(f"위치: {best_match.center}")
+                self.logger.info(f"매칭 전략: {strategy}, 점수: {best_score:.2f}")
+                return TextMatch(best_match, strategy, best_score)
+        return None
+    
+    def _log_not_found(self, target_text: str, region: Optional[Tuple[int, int, int, int]],
+                       text_results: List[TextResult]):
+        """검색 실패 원인 안내 로그"""
+        self.logger.warning(f"=== 텍스트를 찾을 수 없음 ===")
+        self.logger.warning(f"찾으려던 텍스트: '{target_text}'")
+        self.logger.warning(f"검색 영역: {region if region else '전체 화면'}")
+        self.logger.warning(f"OCR로 추출된 텍스트 개수: {len(text_results)}개")
+        if len(text_results) > 0:
+            self.logger.warning("가능한 원인:")
+            self.logger.warning("1. 텍스트가 검색 영역 밖에 있음")
+            self.logger.warning("2. OCR 인식 오류")
+            self.logger.warning("3. 텍스트 형식 불일치 (띄어쓰기, 특수문자 등)")
+        else:
+            self.logger.warning("OCR이 아무 텍스트도 추출하지 못했습니다. 검색 영역을 확인하세요.")
+    
     def find_all_text(self, target_text: str, region: Optional[Tuple[int, int, int, int]] = None,
                       exact_match: bool = False, confidence_threshold: float = 0.5) -> List[TextResult]:
         """
@@ -713,22 +931,11 @@ class PaddleTextExtractor:
             # 모든 텍스트 추출
             text_results = self.extract_text_from_region(region, confidence_threshold)
             
-            # 대상 텍스트 정규화
-            target_lower = target_text.lower().strip()
-            
-            # 모든 매칭 찾기
-            matches = []
-            
-            for result in text_results:
-                text_lower = result.text.lower().strip()
-                
-                if exact_match:
-                    if text_lower == target_lower:
-                        matches.append(result)
-                else:
-                    # 부분 매칭
-                    if target_lower in text_lower or text_lower in target_lower:
-                        matches.append(result)
+            # 모든 매칭 찾기 (점수 높은 순)
+            strategy = MATCH_EXACT if exact_match else MATCH_PARTIAL
+            indices = self.matcher.matching(target_text, [r.text for r in text_results],
+                                            [r.confidence for r in text_results], strategy)
+            matches = [text_results[i] for i in indices]
             
             self.logger.info(f"'{target_text}'의 {len(matches)}개 항목 찾음")
             return matches
@@ -737,49 +944,78 @@ class PaddleTextExtractor:
             self.logger.error(f"모든 텍스트 찾기 오류: {e}")
             return []
     
-    def preload_models(self):
-        """OCR 모델 사전 로드"""
+    def preload_models(self, progress: Optional[Callable[[int, str], None]] = None) -> bool:
+        """OCR 모델 사전 로드 및 예열
+        
+        실제 화면과 비슷한 한글 텍스트 이미지로 검출+인식과 인식 전용 모델을 한 번씩
+        실행해 첫 단계의 추론 지연(모델 로드, 입력 크기별 초기화)을 미리 지불한다.
+        
+        Args:
+            progress: (퍼센트, 메시지) 진행 상황 콜백
+            
+        Returns:
+            OCR 사용 가능 여부
+        """
+        report = progress or (lambda percent, message: None)
+        image, boxes = render_warmup_image()
         try:
-            self.logger.info("PaddleOCR 모델 사전 로드 중...")
+            service = self._get_ocr_service()
+            if service is not None:
+                # 워커 프로세스에서 모델 로드
+                report(10, "OCR 워커 프로세스 시작 중...")
+                if service.wait_ready():
+                    report(60, "텍스트 검출 모델 예열 중...")
+                    service.recognize(image, 0.0)
+                    report(85, "텍스트 인식 모델 예열 중...")
+                    try:
+                        service.recognize(image, 0.0, boxes=boxes)
+                    except Exception as e:
+                        self.logger.warning(f"인식 전용 모델을 사용할 수 없어 전체 검출을 사용합니다: {e}")
+                        self._recognition_only = False
+                    report(100, "OCR 준비 완료")
+                    return True
+                self.logger.warning("OCR 워커를 시작하지 못해 앱 프로세스에서 로드합니다.")
+                self._ocr_service_enabled = False
+            
+            report(20, "PaddleOCR 모델 로드 중...")
             ocr = self._get_ocr()
-            
-            # 더미 이미지로 인식 수행
-            import numpy as np
-            dummy_img = np.zeros((100, 100, 3), dtype=np.uint8)
-            dummy_img.fill(255)  # 흰색 배경
-            
-            ocr.ocr(dummy_img)
+            report(60, "텍스트 검출 모델 예열 중...")
+            ocr.ocr(image)
+            report(85, "텍스트 인식 모델 예열 중...")
+            recognizer = self._get_recognizer()
+            if recognizer is not None:
+                recognize_boxes(recognizer, image, boxes, 0.0)
+            else:
+                self._recognition_only = False
+            report(100, "OCR 준비 완료")
             self.logger.info("PaddleOCR 모델 사전 로드 완료")
+            return True
             
         except Exception as e:
             self.logger.error(f"모델 사전 로드 오류: {e}")
-
-    def find_text_with_fallback(self, target_text: str, **kwargs) -> Optional[TextResult]:
-        """폴백 전략을 포함한 텍스트 검색"""
-        # 1차: 정확한 매칭
-        result = self.find_text(target_text, exact_match=True, **kwargs)
-        if result:
-            return result
-        
-        # 2차: 부분 매칭
-        result = self.find_text(target_text, exact_match=False, **kwargs)
-        if result:
-            return result
-        
-        # 3차: 정규화 후 매칭
-        normalized_target = self._aggressive_normalize(target_text)
-        result = self.find_text(normalized_target, exact_match=False, **kwargs)
+            return False
+    
+    def find_text_with_fallback(self, target_text: str, region: Optional[Tuple[int, int, int, int]] = None,
+                                confidence_threshold: float = 0.5,
+                                monitor_info: Optional[Dict] = None,
+                                ocr_mode: str = OCR_MODE_FULL, **kwargs) -> Optional[TextResult]:
+        """폴백 전략을 포함한 텍스트 검색
         
-        return result
+        OCR은 한 번만 실행하고 정확 일치 → 부분 일치 → 정규화 일치를 메모리에서 순서대로 적용.
+        사용된 전략과 점수는 last_match에 남는다.
+        """
+        if 'confidence' in kwargs and kwargs['confidence'] is not None:
+            confidence_threshold = kwargs['confidence']
+        text_results = self.extract_text_from_region(region, confidence_threshold, monitor_info, ocr_mode)
+        self.last_match = self.match_text(target_text, text_results, FALLBACK_STRATEGIES)
+        if self.last_match is None:
+            self._log_not_found(target_text, region, text_results)
+            return None
+        return self.last_match.result
     
     def _aggressive_normalize(self, text: str) -> str:
         """공격적인 텍스트 정규화"""
-        # 모든 공백 제거
-        text = text.replace(' ', '')
-        # 특수문자 제거
-        import re
-        text = re.sub(r'[^\w\s가-힣]', '', text)
-        return text
+        return aggressive_normalize(text)
 
 # 전역 인스턴스 생성
 paddle_text_extractor = PaddleTextExtractor()
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Spatial index over the OCR results of one extraction
+
+Label/value screens (e.g. "환자번호 12345678") are read by finding the label
+once and looking up the value next to it in the same results, instead of
+running OCR again on a hand-tuned region.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from vision.ocr_common import TextResult
+from vision.text_matcher import normalize, compact
+
+Box = Tuple[int, int, int, int]  # x, y, width, height
+
+QUERY_RIGHT = "right"   # nearest text right of the anchor
+QUERY_BELOW = "below"   # nearest text below the anchor
+QUERY_LEFT = "left"
+QUERY_ABOVE = "above"
+QUERY_ROW = "row"       # all text right of the anchor on its row
+QUERY_BOX = "box"       # text inside a box placed relative to the anchor
+
+ANCHOR_QUERIES = (QUERY_RIGHT, QUERY_BELOW, QUERY_ROW, QUERY_BOX, QUERY_LEFT, QUERY_ABOVE)
+
+
+def _overlap(a0: int, a1: int, b0: int, b1: int) -> int:
+    return max(0, min(a1, b1) - max(a0, b0))
+
+
+def reading_order(results: Sequence[TextResult]) -> List[TextResult]:
+    """Top-to-bottom rows, left to right within a row"""
+    if not results:
+        return []
+    line = max(1.0, float(np.median([r.bbox[3] for r in results])))
+    return sorted(results, key=lambda r: (int(r.center[1] // line), r.bbox[0]))
+
+
+def join_text(results: Sequence[TextResult]) -> str:
+    """Text of several results in reading order"""
+    return " ".join(r.text for r in reading_order(results)).strip()
+
+
+_SEPARATORS = " :：-="
+
+
+def _label_end(text: str, wanted: str) -> Optional[int]:
+    """Position in ``text`` right after the label (compact, normalized ``wanted``)"""
+    for end in range(1, len(text) + 1):
+        prefix = compact(normalize(text[:end]))
+        if prefix == wanted:
+            return end
+        if len(prefix) > len(wanted) or not wanted.startswith(prefix):
+            break
+    # 라벨 일부가 오인식된 경우: 라벨 길이 근처의 첫 구분자에서 나눔
+    tolerance = max(1, len(wanted) // 4)
+    for end, char in enumerate(text):
+        if char in _SEPARATORS:
+            length = len(compact(normalize(text[:end])))
+            if abs(length - len(wanted)) <= tolerance:
+                return end
+            if length > len(wanted) + tolerance:
+                break
+    return None
+
+
+def split_labeled(result: TextResult, label: str) -> Tuple[TextResult, Optional[TextResult]]:
+    """Split a detection that holds both a label and its value ("환자번호: 12345678")
+
+    Detection often joins a label and a value that sit close together. When
+    the result's text starts with the label, the rest becomes a separate
+    value result whose box is estimated from the character positions.
+
+    Returns:
+        (label result, value result or None)
+    """
+    wanted = compact(normalize(label))
+    text = result.text
+    end = _label_end(text, wanted) if wanted else None
+    if end is None:
+        return result, None
+    start = end + len(text[end:]) - len(text[end:].lstrip(_SEPARATORS))
+    value = text[start:].rstrip()
+    if not value:
+        return result, None
+
+    x, y, w, h = result.bbox
+    per_char = w / max(1, len(text))
+    label_width = max(1, int(round(per_char * end)))
+    value_x = x + int(round(per_char * start))
+    value_width = max(1, int(round(per_char * len(value))))
+    label_part = TextResult(text[:end], result.confidence, (x, y, label_width, h),
+                            (x + label_width // 2, y + h // 2))
+    value_part = TextResult(value, result.confidence, (value_x, y, value_width, h),
+                            (value_x + value_width // 2, y + h // 2))
+    return label_part, value_part
+
+
+class TextIndex:
+    """Uniform grid over text results
+
+    Every result is registered in each grid cell its box touches, so box and
+    neighbour queries only look at nearby results. Coordinates are whatever
+    the results use (screen coordinates for extractor output).
+    """
+
+    def __init__(self, results: Sequence[TextResult], cell_size: int = 0):
+        """
+        Args:
+            results: Results of one extraction
+            cell_size: Grid cell size in pixels (0: four times the median text height)
+        """
+        self.results = list(results)
+        heights = [r.bbox[3] for r in self.results]
+        self.line_height = float(np.median(heights)) if heights else 16.0
+        self.cell_size = int(cell_size or max(16, 4 * self.line_height))
+        self._grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for index, result in enumerate(self.results):
+            for cell in self._cells(result.bbox):
+                self._grid[cell].append(index)
+        if self.results:
+            self.extent = (min(r.bbox[0] for r in self.results), min(r.bbox[1] for r in self.results),
+                           max(r.bbox[0] + r.bbox[2] for r in self.results),
+                           max(r.bbox[1] + r.bbox[3] for r in self.results))
+        else:
+            self.extent = (0, 0, 0, 0)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def _cells(self, box: Box):
+        x, y, w, h = box
+        size = self.cell_size
+        for gx in range(x // size, (x + max(w, 1) - 1) // size + 1):
+            for gy in range(y // size, (y + max(h, 1) - 1) // size + 1):
+                yield gx, gy
+
+    def _candidates(self, box: Box) -> Set[int]:
+        """Indices of results that may intersect a box"""
+        x0, y0, x1, y1 = self.extent
+        bx0, by0 = max(box[0], x0), max(box[1], y0)
+        bx1, by1 = min(box[0] + box[2], x1), min(box[1] + box[3], y1)
+        if bx1 <= bx0 or by1 <= by0:
+            return set()
+        found: Set[int] = set()
+        for cell in self._cells((bx0, by0, bx1 - bx0, by1 - by0)):
+            found.update(self._grid.get(cell, ()))
+        return found
+
+    def in_box(self, box: Box, min_overlap: float = 0.5) -> List[TextResult]:
+        """Results covered by a box (at least ``min_overlap`` of their own area), in reading order"""
+        x, y, w, h = box
+        found = []
+        for index in self._candidates(box):
+            result = self.results[index]
+            rx, ry, rw, rh = result.bbox
+            area = _overlap(rx, rx + rw, x, x + w) * _overlap(ry, ry + rh, y, y + h)
+            if area > 0 and area >= min_overlap * max(1, rw * rh):
+                found.append(result)
+        return reading_order(found)
+
+    def neighbour(self, anchor: TextResult, direction: str = QUERY_RIGHT, max_distance: int = 0,
+                  min_overlap: float = 0.5) -> Optional[TextResult]:
+        """Nearest result on one side of the anchor and aligned with it
+
+        Args:
+            anchor: Label result
+            direction: QUERY_RIGHT, QUERY_LEFT, QUERY_BELOW or QUERY_ABOVE
+            max_distance: Largest gap from the anchor's edge in pixels (0: unlimited)
+            min_overlap: Required overlap across the direction (share of the
+                smaller of the two boxes), i.e. same row for left/right and
+                same column for above/below
+        """
+        found = self._side(anchor, direction, max_distance, min_overlap)
+        return found[0] if found else None
+
+    def row(self, anchor: TextResult, max_distance: int = 0, max_gap: int = 0,
+            min_overlap: float = 0.5) -> List[TextResult]:
+        """Results right of the anchor on its row, left to right
+
+        Args:
+            max_distance: Only results starting within this distance of the anchor (0: unlimited)
+            max_gap: Stop at a gap wider than this between consecutive results (0: no limit)
+        """
+        found = self._side(anchor, QUERY_RIGHT, max_distance, min_overlap)
+        if max_gap:
+            edge = anchor.bbox[0] + anchor.bbox[2]
+            kept = []
+            for result in found:
+                if result.bbox[0] - edge > max_gap:
+                    break
+                kept.append(result)
+                edge = max(edge, result.bbox[0] + result.bbox[2])
+            found = kept
+        return found
+
+    @staticmethod
+    def relative_box(anchor: TextResult, offset: Box) -> Box:
+        """Box placed relative to the anchor's top-left corner"""
+        dx, dy, w, h = offset
+        return (anchor.bbox[0] + dx, anchor.bbox[1] + dy, w, h)
+
+    def query(self, anchor: TextResult, query: str = QUERY_RIGHT, max_distance: int = 0,
+              box_offset: Optional[Box] = None) -> List[TextResult]:
+        """Value results for an anchor query (see ANCHOR_QUERIES)"""
+        if query == QUERY_ROW:
+            return self.row(anchor, max_distance)
+        if query == QUERY_BOX:
+            if not box_offset:
+                raise ValueError("box query needs box_offset")
+            return [r for r in self.in_box(self.relative_box(anchor, box_offset)) if r is not anchor]
+        found = self.neighbour(anchor, query, max_distance)
+        return [found] if found is not None else []
+
+    def _side(self, anchor: TextResult, direction: str, max_distance: int,
+              min_overlap: float) -> List[TextResult]:
+        """Aligned results on one side of the anchor, nearest first"""
+        ax, ay, aw, ah = anchor.bbox
+        x0, y0, x1, y1 = self.extent
+        reach_x = max_distance or max(1, x1 - x0)
+        reach_y = max_distance or max(1, y1 - y0)
+        slack = max(2, int(0.2 * min(ah, self.line_height)))  # boxes of one line may touch or overlap a little
+        if direction == QUERY_RIGHT:
+            search = (ax + aw - slack, ay, reach_x + slack, ah)
+        elif direction == QUERY_LEFT:
+            search = (ax - reach_x, ay, reach_x + slack, ah)
+        elif direction == QUERY_BELOW:
+            search = (ax, ay + ah - slack, aw, reach_y + slack)
+        elif direction == QUERY_ABOVE:
+            search = (ax, ay - reach_y, aw, reach_y + slack)
+        else:
+            raise ValueError(f"unknown direction: {direction}")
+        horizontal = direction in (QUERY_RIGHT, QUERY_LEFT)
+        acx, acy = anchor.center
+
+        found = []
+        for index in self._candidates(search):
+            result = self.results[index]
+            if result is anchor or result.bbox == anchor.bbox:
+                continue
+            rx, ry, rw, rh = result.bbox
+            if horizontal:
+                aligned = _overlap(ay, ay + ah, ry, ry + rh) >= min_overlap * min(ah, rh)
+                gap = rx - (ax + aw) if direction == QUERY_RIGHT else ax - (rx + rw)
+                offset = abs(result.center[1] - acy)
+            else:
+                aligned = _overlap(ax, ax + aw, rx, rx + rw) >= min_overlap * min(aw, rw)
+                gap = ry - (ay + ah) if direction == QUERY_BELOW else ay - (ry + rh)
+                offset = abs(result.center[0] - acx)
+            if not aligned or gap < -slack or (max_distance and gap > max_distance):
+                continue
+            found.append((max(gap, 0), offset, result))
+        found.sort(key=lambda item: (item[0], item[1]))
+        return [result for _, _, result in found]
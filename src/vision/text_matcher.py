@@ -0,0 +1,218 @@
+"""
+Hangul-aware fuzzy matching of search text against OCR results
+"""
+
+import re
+import unicodedata
+from typing import List, Optional, Sequence
+import numpy as np
+
+MODE_EXACT = "exact"
+MODE_PARTIAL = "partial"
+MODE_AGGRESSIVE = "aggressive"
+
+
+def _width_table() -> dict:
+    """Full-width ASCII, ideographic space and half-width Hangul/Katakana forms"""
+    table = {}
+    for code in list(range(0xFF01, 0xFFEF)) + [0x3000]:
+        folded = unicodedata.normalize('NFKC', chr(code))
+        if folded != chr(code):
+            table[code] = folded
+    table[ord('。')] = '.'
+    return table
+
+
+def _jamo_table() -> dict:
+    """Hangul syllables and compatibility jamo -> conjoining jamo"""
+    table = {}
+    for code in range(0xAC00, 0xD7A4):
+        index = code - 0xAC00
+        lead, rest = divmod(index, 21 * 28)
+        vowel, tail = divmod(rest, 28)
+        table[code] = chr(0x1100 + lead) + chr(0x1161 + vowel) + (chr(0x11A7 + tail) if tail else '')
+    for code in range(0x3131, 0x318F):
+        table[code] = unicodedata.normalize('NFKC', chr(code))
+    return table
+
+
+WIDTH_TABLE = str.maketrans(_width_table())
+JAMO_TABLE = str.maketrans(_jamo_table())
+_NON_WORD = re.compile(r'[^\w가-힣]')
+_DIGITS = frozenset('0123456789')
+
+
+def normalize(text: str) -> str:
+    """Lower case, trimmed, full/half-width forms folded"""
+    return text.translate(WIDTH_TABLE).lower().strip()
+
+
+def compact(text: str) -> str:
+    """Remove whitespace and punctuation"""
+    return _NON_WORD.sub('', text)
+
+
+def decompose_hangul(text: str) -> str:
+    """Split Hangul syllables into jamo so one misread jamo costs one edit (환자 vs 환지)"""
+    return text.translate(JAMO_TABLE)
+
+
+def _codes(texts: Sequence[str], width: int) -> np.ndarray:
+    """Code points padded with -1 into a (len(texts), width + 1) matrix (column 0 unused)"""
+    codes = np.full((len(texts), width + 1), -1, dtype=np.int32)
+    for row, text in enumerate(texts):
+        if text:
+            codes[row, 1:len(text) + 1] = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return codes
+
+
+def fuzzy_distances(pattern: str, texts: Sequence[str], max_distance: int,
+                    partial: bool = True, strict: frozenset = frozenset()) -> np.ndarray:
+    """Edit distance of ``pattern`` to every text, computed together
+
+    The DP runs one pattern character at a time over all texts at once (rows
+    are texts, columns text positions). Texts whose best cell already exceeds
+    ``max_distance`` are dropped, and the loop stops when none are left.
+
+    Args:
+        pattern: Search text (already normalized)
+        texts: Candidate texts (already normalized)
+        max_distance: Distances above this are reported as ``max_distance + 1``
+        partial: Match the pattern against the best substring of each text
+            (free prefix/suffix) instead of the whole text
+        strict: Pattern characters that must not be substituted or dropped
+            (e.g. digits of an ID)
+
+    Returns:
+        int array of distances, capped at ``max_distance + 1``
+    """
+    count = len(texts)
+    over = max_distance + 1
+    result = np.full(count, over, dtype=np.int64)
+    if count == 0:
+        return result
+    lengths = np.array([len(t) for t in texts], dtype=np.int64)
+    if not pattern:
+        return np.minimum(np.zeros(count, dtype=np.int64) if partial else lengths, over)
+
+    width = int(lengths.max())
+    codes = _codes(texts, width)
+    columns = np.arange(width + 1, dtype=np.int64)
+    rows = np.arange(count)
+    previous = np.zeros((count, width + 1), dtype=np.int64) if partial else np.tile(columns, (count, 1))
+
+    for position, char in enumerate(pattern, 1):
+        cost = over if char in strict else 1
+        candidate = np.empty_like(previous)
+        candidate[:, 0] = previous[:, 0] + cost
+        substitute = previous[:, :-1] + np.where(codes[:, 1:] == ord(char), 0, cost)
+        candidate[:, 1:] = np.minimum(substitute, previous[:, 1:] + cost)
+        # Insertions: cell j = min over k <= j of candidate[k] + (j - k)
+        current = np.minimum.accumulate(candidate - columns, axis=1) + columns
+
+        alive = current.min(axis=1) <= max_distance
+        if not alive.all():
+            if not alive.any():
+                return result
+            current, codes, rows, lengths = current[alive], codes[alive], rows[alive], lengths[alive]
+        previous = current
+
+    if partial:
+        valid = columns[None, :] <= lengths[:, None]
+        distances = np.where(valid, previous, over).min(axis=1)
+    else:
+        distances = previous[np.arange(len(rows)), lengths]
+    result[rows] = np.minimum(distances, over)
+    return result
+
+
+class TextMatcher:
+    """Scores OCR results against a search text
+
+    Similarity is one minus the (jamo-level) edit distance relative to the
+    search text's length; results need at least ``1 - max_error_ratio``. For
+    partial matches shorter OCR lines rank above long lines that merely
+    contain the text, and the OCR confidence weighs the final score. A result
+    counts as a match only when its final score reaches ``min_score``.
+    """
+
+    def __init__(self, use_jamo: bool = True, max_error_ratio: float = 0.25,
+                 confidence_weight: float = 0.3, strict_digits: bool = True,
+                 min_score: float = 0.5):
+        """
+        Args:
+            use_jamo: Compare Hangul by jamo instead of whole syllables
+            max_error_ratio: Edits allowed per character of the search text
+            confidence_weight: Share of the final score that depends on OCR confidence
+            strict_digits: Digits must match exactly (IDs, dates, amounts)
+            min_score: Lowest final score accepted as a match; fragments of the
+                search text always score below 0.5, so by default they only
+                rank and are never a match on their own
+        """
+        self.use_jamo = use_jamo
+        self.max_error_ratio = max_error_ratio
+        self.confidence_weight = confidence_weight
+        self.strict = _DIGITS if strict_digits else frozenset()
+        self.min_score = min_score
+
+    def _prepare(self, text: str, mode: str) -> str:
+        text = normalize(text)
+        if mode == MODE_AGGRESSIVE:
+            text = compact(text)
+        elif mode == MODE_PARTIAL:
+            text = text.replace(' ', '')
+        return decompose_hangul(text) if self.use_jamo else text
+
+    def similarities(self, target: str, texts: Sequence[str], mode: str = MODE_PARTIAL) -> np.ndarray:
+        """Similarity in [0, 1] of every text (0 where it does not match)"""
+        if mode == MODE_EXACT:
+            wanted = normalize(target)
+            return np.array([1.0 if normalize(t) == wanted else 0.0 for t in texts])
+
+        pattern = self._prepare(target, mode)
+        candidates = [self._prepare(t, mode) for t in texts]
+        if not pattern:
+            return np.zeros(len(texts))
+        max_distance = int(len(pattern) * self.max_error_ratio)
+        distances = fuzzy_distances(pattern, candidates, max_distance, partial=True, strict=self.strict)
+        similarity = np.where(distances <= max_distance, 1.0 - distances / len(pattern), 0.0)
+
+        # Tightness: "환자번호" beats "환자번호 조회 결과" for the same search
+        lengths = np.array([max(len(c), 1) for c in candidates], dtype=np.float64)
+        similarity *= 0.85 + 0.15 * np.minimum(1.0, len(pattern) / lengths)
+
+        # OCR line that is a fragment of the search text (cut by a box edge);
+        # never for strict characters, or "1234" would stand in for "12345"
+        for i, candidate in enumerate(candidates):
+            if similarity[i] == 0.0 and len(candidate) > 2 and candidate in pattern \
+                    and self.strict.isdisjoint(candidate):
+                similarity[i] = len(candidate) / len(pattern) * 0.5
+        return similarity
+
+    def scores(self, target: str, texts: Sequence[str], confidences: Sequence[float],
+               mode: str = MODE_PARTIAL) -> np.ndarray:
+        """Confidence-weighted scores (0 where the text does not match)"""
+        similarity = self.similarities(target, texts, mode)
+        weight = self.confidence_weight
+        return similarity * (1.0 - weight + weight * np.asarray(confidences, dtype=np.float64))
+
+    def accepts(self, score: float) -> bool:
+        """Whether a final score is high enough to count as a match"""
+        return score > 0 and score >= self.min_score
+
+    def best(self, target: str, texts: Sequence[str], confidences: Sequence[float],
+             mode: str = MODE_PARTIAL) -> Optional[int]:
+        """Index of the best-scoring text, or None"""
+        if not texts:
+            return None
+        scores = self.scores(target, texts, confidences, mode)
+        index = int(np.argmax(scores))
+        return index if self.accepts(scores[index]) else None
+
+    def matching(self, target: str, texts: Sequence[str], confidences: Sequence[float],
+                 mode: str = MODE_PARTIAL) -> List[int]:
+        """Indices of all matching texts, best first"""
+        if not texts:
+            return []
+        scores = self.scores(target, texts, confidences, mode)
+        return [int(i) for i in np.argsort(-scores, kind='stable') if self.accepts(scores[i])]
@@ -0,0 +1,10 @@
+"""
+Unit test setup: make the application packages under src importable
+"""
+
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
@@ -0,0 +1,78 @@
+"""
+Tests for compiling macros into execution plans
+"""
+
+from automation.execution_plan import (ACTION_EXCEL_LOOP, ACTION_RUN, ACTION_SKIP_BLOCK, compile_plan,
+                                       compile_steps)
+from core.macro_types import (ErrorHandling, ExcelRowEndStep, ExcelRowStartStep, LoopStep, Macro,
+                              StepType, WaitTimeStep)
+
+
+def _handlers():
+    return {StepType.WAIT_TIME: lambda step: None, StepType.LOOP: lambda step: None}
+
+
+def _wait(name, **kwargs):
+    return WaitTimeStep(name=name, seconds=0, **kwargs)
+
+
+def test_disabled_steps_are_left_out():
+    steps = [_wait("a"), _wait("b", enabled=False), _wait("c")]
+    plan = compile_steps(steps, _handlers())
+    assert [entry.step.name for entry in plan.entries] == ["a", "c"]
+    assert [entry.index for entry in plan.entries] == [0, 2]
+    assert len(plan) == 2
+    assert plan.steps == tuple(steps)
+
+
+def test_handlers_and_error_policy_are_resolved():
+    steps = [_wait("a", error_handling=ErrorHandling.RETRY, retry_count=2),
+             ExcelRowEndStep(name="orphan end")]
+    handlers = _handlers()
+    plan = compile_steps(steps, handlers)
+    first, second = plan.entries
+    assert first.handler is handlers[StepType.WAIT_TIME]
+    assert first.retries and first.retry_count == 2 and not first.stops_on_error
+    assert second.handler is None
+    assert second.action == ACTION_RUN
+
+
+def test_excel_block_is_paired_and_cut_from_row_steps():
+    start = ExcelRowStartStep(name="start", pair_id="p1")
+    end = ExcelRowEndStep(name="end", pair_id="p1")
+    steps = [_wait("before"), start, _wait("inside"), end, _wait("after")]
+    plan = compile_steps(steps, _handlers())
+
+    start_entry = plan.entries[1]
+    assert start_entry.action == ACTION_SKIP_BLOCK
+    assert start_entry.end_index == 3
+    assert [entry.step.name for entry in plan.row_entries] == ["before", "after"]
+    assert plan.has_row_start
+
+    (block,) = plan.blocks
+    assert (block.start_step, block.start_index, block.end_index) == (start, 1, 3)
+    assert [entry.step.name for entry in block.plan.entries] == ["inside"]
+
+
+def test_unpaired_row_start_keeps_following_steps():
+    steps = [ExcelRowStartStep(name="start", pair_id="p1"), _wait("a")]
+    plan = compile_steps(steps, _handlers())
+    assert plan.entries[0].end_index == -1
+    assert plan.blocks == ()
+    assert [entry.step.name for entry in plan.row_entries] == ["a"]
+
+
+def test_excel_loop_body_is_compiled_nested():
+    body = [_wait("body 1"), _wait("body 2")]
+    loop = LoopStep(name="loop", loop_type="excel_rows", loop_steps=[s.step_id for s in body])
+    plan = compile_steps([loop] + body, _handlers())
+    loop_entry = plan.entries[0]
+    assert loop_entry.action == ACTION_EXCEL_LOOP
+    assert [entry.step.name for entry in loop_entry.body.entries] == ["body 1", "body 2"]
+    assert all(entry.action == ACTION_RUN for entry in loop_entry.body.entries)
+
+
+def test_compile_plan_uses_macro_steps():
+    macro = Macro(name="m", steps=[_wait("a"), _wait("b")])
+    plan = compile_plan(macro, _handlers())
+    assert [entry.step.name for entry in plan.entries] == ["a", "b"]
@@ -0,0 +1,46 @@
+"""
+Tests for the per-template hit history used as a search prior
+"""
+
+from vision.hit_history import HitHistory
+
+
+def _history(tmp_path, **kwargs):
+    return HitHistory(history_file=tmp_path / "hits.json", save_interval=3600, **kwargs)
+
+
+def test_last_hit_and_probe_window(tmp_path):
+    history = _history(tmp_path)
+    assert history.last_hit("ok.png") is None
+    history.record("ok.png", (100, 50, 40, 20))
+    assert history.last_hit("ok.png") == (100, 50, 40, 20)
+    assert history.probe_window("ok.png", 10) == (90, 40, 60, 40)
+
+
+def test_probe_window_clipped_to_bounds(tmp_path):
+    history = _history(tmp_path)
+    history.record("ok.png", (0, 0, 40, 20))
+    assert history.probe_window("ok.png", 10, bounds=(0, 0, 200, 200)) == (0, 0, 50, 30)
+    # Last hit no longer inside the search bounds
+    assert history.probe_window("ok.png", 10, bounds=(100, 100, 50, 50)) is None
+
+
+def test_suggest_region_needs_enough_hits(tmp_path):
+    history = _history(tmp_path)
+    history.record("ok.png", (100, 100, 10, 10))
+    history.record("ok.png", (200, 150, 10, 10))
+    assert history.suggest_region("ok.png", padding=5) is None
+    history.record("ok.png", (150, 120, 10, 10))
+    assert history.suggest_region("ok.png", padding=5) == (95, 95, 120, 70)
+
+
+def test_hits_are_bounded_and_persisted(tmp_path):
+    history = _history(tmp_path, max_hits=2)
+    for x in range(5):
+        history.record("ok.png", (x, 0, 10, 10))
+    history.flush()
+    reloaded = _history(tmp_path)
+    assert reloaded.last_hit("ok.png") == (4, 0, 10, 10)
+    assert reloaded.report()[0]['hits'] == 2
+    history.forget("ok.png")
+    assert history.last_hit("ok.png") is None
@@ -0,0 +1,56 @@
+"""
+Tests for projection-profile line segmentation (recognition-only OCR)
+"""
+
+import numpy as np
+
+from vision.line_segmentation import (OCR_MODE_AUTO, OCR_MODE_FULL, OCR_MODE_LINE, OCR_MODE_LINES,
+                                      plan_recognition_boxes, split_lines)
+
+
+def _page(height, width, blocks):
+    """White image with black rectangles (x, y, w, h) standing in for text"""
+    gray = np.full((height, width), 255, dtype=np.uint8)
+    for x, y, w, h in blocks:
+        gray[y:y + h, x:x + w] = 0
+    return gray
+
+
+def test_split_lines_finds_each_row():
+    gray = _page(80, 200, [(10, 10, 100, 12), (10, 40, 60, 12)])
+    assert split_lines(gray) == [(10, 10, 100, 12), (10, 40, 60, 12)]
+
+
+def test_wide_column_gap_splits_fields():
+    gray = _page(40, 300, [(10, 10, 50, 12), (200, 10, 50, 12)])
+    assert split_lines(gray) == [(10, 10, 50, 12), (200, 10, 50, 12)]
+
+
+def test_thin_rules_are_dropped():
+    gray = _page(60, 200, [(0, 5, 200, 1), (10, 20, 80, 12)])
+    assert split_lines(gray) == [(10, 20, 80, 12)]
+
+
+def test_full_mode_always_uses_detection():
+    assert plan_recognition_boxes(_page(30, 200, [(10, 10, 80, 12)]), OCR_MODE_FULL) is None
+
+
+def test_single_line_region_gets_one_padded_box():
+    boxes = plan_recognition_boxes(_page(30, 200, [(10, 10, 80, 12)]), OCR_MODE_LINE)
+    assert len(boxes) == 1
+    x, y, w, h = boxes[0]
+    assert x < 10 and y < 10 and x + w > 90 and y + h > 22
+
+
+def test_lines_mode_returns_every_line():
+    gray = _page(100, 300, [(10, 10, 100, 12), (10, 40, 100, 12), (10, 70, 100, 12)])
+    assert len(plan_recognition_boxes(gray, OCR_MODE_LINES)) == 3
+
+
+def test_auto_mode_uses_detection_for_large_regions():
+    gray = _page(600, 1000, [(10, 10, 100, 12)])
+    assert plan_recognition_boxes(gray, OCR_MODE_AUTO) is None
+
+
+def test_blank_region_has_no_boxes():
+    assert plan_recognition_boxes(np.full((30, 200), 255, dtype=np.uint8), OCR_MODE_AUTO) == []
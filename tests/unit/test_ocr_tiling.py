@@ -0,0 +1,68 @@
+"""
+Tests for OCR tile planning and seam-aware merging
+"""
+
+from vision.ocr_common import TextResult
+from vision.ocr_tiling import _spans, merge_tile_results, monitor_areas, plan_tiles
+
+
+def _result(text, bbox, confidence=0.9):
+    x, y, w, h = bbox
+    return TextResult(text, confidence, bbox, (x + w // 2, y + h // 2))
+
+
+def test_spans_single_span_when_it_fits():
+    assert _spans(100, 500, 960, 64) == [(100, 600)]
+
+
+def test_spans_cover_length_with_overlap_and_equal_size():
+    spans = _spans(0, 2000, 960, 64)
+    assert spans[0][0] == 0 and spans[-1][1] == 2000
+    sizes = {end - start for start, end in spans}
+    assert len(sizes) == 1 and sizes.pop() <= 960
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert end - start >= 64
+
+
+def test_plan_tiles_never_straddles_monitors():
+    monitors = [
+        {"left": 0, "top": 0, "width": 3840, "height": 1080},
+        {"left": 0, "top": 0, "width": 1920, "height": 1080},
+        {"left": 1920, "top": 0, "width": 1920, "height": 1080},
+    ]
+    tiles = plan_tiles((0, 0, 3840, 1080), monitors, tile_size=960, overlap=64)
+    for x, y, w, h in tiles:
+        assert w <= 960 and h <= 960
+        assert x + w <= 1920 or x >= 1920
+
+
+def test_monitor_areas_without_monitor_list():
+    assert monitor_areas((10, 20, 300, 200), []) == [(10, 20, 300, 200)]
+
+
+def test_duplicate_in_overlap_keeps_uncut_box():
+    outer = [(0, 0, 200, 100)]
+    left_tile, right_tile = (0, 0, 120, 100), (80, 0, 120, 100)
+    cut = _result("확인", (100, 10, 20, 10))     # touches the left tile's right seam
+    whole = _result("확인", (95, 10, 25, 10))
+    merged = merge_tile_results([(left_tile, [cut]), (right_tile, [whole])], outer)
+    assert merged == [whole]
+
+
+def test_line_cut_by_both_tiles_is_joined():
+    outer = [(0, 0, 200, 100)]
+    left_tile, right_tile = (0, 0, 120, 100), (80, 0, 120, 100)
+    left = _result("환자번호조", (40, 10, 80, 12))   # cut at x=120
+    right = _result("번호조회", (80, 10, 80, 12))    # cut at x=80
+    merged = merge_tile_results([(left_tile, [left]), (right_tile, [right])], outer)
+    assert len(merged) == 1
+    assert merged[0].text == "환자번호조회"
+    assert merged[0].bbox == (40, 10, 120, 12)
+
+
+def test_separate_lines_are_kept_in_reading_order():
+    outer = [(0, 0, 200, 100)]
+    tile = (0, 0, 200, 100)
+    second = _result("둘", (10, 50, 20, 10))
+    first = _result("하나", (10, 10, 20, 10))
+    assert merge_tile_results([(tile, [second, first])], outer) == [first, second]
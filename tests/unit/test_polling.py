@@ -0,0 +1,50 @@
+"""
+Tests for frame diffing and adaptive polling used by wait steps
+"""
+
+import time
+
+import numpy as np
+
+from vision.polling import AdaptivePoller, FrameDiffer, search_windows
+
+
+def test_frame_differ_reports_changed_tiles_only():
+    differ = FrameDiffer(tile_size=64, scale=4)
+    frame = np.zeros((128, 192), dtype=np.uint8)
+    assert differ.update(frame) is None
+    assert differ.update(frame.copy()) == []
+
+    changed = frame.copy()
+    changed[70:80, 140:150] = 255
+    assert differ.update(changed) == [(128, 64, 64, 64)]
+    assert differ.tile_count(frame.shape) == 6
+
+
+def test_frame_differ_restarts_on_size_change():
+    differ = FrameDiffer()
+    differ.update(np.zeros((64, 64), dtype=np.uint8))
+    assert differ.update(np.zeros((32, 64), dtype=np.uint8)) is None
+
+
+def test_search_windows_grow_by_template_and_merge():
+    windows = search_windows([(64, 0, 64, 64), (128, 0, 64, 64)], (10, 10), (256, 256))
+    assert windows == [(55, 0, 146, 73)]
+
+
+def test_search_windows_are_clipped_to_frame():
+    assert search_windows([(0, 0, 32, 32)], (20, 20), (40, 40)) == [(0, 0, 40, 40)]
+
+
+def test_poller_backs_off_while_idle_and_resets_on_change():
+    poller = AdaptivePoller(min_interval=0.05, max_interval=0.2, backoff=2.0)
+    assert poller.update(False) == 0.1
+    assert poller.update(False) == 0.2
+    assert poller.update(False) == 0.2
+    assert poller.update(True) == 0.05
+
+
+def test_poller_stays_fast_after_input():
+    poller = AdaptivePoller(min_interval=0.05, max_interval=0.5, backoff=2.0,
+                            last_input_time=time.perf_counter)
+    assert poller.update(False) == 0.05
@@ -0,0 +1,80 @@
+"""
+Tests for the byte-bounded template cache and its on-disk store
+"""
+
+import json
+
+import numpy as np
+
+from vision.template_cache import TemplateCache
+
+
+def _template(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def _builder(shape=(10, 10)):
+    calls = []
+
+    def build(data):
+        calls.append(data)
+        return np.zeros(shape, dtype=np.uint8)
+    return build, calls
+
+
+def test_hit_after_first_build(tmp_path):
+    cache = TemplateCache(use_disk=False)
+    path = _template(tmp_path, "a.png", b"a")
+    build, calls = _builder()
+    cache.get(path, "gray", 1.0, build)
+    cache.get(path, "gray", 1.0, build)
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_copies_share_entries_and_variants_do_not(tmp_path):
+    cache = TemplateCache(use_disk=False)
+    first = _template(tmp_path, "a.png", b"same")
+    copy = _template(tmp_path, "b.png", b"same")
+    build, calls = _builder()
+    cache.get(first, "gray", 1.0, build)
+    cache.get(copy, "gray", 1.0, build)
+    cache.get(copy, "gray", 0.5, build)
+    assert len(calls) == 2
+
+
+def test_evicts_least_recently_used_over_budget(tmp_path):
+    cache = TemplateCache(max_bytes=250, use_disk=False)
+    build, calls = _builder((10, 10))
+    paths = [_template(tmp_path, f"{i}.png", bytes([i])) for i in range(3)]
+    for path in paths:
+        cache.get(path, "gray", 1.0, build)
+    assert cache.size_bytes == 200
+    cache.get(paths[0], "gray", 1.0, build)
+    assert len(calls) == 4
+
+
+def test_disk_store_survives_new_instance(tmp_path):
+    store = tmp_path / "store"
+    path = _template(tmp_path, "a.png", b"a")
+    build, calls = _builder()
+    TemplateCache(store_dir=store).get(path, "gray", 1.0, build)
+
+    cache = TemplateCache(store_dir=store)
+    value = cache.get(path, "gray", 1.0, build)
+    assert len(calls) == 1
+    assert cache.disk_hits == 1
+    assert value.shape == (10, 10)
+
+
+def test_index_is_written_on_flush_not_per_file(tmp_path):
+    store = tmp_path / "store"
+    cache = TemplateCache(store_dir=store)
+    build, _ = _builder()
+    for i in range(3):
+        cache.get(_template(tmp_path, f"{i}.png", bytes([i])), "gray", 1.0, build)
+    assert not (store / TemplateCache.INDEX_FILE).exists()
+    cache.flush()
+    assert len(json.loads((store / TemplateCache.INDEX_FILE).read_text(encoding='utf-8'))) == 3
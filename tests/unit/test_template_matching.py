@@ -0,0 +1,85 @@
+"""
+Tests for template matching helpers (local maxima, NMS, top-K, pyramid)
+"""
+
+import numpy as np
+import pytest
+
+from vision.template_matching import (find_peaks, match_best, match_pyramid, pyramid_levels_for,
+                                      sort_reading_order, top_peaks)
+
+
+def _score_map(shape, peaks):
+    """Match map with a small Gaussian bump of the given height at each (x, y)"""
+    result = np.zeros(shape, dtype=np.float32)
+    ys, xs = np.mgrid[0:shape[0], 0:shape[1]]
+    for (x, y), height in peaks.items():
+        bump = height * np.exp(-((xs - x) ** 2 + (ys - y) ** 2) / 2.0)
+        result = np.maximum(result, bump.astype(np.float32))
+    return result
+
+
+def test_find_peaks_returns_one_match_per_bump_best_first():
+    result = _score_map((60, 80), {(10, 10): 0.95, (50, 40): 0.9, (70, 10): 0.85})
+    peaks = find_peaks(result, 0.8, (8, 8))
+    assert [loc for _, loc in peaks] == [(10, 10), (50, 40), (70, 10)]
+    assert peaks[0][0] == pytest.approx(0.95)
+
+
+def test_find_peaks_ignores_scores_below_threshold():
+    result = _score_map((40, 40), {(10, 10): 0.95, (30, 30): 0.6})
+    assert [loc for _, loc in find_peaks(result, 0.8, (8, 8))] == [(10, 10)]
+
+
+def test_find_peaks_suppresses_overlapping_placements():
+    # Two maxima 3 px apart with a 20 px template are the same occurrence
+    result = np.zeros((40, 40), dtype=np.float32)
+    result[10, 10] = 0.95
+    result[10, 13] = 0.9
+    result[10, 35] = 0.85
+    peaks = find_peaks(result, 0.8, (20, 20), iou_threshold=0.3)
+    assert [loc for _, loc in peaks] == [(10, 10), (35, 10)]
+
+
+def test_find_peaks_respects_limit():
+    result = _score_map((20, 200), {(x, 10): 0.9 + x / 10000 for x in range(10, 190, 20)})
+    peaks = find_peaks(result, 0.8, (5, 5), limit=3)
+    assert len(peaks) == 3
+    assert [loc[0] for _, loc in peaks] == [170, 150, 130]
+
+
+def test_find_peaks_with_no_limit_or_no_hits():
+    result = _score_map((20, 20), {(10, 10): 0.9})
+    assert find_peaks(result, 0.8, (5, 5), limit=0) == []
+    assert find_peaks(result, 0.99, (5, 5)) == []
+
+
+def test_top_peaks_suppresses_neighbourhood():
+    result = _score_map((30, 60), {(10, 10): 0.9, (12, 10): 0.88, (50, 20): 0.7})
+    peaks = top_peaks(result, 2, (5, 5))
+    assert [loc for _, loc in peaks] == [(10, 10), (50, 20)]
+
+
+def test_sort_reading_order_groups_rows():
+    points = [(100, 52), (10, 50), (50, 100), (5, 98)]
+    assert sort_reading_order(points, row_tolerance=5) == [1, 0, 3, 2]
+
+
+def test_pyramid_levels_keep_template_above_min_side():
+    assert pyramid_levels_for((20, 100)) == 0
+    assert pyramid_levels_for((40, 40)) == 1
+    assert pyramid_levels_for((200, 300)) == 3
+
+
+def test_match_pyramid_finds_same_location_as_full_match():
+    rng = np.random.default_rng(0)
+    image = (rng.random((240, 320)) * 255).astype(np.uint8)
+    template = image[100:164, 150:214].copy()
+    assert match_best(image, template)[1] == (150, 100)
+    score, loc = match_pyramid(image, template)
+    assert loc == (150, 100)
+    assert score == pytest.approx(1.0, abs=1e-3)
+
+
+def test_match_best_with_template_larger_than_image():
+    assert match_best(np.zeros((10, 10), np.uint8), np.zeros((20, 20), np.uint8)) == (0.0, (0, 0))
@@ -0,0 +1,73 @@
+"""
+Tests for anchor-relative queries over OCR results
+"""
+
+import pytest
+
+from vision.ocr_common import TextResult
+from vision.text_index import (QUERY_BELOW, QUERY_BOX, QUERY_LEFT, QUERY_RIGHT, QUERY_ROW, TextIndex,
+                               join_text, reading_order, split_labeled)
+
+
+def _result(text, x, y, w=60, h=16):
+    return TextResult(text, 0.9, (x, y, w, h), (x + w // 2, y + h // 2))
+
+
+@pytest.fixture
+def form():
+    label = _result("환자번호", 10, 10)
+    value = _result("12345678", 90, 12)
+    far = _result("메모", 400, 10)
+    name_label = _result("이름", 10, 40)
+    name = _result("홍길동", 90, 40)
+    return [label, value, far, name_label, name]
+
+
+def test_neighbour_right_and_below(form):
+    index = TextIndex(form)
+    label, value, far, name_label, name = form
+    assert index.neighbour(label, QUERY_RIGHT) is value
+    assert index.neighbour(label, QUERY_BELOW) is name_label
+    assert index.neighbour(value, QUERY_LEFT) is label
+    assert index.neighbour(label, QUERY_RIGHT, max_distance=5) is None
+
+
+def test_row_stops_at_wide_gap(form):
+    index = TextIndex(form)
+    label, value, far = form[:3]
+    assert index.row(label) == [value, far]
+    assert index.row(label, max_gap=50) == [value]
+
+
+def test_box_query_is_relative_to_anchor(form):
+    index = TextIndex(form)
+    label, value = form[:2]
+    assert index.query(label, QUERY_BOX, box_offset=(70, -5, 100, 30)) == [value]
+    with pytest.raises(ValueError):
+        index.query(label, QUERY_BOX)
+    assert index.query(label, QUERY_ROW, max_distance=100) == [value]
+
+
+def test_reading_order_and_join(form):
+    shuffled = list(reversed(form))
+    assert join_text(shuffled) == "환자번호 12345678 메모 이름 홍길동"
+    assert reading_order([]) == []
+
+
+def test_split_labeled_separates_value():
+    combined = _result("환자번호: 12345678", 10, 10, w=180)
+    label, value = split_labeled(combined, "환자번호")
+    assert label.text == "환자번호"
+    assert value.text == "12345678"
+    assert value.bbox[0] > label.bbox[0] + label.bbox[2] - 1
+
+
+def test_split_labeled_without_label():
+    result = _result("12345678", 10, 10)
+    assert split_labeled(result, "환자번호") == (result, None)
+
+
+def test_empty_index():
+    index = TextIndex([])
+    assert len(index) == 0
+    assert index.in_box((0, 0, 100, 100)) == []
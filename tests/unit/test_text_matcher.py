@@ -0,0 +1,94 @@
+"""
+Tests for Hangul-aware fuzzy text matching
+"""
+
+import numpy as np
+import pytest
+
+from vision.text_matcher import (MODE_AGGRESSIVE, MODE_EXACT, MODE_PARTIAL, TextMatcher, compact,
+                                 decompose_hangul, fuzzy_distances, normalize)
+
+
+def test_normalize_folds_full_width_and_case():
+    assert normalize("  ＡＢＣ１２３ ") == "abc123"
+
+
+def test_compact_drops_spaces_and_punctuation():
+    assert compact("환자 번호: 12-34") == "환자번호1234"
+
+
+def test_decompose_hangul_makes_one_jamo_one_edit():
+    a, b = decompose_hangul("환자"), decompose_hangul("환지")
+    assert len(a) == len(b)
+    assert sum(x != y for x, y in zip(a, b)) == 1
+
+
+def test_fuzzy_distances_partial_and_whole():
+    texts = ["abcdef", "xxabcxx", "abd", "zzz"]
+    partial = fuzzy_distances("abc", texts, max_distance=1)
+    assert partial.tolist() == [0, 0, 1, 2]
+    whole = fuzzy_distances("abc", texts, max_distance=5, partial=False)
+    assert whole.tolist() == [3, 4, 1, 3]
+
+
+def test_fuzzy_distances_strict_characters_cannot_be_edited():
+    distances = fuzzy_distances("12345", ["12845", "12345"], max_distance=2, strict=frozenset("0123456789"))
+    assert distances.tolist() == [3, 0]
+
+
+def test_fuzzy_distances_empty_input():
+    assert fuzzy_distances("abc", [], 1).tolist() == []
+
+
+def test_exact_mode_requires_equal_normalized_text():
+    matcher = TextMatcher()
+    assert matcher.similarities("환자번호", ["환자번호", "환자번호 조회"], MODE_EXACT).tolist() == [1.0, 0.0]
+
+
+def test_one_misread_jamo_still_matches():
+    matcher = TextMatcher()
+    assert matcher.best("환자번호", ["진료과", "환지번호"], [0.9, 0.9]) == 1
+
+
+def test_tighter_line_ranks_first():
+    matcher = TextMatcher()
+    assert matcher.matching("환자번호", ["환자번호 조회 결과", "환자번호"], [0.9, 0.9]) == [1, 0]
+
+
+def test_digits_must_match_exactly():
+    matcher = TextMatcher()
+    assert matcher.best("12345", ["12346", "1234"], [1.0, 1.0]) is None
+    assert matcher.best("12345", ["ID 12345"], [1.0]) == 0
+
+
+def test_digit_fragment_never_scores():
+    matcher = TextMatcher()
+    assert matcher.similarities("12345", ["1234"]).tolist() == [0.0]
+
+
+def test_fragment_ranks_but_is_not_a_match_on_its_own():
+    matcher = TextMatcher()
+    similarity = matcher.similarities("진료과목선택", ["진료과목"])
+    assert 0.0 < similarity[0] < 0.5
+    assert matcher.best("진료과목선택", ["진료과목"], [1.0]) is None
+
+
+def test_confidence_weighs_score():
+    matcher = TextMatcher(confidence_weight=0.3)
+    scores = matcher.scores("확인", ["확인", "확인"], [1.0, 0.0])
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] == pytest.approx(0.7)
+
+
+def test_aggressive_mode_ignores_punctuation():
+    matcher = TextMatcher()
+    assert matcher.best("환자번호", ["환자-번호:"], [1.0], MODE_AGGRESSIVE) == 0
+    assert matcher.similarities("환자번호", ["환자-번호:"], MODE_PARTIAL)[0] < \
+        matcher.similarities("환자번호", ["환자-번호:"], MODE_AGGRESSIVE)[0]
+
+
+def test_no_texts():
+    matcher = TextMatcher()
+    assert matcher.best("a", [], []) is None
+    assert matcher.matching("a", [], []) == []
+    assert isinstance(matcher.similarities("", ["a"]), np.ndarray)
@@ -0,0 +1,91 @@
+"""
+OCR 엔진 프로파일 자동 조정 스크립트
+
+사용법:
+    python tune_ocr_profile.py [이미지 폴더 ...] [--runs N] [--max-images N] [--tolerance T] [--dry-run]
+
+샘플 이미지(기본: captures/, image/)로 PaddleOCR 설정 후보를 측정하고, 정확도가 가장 좋은 설정과
+tolerance 이내인 것 중 가장 빠른 설정을 ocr.profile에 저장합니다. 앱을 다시 시작하면 적용됩니다.
+
+측정 항목 (단계별로 하나씩 바꿔 가며 측정):
+- CPU 스레드 수 (이 PC의 코어 수까지)
+- MKL-DNN 사용 여부
+- 검출 입력 긴 변 상한 (det_limit_side_len)
+- 검출/인식 모델 종류
+
+정확도: 이미지 옆의 <이름>.txt (한 줄에 기대 텍스트 하나) 또는 폴더의 labels.json
+({"파일 이름": ["텍스트", ...]})을 정답으로 사용합니다. 라벨이 없는 이미지는 기존 기본 설정의
+인식 결과와 비교합니다 (더 빠른 설정이 기존에 찾던 텍스트를 놓치지 않는지).
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root / "src"))
+
+from vision.ocr_common import check_gpu_availability
+from vision.ocr_profiler import OCRProfileTuner, ProfileResult, load_samples, save_profile
+
+
+def describe(profile) -> str:
+    side = profile['det_limit_side_len'] or 'default'
+    return (f"{profile['det_model']:<20} {profile['rec_model']:<27} side={side:<7} "
+            f"threads={profile['cpu_threads']:<3} mkldnn={'on' if profile['enable_mkldnn'] else 'off'}")
+
+
+def print_result(result: ProfileResult):
+    if result.ok:
+        print(f"{describe(result.profile)} {result.latency_ms:>8.1f} ms  load {result.load_s:>5.1f} s")
+    else:
+        print(f"{describe(result.profile)} 실패: {result.error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR engine settings and store the best profile")
+    parser.add_argument("folders", nargs="*",
+                        default=[str(project_root / "captures"), str(project_root / "image")])
+    parser.add_argument("--runs", type=int, default=3, help="OCR repetitions per image")
+    parser.add_argument("--max-images", type=int, default=0, help="limit the number of sample images")
+    parser.add_argument("--tolerance", type=float, default=0.02,
+                        help="accuracy a faster profile may lose against the most accurate one")
+    parser.add_argument("--dry-run", action="store_true", help="measure only, do not save")
+    args = parser.parse_args()
+
+    from vision.text_extractor_paddle import PADDLEOCR_AVAILABLE
+    if not PADDLEOCR_AVAILABLE:
+        print("PaddleOCR이 설치되지 않았습니다: pip install paddlepaddle paddleocr")
+        return
+
+    samples = load_samples(args.folders, args.max_images)
+    if not samples:
+        print(f"이미지가 없습니다: {', '.join(args.folders)}")
+        return
+    labeled = sum(1 for s in samples if s.expected is not None)
+    print(f"샘플 이미지 {len(samples)}개 (라벨 {labeled}개), 반복 {args.runs}회\n")
+
+    tuner = OCRProfileTuner(samples, runs=args.runs, tolerance=args.tolerance,
+                            use_gpu=check_gpu_availability(), progress=print_result)
+    best = tuner.tune()
+
+    print(f"\n{'profile':<86} {'ms':>8} {'accuracy':>9}")
+    for result in sorted((r for r in tuner.results.values() if r.ok), key=lambda r: r.latency_ms):
+        marker = " *" if result is best else ""
+        print(f"{describe(result.profile)} {result.latency_ms:>8.1f} {result.accuracy:>9.3f}{marker}")
+
+    reference = tuner.reference
+    print(f"\n선택: {describe(best.profile)}")
+    print(f"기본 설정 대비 {reference.latency_ms / best.latency_ms:.2f}배 "
+          f"({reference.latency_ms:.1f} -> {best.latency_ms:.1f} ms), 정확도 {best.accuracy:.3f}")
+
+    if args.dry_run:
+        return
+    from config.settings import Settings
+    save_profile(Settings(), best)
+    print("ocr.profile에 저장했습니다. 앱을 다시 시작하면 적용됩니다.")
+
+
+if __name__ == "__main__":
+    main()